@@ -0,0 +1,341 @@
+"""Parallel backfill of analytics aggregates, split by partition day and org."""
+
+import asyncio
+import multiprocessing
+import time
+from collections import Counter
+from concurrent.futures import Executor, ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.analytics.incremental_aggregation import IncrementalAggregator
+from app.analytics.quantile_sketch import SketchStore
+from app.core.database import get_sync_url
+
+DEFAULT_WORKERS = 4
+
+PLAN_SQL = """
+    SELECT CAST(partition_date AS date) AS day, organization_id, count(*)
+    FROM fact_ivr_call
+    WHERE partition_date >= :start AND partition_date < :end
+        AND (
+            CAST(:organization_ids AS integer[]) IS NULL
+            OR organization_id = ANY(:organization_ids)
+        )
+    GROUP BY 1, 2
+    ORDER BY 1, 2
+"""
+
+SKETCH_SOURCE_SQL = """
+    SELECT
+        t.date AS call_time,
+        o.org_id,
+        f.duration_seconds,
+        f.verification_time_seconds
+    FROM fact_ivr_call f
+    JOIN dim_time t ON t.id = f.time_id
+    JOIN dim_organization o ON o.id = f.organization_id
+    WHERE f.partition_date >= :day
+        AND f.partition_date < CAST(:day AS date) + 1
+        AND f.organization_id = :organization_id
+"""
+
+CHECKPOINT_SQL = """
+    INSERT INTO etl_backfill_checkpoints (
+        run_id, partition_date, organization_id,
+        status, fact_rows, elapsed_ms, error, completed_at
+    )
+    VALUES (
+        :run_id, :day, :organization_id,
+        :status, :fact_rows, :elapsed_ms, :error, now()
+    )
+    ON CONFLICT (run_id, partition_date, organization_id) DO UPDATE SET
+        status = EXCLUDED.status,
+        fact_rows = EXCLUDED.fact_rows,
+        elapsed_ms = EXCLUDED.elapsed_ms,
+        error = EXCLUDED.error,
+        completed_at = EXCLUDED.completed_at
+"""
+
+
+class BackfillUnit(NamedTuple):
+    """One independently rebuildable slice of the fact table."""
+
+    day: date
+    organization_id: int
+    fact_rows: int = 0
+
+
+@dataclass
+class BackfillProgress:
+    """Running totals of a backfill, weighted by fact rows for throughput."""
+
+    total_units: int
+    total_rows: int
+    skipped_units: int = 0
+    completed_units: int = 0
+    failed_units: int = 0
+    rows: int = 0
+    started_at: float = field(default_factory=time.monotonic)
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started_at
+
+    @property
+    def rows_per_second(self) -> float:
+        elapsed = self.elapsed
+        return self.rows / elapsed if elapsed > 0 else 0.0
+
+    @property
+    def eta_seconds(self) -> Optional[float]:
+        rate = self.rows_per_second
+        if not rate:
+            return None
+        return (self.total_rows - self.rows) / rate
+
+    def as_dict(self) -> Dict:
+        eta = self.eta_seconds
+        return {
+            "total_units": self.total_units,
+            "skipped_units": self.skipped_units,
+            "completed_units": self.completed_units,
+            "failed_units": self.failed_units,
+            "rows": self.rows,
+            "total_rows": self.total_rows,
+            "elapsed_seconds": round(self.elapsed, 1),
+            "rows_per_second": round(self.rows_per_second, 1),
+            "eta_seconds": round(eta, 1) if eta is not None else None,
+        }
+
+
+def _checkpoint(
+    db: Session,
+    run_id: str,
+    unit: BackfillUnit,
+    status: str,
+    elapsed_ms: int = 0,
+    error: Optional[str] = None,
+) -> None:
+    db.execute(
+        text(CHECKPOINT_SQL),
+        {
+            "run_id": run_id,
+            "day": unit.day,
+            "organization_id": unit.organization_id,
+            "status": status,
+            "fact_rows": unit.fact_rows,
+            "elapsed_ms": elapsed_ms,
+            "error": error,
+        },
+    )
+
+
+async def _rebuild_sketches(db: Session, unit: BackfillUnit) -> int:
+    """Replace the unit's latency sketches with ones built from its facts."""
+    params = {"day": unit.day, "organization_id": unit.organization_id}
+    calls = [dict(row._mapping) for row in db.execute(text(SKETCH_SOURCE_SQL), params)]
+    if not calls:
+        return 0
+    return await SketchStore().rebuild_day(calls[0]["org_id"], unit.day, calls)
+
+
+def backfill_unit(
+    db: Session,
+    run_id: str,
+    unit: BackfillUnit,
+    rebuild_sketches: bool = False,
+    loop: Optional[asyncio.AbstractEventLoop] = None,
+) -> Dict[str, int]:
+    """
+    Rebuild the aggregates (and optionally sketches) of one unit.
+
+    The checkpoint is written in the same transaction as the aggregates, so
+    a unit is either rebuilt and recorded or neither.
+    """
+    started = time.perf_counter()
+    result = IncrementalAggregator(db).aggregate_organization(
+        unit.day, unit.organization_id
+    )
+    if rebuild_sketches:
+        coroutine = _rebuild_sketches(db, unit)
+        result["sketches"] = (
+            loop.run_until_complete(coroutine) if loop else asyncio.run(coroutine)
+        )
+    result["elapsed_ms"] = int((time.perf_counter() - started) * 1000)
+    _checkpoint(db, run_id, unit, "completed", result["elapsed_ms"])
+    db.commit()
+    return result
+
+
+# Per-process state of pool workers, set up by _init_worker
+_worker_sessions: Optional[sessionmaker] = None
+_worker_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _init_worker(database_url: str) -> None:
+    """Give each worker process its own connection and event loop."""
+    global _worker_sessions, _worker_loop
+    engine = create_engine(
+        database_url, pool_size=1, max_overflow=0, pool_pre_ping=True
+    )
+    _worker_sessions = sessionmaker(bind=engine)
+    # One loop per worker keeps pooled Redis connections usable across units
+    _worker_loop = asyncio.new_event_loop()
+
+
+def _run_unit(run_id: str, unit: BackfillUnit, rebuild_sketches: bool) -> Dict:
+    with _worker_sessions() as db:
+        try:
+            return backfill_unit(db, run_id, unit, rebuild_sketches, _worker_loop)
+        except Exception:
+            db.rollback()
+            raise
+
+
+class BackfillRunner:
+    """
+    Rebuilds call aggregates for a date range in parallel.
+
+    The fact table is split into (partition day, organization) units that
+    are rebuilt in a process pool, each worker on its own connection. Every
+    finished unit is checkpointed under ``run_id``, so re-running the same
+    run skips completed units. Once every unit of a day has been rebuilt the
+    day's incremental-aggregation watermark is advanced as well.
+    """
+
+    def __init__(
+        self,
+        db: Session,
+        run_id: str,
+        workers: int = DEFAULT_WORKERS,
+        rebuild_sketches: bool = False,
+        database_url: Optional[str] = None,
+    ):
+        self.db = db
+        self.run_id = run_id
+        self.workers = workers
+        self.rebuild_sketches = rebuild_sketches
+        self.database_url = database_url or get_sync_url()
+        self.aggregator = IncrementalAggregator(db)
+
+    def plan(
+        self,
+        start: date,
+        end: date,
+        organization_ids: Optional[Iterable[int]] = None,
+    ) -> List[BackfillUnit]:
+        """Return the units holding facts in [start, end)."""
+        rows = self.db.execute(
+            text(PLAN_SQL),
+            {
+                "start": start,
+                "end": end,
+                "organization_ids": (
+                    list(organization_ids) if organization_ids is not None else None
+                ),
+            },
+        )
+        return [BackfillUnit(*row) for row in rows]
+
+    def completed_units(self) -> Set[Tuple[date, int]]:
+        """Return the units this run already checkpointed as completed."""
+        rows = self.db.execute(
+            text(
+                "SELECT partition_date, organization_id "
+                "FROM etl_backfill_checkpoints "
+                "WHERE run_id = :run_id AND status = 'completed'"
+            ),
+            {"run_id": self.run_id},
+        )
+        return {(row[0], row[1]) for row in rows}
+
+    def _executor(self) -> Executor:
+        # Forked children would inherit the parent's connections
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(self.database_url,),
+        )
+
+    def _record_failure(self, unit: BackfillUnit, error: Exception) -> None:
+        try:
+            _checkpoint(self.db, self.run_id, unit, "failed", error=str(error))
+            self.db.commit()
+        except Exception as e:
+            print(f"Error recording backfill failure: {e}")
+            self.db.rollback()
+
+    def run(
+        self,
+        start: date,
+        end: date,
+        organization_ids: Optional[Iterable[int]] = None,
+        on_progress: Optional[Callable[[BackfillProgress], None]] = None,
+    ) -> BackfillProgress:
+        """
+        Backfill every unit in [start, end) not yet completed by this run.
+
+        Args:
+            start: First partition day
+            end: Day after the last partition day
+            organization_ids: Restrict the backfill to these organizations
+            on_progress: Called with the running totals after each unit
+
+        Returns:
+            Final progress totals
+        """
+        units = self.plan(start, end, organization_ids)
+        done = self.completed_units()
+        pending = [u for u in units if (u.day, u.organization_id) not in done]
+        progress = BackfillProgress(
+            total_units=len(units),
+            total_rows=sum(u.fact_rows for u in pending),
+            skipped_units=len(units) - len(pending),
+        )
+        if not pending:
+            return progress
+
+        # Snapshot each day first so facts arriving mid-run stay dirty; days
+        # resumed from an earlier attempt keep their old watermark
+        remaining = Counter(u.day for u in pending)
+        skip_watermark = {day for day, _ in done} & set(remaining)
+        states = {
+            day: self.aggregator.partition_state(day)
+            for day in remaining
+            if day not in skip_watermark
+        }
+        self.db.commit()
+
+        with self._executor() as pool:
+            futures = {
+                pool.submit(_run_unit, self.run_id, unit, self.rebuild_sketches): unit
+                for unit in pending
+            }
+            for future in as_completed(futures):
+                unit = futures[future]
+                try:
+                    future.result()
+                    progress.completed_units += 1
+                    progress.rows += unit.fact_rows
+                except Exception as e:
+                    print(
+                        f"Error backfilling {unit.day} org {unit.organization_id}: {e}"
+                    )
+                    progress.failed_units += 1
+                    skip_watermark.add(unit.day)
+                    self._record_failure(unit, e)
+
+                remaining[unit.day] -= 1
+                if not remaining[unit.day] and unit.day not in skip_watermark:
+                    self.aggregator.record_watermark(unit.day, states[unit.day])
+                    self.db.commit()
+                if on_progress:
+                    on_progress(progress)
+
+        return progress
@@ -0,0 +1,306 @@
+"""In-memory surrogate-key maps for the analytics star schema dimensions."""
+
+import calendar
+from datetime import datetime, timezone
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.analytics.models import (
+    DimGeography,
+    DimInsuranceProvider,
+    DimOrganization,
+    DimPatientSatisfaction,
+    DimTime,
+    DimVerificationPerformance,
+)
+
+# How far ahead the time dimension is generated at ETL start
+TIME_DIMENSION_YEARS_AHEAD = 2
+
+# Sentiment is keyed at one decimal so the satisfaction dimension stays
+# small; the exact score is kept on the call fact
+SENTIMENT_KEY_STEP = Decimal("0.1")
+
+# Natural keys of the junk dimensions: every attribute of the row
+SATISFACTION_COLUMNS = (
+    "satisfaction_level",
+    "feedback_category",
+    "response_channel",
+    "sentiment_score",
+)
+VERIFICATION_COLUMNS = (
+    "verification_type",
+    "response_time_category",
+    "error_type",
+    "retry_count",
+    "sla_category",
+)
+
+
+def truncate_to_hour(value: datetime) -> datetime:
+    """Return ``value`` as naive UTC at the grain of the time dimension."""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc)
+    return value.replace(minute=0, second=0, microsecond=0, tzinfo=None)
+
+
+def sentiment_bucket(score: float) -> float:
+    """Round a sentiment score to its dimension key, halves away from zero.
+
+    Matches PostgreSQL ``round(numeric, 1)``, which the natural-key
+    migration applies to existing rows.
+    """
+    return float(Decimal(str(score)).quantize(SENTIMENT_KEY_STEP, ROUND_HALF_UP))
+
+
+def add_years(value: datetime, years: int) -> datetime:
+    """Shift ``value`` by whole years, moving Feb 29 to Feb 28."""
+    year = value.year + years
+    day = min(value.day, calendar.monthrange(year, value.month)[1])
+    return value.replace(year=year, day=day)
+
+
+def time_dimension_row(value: datetime) -> Dict:
+    """Build the attributes of the hourly time dimension row for ``value``."""
+    hour = truncate_to_hour(value)
+    return {
+        "date": hour,
+        "year": hour.year,
+        "month": hour.month,
+        "day": hour.day,
+        "hour": hour.hour,
+        "day_of_week": hour.weekday(),
+        "week_of_year": hour.isocalendar()[1],
+        "quarter": (hour.month - 1) // 3 + 1,
+        "is_weekend": hour.weekday() >= 5,
+        "is_holiday": False,
+    }
+
+
+class DimensionKeyCache:
+    """
+    Natural-key to surrogate-key map for one dimension table.
+
+    The whole mapping is preloaded once; lookups that miss are inserted (when
+    a row builder is available) with ``INSERT ... ON CONFLICT`` so concurrent
+    loaders converge on the same surrogate key. Keys inserted in the current
+    transaction stay pending until ``confirm`` so a rollback cannot leave ids
+    in the map that never reached the table.
+    """
+
+    def __init__(
+        self,
+        db: Session,
+        model,
+        natural_key: Tuple[str, ...],
+        constraint: Optional[str] = None,
+        build_row: Optional[Callable[[Tuple], Dict]] = None,
+    ):
+        self.db = db
+        self.model = model
+        self.natural_key = natural_key
+        self.constraint = constraint
+        self.build_row = build_row
+        self._keys: Dict[Tuple, int] = {}
+        self._pending: Dict[Tuple, int] = {}
+        self._natural: Dict[int, Tuple] = {}
+        self.loaded = False
+        self.stats = {"hits": 0, "misses": 0, "inserted": 0}
+
+    def preload(self) -> int:
+        """Load every existing row of the dimension and return the count."""
+        columns = [getattr(self.model, c) for c in self.natural_key]
+        result = self.db.execute(select(self.model.id, *columns))
+        self._keys = {tuple(row[1:]): row[0] for row in result}
+        self._pending = {}
+        self._natural = {surrogate: key for key, surrogate in self._keys.items()}
+        self.loaded = True
+        return len(self._keys)
+
+    def _lookup(self, key: Tuple) -> Optional[int]:
+        surrogate = self._keys.get(key)
+        if surrogate is None:
+            surrogate = self._pending.get(key)
+        return surrogate
+
+    def _insert(self, keys: Iterable[Tuple]) -> Dict[Tuple, int]:
+        """Insert missing keys and return their surrogate ids."""
+        rows = [self.build_row(key) for key in keys]
+        if not rows:
+            return {}
+        stmt = pg_insert(self.model).values(rows)
+        # A no-op DO UPDATE makes RETURNING also yield rows another loader
+        # inserted after our preload
+        first = self.natural_key[0]
+        stmt = stmt.on_conflict_do_update(
+            constraint=self.constraint,
+            index_elements=None if self.constraint else list(self.natural_key),
+            set_={first: stmt.excluded[first]},
+        ).returning(self.model.id, *(getattr(self.model, c) for c in self.natural_key))
+        inserted = {tuple(row[1:]): row[0] for row in self.db.execute(stmt)}
+        self._pending.update(inserted)
+        self._natural.update({surrogate: key for key, surrogate in inserted.items()})
+        self.stats["inserted"] += len(inserted)
+        return inserted
+
+    def resolve_many(self, keys: Iterable[Tuple]) -> Dict[Tuple, int]:
+        """
+        Map natural keys to surrogate ids.
+
+        Keys that are not in the dimension are inserted when the cache has a
+        row builder and left out of the result otherwise.
+        """
+        resolved = {}
+        missing = set()
+        for key in keys:
+            surrogate = self._lookup(key)
+            if surrogate is None:
+                missing.add(key)
+            else:
+                resolved[key] = surrogate
+        self.stats["hits"] += len(resolved)
+        self.stats["misses"] += len(missing)
+        if missing and self.build_row is not None:
+            resolved.update(self._insert(missing))
+        return resolved
+
+    def resolve(self, key: Tuple) -> Optional[int]:
+        """Map a single natural key to its surrogate id."""
+        return self.resolve_many([key]).get(key)
+
+    def natural_key_of(self, surrogate: int) -> Optional[Tuple]:
+        """Map a surrogate id back to its natural key."""
+        return self._natural.get(surrogate)
+
+    def confirm(self) -> None:
+        """Promote keys inserted in the committed transaction."""
+        self._keys.update(self._pending)
+        self._pending = {}
+
+    def discard(self) -> None:
+        """Forget keys inserted in a rolled-back transaction."""
+        self._pending = {}
+
+
+class StarSchemaKeyCache:
+    """Surrogate-key caches for every dimension a call fact references."""
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.time = DimensionKeyCache(
+            db,
+            DimTime,
+            ("date",),
+            build_row=lambda key: time_dimension_row(key[0]),
+        )
+        self.geography = DimensionKeyCache(
+            db, DimGeography, ("territory_id", "zip_code")
+        )
+        self.organization = DimensionKeyCache(db, DimOrganization, ("org_id",))
+        self.insurance_provider = DimensionKeyCache(
+            db, DimInsuranceProvider, ("provider_id",)
+        )
+        self.satisfaction = DimensionKeyCache(
+            db,
+            DimPatientSatisfaction,
+            SATISFACTION_COLUMNS,
+            constraint="uq_dim_patient_satisfaction_natural_key",
+            build_row=lambda key: dict(zip(SATISFACTION_COLUMNS, key)),
+        )
+        self.verification = DimensionKeyCache(
+            db,
+            DimVerificationPerformance,
+            VERIFICATION_COLUMNS,
+            constraint="uq_dim_verification_performance_natural_key",
+            build_row=lambda key: dict(zip(VERIFICATION_COLUMNS, key)),
+        )
+        self.loaded = False
+
+    def caches(self) -> Tuple[DimensionKeyCache, ...]:
+        """Return the cache of every dimension."""
+        return (
+            self.time,
+            self.geography,
+            self.organization,
+            self.insurance_provider,
+            self.satisfaction,
+            self.verification,
+        )
+
+    def generate_time_dimension(
+        self,
+        start: Optional[datetime] = None,
+        years_ahead: int = TIME_DIMENSION_YEARS_AHEAD,
+    ) -> int:
+        """
+        Insert hourly ``DimTime`` rows from ``start`` through ``years_ahead``.
+
+        Rows are generated set-based in the database; existing hours are
+        left untouched.
+        """
+        start = truncate_to_hour(start or datetime.utcnow()).replace(hour=0)
+        end = add_years(start, years_ahead)
+        result = self.db.execute(
+            text(
+                """
+                INSERT INTO dim_time (
+                    date, year, month, day, hour, day_of_week,
+                    week_of_year, quarter, is_weekend, is_holiday
+                )
+                SELECT
+                    ts,
+                    EXTRACT(YEAR FROM ts)::int,
+                    EXTRACT(MONTH FROM ts)::int,
+                    EXTRACT(DAY FROM ts)::int,
+                    EXTRACT(HOUR FROM ts)::int,
+                    EXTRACT(ISODOW FROM ts)::int - 1,
+                    EXTRACT(WEEK FROM ts)::int,
+                    EXTRACT(QUARTER FROM ts)::int,
+                    EXTRACT(ISODOW FROM ts) >= 6,
+                    false
+                FROM generate_series(
+                    CAST(:start AS timestamp),
+                    CAST(:end AS timestamp) - interval '1 hour',
+                    interval '1 hour'
+                ) AS ts
+                ON CONFLICT (date) DO NOTHING
+                """
+            ),
+            {"start": start, "end": end},
+        )
+        return result.rowcount
+
+    def preload(self, generate_time: bool = True) -> Dict[str, int]:
+        """Load every dimension map, generating future time rows first."""
+        if generate_time:
+            self.generate_time_dimension()
+            self.db.commit()
+        counts = {cache.model.__tablename__: cache.preload() for cache in self.caches()}
+        self.loaded = True
+        return counts
+
+    def ensure_loaded(self) -> None:
+        """Preload on first use."""
+        if not self.loaded:
+            self.preload()
+
+    def confirm(self) -> None:
+        """Promote keys inserted in the transaction that just committed."""
+        for cache in self.caches():
+            cache.confirm()
+
+    def discard(self) -> None:
+        """Forget keys inserted in the transaction that was rolled back."""
+        for cache in self.caches():
+            cache.discard()
+
+    def report(self) -> Dict[str, Dict[str, int]]:
+        """Return hit/miss/insert counters and map size per dimension."""
+        return {
+            cache.model.__tablename__: {**cache.stats, "size": len(cache._keys)}
+            for cache in self.caches()
+        }
@@ -1,25 +1,136 @@
 """ETL pipeline for analytics data warehouse with data quality validation."""
 
+import csv
+import io
+import json
+from collections import Counter, defaultdict
 from datetime import datetime, timedelta
-from typing import Dict, List, Tuple, Optional
+from enum import IntFlag
+from typing import Dict, Iterable, List, Tuple, Optional
 from uuid import UUID
 
-from sqlalchemy import text, func, select
+import numpy as np
+import pandas as pd
+from fastapi import Depends
+from sqlalchemy import insert, text, func, select
 from sqlalchemy.orm import Session
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
+from app.analytics.dimension_cache import (
+    SATISFACTION_COLUMNS,
+    VERIFICATION_COLUMNS,
+    StarSchemaKeyCache,
+    sentiment_bucket,
+    truncate_to_hour,
+)
+from app.analytics.incremental_aggregation import (
+    IncrementalAggregator,
+    partition_day,
+)
 from app.analytics.models import (
-    CallFact,
-    PatientSatisfactionDimension,
-    VerificationPerformanceDimension,
     DailyMetrics,
+    FactIVRCall as CallFact,
     GeographicMetrics,
     HourlyMetrics,
-    VerificationPerformanceDimension,
+    QuarantinedCall,
 )
+from app.analytics.quantile_sketch import SketchStore
 from app.services.redis_cache import RedisCache
 
+# Calls per COPY/commit when ingesting large loads
+CALL_BATCH_SIZE = 50_000
+
+# Natural-key fields a call may carry instead of surrogate ids:
+# surrogate field -> (dimension cache attribute, natural key fields)
+NATURAL_KEY_FIELDS = {
+    "time_id": ("time", ("call_time",)),
+    "geography_id": ("geography", ("territory_id", "zip_code")),
+    "organization_id": ("organization", ("org_id",)),
+    "insurance_provider_id": ("insurance_provider", ("provider_id",)),
+}
+
+# Fields the batch path needs beyond DataQualityValidator's completeness check
+BATCH_REQUIRED_FIELDS = {
+    "call_id",
+    "duration_seconds",
+    "verification_time_seconds",
+    "sentiment_score",
+    "feedback_category",
+    "response_channel",
+    "response_time_category",
+    "sla_category",
+}
+
+# Fact columns written by COPY, in order
+CALL_FACT_COLUMNS = (
+    "call_id",
+    "time_id",
+    "geography_id",
+    "organization_id",
+    "insurance_provider_id",
+    "duration_seconds",
+    "menu_selections",
+    "outcome",
+    "approval_status",
+    "verification_time_seconds",
+    "satisfaction_id",
+    "verification_performance_id",
+    "sentiment_score",
+    "feedback_text",
+    "partition_date",
+)
+
+
+# Valid values, built once rather than per validated row
+REQUIRED_FIELDS = frozenset(
+    {
+        "time_id",
+        "geography_id",
+        "organization_id",
+        "insurance_provider_id",
+        "approval_status",
+        "satisfaction_level",
+        "verification_type",
+    }
+)
+TYPE_CHECKS = {
+    "time_id": int,
+    "duration_seconds": int,
+    "verification_time_seconds": int,
+    "approval_status": str,
+    "satisfaction_level": str,
+    "sentiment_score": float,
+    "verification_type": str,
+}
+VALID_APPROVAL_STATUSES = frozenset({"approved", "denied", "pending", "expired"})
+VALID_SATISFACTION_LEVELS = frozenset({"high", "medium", "low"})
+VALID_VERIFICATION_TYPES = frozenset({"real-time", "batch", "manual"})
+
+# pandas.api.types.infer_dtype results that satisfy each expected type
+_INFERRED_TYPES = {
+    int: {"integer", "empty"},
+    float: {"floating", "empty"},
+    str: {"string", "empty"},
+}
+
+
+class DataQualityError(IntFlag):
+    """Per-row data quality error codes; a row's code ORs every failure."""
+
+    MISSING_FIELD = 1
+    INVALID_TYPE = 2
+    NEGATIVE_DURATION = 4
+    INVALID_APPROVAL_STATUS = 8
+    INVALID_SATISFACTION_LEVEL = 16
+    INVALID_VERIFICATION_TYPE = 32
+    LOAD_FAILED = 64
+
+
+def describe_errors(code: int) -> List[str]:
+    """Return the names of the errors set in a row's error code."""
+    return [error.name for error in DataQualityError if code & error]
+
 
 class DataQualityValidator:
     """Validates data quality before ETL processing."""
@@ -28,17 +139,8 @@ class DataQualityValidator:
     def validate_completeness(data: Dict) -> Tuple[bool, List[str]]:
         """Check for missing required fields."""
         errors = []
-        required_fields = {
-            "time_id",
-            "geography_id",
-            "organization_id",
-            "insurance_provider_id",
-            "approval_status",
-            "satisfaction_level",
-            "verification_type",
-        }
 
-        missing = required_fields - set(data.keys())
+        missing = REQUIRED_FIELDS - set(data.keys())
         if missing:
             errors.append(f"Missing required fields: {missing}")
 
@@ -48,17 +150,8 @@ class DataQualityValidator:
     def validate_data_types(data: Dict) -> Tuple[bool, List[str]]:
         """Validate data types of fields."""
         errors = []
-        type_checks = {
-            "time_id": int,
-            "duration_seconds": int,
-            "verification_time_seconds": int,
-            "approval_status": str,
-            "satisfaction_level": str,
-            "sentiment_score": float,
-            "verification_type": str,
-        }
 
-        for field, expected_type in type_checks.items():
+        for field, expected_type in TYPE_CHECKS.items():
             if field in data and not isinstance(data[field], expected_type):
                 errors.append(
                     f"Invalid type for {field}: expected {expected_type}, "
@@ -77,37 +170,110 @@ class DataQualityValidator:
             errors.append("Duration cannot be negative")
 
         # Verify valid approval status
-        valid_statuses = {"approved", "denied", "pending", "expired"}
-        has_status = "approval_status" in data
         status_value = data.get("approval_status", "")
-        invalid_status = has_status and status_value not in valid_statuses
-        if invalid_status:
+        if "approval_status" in data and status_value not in VALID_APPROVAL_STATUSES:
             errors.append(f"Invalid approval status: {status_value}")
 
         # Verify valid satisfaction level
-        valid_satisfaction = {"high", "medium", "low"}
-        has_satisfaction = "satisfaction_level" in data
         satisfaction_value = data.get("satisfaction_level", "")
-        invalid_satisfaction = (
-            has_satisfaction and satisfaction_value not in valid_satisfaction
-        )
-        if invalid_satisfaction:
+        has_satisfaction = "satisfaction_level" in data
+        if has_satisfaction and satisfaction_value not in VALID_SATISFACTION_LEVELS:
             msg = f"Invalid satisfaction level: {satisfaction_value}"
             errors.append(msg)
 
         # Verify valid verification type
-        valid_verification = {"real-time", "batch", "manual"}
-        has_verification = "verification_type" in data
         verification_value = data.get("verification_type", "")
-        invalid_verification = (
-            has_verification and verification_value not in valid_verification
-        )
-        if invalid_verification:
+        has_verification = "verification_type" in data
+        if has_verification and verification_value not in VALID_VERIFICATION_TYPES:
             msg = f"Invalid verification type: {verification_value}"
             errors.append(msg)
 
         return len(errors) == 0, errors
 
+    @staticmethod
+    def _type_mask(column: pd.Series, expected_type: type) -> np.ndarray:
+        """Mask values present but not of ``expected_type``."""
+        # Homogeneous columns are settled from the inferred dtype alone
+        if (
+            pd.api.types.infer_dtype(column, skipna=True)
+            in _INFERRED_TYPES[expected_type]
+        ):
+            return np.zeros(len(column), dtype=bool)
+        present = column.notna().to_numpy()
+        matches = column.map(lambda v: isinstance(v, expected_type)).to_numpy(bool)
+        return present & ~matches
+
+    def validate_frame(
+        self, frame: pd.DataFrame, required_fields: Iterable[str] = REQUIRED_FIELDS
+    ) -> np.ndarray:
+        """
+        Validate every row of a columnar batch at once.
+
+        Args:
+            frame: One column per call field (object dtype, None when absent)
+            required_fields: Fields that must be present in every row
+
+        Returns:
+            One ``DataQualityError`` code per row; 0 for valid rows
+        """
+        rows = len(frame)
+        codes = np.zeros(rows, dtype=np.int32)
+
+        def column(field: str) -> pd.Series:
+            if field in frame:
+                return frame[field]
+            return pd.Series([None] * rows, index=frame.index, dtype=object)
+
+        missing = np.zeros(rows, dtype=bool)
+        for field in required_fields:
+            missing |= column(field).isna().to_numpy()
+        codes[missing] |= DataQualityError.MISSING_FIELD
+
+        invalid_type = np.zeros(rows, dtype=bool)
+        for field, expected_type in TYPE_CHECKS.items():
+            invalid_type |= self._type_mask(column(field), expected_type)
+        codes[invalid_type] |= DataQualityError.INVALID_TYPE
+
+        duration = pd.to_numeric(column("duration_seconds"), errors="coerce")
+        codes[(duration < 0).to_numpy()] |= DataQualityError.NEGATIVE_DURATION
+
+        for field, valid, error in (
+            (
+                "approval_status",
+                VALID_APPROVAL_STATUSES,
+                DataQualityError.INVALID_APPROVAL_STATUS,
+            ),
+            (
+                "satisfaction_level",
+                VALID_SATISFACTION_LEVELS,
+                DataQualityError.INVALID_SATISFACTION_LEVEL,
+            ),
+            (
+                "verification_type",
+                VALID_VERIFICATION_TYPES,
+                DataQualityError.INVALID_VERIFICATION_TYPE,
+            ),
+        ):
+            values = column(field)
+            invalid = values.notna() & ~values.isin(valid)
+            codes[invalid.to_numpy()] |= error
+
+        return codes
+
+    def validate_batch(
+        self, calls: List[Dict], required_fields: Iterable[str] = REQUIRED_FIELDS
+    ) -> np.ndarray:
+        """Validate a list of call dicts column-wise; see ``validate_frame``."""
+        required_fields = set(required_fields)
+        fields = required_fields | set(TYPE_CHECKS)
+        frame = pd.DataFrame(
+            {
+                field: pd.Series([c.get(field) for c in calls], dtype=object)
+                for field in fields
+            }
+        )
+        return self.validate_frame(frame, required_fields)
+
 
 class ETLPipeline:
     """Manages ETL processes for analytics data warehouse."""
@@ -116,46 +282,70 @@ class ETLPipeline:
         self.db = db
         self.validator = DataQualityValidator()
         self.cache = RedisCache()
+        self.dimensions = StarSchemaKeyCache(db)
+        self.aggregator = IncrementalAggregator(db)
+        self.sketches = SketchStore(self.cache)
 
     def process_satisfaction_data(self, data: Dict) -> int:
-        """Process satisfaction data and return dimension ID."""
-        satisfaction = PatientSatisfactionDimension(
-            satisfaction_level=data["satisfaction_level"],
-            feedback_category=data["feedback_category"],
-            response_channel=data["response_channel"],
-            sentiment_score=data["sentiment_score"],
-        )
-        self.db.add(satisfaction)
-        self.db.flush()  # Get ID without committing
-        return satisfaction.id
+        """Resolve the satisfaction dimension ID, inserting it on first use."""
+        return self.dimensions.satisfaction.resolve(self._satisfaction_key(data))
 
     def process_verification_data(self, data: Dict) -> int:
-        """Process verification performance data and return dimension ID."""
-        verification = VerificationPerformanceDimension(
-            verification_type=data["verification_type"],
-            response_time_category=data["response_time_category"],
-            error_type=data.get("error_type"),
-            retry_count=data.get("retry_count", 0),
-            sla_category=data["sla_category"],
-        )
-        self.db.add(verification)
-        self.db.flush()  # Get ID without committing
-        return verification.id
+        """Resolve the verification dimension ID, inserting it on first use."""
+        return self.dimensions.verification.resolve(self._verification_key(data))
+
+    def _resolve_surrogate_keys(self, calls: List[Dict]) -> None:
+        """
+        Fill surrogate dimension ids for calls that carry natural keys.
+
+        Times are inserted into ``DimTime`` on a miss; other dimensions are
+        master data, so calls referencing unknown keys are left unresolved
+        and fail validation. Calls that only carry the organization surrogate
+        get its ``org_id`` back.
+        """
+        for field, (dimension, key_fields) in NATURAL_KEY_FIELDS.items():
+            pending = [c for c in calls if field not in c and key_fields[0] in c]
+            if not pending:
+                continue
+
+            def natural_key(call_data: Dict) -> Tuple:
+                key = tuple(call_data.get(k) for k in key_fields)
+                if field == "time_id":
+                    key = (truncate_to_hour(key[0]),)
+                return key
+
+            resolved = getattr(self.dimensions, dimension).resolve_many(
+                {natural_key(c) for c in pending}
+            )
+            for call_data in pending:
+                surrogate = resolved.get(natural_key(call_data))
+                if surrogate is not None:
+                    call_data[field] = surrogate
+
+        # Sketches are keyed by the organization's own id
+        for call_data in calls:
+            if call_data.get("org_id") is None:
+                key = self.dimensions.organization.natural_key_of(
+                    call_data.get("organization_id")
+                )
+                if key is not None:
+                    call_data["org_id"] = key[0]
 
-    def process_call_data(self, call_data: Dict) -> bool:
+    async def process_call_data(self, call_data: Dict) -> bool:
         """Process and validate call data for analytics."""
-        # Validate data quality
-        validations = [
-            self.validator.validate_completeness(call_data),
-            self.validator.validate_data_types(call_data),
-            self.validator.validate_business_rules(call_data),
-        ]
-
-        for is_valid, errors in validations:
-            if not is_valid:
-                # Log validation errors
-                print(f"Validation errors: {errors}")
-                return False
+        self.dimensions.ensure_loaded()
+        self._resolve_surrogate_keys([call_data])
+
+        # Validate data quality; rejected calls are kept for review
+        code = int(self.validator.validate_batch([call_data])[0])
+        if code:
+            try:
+                self._quarantine([(call_data, code)])
+                self.db.commit()
+            except Exception as e:
+                print(f"Error quarantining call data: {e}")
+                self.db.rollback()
+            return False
 
         try:
             # Process dimension data first
@@ -176,117 +366,334 @@ class ETLPipeline:
                 verification_performance_id=verification_id,
                 sentiment_score=call_data["sentiment_score"],
                 feedback_text=call_data.get("feedback_text"),
-                partition_date=datetime.now().date(),
+                partition_date=self._partition_date(call_data, datetime.now().date()),
             )
 
             self.db.add(call_fact)
             self.db.commit()
-
-            # Update cache for real-time analytics
-            self._update_cache(call_data)
-
-            return True
+            self.dimensions.confirm()
 
         except Exception as e:
             print(f"Error processing call data: {e}")
             self.db.rollback()
+            self.dimensions.discard()
             return False
 
-    def _update_cache(self, call_data: Dict) -> None:
-        """Update Redis cache with real-time metrics."""
+        # The call is committed; a cache failure must not invite a retry
+        try:
+            await self._update_cache(call_data)
+        except Exception as e:
+            print(f"Error updating real-time call metrics: {e}")
+        return True
+
+    async def _update_cache(self, call_data: Dict) -> None:
+        """Update Redis cache with real-time metrics in one round trip."""
         org_id = call_data["organization_id"]
         cache_key = f"call_metrics:{org_id}"
+        satisfaction_key = f"satisfaction:{org_id}"
+        verification_key = f"verification:{org_id}"
+
+        async with self.cache.pipeline() as pipe:
+            # Update basic metrics; means are the sums over total_calls
+            pipe.hincrby(cache_key, "total_calls", 1)
+            pipe.hincrbyfloat(cache_key, "duration_sum", call_data["duration_seconds"])
+
+            # Update satisfaction metrics
+            pipe.hincrby(satisfaction_key, call_data["satisfaction_level"], 1)
+            pipe.hincrbyfloat(
+                satisfaction_key, "sentiment_sum", call_data["sentiment_score"]
+            )
+
+            # Update verification metrics
+            pipe.hincrby(verification_key, call_data["verification_type"], 1)
+            pipe.hincrby(verification_key, call_data["sla_category"], 1)
 
-        # Update basic metrics
-        self.cache.hincrby(cache_key, "total_calls", 1)
-        self.cache.hincrbyfloat(
-            cache_key, "avg_duration", call_data["duration_seconds"]
+            # Update latency percentile sketches
+            self.sketches.queue_updates(pipe, self.sketches.build([call_data]))
+
+    def _validate_batch(
+        self, calls: List[Dict]
+    ) -> Tuple[List[Dict], List[Tuple[Dict, int]]]:
+        """Split a batch into valid calls and (call, error code) rejects."""
+        codes = self.validator.validate_batch(
+            calls, REQUIRED_FIELDS | BATCH_REQUIRED_FIELDS
+        )
+        valid = [call_data for call_data, code in zip(calls, codes) if not code]
+        rejected = [(calls[i], int(codes[i])) for i in np.flatnonzero(codes)]
+        return valid, rejected
+
+    def _quarantine(self, rejected: List[Tuple[Dict, int]]) -> None:
+        """Write rejected calls to the quarantine table in one statement."""
+        if not rejected:
+            return
+        self.db.execute(
+            insert(QuarantinedCall),
+            [
+                {
+                    "call_id": (
+                        str(call_data["call_id"])
+                        if call_data.get("call_id") is not None
+                        else None
+                    ),
+                    "error_code": code,
+                    "errors": describe_errors(code),
+                    "payload": json.loads(json.dumps(call_data, default=str)),
+                }
+                for call_data, code in rejected
+            ],
         )
 
-        # Update satisfaction metrics
-        satisfaction_key = f"satisfaction:{org_id}"
-        self.cache.hincrby(satisfaction_key, call_data["satisfaction_level"], 1)
-        self.cache.hincrbyfloat(
-            satisfaction_key, "avg_sentiment", call_data["sentiment_score"]
+    @staticmethod
+    def _satisfaction_key(call_data: Dict) -> Tuple:
+        # The dimension holds the bucketed score; facts keep the exact one
+        return tuple(
+            sentiment_bucket(call_data[c]) if c == "sentiment_score" else call_data[c]
+            for c in SATISFACTION_COLUMNS
         )
 
-        # Update verification metrics
-        verification_key = f"verification:{org_id}"
-        self.cache.hincrby(verification_key, call_data["verification_type"], 1)
-        self.cache.hincrby(verification_key, call_data["sla_category"], 1)
+    @staticmethod
+    def _verification_key(call_data: Dict) -> Tuple:
+        # Key columns are NOT NULL; a missing error type means no error
+        defaults = {"error_type": "", "retry_count": 0}
+        return tuple(
+            defaults.get(c) if call_data.get(c) is None else call_data[c]
+            for c in VERIFICATION_COLUMNS
+        )
+
+    @staticmethod
+    def _partition_date(call_data: Dict, default):
+        """Partition calls by the UTC day they happened, else the load day."""
+        call_time = call_data.get("call_time")
+        if isinstance(call_time, datetime):
+            return truncate_to_hour(call_time).date()
+        return default
+
+    @classmethod
+    def _call_fact_csv(
+        cls,
+        calls: List[Dict],
+        satisfaction_ids: Dict[Tuple, int],
+        verification_ids: Dict[Tuple, int],
+        partition_date,
+    ) -> io.StringIO:
+        """Render call facts as CSV in ``CALL_FACT_COLUMNS`` order for COPY."""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for call_data in calls:
+            writer.writerow(
+                (
+                    call_data["call_id"],
+                    call_data["time_id"],
+                    call_data["geography_id"],
+                    call_data["organization_id"],
+                    call_data["insurance_provider_id"],
+                    call_data["duration_seconds"],
+                    json.dumps(call_data.get("menu_selections") or {}),
+                    call_data.get("outcome", "unknown"),
+                    call_data["approval_status"],
+                    call_data["verification_time_seconds"],
+                    satisfaction_ids[cls._satisfaction_key(call_data)],
+                    verification_ids[cls._verification_key(call_data)],
+                    call_data["sentiment_score"],
+                    call_data.get("feedback_text"),
+                    cls._partition_date(call_data, partition_date),
+                )
+            )
+        buffer.seek(0)
+        return buffer
+
+    def _copy_call_facts(self, buffer: io.StringIO) -> set:
+        """
+        COPY call facts through a staging table and return the new call_ids.
+
+        Calls already loaded (same call_id) are skipped, so a batch can be
+        replayed after a partial failure.
+        """
+        columns = ", ".join(CALL_FACT_COLUMNS)
+        table = CallFact.__tablename__
+        self.db.execute(
+            text(
+                f"CREATE TEMP TABLE IF NOT EXISTS {table}_staging "
+                f"(LIKE {table} INCLUDING DEFAULTS) ON COMMIT DELETE ROWS"
+            )
+        )
+        raw_connection = self.db.connection().connection
+        with raw_connection.cursor() as cursor:
+            cursor.copy_expert(
+                f"COPY {table}_staging ({columns}) FROM STDIN WITH (FORMAT csv)",
+                buffer,
+            )
+        result = self.db.execute(
+            text(
+                f"INSERT INTO {table} ({columns}) "
+                f"SELECT {columns} FROM {table}_staging "
+                "ON CONFLICT (call_id) DO NOTHING RETURNING call_id"
+            )
+        )
+        return set(result.scalars())
+
+    async def process_call_batch(self, calls: List[Dict]) -> Dict[str, int]:
+        """
+        Validate and load a batch of calls in a single transaction.
+
+        Natural keys are resolved through the in-memory dimension maps, new
+        dimension rows are upserted in bulk, call facts are COPY-loaded, and
+        real-time cache counters are updated once per organization.
+
+        Returns:
+            Counts of received, loaded, rejected and duplicate calls
+        """
+        self.dimensions.ensure_loaded()
+        self._resolve_surrogate_keys(calls)
+        valid, rejected = self._validate_batch(calls)
+
+        # Keep the last occurrence of a call repeated within the batch
+        unique = list(
+            {str(call_data["call_id"]): call_data for call_data in valid}.values()
+        )
+        stats = {
+            "received": len(calls),
+            "loaded": 0,
+            "rejected": len(rejected),
+            "duplicates": len(valid) - len(unique),
+        }
+        if not unique and not rejected:
+            return stats
 
-    def update_daily_metrics(self, date: datetime) -> bool:
-        """Update daily aggregated metrics."""
+        loaded_ids = set()
         try:
-            # Calculate metrics for the specified date
-            metrics_query = text(
-                """
-                WITH metrics AS (
-                    SELECT
-                        DATE(:date) as date,
-                        c.organization_id,
-                        g.territory_id,
-                        COUNT(*) as total_calls,
-                        AVG(c.duration_seconds) as avg_call_duration,
-                        SUM(CASE
-                            WHEN c.outcome = 'success' THEN 1
-                            ELSE 0
-                        END)::float / COUNT(*) as call_success_rate,
-                        SUM(CASE
-                            WHEN c.approval_status = 'approved' THEN 1
-                            ELSE 0
-                        END)::float / COUNT(*) as success_rate,
-                        AVG(c.verification_time_seconds) as avg_time,
-                        jsonb_object_agg(
-                            i.provider_id,
-                            SUM(CASE
-                                WHEN c.approval_status = 'approved' THEN 1
-                                ELSE 0
-                            END)::float / COUNT(*)
-                        ) as provider_rates,
-                        jsonb_object_agg(
-                            g.territory_id,
-                            SUM(CASE
-                                WHEN c.approval_status = 'approved' THEN 1
-                                ELSE 0
-                            END)::float / COUNT(*)
-                        ) as territory_rates
-                    FROM fact_calls c
+            self._quarantine(rejected)
+            if unique:
+                # Only combinations not seen before reach the database
+                satisfaction_ids = self.dimensions.satisfaction.resolve_many(
+                    {self._satisfaction_key(c) for c in unique}
                 )
-                INSERT INTO agg_daily_metrics (
-                    date, organization_id, territory_id,
-                    total_calls, avg_call_duration, call_success_rate,
-                    verification_success_rate, avg_verification_time,
-                    approval_rate_by_provider, territory_approval_rates
+                verification_ids = self.dimensions.verification.resolve_many(
+                    {self._verification_key(c) for c in unique}
                 )
-                SELECT
-                    date,
-                    organization_id,
-                    territory_id,
-                    total_calls,
-                    avg_call_duration,
-                    call_success_rate,
-                    success_rate as verification_success_rate,
-                    avg_time as avg_verification_time,
-                    provider_rates as approval_rate_by_provider,
-                    territory_rates as territory_approval_rates
-                FROM metrics
-            """
+                buffer = self._call_fact_csv(
+                    unique, satisfaction_ids, verification_ids, datetime.now().date()
+                )
+                loaded_ids = self._copy_call_facts(buffer)
+            self.db.commit()
+            self.dimensions.confirm()
+        except Exception as e:
+            print(f"Error processing call batch: {e}")
+            self.db.rollback()
+            self.dimensions.discard()
+            stats["rejected"] += len(unique)
+            # Keep the whole batch for replay once the cause is fixed
+            try:
+                self._quarantine(
+                    rejected + [(c, int(DataQualityError.LOAD_FAILED)) for c in unique]
+                )
+                self.db.commit()
+            except Exception as quarantine_error:
+                print(f"Error quarantining call batch: {quarantine_error}")
+                self.db.rollback()
+            return stats
+
+        stats["loaded"] = len(loaded_ids)
+        stats["duplicates"] += len(unique) - len(loaded_ids)
+        # Counters are only bumped for calls that were not loaded before
+        try:
+            await self._update_cache_batch(
+                [c for c in unique if str(c["call_id"]) in loaded_ids]
             )
+        except Exception as e:
+            print(f"Error updating real-time call metrics: {e}")
+        return stats
+
+    async def ingest_calls(
+        self, calls: Iterable[Dict], batch_size: int = CALL_BATCH_SIZE
+    ) -> Dict[str, int]:
+        """Load an arbitrarily large stream of calls in fixed-size batches."""
+        totals = Counter()
+        batch = []
+        for call_data in calls:
+            batch.append(call_data)
+            if len(batch) >= batch_size:
+                totals.update(await self.process_call_batch(batch))
+                batch = []
+        if batch:
+            totals.update(await self.process_call_batch(batch))
+        return dict(totals)
 
-            self.db.execute(metrics_query, {"date": date})
-            self.db.commit()
+    @staticmethod
+    def _aggregate_cache_updates(calls: List[Dict]) -> Dict[str, Dict]:
+        """Fold a batch of calls into per-organization counter increments."""
+        per_org = defaultdict(
+            lambda: {
+                "total_calls": 0,
+                "duration": 0.0,
+                "sentiment": 0.0,
+                "satisfaction": Counter(),
+                "verification": Counter(),
+            }
+        )
+        for call_data in calls:
+            org = per_org[call_data["organization_id"]]
+            org["total_calls"] += 1
+            org["duration"] += call_data["duration_seconds"]
+            org["sentiment"] += call_data["sentiment_score"]
+            org["satisfaction"][call_data["satisfaction_level"]] += 1
+            org["verification"][call_data["verification_type"]] += 1
+            org["verification"][call_data["sla_category"]] += 1
+        return per_org
+
+    async def _update_cache_batch(self, calls: List[Dict]) -> None:
+        """Apply a batch's real-time metric increments in one round trip."""
+        per_org = self._aggregate_cache_updates(calls)
+        if not per_org:
+            return
+        async with self.cache.pipeline() as pipe:
+            for org_id, org in per_org.items():
+                cache_key = f"call_metrics:{org_id}"
+                satisfaction_key = f"satisfaction:{org_id}"
+                verification_key = f"verification:{org_id}"
+
+                pipe.hincrby(cache_key, "total_calls", org["total_calls"])
+                pipe.hincrbyfloat(cache_key, "duration_sum", org["duration"])
+                for level, count in org["satisfaction"].items():
+                    pipe.hincrby(satisfaction_key, level, count)
+                pipe.hincrbyfloat(satisfaction_key, "sentiment_sum", org["sentiment"])
+                for field, count in org["verification"].items():
+                    pipe.hincrby(verification_key, field, count)
+
+            self.sketches.queue_updates(pipe, self.sketches.build(calls))
+
+    async def update_daily_metrics(self, date: datetime) -> bool:
+        """Re-aggregate the daily and hourly metrics of one partition."""
+        day = partition_day(date)
+        try:
+            self.aggregator.run([day])
 
-            # Update cache
-            self.cache.delete_pattern("daily_metrics:*")
+            # Drop only the cached entries tagged with the aggregated date
+            await self.cache.invalidate_daily_metrics(date=day.isoformat())
             return True
 
         except Exception as e:
             print(f"Error updating daily metrics: {e}")
-            self.db.rollback()
             return False
 
+    async def update_metrics_incremental(self) -> Dict[str, Dict[str, int]]:
+        """
+        Aggregate every partition whose facts changed since its watermark.
+
+        Returns:
+            Upserted row counts and new watermark per reprocessed day
+        """
+        try:
+            processed = self.aggregator.run()
+        except Exception as e:
+            print(f"Error updating incremental metrics: {e}")
+            return {}
+
+        for day in processed:
+            await self.cache.invalidate_daily_metrics(date=day.isoformat())
+        return {day.isoformat(): counts for day, counts in processed.items()}
+
 
-def get_etl_pipeline(db: Session = next(get_db())) -> ETLPipeline:
+def get_etl_pipeline(db: Session = Depends(get_db)) -> ETLPipeline:
     """Dependency injection for ETL pipeline."""
     return ETLPipeline(db)
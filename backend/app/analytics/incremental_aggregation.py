@@ -0,0 +1,261 @@
+"""Watermark-driven incremental aggregation of IVR call facts."""
+
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+# Fact ids are assigned before commit, so a slow transaction can commit rows
+# below the watermark after it advanced; re-check this many ids behind it
+WATERMARK_OVERLAP_IDS = 200_000
+
+DAILY_AGGREGATE_SQL = """
+    WITH facts AS (
+        SELECT
+            f.organization_id,
+            g.territory_id,
+            f.insurance_provider_id,
+            f.duration_seconds,
+            f.outcome,
+            f.approval_status,
+            f.verification_time_seconds
+        FROM fact_ivr_call f
+        JOIN dim_geography g ON g.id = f.geography_id
+        WHERE f.partition_date >= :day AND f.partition_date < :next_day
+            AND (
+                CAST(:organization_id AS integer) IS NULL
+                OR f.organization_id = :organization_id
+            )
+    ),
+    totals AS (
+        SELECT
+            organization_id,
+            territory_id,
+            COUNT(*) AS total_calls,
+            AVG(duration_seconds) AS avg_call_duration,
+            AVG((outcome = 'success')::int)::float AS call_success_rate,
+            AVG((approval_status = 'approved')::int)::float AS success_rate,
+            AVG(verification_time_seconds) AS avg_time
+        FROM facts
+        GROUP BY organization_id, territory_id
+    ),
+    by_provider AS (
+        SELECT
+            organization_id,
+            territory_id,
+            jsonb_object_agg(insurance_provider_id, rate) AS provider_rates
+        FROM (
+            SELECT
+                organization_id,
+                territory_id,
+                insurance_provider_id,
+                AVG((approval_status = 'approved')::int)::float AS rate
+            FROM facts
+            GROUP BY organization_id, territory_id, insurance_provider_id
+        ) p
+        GROUP BY organization_id, territory_id
+    ),
+    by_territory AS (
+        SELECT
+            organization_id,
+            jsonb_object_agg(territory_id, success_rate) AS territory_rates
+        FROM totals
+        GROUP BY organization_id
+    )
+    INSERT INTO agg_daily_metrics (
+        date, organization_id, territory_id,
+        total_calls, avg_call_duration, call_success_rate,
+        verification_success_rate, avg_verification_time,
+        approval_rate_by_provider, territory_approval_rates, updated_at
+    )
+    SELECT
+        CAST(:day AS date),
+        t.organization_id,
+        t.territory_id,
+        t.total_calls,
+        t.avg_call_duration,
+        t.call_success_rate,
+        t.success_rate,
+        t.avg_time,
+        p.provider_rates,
+        r.territory_rates,
+        now()
+    FROM totals t
+    JOIN by_provider p USING (organization_id, territory_id)
+    JOIN by_territory r USING (organization_id)
+    ON CONFLICT ON CONSTRAINT uq_agg_daily_metrics_grain DO UPDATE SET
+        total_calls = EXCLUDED.total_calls,
+        avg_call_duration = EXCLUDED.avg_call_duration,
+        call_success_rate = EXCLUDED.call_success_rate,
+        verification_success_rate = EXCLUDED.verification_success_rate,
+        avg_verification_time = EXCLUDED.avg_verification_time,
+        approval_rate_by_provider = EXCLUDED.approval_rate_by_provider,
+        territory_approval_rates = EXCLUDED.territory_approval_rates,
+        updated_at = EXCLUDED.updated_at
+"""
+
+HOURLY_AGGREGATE_SQL = """
+    INSERT INTO agg_hourly_metrics (
+        hour, organization_id, territory_id,
+        total_calls, avg_call_duration, call_success_rate,
+        verification_success_rate, avg_verification_time, updated_at
+    )
+    SELECT
+        date_trunc('hour', t.date),
+        f.organization_id,
+        g.territory_id,
+        COUNT(*),
+        AVG(f.duration_seconds),
+        AVG((f.outcome = 'success')::int)::float,
+        AVG((f.approval_status = 'approved')::int)::float,
+        AVG(f.verification_time_seconds),
+        now()
+    FROM fact_ivr_call f
+    JOIN dim_geography g ON g.id = f.geography_id
+    JOIN dim_time t ON t.id = f.time_id
+    WHERE f.partition_date >= :day AND f.partition_date < :next_day
+        AND (
+            CAST(:organization_id AS integer) IS NULL
+            OR f.organization_id = :organization_id
+        )
+    GROUP BY date_trunc('hour', t.date), f.organization_id, g.territory_id
+    ON CONFLICT ON CONSTRAINT uq_agg_hourly_metrics_grain DO UPDATE SET
+        total_calls = EXCLUDED.total_calls,
+        avg_call_duration = EXCLUDED.avg_call_duration,
+        call_success_rate = EXCLUDED.call_success_rate,
+        verification_success_rate = EXCLUDED.verification_success_rate,
+        avg_verification_time = EXCLUDED.avg_verification_time,
+        updated_at = EXCLUDED.updated_at
+"""
+
+
+class IncrementalAggregator:
+    """
+    Re-aggregates only the fact partitions that changed since the last run.
+
+    Each ``partition_date`` slice has a watermark recording the highest fact
+    id and the row count folded into its aggregates. A run looks at facts
+    above the global watermark (minus an overlap for late commits), keeps
+    the partitions whose count or max id moved, and recomputes just those
+    days. Late-arriving calls land in their own old partition, so only that
+    partition is reprocessed.
+    """
+
+    def __init__(self, db: Session, overlap_ids: int = WATERMARK_OVERLAP_IDS):
+        self.db = db
+        self.overlap_ids = overlap_ids
+
+    def global_watermark(self) -> int:
+        """Return the highest fact id folded into any partition."""
+        value = self.db.execute(
+            text("SELECT max(last_fact_id) FROM etl_aggregation_watermarks")
+        ).scalar()
+        return value or 0
+
+    def candidate_partitions(self) -> List[date]:
+        """Return partitions holding facts at or above the scan floor."""
+        floor = max(self.global_watermark() - self.overlap_ids, 0)
+        rows = self.db.execute(
+            text(
+                "SELECT DISTINCT CAST(partition_date AS date) "
+                "FROM fact_ivr_call WHERE id > :floor"
+            ),
+            {"floor": floor},
+        )
+        return sorted(row[0] for row in rows)
+
+    def partition_state(self, day: date) -> Dict[str, int]:
+        """Return the current max fact id and row count of a partition."""
+        row = self.db.execute(
+            text(
+                "SELECT coalesce(max(id), 0), count(*) FROM fact_ivr_call "
+                "WHERE partition_date >= :day AND partition_date < :next_day"
+            ),
+            {"day": day, "next_day": day + timedelta(days=1)},
+        ).one()
+        return {"last_fact_id": row[0], "row_count": row[1]}
+
+    def recorded_state(self, days: List[date]) -> Dict[date, Dict[str, int]]:
+        """Return the stored watermark of each partition in ``days``."""
+        if not days:
+            return {}
+        rows = self.db.execute(
+            text(
+                "SELECT partition_date, last_fact_id, row_count "
+                "FROM etl_aggregation_watermarks "
+                "WHERE partition_date = ANY(:days)"
+            ),
+            {"days": days},
+        )
+        return {row[0]: {"last_fact_id": row[1], "row_count": row[2]} for row in rows}
+
+    def dirty_partitions(self) -> List[date]:
+        """Return partitions whose facts changed since they were aggregated."""
+        candidates = self.candidate_partitions()
+        recorded = self.recorded_state(candidates)
+        return [
+            day for day in candidates if self.partition_state(day) != recorded.get(day)
+        ]
+
+    def aggregate_organization(self, day: date, organization_id: int) -> Dict[str, int]:
+        """Recompute daily and hourly aggregates of one organization's day."""
+        return self._aggregate(day, organization_id)
+
+    def _aggregate(self, day: date, organization_id: Optional[int]) -> Dict[str, int]:
+        params = {
+            "day": day,
+            "next_day": day + timedelta(days=1),
+            "organization_id": organization_id,
+        }
+        daily = self.db.execute(text(DAILY_AGGREGATE_SQL), params).rowcount
+        hourly = self.db.execute(text(HOURLY_AGGREGATE_SQL), params).rowcount
+        return {"daily_rows": daily, "hourly_rows": hourly}
+
+    def record_watermark(self, day: date, state: Dict[str, int]) -> None:
+        """Store ``state`` as the aggregated watermark of a partition."""
+        self.db.execute(
+            text(
+                """
+                INSERT INTO etl_aggregation_watermarks (
+                    partition_date, last_fact_id, row_count, aggregated_at
+                )
+                VALUES (:day, :last_fact_id, :row_count, now())
+                ON CONFLICT (partition_date) DO UPDATE SET
+                    last_fact_id = EXCLUDED.last_fact_id,
+                    row_count = EXCLUDED.row_count,
+                    aggregated_at = EXCLUDED.aggregated_at
+                """
+            ),
+            {"day": day, **state},
+        )
+
+    def aggregate_partition(self, day: date) -> Dict[str, int]:
+        """Recompute and upsert daily and hourly aggregates for one partition."""
+        # Read the state first so rows arriving mid-run stay above it
+        state = self.partition_state(day)
+        counts = self._aggregate(day, None)
+        self.record_watermark(day, state)
+        return {**counts, **state}
+
+    def run(self, days: Optional[List[date]] = None) -> Dict[date, Dict[str, int]]:
+        """
+        Aggregate ``days`` (or every dirty partition), committing per day.
+
+        Returns:
+            Upserted row counts and new watermark per processed partition
+        """
+        processed = {}
+        for day in days if days is not None else self.dirty_partitions():
+            try:
+                processed[day] = self.aggregate_partition(day)
+                self.db.commit()
+            except Exception:
+                self.db.rollback()
+                raise
+        return processed
+
+
+def partition_day(value) -> date:
+    """Normalize a date or datetime to the partition day it belongs to."""
+    return value.date() if isinstance(value, datetime) else value
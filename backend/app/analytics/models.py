@@ -6,15 +6,19 @@ from datetime import datetime
 from typing import Dict, List, Optional
 from uuid import UUID, uuid4
 from sqlalchemy import (
+    BigInteger,
     Boolean,
+    Date,
     DateTime,
     Float,
     ForeignKey,
     Index,
     Integer,
     JSON,
+    Numeric,
     String,
     Text,
+    UniqueConstraint,
 )
 from sqlalchemy.dialects.postgresql import ARRAY, JSONB, UUID as PyUUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
@@ -145,6 +149,14 @@ class DimPatientSatisfaction(Base):
     __table_args__ = (
         Index("idx_satisfaction_level", "satisfaction_level"),
         Index("idx_feedback_category", "feedback_category"),
+        # Natural key so the ETL can upsert rows instead of inserting per call
+        UniqueConstraint(
+            "satisfaction_level",
+            "feedback_category",
+            "response_channel",
+            "sentiment_score",
+            name="uq_dim_patient_satisfaction_natural_key",
+        ),
     )
 
 
@@ -158,15 +170,28 @@ class DimVerificationPerformance(Base):
     verification_type: Mapped[str] = mapped_column(String(50), nullable=False)
     # fast, medium, slow
     response_time_category: Mapped[str] = mapped_column(String(20), nullable=False)
-    # timeout, invalid data, system error
-    error_type: Mapped[Optional[str]] = mapped_column(String(50))
-    retry_count: Mapped[int] = mapped_column(Integer, default=0)
+    # timeout, invalid data, system error; empty when there was none (the
+    # natural key columns are NOT NULL so PostgreSQL 13 treats them as equal)
+    error_type: Mapped[str] = mapped_column(
+        String(50), nullable=False, default="", server_default=""
+    )
+    retry_count: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
     # met, missed, critical
     sla_category: Mapped[str] = mapped_column(String(20), nullable=False)
 
     __table_args__ = (
         Index("idx_verification_type", "verification_type"),
         Index("idx_sla_category", "sla_category"),
+        UniqueConstraint(
+            "verification_type",
+            "response_time_category",
+            "error_type",
+            "retry_count",
+            "sla_category",
+            name="uq_dim_verification_performance_natural_key",
+        ),
     )
 
 
@@ -376,7 +401,10 @@ class OrganizationMetrics(Base):
     )
 
     # Indexes
-    __table_args__ = (Index("idx_org_metrics", "organization_id"),)
+    __table_args__ = (
+        UniqueConstraint("organization_id", name="uq_organization_metrics_org"),
+        Index("idx_org_metrics", "organization_id"),
+    )
 
 
 class DailyMetrics(Base):
@@ -475,6 +503,221 @@ class HourlyMetrics(Base):
     )
 
 
+class MetricsRollup(Base):
+    """HourlyMetrics rolled up into daily and weekly buckets."""
+
+    __tablename__ = "metrics_rollups"
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    organization_id: Mapped[UUID] = mapped_column(
+        PyUUID(as_uuid=True),
+        ForeignKey("organizations.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    # Bucket width, e.g. 1d or 7d
+    resolution: Mapped[str] = mapped_column(String(8), nullable=False)
+    bucket_start: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False
+    )
+    total_orders: Mapped[int] = mapped_column(default=0)
+    total_patients: Mapped[int] = mapped_column(default=0)
+    total_providers: Mapped[int] = mapped_column(default=0)
+    total_facilities: Mapped[int] = mapped_column(default=0)
+    total_users: Mapped[int] = mapped_column(default=0)
+    active_users: Mapped[int] = mapped_column(default=0)
+    new_orders: Mapped[int] = mapped_column(default=0)
+    completed_orders: Mapped[int] = mapped_column(default=0)
+    cancelled_orders: Mapped[int] = mapped_column(default=0)
+    new_patients: Mapped[int] = mapped_column(default=0)
+    new_providers: Mapped[int] = mapped_column(default=0)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+    )
+
+    __table_args__ = (
+        UniqueConstraint(
+            "organization_id",
+            "resolution",
+            "bucket_start",
+            name="uq_metrics_rollups_bucket",
+        ),
+        Index("idx_metrics_rollups_resolution_bucket", "resolution", "bucket_start"),
+    )
+
+
+class AggDailyCallMetrics(Base):
+    """Daily IVR call aggregates per organization and territory."""
+
+    __tablename__ = "agg_daily_metrics"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    date: Mapped[datetime] = mapped_column(Date, nullable=False)
+    organization_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("dim_organization.id"), nullable=False
+    )
+    territory_id: Mapped[str] = mapped_column(String(36), nullable=False)
+    total_calls: Mapped[int] = mapped_column(Integer, nullable=False)
+    avg_call_duration: Mapped[float] = mapped_column(Float, nullable=False)
+    call_success_rate: Mapped[float] = mapped_column(Float, nullable=False)
+    verification_success_rate: Mapped[float] = mapped_column(Float, nullable=False)
+    avg_verification_time: Mapped[float] = mapped_column(Float, nullable=False)
+    approval_rate_by_provider: Mapped[dict] = mapped_column(JSONB, default=dict)
+    territory_approval_rates: Mapped[dict] = mapped_column(JSONB, default=dict)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+    )
+
+    __table_args__ = (
+        UniqueConstraint(
+            "date",
+            "organization_id",
+            "territory_id",
+            name="uq_agg_daily_metrics_grain",
+        ),
+        Index("idx_agg_daily_metrics_org_date", "organization_id", "date"),
+    )
+
+
+class AggHourlyCallMetrics(Base):
+    """Hourly IVR call aggregates per organization and territory."""
+
+    __tablename__ = "agg_hourly_metrics"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    hour: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    organization_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("dim_organization.id"), nullable=False
+    )
+    territory_id: Mapped[str] = mapped_column(String(36), nullable=False)
+    total_calls: Mapped[int] = mapped_column(Integer, nullable=False)
+    avg_call_duration: Mapped[float] = mapped_column(Float, nullable=False)
+    call_success_rate: Mapped[float] = mapped_column(Float, nullable=False)
+    verification_success_rate: Mapped[float] = mapped_column(Float, nullable=False)
+    avg_verification_time: Mapped[float] = mapped_column(Float, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+    )
+
+    __table_args__ = (
+        UniqueConstraint(
+            "hour",
+            "organization_id",
+            "territory_id",
+            name="uq_agg_hourly_metrics_grain",
+        ),
+        Index("idx_agg_hourly_metrics_org_hour", "organization_id", "hour"),
+    )
+
+
+class AggregationWatermark(Base):
+    """Highest fact id folded into the aggregates of each fact partition."""
+
+    __tablename__ = "etl_aggregation_watermarks"
+
+    partition_date: Mapped[datetime] = mapped_column(Date, primary_key=True)
+    last_fact_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    row_count: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    aggregated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+    )
+
+
+class AnalyticsRefreshQueue(Base):
+    """Organizations whose analytics read models need recomputing."""
+
+    __tablename__ = "analytics_refresh_queue"
+
+    organization_id: Mapped[UUID] = mapped_column(
+        PyUUID(as_uuid=True), primary_key=True
+    )
+    enqueued_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
+
+    __table_args__ = (Index("idx_analytics_refresh_queue_enqueued", "enqueued_at"),)
+
+
+class OrderRevenueDaily(Base):
+    """
+    Order count and total per organization, day, provider and status.
+
+    Order totals are encrypted per row; this summary is maintained from the
+    plaintext at write time (see app.analytics.revenue) so revenue can be
+    aggregated in SQL. It holds no per-order amounts.
+    """
+
+    __tablename__ = "order_revenue_daily"
+
+    organization_id: Mapped[UUID] = mapped_column(
+        PyUUID(as_uuid=True),
+        ForeignKey("organizations.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    # Day the order was created, in UTC
+    day: Mapped[datetime] = mapped_column(Date, primary_key=True)
+    provider_id: Mapped[UUID] = mapped_column(PyUUID(as_uuid=True), primary_key=True)
+    status: Mapped[str] = mapped_column(String(20), primary_key=True)
+    order_count: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    total_amount: Mapped[float] = mapped_column(
+        Numeric(14, 2), nullable=False, default=0
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+    )
+
+
+class BackfillCheckpoint(Base):
+    """Outcome of one (partition day, organization) unit of a backfill run."""
+
+    __tablename__ = "etl_backfill_checkpoints"
+
+    run_id: Mapped[str] = mapped_column(String(64), primary_key=True)
+    partition_date: Mapped[datetime] = mapped_column(Date, primary_key=True)
+    organization_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    # completed | failed
+    status: Mapped[str] = mapped_column(String(16), nullable=False)
+    fact_rows: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    elapsed_ms: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    error: Mapped[Optional[str]] = mapped_column(Text)
+    completed_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+    )
+
+
+class QuarantinedCall(Base):
+    """Call records rejected by ETL data quality checks, kept for review."""
+
+    __tablename__ = "etl_call_quarantine"
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    call_id: Mapped[Optional[str]] = mapped_column(String(36))
+    # OR of DataQualityError flags
+    error_code: Mapped[int] = mapped_column(Integer, nullable=False)
+    errors: Mapped[List[str]] = mapped_column(JSONB, nullable=False)
+    payload: Mapped[dict] = mapped_column(JSONB, nullable=False)
+    quarantined_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
+    resolved_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
+
+    __table_args__ = (
+        Index("idx_call_quarantine_quarantined_at", "quarantined_at"),
+        Index("idx_call_quarantine_call_id", "call_id"),
+    )
+
+
 class AnalyticsEvent(Base):
     """Analytics event model."""
 
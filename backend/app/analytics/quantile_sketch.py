@@ -0,0 +1,246 @@
+"""Mergeable DDSketch quantile sketches for latency metrics, stored in Redis."""
+
+import math
+from collections import Counter
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Dict, Iterable, List, Optional
+
+from app.services.redis_cache import RedisCache
+
+# Sketched metrics and the call field each is read from
+SKETCH_METRICS = {
+    "call_duration": "duration_seconds",
+    "verification_time": "verification_time_seconds",
+}
+
+DEFAULT_RELATIVE_ACCURACY = 0.01
+# Hourly sketches are kept long enough to serve month-over-month ranges
+SKETCH_TTL_SECONDS = 40 * 24 * 3600
+# Longest range a single percentile query may merge; longer ranges are
+# rejected rather than cut short
+MAX_SKETCH_HOURS = 31 * 24
+
+# Reserved hash fields; every other field is a bucket index
+COUNT_FIELD = "n"
+SUM_FIELD = "s"
+ZERO_FIELD = "z"
+
+
+class DDSketch:
+    """
+    Quantile sketch with relative-error guarantees (DDSketch).
+
+    Values are counted in logarithmic buckets so any quantile estimate is
+    within ``relative_accuracy`` of the true value. Sketches built with the
+    same accuracy merge by adding bucket counts, which is what lets hourly
+    sketches be combined into any range.
+    """
+
+    min_value = 1e-9
+
+    def __init__(self, relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.bins: Counter = Counter()
+        self.zero_count = 0
+        self.count = 0
+        self.sum = 0.0
+
+    def key(self, value: float) -> Optional[int]:
+        """Return the bucket index of ``value``, or None for the zero bucket."""
+        if value < self.min_value:
+            return None
+        return math.ceil(math.log(value) / self._log_gamma)
+
+    def add(self, value: float, weight: int = 1) -> None:
+        """Count ``value`` (negative latencies are treated as zero)."""
+        bucket = self.key(value)
+        if bucket is None:
+            self.zero_count += weight
+        else:
+            self.bins[bucket] += weight
+        self.count += weight
+        self.sum += max(value, 0.0) * weight
+
+    def merge(self, other: "DDSketch") -> None:
+        """Fold ``other`` into this sketch."""
+        self.bins.update(other.bins)
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.sum += other.sum
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self.sum / self.count if self.count else None
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate the ``q`` quantile (0 <= q <= 1)."""
+        if not self.count:
+            return None
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return 0.0
+        for bucket in sorted(self.bins):
+            seen += self.bins[bucket]
+            if rank < seen:
+                return 2 * self.gamma**bucket / (self.gamma + 1)
+        return 2 * self.gamma ** max(self.bins) / (self.gamma + 1)
+
+    def to_fields(self) -> Dict[str, float]:
+        """Return the sketch as Redis hash increments."""
+        fields = {str(bucket): count for bucket, count in self.bins.items()}
+        fields[COUNT_FIELD] = self.count
+        fields[SUM_FIELD] = self.sum
+        if self.zero_count:
+            fields[ZERO_FIELD] = self.zero_count
+        return fields
+
+    @classmethod
+    def from_fields(
+        cls,
+        fields: Dict[str, str],
+        relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY,
+    ) -> "DDSketch":
+        """Rebuild a sketch from a Redis hash."""
+        sketch = cls(relative_accuracy)
+        for field, value in fields.items():
+            if field == COUNT_FIELD:
+                sketch.count = int(value)
+            elif field == SUM_FIELD:
+                sketch.sum = float(value)
+            elif field == ZERO_FIELD:
+                sketch.zero_count = int(value)
+            else:
+                sketch.bins[int(field)] = int(value)
+        return sketch
+
+
+def hour_bucket(value: Optional[datetime] = None) -> datetime:
+    """Return the UTC hour a sample is recorded under."""
+    value = value or datetime.now(timezone.utc)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).replace(minute=0, second=0, microsecond=0)
+
+
+def sketch_hours(start: datetime, end: datetime) -> List[datetime]:
+    """
+    Return the hours whose sketches cover [start, end).
+
+    Raises:
+        ValueError: If the range spans more than ``MAX_SKETCH_HOURS`` hours
+    """
+    if end.tzinfo is None:
+        end = end.replace(tzinfo=timezone.utc)
+    first = hour_bucket(start)
+    count = max(0, math.ceil((end - first) / timedelta(hours=1)))
+    if count > MAX_SKETCH_HOURS:
+        raise ValueError(
+            f"Percentile ranges are limited to {MAX_SKETCH_HOURS // 24} days"
+        )
+    return [first + timedelta(hours=offset) for offset in range(count)]
+
+
+def sketch_key(metric: str, org_id: str, hour: datetime) -> str:
+    """Return the Redis hash holding one org's sketch for one hour."""
+    return f"sketch:{metric}:{org_id}:{hour:%Y%m%d%H}"
+
+
+class SketchStore:
+    """
+    Hourly per-organization sketches kept as Redis hashes.
+
+    Samples are folded into sketches client-side and applied with HINCRBY,
+    so concurrent loaders update the same hour without read-modify-write.
+    """
+
+    def __init__(
+        self,
+        cache: Optional[RedisCache] = None,
+        relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY,
+    ):
+        self._cache = cache
+        self.relative_accuracy = relative_accuracy
+
+    @property
+    def cache(self) -> RedisCache:
+        if self._cache is None:
+            self._cache = RedisCache()
+        return self._cache
+
+    def build(self, calls: Iterable[Dict]) -> Dict[str, DDSketch]:
+        """
+        Fold calls into one sketch per (metric, organization, hour) key.
+
+        Sketches are keyed by the organization's ``org_id`` (its id in the
+        application, as read back by the percentiles endpoint), never by the
+        dimension surrogate; calls without one are skipped.
+        """
+        sketches: Dict[str, DDSketch] = {}
+        for call_data in calls:
+            if call_data.get("org_id") is None:
+                continue
+            org_id = str(call_data["org_id"])
+            hour = hour_bucket(call_data.get("call_time"))
+            for metric, field in SKETCH_METRICS.items():
+                if call_data.get(field) is None:
+                    continue
+                key = sketch_key(metric, org_id, hour)
+                sketch = sketches.get(key)
+                if sketch is None:
+                    sketch = sketches[key] = DDSketch(self.relative_accuracy)
+                sketch.add(call_data[field])
+        return sketches
+
+    def queue_updates(self, pipe, sketches: Dict[str, DDSketch]) -> None:
+        """Queue the increments for ``sketches`` on a Redis pipeline."""
+        for key, sketch in sketches.items():
+            for field, value in sketch.to_fields().items():
+                if field == SUM_FIELD:
+                    pipe.hincrbyfloat(key, field, value)
+                else:
+                    pipe.hincrby(key, field, value)
+            pipe.expire(key, SKETCH_TTL_SECONDS)
+
+    async def rebuild_day(self, org_id: str, day: date, calls: Iterable[Dict]) -> int:
+        """
+        Replace one organization's hourly sketches for ``day`` with ``calls``.
+
+        The old hours are deleted and the new counts written in one MULTI/EXEC,
+        so a rebuild can be repeated without double counting.
+        """
+        sketches = self.build(calls)
+        first_hour = hour_bucket(datetime.combine(day, time.min))
+        keys = [
+            sketch_key(metric, org_id, first_hour + timedelta(hours=offset))
+            for metric in SKETCH_METRICS
+            for offset in range(24)
+        ]
+        async with self.cache.pipeline(transaction=True) as pipe:
+            pipe.delete(*keys)
+            self.queue_updates(pipe, sketches)
+        return len(sketches)
+
+    async def load(
+        self, metric: str, org_id: str, start: datetime, end: datetime
+    ) -> DDSketch:
+        """
+        Merge the hourly sketches of ``org_id`` covering [start, end).
+
+        Raises:
+            ValueError: If the range spans more than ``MAX_SKETCH_HOURS`` hours
+        """
+        hours = sketch_hours(start, end)
+
+        async with self.cache.redis.pipeline(transaction=False) as pipe:
+            for hour in hours:
+                pipe.hgetall(sketch_key(metric, org_id, hour))
+            results: List[Dict[str, str]] = await pipe.execute()
+
+        merged = DDSketch(self.relative_accuracy)
+        for fields in results:
+            if fields:
+                merged.merge(DDSketch.from_fields(fields, self.relative_accuracy))
+        return merged
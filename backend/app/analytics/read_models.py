@@ -0,0 +1,273 @@
+"""Incrementally refreshed organization and geographic analytics read models."""
+
+import asyncio
+import json
+from itertools import chain
+from typing import List, Optional, Sequence, Set
+from uuid import UUID
+
+from sqlalchemy import event, inspect, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.analytics.models import AnalyticsRefreshQueue
+from app.core import database
+from app.models.facility import Facility
+from app.models.order import Order
+from app.models.patient import Patient
+from app.models.provider import Provider
+from app.models.user import User
+from app.services.redis_cache import RedisCache, generation_key
+
+# Columns of each model the read models count or group by. Inserts and
+# deletes always count; updates only when one of these columns changes, so
+# e.g. a user's last login does not queue a refresh
+TRACKED_COLUMNS = {
+    Order: ("organization_id", "provider_id"),
+    Patient: ("organization_id", "facility_id"),
+    Provider: ("organization_id", "state"),
+    Facility: ("organization_id", "state"),
+    User: ("organization_id",),
+}
+TRACKED_MODELS = tuple(TRACKED_COLUMNS)
+
+# Organizations refreshed per transaction
+REFRESH_BATCH_SIZE = 100
+DEFAULT_REFRESH_INTERVAL = 30
+
+# US Census Bureau regions, keyed by state code
+STATE_REGIONS = {
+    **dict.fromkeys("CT ME MA NH RI VT NJ NY PA".split(), "Northeast"),
+    **dict.fromkeys("IL IN MI OH WI IA KS MN MO NE ND SD".split(), "Midwest"),
+    **dict.fromkeys(
+        "DE DC FL GA MD NC SC VA WV AL KY MS TN AR LA OK TX".split(), "South"
+    ),
+    **dict.fromkeys("AZ CO ID MT NV NM UT WY AK CA HI OR WA".split(), "West"),
+}
+
+CLAIM_SQL = """
+    DELETE FROM analytics_refresh_queue
+    WHERE organization_id IN (
+        SELECT organization_id FROM analytics_refresh_queue
+        ORDER BY enqueued_at
+        LIMIT :limit
+        FOR UPDATE SKIP LOCKED
+    )
+    RETURNING organization_id
+"""
+
+ORGANIZATION_REFRESH_SQL = """
+    INSERT INTO organization_metrics (
+        id, organization_id,
+        total_orders, total_patients, total_providers,
+        total_facilities, total_users,
+        event_metadata, created_at, updated_at
+    )
+    SELECT
+        gen_random_uuid(),
+        o.id,
+        (SELECT count(*) FROM orders WHERE organization_id = o.id),
+        (SELECT count(*) FROM patients WHERE organization_id = o.id),
+        (SELECT count(*) FROM providers WHERE organization_id = o.id),
+        (SELECT count(*) FROM facilities WHERE organization_id = o.id),
+        (SELECT count(*) FROM users WHERE organization_id = o.id),
+        '{}',
+        now(),
+        now()
+    FROM organizations o
+    WHERE o.id = ANY(:organization_ids)
+    ON CONFLICT (organization_id) DO UPDATE SET
+        total_orders = EXCLUDED.total_orders,
+        total_patients = EXCLUDED.total_patients,
+        total_providers = EXCLUDED.total_providers,
+        total_facilities = EXCLUDED.total_facilities,
+        total_users = EXCLUDED.total_users,
+        updated_at = EXCLUDED.updated_at
+"""
+
+GEOGRAPHIC_DELETE_SQL = """
+    DELETE FROM geographic_metrics WHERE organization_id = ANY(:organization_ids)
+"""
+
+# Orders and providers are placed by the provider's state, patients by the
+# state of their facility
+GEOGRAPHIC_REFRESH_SQL = """
+    INSERT INTO geographic_metrics (
+        id, organization_id, state, region,
+        total_orders, total_patients, total_providers,
+        event_metadata, created_at, updated_at
+    )
+    SELECT
+        gen_random_uuid(),
+        organization_id,
+        state,
+        coalesce(CAST(:regions AS jsonb) ->> state, 'Other'),
+        sum(orders),
+        sum(patients),
+        sum(providers),
+        '{}',
+        now(),
+        now()
+    FROM (
+        SELECT o.organization_id, p.state, count(*) AS orders,
+            0 AS patients, 0 AS providers
+        FROM orders o
+        JOIN providers p ON p.id = o.provider_id
+        WHERE o.organization_id = ANY(:organization_ids)
+        GROUP BY o.organization_id, p.state
+        UNION ALL
+        SELECT pt.organization_id, f.state, 0, count(*), 0
+        FROM patients pt
+        JOIN facilities f ON f.id = pt.facility_id
+        WHERE pt.organization_id = ANY(:organization_ids)
+        GROUP BY pt.organization_id, f.state
+        UNION ALL
+        SELECT organization_id, state, 0, 0, count(*)
+        FROM providers
+        WHERE organization_id = ANY(:organization_ids)
+        GROUP BY organization_id, state
+    ) counts
+    WHERE organization_id IN (
+        SELECT id FROM organizations WHERE id = ANY(:organization_ids)
+    )
+    GROUP BY organization_id, state
+"""
+
+
+def version_namespace(organization_id) -> str:
+    """Return the generation counter stamping an organization's read models."""
+    return f"read_model:{organization_id}"
+
+
+async def get_version(organization_id, cache: Optional[RedisCache] = None) -> int:
+    """Return the read-model version of an organization (0 if never stamped)."""
+    return await (cache or RedisCache()).get_generation(
+        version_namespace(organization_id)
+    )
+
+
+def changed_organizations(session: Session) -> Set[UUID]:
+    """Return organizations whose counts the pending flush changes."""
+    organizations = set()
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if not isinstance(obj, TRACKED_MODELS):
+            continue
+        attrs = inspect(obj).attrs
+        if obj in session.dirty and obj not in session.deleted:
+            columns = next(
+                names
+                for model, names in TRACKED_COLUMNS.items()
+                if isinstance(obj, model)
+            )
+            if not any(attrs[name].history.has_changes() for name in columns):
+                continue
+        # Moving a row between organizations changes both
+        history = attrs.organization_id.history
+        organizations.update(
+            value
+            for value in chain(history.added, history.unchanged, history.deleted)
+            if value is not None
+        )
+    return organizations
+
+
+def _enqueue_changed_organizations(session: Session, flush_context) -> None:
+    """Queue refreshes in the writing transaction so none are lost."""
+    organizations = changed_organizations(session)
+    if not organizations:
+        return
+    connection = session.connection()
+    if connection.dialect.name != "postgresql":
+        return
+    connection.execute(
+        pg_insert(AnalyticsRefreshQueue)
+        .values([{"organization_id": org_id} for org_id in organizations])
+        .on_conflict_do_nothing()
+    )
+
+
+event.listen(Session, "after_flush", _enqueue_changed_organizations)
+
+
+class ReadModelRefresher:
+    """
+    Keeps ``OrganizationMetrics`` and ``GeographicMetrics`` current.
+
+    Order, patient, provider, facility and user writes queue their
+    organization in ``analytics_refresh_queue`` as part of the same
+    transaction. The refresher claims queued organizations with
+    ``SKIP LOCKED`` (so several app workers can share the queue), recomputes
+    their rows set-based and, after commit, bumps each organization's
+    read-model version so routes can serve ETags and cache per version.
+    """
+
+    def __init__(
+        self,
+        cache: Optional[RedisCache] = None,
+        batch_size: int = REFRESH_BATCH_SIZE,
+    ):
+        self._cache = cache
+        self.batch_size = batch_size
+
+    @property
+    def cache(self) -> RedisCache:
+        if self._cache is None:
+            self._cache = RedisCache()
+        return self._cache
+
+    async def refresh(self, db: AsyncSession, organization_ids: Sequence[UUID]) -> None:
+        """Recompute the read models of ``organization_ids`` in ``db``."""
+        params = {"organization_ids": list(organization_ids)}
+        await db.execute(text(ORGANIZATION_REFRESH_SQL), params)
+        await db.execute(text(GEOGRAPHIC_DELETE_SQL), params)
+        await db.execute(
+            text(GEOGRAPHIC_REFRESH_SQL),
+            {**params, "regions": json.dumps(STATE_REGIONS)},
+        )
+
+    async def publish(self, organization_ids: Sequence[UUID]) -> None:
+        """Stamp refreshed organizations with a new read-model version."""
+        async with self.cache.pipeline() as pipe:
+            for org_id in organization_ids:
+                pipe.incr(generation_key(version_namespace(org_id)))
+
+    async def refresh_pending(self) -> List[UUID]:
+        """Refresh one batch of queued organizations and return them."""
+        async with database.async_session_factory() as db:
+            result = await db.execute(text(CLAIM_SQL), {"limit": self.batch_size})
+            organization_ids = [row[0] for row in result]
+            if organization_ids:
+                await self.refresh(db, organization_ids)
+            await db.commit()
+        if organization_ids:
+            try:
+                await self.publish(organization_ids)
+            except Exception as e:
+                print(f"Error publishing read-model versions: {e}")
+        return organization_ids
+
+    async def refresh_all(self) -> int:
+        """Queue and refresh every organization, e.g. after a deploy."""
+        async with database.async_session_factory() as db:
+            await db.execute(
+                text(
+                    "INSERT INTO analytics_refresh_queue (organization_id) "
+                    "SELECT id FROM organizations ON CONFLICT DO NOTHING"
+                )
+            )
+            await db.commit()
+        refreshed = 0
+        while organization_ids := await self.refresh_pending():
+            refreshed += len(organization_ids)
+        return refreshed
+
+    async def run(self, interval: float = DEFAULT_REFRESH_INTERVAL) -> None:
+        """Drain the queue every ``interval`` seconds until cancelled."""
+        while True:
+            try:
+                while await self.refresh_pending():
+                    pass
+            except Exception as e:
+                print(f"Error refreshing analytics read models: {e}")
+            await asyncio.sleep(interval)
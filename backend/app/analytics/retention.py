@@ -0,0 +1,194 @@
+"""Retention and rollup policy for HourlyMetrics."""
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.analytics.series import (
+    BUCKET_ORIGIN_SECONDS,
+    COUNTER_COLUMNS,
+    GAUGE_COLUMNS,
+    RESOLUTIONS,
+)
+from app.core.config import settings
+
+# Rows deleted per statement, so retention never holds long locks
+DELETE_BATCH_SIZE = 10_000
+# Buckets before the last rolled one that are recomputed for late rows
+ROLLUP_OVERLAP_BUCKETS = 1
+
+_METRIC_COLUMNS = (*COUNTER_COLUMNS, *GAUGE_COLUMNS)
+
+
+def _rollup_sql(source: str, time_column: str, source_filter: str = "") -> str:
+    """Upsert ``source`` rows since :since into :resolution buckets."""
+    names = ", ".join(_METRIC_COLUMNS)
+    aggregates = ", ".join(
+        [f"sum({c})" for c in COUNTER_COLUMNS] + [f"max({c})" for c in GAUGE_COLUMNS]
+    )
+    updates = ", ".join(f"{c} = EXCLUDED.{c}" for c in _METRIC_COLUMNS)
+    bucket = (
+        f"to_timestamp(floor((extract(epoch FROM {time_column}) - :origin) "
+        f"/ :width) * :width + :origin)"
+    )
+    return f"""
+        INSERT INTO metrics_rollups (
+            organization_id, resolution, bucket_start, {names}, updated_at
+        )
+        SELECT organization_id, :resolution, {bucket}, {aggregates}, now()
+        FROM {source}
+        WHERE {time_column} >= :since {source_filter}
+        GROUP BY organization_id, {bucket}
+        ON CONFLICT ON CONSTRAINT uq_metrics_rollups_bucket DO UPDATE SET
+            {updates},
+            updated_at = EXCLUDED.updated_at
+    """
+
+
+DAILY_ROLLUP_SQL = _rollup_sql("hourly_metrics", "timestamp")
+WEEKLY_ROLLUP_SQL = _rollup_sql(
+    "metrics_rollups", "bucket_start", "AND resolution = '1d'"
+)
+
+
+def align(value: datetime, width: int) -> datetime:
+    """Floor ``value`` to the start of its ``width``-second bucket."""
+    offset = int(value.timestamp()) - BUCKET_ORIGIN_SECONDS
+    seconds = offset // width * width + BUCKET_ORIGIN_SECONDS
+    return datetime.fromtimestamp(seconds, tz=timezone.utc)
+
+
+@dataclass
+class RetentionPolicy:
+    """How long each HourlyMetrics tier is kept (weekly rollups are kept)."""
+
+    raw_days: int = settings.HOURLY_METRICS_RETENTION_DAYS
+    daily_days: int = settings.DAILY_ROLLUP_RETENTION_DAYS
+
+
+class MetricsRetentionEngine:
+    """
+    Rolls raw hourly metrics into daily and weekly buckets and expires them.
+
+    Hourly rows roll into ``1d`` rollups and those into ``7d`` rollups,
+    resuming at the last rolled bucket; the current (partial) bucket is
+    recomputed on every run. Raw rows older than ``raw_days`` and daily
+    rollups older than ``daily_days`` are then deleted in batches, but
+    never past what has been rolled up.
+    """
+
+    def __init__(self, db: AsyncSession, policy: Optional[RetentionPolicy] = None):
+        self.db = db
+        self.policy = policy or RetentionPolicy()
+
+    async def _rollup_since(self, resolution: str, source_sql: str) -> datetime:
+        """Return the aligned start of the next rollup window."""
+        width = RESOLUTIONS[resolution]
+        last = await self._last_bucket(resolution)
+        if last is None:
+            # First run: start from the oldest source row
+            last = (await self.db.execute(text(source_sql))).scalar()
+            if last is None:
+                return align(datetime.now(timezone.utc), width)
+        return align(last, width) - timedelta(seconds=width * ROLLUP_OVERLAP_BUCKETS)
+
+    async def _last_bucket(self, resolution: str) -> Optional[datetime]:
+        return (
+            await self.db.execute(
+                text(
+                    "SELECT max(bucket_start) FROM metrics_rollups "
+                    "WHERE resolution = :resolution"
+                ),
+                {"resolution": resolution},
+            )
+        ).scalar()
+
+    async def rollup(self, resolution: str, sql: str, oldest_source_sql: str) -> int:
+        """Upsert ``resolution`` buckets from the resume point onwards."""
+        since = await self._rollup_since(resolution, oldest_source_sql)
+        width = RESOLUTIONS[resolution]
+        result = await self.db.execute(
+            text(sql),
+            {
+                "resolution": resolution,
+                "width": width,
+                "origin": BUCKET_ORIGIN_SECONDS,
+                "since": since,
+            },
+        )
+        await self.db.commit()
+        return result.rowcount
+
+    async def rollup_daily(self) -> int:
+        """Roll raw hourly rows into daily buckets."""
+        return await self.rollup(
+            "1d", DAILY_ROLLUP_SQL, "SELECT min(timestamp) FROM hourly_metrics"
+        )
+
+    async def rollup_weekly(self) -> int:
+        """Roll daily buckets into weekly buckets."""
+        return await self.rollup(
+            "7d",
+            WEEKLY_ROLLUP_SQL,
+            "SELECT min(bucket_start) FROM metrics_rollups WHERE resolution = '1d'",
+        )
+
+    async def _delete_batched(self, sql: str, params: Dict) -> int:
+        deleted = 0
+        while True:
+            result = await self.db.execute(
+                text(sql), {**params, "batch": DELETE_BATCH_SIZE}
+            )
+            await self.db.commit()
+            deleted += result.rowcount
+            if result.rowcount < DELETE_BATCH_SIZE:
+                return deleted
+
+    async def expire(self, now: Optional[datetime] = None) -> Dict[str, int]:
+        """Delete raw and daily rows past retention that are rolled up."""
+        now = now or datetime.now(timezone.utc)
+        # Whole buckets only, so a rolled bucket never loses half its rows
+        raw_cutoff = align(
+            now - timedelta(days=self.policy.raw_days), RESOLUTIONS["1d"]
+        )
+        daily_cutoff = align(
+            now - timedelta(days=self.policy.daily_days), RESOLUTIONS["7d"]
+        )
+        # Nothing newer than the last rolled bucket of the next tier goes
+        epoch = datetime.fromtimestamp(0, tz=timezone.utc)
+        raw_cutoff = min(raw_cutoff, await self._last_bucket("1d") or epoch)
+        daily_cutoff = min(daily_cutoff, await self._last_bucket("7d") or epoch)
+        return {
+            "hourly_deleted": await self._delete_batched(
+                """
+                DELETE FROM hourly_metrics WHERE id IN (
+                    SELECT id FROM hourly_metrics
+                    WHERE timestamp < :cutoff
+                    LIMIT :batch
+                )
+                """,
+                {"cutoff": raw_cutoff},
+            ),
+            "daily_deleted": await self._delete_batched(
+                """
+                DELETE FROM metrics_rollups WHERE id IN (
+                    SELECT id FROM metrics_rollups
+                    WHERE resolution = '1d' AND bucket_start < :cutoff
+                    LIMIT :batch
+                )
+                """,
+                {"cutoff": daily_cutoff},
+            ),
+        }
+
+    async def run(self, now: Optional[datetime] = None) -> Dict[str, int]:
+        """Roll up every tier, then enforce retention."""
+        summary = {
+            "daily_buckets": await self.rollup_daily(),
+            "weekly_buckets": await self.rollup_weekly(),
+        }
+        summary.update(await self.expire(now))
+        return summary
@@ -0,0 +1,320 @@
+"""
+Order revenue summaries maintained at write time.
+
+Order totals are encrypted per row, so summing them directly means loading
+and decrypting every order. Instead, each flush that creates, changes or
+deletes an order folds the change into ``order_revenue_daily`` in the same
+transaction. The plaintext is only seen by the writer that already holds it.
+Revenue dashboards then run as SQL aggregates over the summary, which holds
+no per-order amounts and is only served to callers with
+``analytics:revenue``.
+
+Writes that bypass the ORM (Core ``UPDATE``/``DELETE`` of orders) are not
+seen by the flush listener. Bulk status changes record their moves with
+``record_status_change``; ``scripts/rebuild_order_revenue.py`` rebuilds
+the summary from the orders themselves.
+"""
+
+from collections import defaultdict
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from itertools import chain
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from sqlalchemy import Select, event, func, inspect, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.analytics.models import OrderRevenueDaily
+from app.core.config import settings
+from app.core.security import decrypt_field
+from app.models.order import Order
+from app.models.provider import Provider
+
+REVENUE_PERMISSION = "analytics:revenue"
+
+# Dimensions a revenue query can group by
+GROUP_BY = ("day", "provider", "state", "status")
+
+# Order columns that decide which summary row an order counts towards
+TRACKED_COLUMNS = (
+    "organization_id",
+    "created_at",
+    "provider_id",
+    "status",
+    "_total_amount",
+)
+
+# (organization_id, day, provider_id, status)
+RevenueKey = Tuple[UUID, date, UUID, str]
+
+
+def revenue_day(created_at: Optional[datetime]) -> date:
+    """UTC day an order is summarized under; naive times are UTC."""
+    if created_at is None:
+        return datetime.now(timezone.utc).date()
+    if created_at.tzinfo is not None:
+        created_at = created_at.astimezone(timezone.utc)
+    return created_at.date()
+
+
+def order_amount(encrypted: Optional[str]) -> Decimal:
+    """Plaintext of an encrypted order total (zero when unset)."""
+    if not encrypted:
+        return Decimal(0)
+    return Decimal(str(decrypt_field(encrypted)))
+
+
+def _contribution(values: Dict[str, object]) -> Optional[Tuple[RevenueKey, Decimal]]:
+    if values["organization_id"] is None or values["provider_id"] is None:
+        return None
+    key = (
+        values["organization_id"],
+        revenue_day(values["created_at"]),
+        values["provider_id"],
+        str(values["status"] or "pending"),
+    )
+    return key, order_amount(values["_total_amount"])
+
+
+def load_tracked_columns(session: Session) -> None:
+    """
+    Load expired or deferred ``TRACKED_COLUMNS`` of changed and deleted orders.
+
+    An unloaded column has no history, so the order's old summary row could
+    not be found. This has to run before the flush, while deleted rows can
+    still be read.
+    """
+    # Loading must not flush the very changes being summarized
+    with session.no_autoflush:
+        for obj in chain(session.dirty, session.deleted):
+            if not isinstance(obj, Order):
+                continue
+            for name in inspect(obj).unloaded.intersection(TRACKED_COLUMNS):
+                getattr(obj, name)
+
+
+def revenue_deltas(session: Session) -> Dict[RevenueKey, List]:
+    """
+    Changes the pending flush makes to each summary row.
+
+    An order contributes (1, total) to its row; a change subtracts its old
+    contribution and adds the new one, a delete only subtracts.
+    """
+    deltas: Dict[RevenueKey, List] = defaultdict(lambda: [0, Decimal(0)])
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if not isinstance(obj, Order):
+            continue
+        attrs = inspect(obj).attrs
+        histories = {name: attrs[name].history for name in TRACKED_COLUMNS}
+        if obj in session.dirty and obj not in session.deleted:
+            if not any(history.has_changes() for history in histories.values()):
+                continue
+
+        changes = []
+        if obj not in session.new:
+            old = {
+                name: (history.deleted or history.unchanged or [None])[0]
+                for name, history in histories.items()
+            }
+            changes.append((-1, old))
+        if obj not in session.deleted:
+            new = {
+                name: (history.added or history.unchanged or [None])[0]
+                for name, history in histories.items()
+            }
+            changes.append((1, new))
+
+        for sign, values in changes:
+            contribution = _contribution(values)
+            if contribution is None:
+                continue
+            key, amount = contribution
+            deltas[key][0] += sign
+            deltas[key][1] += sign * amount
+
+    return {key: delta for key, delta in deltas.items() if delta[0] or delta[1] != 0}
+
+
+def apply_revenue_deltas(connection, deltas: Dict[RevenueKey, List]) -> None:
+    """Add deltas to their summary rows, creating rows on first use."""
+    if not deltas:
+        return
+    # A fixed row order keeps concurrent writers from deadlocking
+    rows = [
+        {
+            "organization_id": key[0],
+            "day": key[1],
+            "provider_id": key[2],
+            "status": key[3],
+            "order_count": count,
+            "total_amount": amount,
+        }
+        for key, (count, amount) in sorted(deltas.items(), key=lambda d: str(d[0]))
+    ]
+    statement = pg_insert(OrderRevenueDaily).values(rows)
+    table = OrderRevenueDaily.__table__
+    connection.execute(
+        statement.on_conflict_do_update(
+            index_elements=["organization_id", "day", "provider_id", "status"],
+            set_={
+                "order_count": table.c.order_count + statement.excluded.order_count,
+                "total_amount": table.c.total_amount + statement.excluded.total_amount,
+                "updated_at": func.now(),
+            },
+        )
+    )
+
+
+def status_change_deltas(
+    rows: Iterable[Sequence], new_status: str
+) -> Dict[RevenueKey, List]:
+    """
+    Deltas moving orders to ``new_status``.
+
+    Each row holds an order's ``TRACKED_COLUMNS`` with its current status.
+    """
+    deltas: Dict[RevenueKey, List] = defaultdict(lambda: [0, Decimal(0)])
+    for row in rows:
+        values = dict(zip(TRACKED_COLUMNS, row))
+        for sign, status in ((-1, values["status"]), (1, new_status)):
+            contribution = _contribution({**values, "status": status})
+            if contribution is None:
+                continue
+            key, amount = contribution
+            deltas[key][0] += sign
+            deltas[key][1] += sign * amount
+    return {key: delta for key, delta in deltas.items() if delta[0] or delta[1] != 0}
+
+
+def record_status_change(
+    connection, order_ids: Sequence[UUID], new_status: str
+) -> None:
+    """
+    Fold a Core status ``UPDATE`` of ``order_ids`` into the summary.
+
+    Call it in the updating transaction, before the ``UPDATE``, with the
+    orders locked so their current status is the one being replaced.
+    """
+    if not order_ids or connection.dialect.name != "postgresql":
+        return
+    rows = connection.execute(
+        select(*(getattr(Order, name) for name in TRACKED_COLUMNS)).where(
+            Order.id.in_(order_ids)
+        )
+    ).all()
+    apply_revenue_deltas(connection, status_change_deltas(rows, new_status))
+
+
+def _load_revenue_columns(session: Session, flush_context, instances) -> None:
+    """Load what ``revenue_deltas`` reads while the old rows still exist."""
+    load_tracked_columns(session)
+
+
+def _record_revenue(session: Session, flush_context) -> None:
+    """Fold order writes into the summary in the writing transaction."""
+    deltas = revenue_deltas(session)
+    if not deltas:
+        return
+    connection = session.connection()
+    if connection.dialect.name != "postgresql":
+        return
+    apply_revenue_deltas(connection, deltas)
+
+
+event.listen(Session, "before_flush", _load_revenue_columns)
+event.listen(Session, "after_flush", _record_revenue)
+
+
+def can_view_revenue(role: Optional[str], permissions: Iterable[str] = ()) -> bool:
+    """Whether a caller's role or token grants revenue analytics."""
+    granted = set(permissions) | set(settings.ROLE_PERMISSIONS.get(role, []))
+    return "*" in granted or REVENUE_PERMISSION in granted
+
+
+def revenue_query(
+    organization_id: UUID,
+    group_by: Sequence[str] = ("day",),
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    statuses: Optional[Sequence[str]] = None,
+    min_group_size: int = settings.REVENUE_MIN_GROUP_SIZE,
+) -> Select:
+    """
+    Order count and revenue of an organization, grouped by ``group_by``.
+
+    Groups with fewer than ``min_group_size`` orders are left out, so a
+    group never reveals the total of a single order unless policy allows.
+    """
+    unknown = set(group_by) - set(GROUP_BY)
+    if unknown:
+        raise ValueError(f"Cannot group revenue by {', '.join(sorted(unknown))}")
+
+    summary = OrderRevenueDaily
+    columns = {
+        "day": summary.day,
+        "provider": summary.provider_id.label("provider_id"),
+        "state": Provider.state,
+        "status": summary.status,
+    }
+    dimensions = [columns[name] for name in group_by]
+    query = select(
+        *dimensions,
+        func.sum(summary.order_count).label("orders"),
+        func.sum(summary.total_amount).label("revenue"),
+    ).where(summary.organization_id == organization_id)
+    if "state" in group_by:
+        query = query.join(Provider, Provider.id == summary.provider_id)
+    if start is not None:
+        query = query.where(summary.day >= start)
+    if end is not None:
+        query = query.where(summary.day <= end)
+    if statuses:
+        query = query.where(summary.status.in_(statuses))
+    if dimensions:
+        query = query.group_by(*dimensions).order_by(*dimensions)
+    if min_group_size > 1:
+        query = query.having(func.sum(summary.order_count) >= min_group_size)
+    return query
+
+
+def rebuild_revenue(
+    db: Session, organization_id: Optional[UUID] = None, batch_size: int = 5000
+) -> Dict[str, int]:
+    """
+    Recompute the summary from the orders, decrypting each total once.
+
+    The summary is locked against writers for the rebuild: an order write
+    either committed before it (and is counted here) or waits for it and
+    then applies its own delta, so nothing is counted twice or missed.
+    """
+    connection = db.connection()
+    connection.exec_driver_sql("LOCK TABLE order_revenue_daily IN EXCLUSIVE MODE")
+    summary = OrderRevenueDaily.__table__
+    clear = summary.delete()
+    orders = select(*(getattr(Order, name) for name in TRACKED_COLUMNS))
+    if organization_id is not None:
+        clear = clear.where(summary.c.organization_id == organization_id)
+        orders = orders.where(Order.organization_id == organization_id)
+    connection.execute(clear)
+
+    totals: Dict[RevenueKey, List] = defaultdict(lambda: [0, Decimal(0)])
+    scanned = 0
+    result = connection.execution_options(yield_per=batch_size).execute(orders)
+    for row in result:
+        scanned += 1
+        contribution = _contribution(dict(zip(TRACKED_COLUMNS, row)))
+        if contribution is None:
+            continue
+        key, amount = contribution
+        totals[key][0] += 1
+        totals[key][1] += amount
+
+    keys = list(totals)
+    for i in range(0, len(keys), batch_size):
+        apply_revenue_deltas(
+            connection, {key: totals[key] for key in keys[i : i + batch_size]}
+        )
+    db.commit()
+    return {"orders": scanned, "rows": len(keys)}
@@ -0,0 +1,237 @@
+"""Columnar loading, downsampling and encoding of analytics time series."""
+
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+import orjson
+import pyarrow as pa
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.analytics.models import MetricsRollup
+
+# Per-period counts: summed when downsampling
+COUNTER_COLUMNS = (
+    "new_orders",
+    "completed_orders",
+    "cancelled_orders",
+    "new_patients",
+    "new_providers",
+)
+# Running totals: the bucket keeps its peak (totals only grow, so the last)
+GAUGE_COLUMNS = (
+    "total_orders",
+    "total_patients",
+    "total_providers",
+    "total_facilities",
+    "total_users",
+    "active_users",
+)
+# JSON breakdowns cannot be merged generically, so buckets omit them
+NESTED_COLUMNS = ("provider_metrics", "patient_metrics", "order_metrics")
+
+RESPONSE_FORMATS = ("json", "columnar", "arrow")
+ARROW_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+
+# Requestable resolutions in seconds
+RESOLUTIONS = {
+    "1h": 3600,
+    "6h": 6 * 3600,
+    "12h": 12 * 3600,
+    "1d": 24 * 3600,
+    "7d": 7 * 24 * 3600,
+}
+# Resolutions HourlyMetrics is rolled up into, coarsest first
+ROLLUP_RESOLUTIONS = ("7d", "1d")
+# Buckets are floored from Monday 1970-01-05 UTC, so weekly buckets are
+# calendar weeks; the offset is whole days, so narrower buckets keep their
+# epoch alignment
+BUCKET_ORIGIN_SECONDS = 4 * 24 * 3600
+
+
+def bucket_seconds(resolution: Optional[str], native: str) -> Optional[int]:
+    """
+    Return the bucket width for ``resolution``, or None to keep raw rows.
+
+    Raises:
+        ValueError: If the resolution is unknown or finer than ``native``
+    """
+    if resolution is None or resolution == native:
+        return None
+    if resolution not in RESOLUTIONS:
+        raise ValueError(
+            f"Unknown resolution {resolution!r}; expected one of "
+            f"{', '.join(RESOLUTIONS)}"
+        )
+    if RESOLUTIONS[resolution] < RESOLUTIONS[native]:
+        raise ValueError(f"Resolution {resolution} is finer than the data ({native})")
+    return RESOLUTIONS[resolution]
+
+
+def rollup_tier(resolution: Optional[str]) -> Optional[str]:
+    """Return the coarsest rollup tier that can serve ``resolution``."""
+    if resolution not in RESOLUTIONS:
+        return None
+    for tier in ROLLUP_RESOLUTIONS:
+        if RESOLUTIONS[resolution] % RESOLUTIONS[tier] == 0:
+            return tier
+    return None
+
+
+def time_bucket(ts, bucket: int):
+    """Floor ``ts`` to ``bucket`` seconds (UTC, weeks starting on Monday)."""
+    offset = func.extract("epoch", ts) - BUCKET_ORIGIN_SECONDS
+    return func.to_timestamp(
+        func.floor(offset / bucket) * bucket + BUCKET_ORIGIN_SECONDS
+    )
+
+
+def series_query(
+    model,
+    time_column: str,
+    organization_id,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    bucket: Optional[int] = None,
+    label: Optional[str] = None,
+    nested: bool = True,
+):
+    """
+    Build the raw or time-bucketed select of a metrics table.
+
+    ``label`` names the time column in the result (defaults to
+    ``time_column``); ``nested`` includes the JSON breakdowns of raw rows.
+    """
+    ts = getattr(model, time_column)
+    if bucket is None:
+        time_expr = ts
+        columns = [getattr(model, c) for c in (*COUNTER_COLUMNS, *GAUGE_COLUMNS)]
+        if nested:
+            columns += [getattr(model, c) for c in NESTED_COLUMNS]
+            columns.append(model.event_metadata)
+    else:
+        time_expr = time_bucket(ts, bucket)
+        columns = [func.sum(getattr(model, c)) for c in COUNTER_COLUMNS] + [
+            func.max(getattr(model, c)) for c in GAUGE_COLUMNS
+        ]
+
+    query = select(time_expr.label(label or time_column), *columns).where(
+        model.organization_id == organization_id
+    )
+    if start:
+        query = query.where(ts >= start)
+    if end:
+        query = query.where(ts <= end)
+    if bucket is not None:
+        query = query.group_by(time_expr)
+    return query.order_by(time_expr)
+
+
+def series_columns(time_column: str, bucketed: bool) -> List[str]:
+    """Return the response column names of a raw or bucketed series."""
+    columns = [time_column, *COUNTER_COLUMNS, *GAUGE_COLUMNS]
+    if not bucketed:
+        columns += [*NESTED_COLUMNS, "metadata"]
+    return columns
+
+
+def _epoch_ms(value: datetime) -> int:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return int(value.timestamp() * 1000)
+
+
+async def load_series(
+    session: AsyncSession,
+    model,
+    time_column: str,
+    organization_id,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    resolution: Optional[str] = None,
+    native: str = "1h",
+    use_rollups: bool = False,
+) -> Dict[str, Any]:
+    """
+    Load a metrics series as columns.
+
+    With ``use_rollups`` a resolution of a day or coarser is read from the
+    coarsest ``MetricsRollup`` tier that divides it instead of raw rows.
+
+    Returns:
+        ``{"resolution", "time_column", "length", "columns"}`` where
+        ``columns`` maps each name to its list of values and times are epoch
+        milliseconds (UTC)
+    """
+    bucket = bucket_seconds(resolution, native)
+    tier = rollup_tier(resolution) if use_rollups and bucket else None
+    if tier:
+        if RESOLUTIONS[tier] == bucket:
+            bucket = None
+        query = series_query(
+            MetricsRollup,
+            "bucket_start",
+            organization_id,
+            start,
+            end,
+            bucket,
+            label=time_column,
+            nested=False,
+        ).where(MetricsRollup.resolution == tier)
+    else:
+        query = series_query(model, time_column, organization_id, start, end, bucket)
+    result = await session.execute(query)
+    names = series_columns(time_column, tier is not None or bucket is not None)
+    # Transpose rows to columns in one pass
+    values = list(zip(*result.all())) or [()] * len(names)
+    columns = dict(zip(names, (list(v) for v in values)))
+    columns[time_column] = [_epoch_ms(t) for t in columns[time_column]]
+    for name in (*COUNTER_COLUMNS, *GAUGE_COLUMNS):
+        # SUM over integers comes back as Decimal
+        columns[name] = [int(v) if v is not None else None for v in columns[name]]
+    return {
+        "resolution": resolution or native,
+        "source": f"rollup:{tier}" if tier else model.__tablename__,
+        "time_column": time_column,
+        "length": len(columns[time_column]),
+        "columns": columns,
+    }
+
+
+def series_rows(series: Dict[str, Any]) -> List[Dict]:
+    """Expand a columnar series into the row-per-dict JSON format."""
+    columns = dict(series["columns"])
+    time_column = series["time_column"]
+    columns[time_column] = [
+        datetime.fromtimestamp(ms / 1000, tz=timezone.utc)
+        for ms in columns[time_column]
+    ]
+    names = list(columns)
+    return [dict(zip(names, row)) for row in zip(*columns.values())]
+
+
+def series_json(series: Dict[str, Any]) -> bytes:
+    """Encode a columnar series as compact JSON."""
+    return orjson.dumps(series)
+
+
+def series_arrow(series: Dict[str, Any]) -> bytes:
+    """Encode a columnar series as an Arrow IPC stream."""
+    time_column = series["time_column"]
+    arrays = {}
+    for name, values in series["columns"].items():
+        if name == time_column:
+            arrays[name] = pa.array(values, type=pa.timestamp("ms", tz="UTC"))
+        elif name in NESTED_COLUMNS or name == "metadata":
+            # Breakdown keys vary per row; ship them as JSON text
+            arrays[name] = pa.array(
+                [orjson.dumps(v).decode() if v is not None else None for v in values],
+                type=pa.string(),
+            )
+        else:
+            arrays[name] = pa.array(values, type=pa.int64())
+    table = pa.table(arrays)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
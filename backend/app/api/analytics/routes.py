@@ -1,11 +1,11 @@
 """Analytics routes."""
 
 import logging
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from typing import Dict, List, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -15,22 +15,62 @@ from app.analytics.models import (
     HourlyMetrics,
     OrganizationMetrics,
 )
+from app.analytics.quantile_sketch import SKETCH_METRICS, SketchStore
+from app.analytics.read_models import get_version
+from app.analytics.revenue import GROUP_BY, can_view_revenue, revenue_query
+from app.analytics.series import (
+    ARROW_MEDIA_TYPE,
+    RESPONSE_FORMATS,
+    bucket_seconds,
+    load_series,
+    series_arrow,
+    series_json,
+    series_rows,
+)
+from app.core.cache import get_cached_stats
+from app.core.config import settings
 from app.core.database import get_session
-from app.core.security import get_current_user
+from app.core.security import get_current_user, require_roles
+from app.services.read_through_cache import ReadThroughCache, get_cache_stats
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+# Summary metrics change slowly; time series are refreshed by the ETL
+summary_cache = ReadThroughCache("analytics_summary", ttl=300, stale_ttl=120)
+series_cache = ReadThroughCache("analytics_series", ttl=120, stale_ttl=60)
+sketch_store = SketchStore()
+
+
+def _read_model_etag(kind: str, org_id, version: int) -> str:
+    return f'W/"{kind}-{org_id}-{version}"'
+
+
+def _not_modified(request: Request, etag: str) -> bool:
+    """Whether the client's If-None-Match already names ``etag``."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    return header.strip() == "*" or etag in (tag.strip() for tag in header.split(","))
+
+
+def _range_key(start: Optional[datetime], end: Optional[datetime]) -> str:
+    return f"{start.isoformat() if start else '-'}:{end.isoformat() if end else '-'}"
+
 
 @router.get("/metrics/geographic")
 async def get_geographic_metrics(
+    request: Request,
+    response: Response,
     session: AsyncSession = Depends(get_session),
     current_user: Dict = Depends(get_current_user),
 ) -> List[Dict]:
     """Get geographic metrics."""
-    try:
+    org_id = current_user["organization_id"]
+
+    async def load() -> List[Dict]:
         query = select(GeographicMetrics).where(
-            GeographicMetrics.organization_id == current_user["organization_id"]
+            GeographicMetrics.organization_id == org_id
         )
         result = await session.execute(query)
         metrics = result.scalars().all()
@@ -42,10 +82,22 @@ async def get_geographic_metrics(
                 "total_orders": metric.total_orders,
                 "total_patients": metric.total_patients,
                 "total_providers": metric.total_providers,
-                "metadata": metric.metadata,
+                "metadata": metric.event_metadata,
             }
             for metric in metrics
         ]
+
+    try:
+        # Read models are versioned on refresh, so a version names its content
+        version = await get_version(org_id)
+        etag = _read_model_etag("geographic", org_id, version)
+        if _not_modified(request, etag):
+            return Response(status_code=304, headers={"ETag": etag})
+        response.headers["ETag"] = etag
+        response.headers["Cache-Control"] = "private, no-cache"
+        return await summary_cache.get_or_load(
+            f"geographic:{org_id}:v{version}", load, tags=[f"org:{org_id}"]
+        )
     except Exception as e:
         logger.error("Failed to get geographic metrics: %s", str(e))
         raise
@@ -53,13 +105,17 @@ async def get_geographic_metrics(
 
 @router.get("/metrics/organization")
 async def get_organization_metrics(
+    request: Request,
+    response: Response,
     session: AsyncSession = Depends(get_session),
     current_user: Dict = Depends(get_current_user),
 ) -> Dict:
     """Get organization metrics."""
-    try:
+    org_id = current_user["organization_id"]
+
+    async def load() -> Dict:
         query = select(OrganizationMetrics).where(
-            OrganizationMetrics.organization_id == current_user["organization_id"]
+            OrganizationMetrics.organization_id == org_id
         )
         result = await session.execute(query)
         metric = result.scalar_one_or_none()
@@ -73,55 +129,101 @@ async def get_organization_metrics(
             "total_providers": metric.total_providers,
             "total_facilities": metric.total_facilities,
             "total_users": metric.total_users,
-            "metadata": metric.metadata,
+            "metadata": metric.event_metadata,
         }
+
+    try:
+        # Read models are versioned on refresh, so a version names its content
+        version = await get_version(org_id)
+        etag = _read_model_etag("organization", org_id, version)
+        if _not_modified(request, etag):
+            return Response(status_code=304, headers={"ETag": etag})
+        response.headers["ETag"] = etag
+        response.headers["Cache-Control"] = "private, no-cache"
+        return await summary_cache.get_or_load(
+            f"organization:{org_id}:v{version}", load, tags=[f"org:{org_id}"]
+        )
     except Exception as e:
         logger.error("Failed to get organization metrics: %s", str(e))
         raise
 
 
+async def _series_response(
+    session: AsyncSession,
+    model,
+    time_column: str,
+    native: str,
+    org_id,
+    start: Optional[datetime],
+    end: Optional[datetime],
+    resolution: Optional[str],
+    response_format: str,
+    use_rollups: bool = False,
+):
+    """Load (through the series cache) and encode a metrics time series."""
+    try:
+        bucket_seconds(resolution, native)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    async def load() -> Dict:
+        return await load_series(
+            session,
+            model,
+            time_column,
+            org_id,
+            start,
+            end,
+            resolution,
+            native,
+            use_rollups,
+        )
+
+    series = await series_cache.get_or_load(
+        f"{model.__tablename__}:{org_id}:{_range_key(start, end)}:"
+        f"{resolution or native}",
+        load,
+        tags=[f"org:{org_id}"],
+    )
+    if response_format == "arrow":
+        return Response(content=series_arrow(series), media_type=ARROW_MEDIA_TYPE)
+    if response_format == "columnar":
+        return Response(content=series_json(series), media_type="application/json")
+    return series_rows(series)
+
+
 @router.get("/metrics/daily")
 async def get_daily_metrics(
     start_date: datetime = Query(default=None),
     end_date: datetime = Query(default=None),
+    resolution: Optional[str] = Query(default=None),
+    response_format: str = Query(
+        default="json", alias="format", pattern=f"^({'|'.join(RESPONSE_FORMATS)})$"
+    ),
     session: AsyncSession = Depends(get_session),
     current_user: Dict = Depends(get_current_user),
 ) -> List[Dict]:
-    """Get daily metrics."""
+    """
+    Get daily metrics.
+
+    ``resolution`` (``7d``) buckets days server-side; ``format`` selects
+    row JSON (default), compact ``columnar`` JSON or an ``arrow`` IPC stream.
+    """
+    org_id = current_user["organization_id"]
     try:
-        query = select(DailyMetrics).where(
-            DailyMetrics.organization_id == current_user["organization_id"]
+        return await _series_response(
+            session,
+            DailyMetrics,
+            "date",
+            "1d",
+            org_id,
+            start_date,
+            end_date,
+            resolution,
+            response_format,
         )
-
-        if start_date:
-            query = query.where(DailyMetrics.date >= start_date)
-        if end_date:
-            query = query.where(DailyMetrics.date <= end_date)
-
-        result = await session.execute(query)
-        metrics = result.scalars().all()
-
-        return [
-            {
-                "date": metric.date,
-                "total_orders": metric.total_orders,
-                "total_patients": metric.total_patients,
-                "total_providers": metric.total_providers,
-                "total_facilities": metric.total_facilities,
-                "total_users": metric.total_users,
-                "active_users": metric.active_users,
-                "new_orders": metric.new_orders,
-                "completed_orders": metric.completed_orders,
-                "cancelled_orders": metric.cancelled_orders,
-                "new_patients": metric.new_patients,
-                "new_providers": metric.new_providers,
-                "provider_metrics": metric.provider_metrics,
-                "patient_metrics": metric.patient_metrics,
-                "order_metrics": metric.order_metrics,
-                "metadata": metric.metadata,
-            }
-            for metric in metrics
-        ]
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error("Failed to get daily metrics: %s", str(e))
         raise
@@ -131,44 +233,130 @@ async def get_daily_metrics(
 async def get_hourly_metrics(
     start_time: datetime = Query(default=None),
     end_time: datetime = Query(default=None),
+    resolution: Optional[str] = Query(default=None),
+    response_format: str = Query(
+        default="json", alias="format", pattern=f"^({'|'.join(RESPONSE_FORMATS)})$"
+    ),
     session: AsyncSession = Depends(get_session),
     current_user: Dict = Depends(get_current_user),
 ) -> List[Dict]:
-    """Get hourly metrics."""
+    """
+    Get hourly metrics.
+
+    ``resolution`` (``6h``, ``12h``, ``1d``, ``7d``) buckets hours
+    server-side; day and week resolutions are read from the rollup tiers,
+    which outlive raw hourly rows. ``format`` selects row JSON (default),
+    compact ``columnar`` JSON or an ``arrow`` IPC stream.
+    """
+    org_id = current_user["organization_id"]
     try:
-        query = select(HourlyMetrics).where(
-            HourlyMetrics.organization_id == current_user["organization_id"]
+        return await _series_response(
+            session,
+            HourlyMetrics,
+            "timestamp",
+            "1h",
+            org_id,
+            start_time,
+            end_time,
+            resolution,
+            response_format,
+            use_rollups=True,
         )
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error("Failed to get hourly metrics: %s", str(e))
+        raise
 
-        if start_time:
-            query = query.where(HourlyMetrics.timestamp >= start_time)
-        if end_time:
-            query = query.where(HourlyMetrics.timestamp <= end_time)
 
-        result = await session.execute(query)
-        metrics = result.scalars().all()
+@router.get("/metrics/percentiles")
+async def get_latency_percentiles(
+    metric: str = Query(default="call_duration"),
+    start_time: datetime = Query(default=None),
+    end_time: datetime = Query(default=None),
+    quantiles: List[float] = Query(default=[0.5, 0.95, 0.99]),
+    current_user: Dict = Depends(get_current_user),
+) -> Dict:
+    """
+    Get latency percentiles merged from hourly sketches.
 
-        return [
-            {
-                "timestamp": metric.timestamp,
-                "total_orders": metric.total_orders,
-                "total_patients": metric.total_patients,
-                "total_providers": metric.total_providers,
-                "total_facilities": metric.total_facilities,
-                "total_users": metric.total_users,
-                "active_users": metric.active_users,
-                "new_orders": metric.new_orders,
-                "completed_orders": metric.completed_orders,
-                "cancelled_orders": metric.cancelled_orders,
-                "new_patients": metric.new_patients,
-                "new_providers": metric.new_providers,
-                "provider_metrics": metric.provider_metrics,
-                "patient_metrics": metric.patient_metrics,
-                "order_metrics": metric.order_metrics,
-                "metadata": metric.metadata,
-            }
-            for metric in metrics
-        ]
+    Ranges longer than 31 days are rejected with a 400, since only that
+    many hours are merged.
+    """
+    if metric not in SKETCH_METRICS:
+        raise HTTPException(status_code=400, detail=f"Unknown metric: {metric}")
+    if any(q < 0 or q > 1 for q in quantiles):
+        raise HTTPException(status_code=400, detail="Quantiles must be in [0, 1]")
+
+    org_id = str(current_user["organization_id"])
+    end_time = end_time or datetime.utcnow()
+    start_time = start_time or end_time - timedelta(hours=24)
+
+    try:
+        sketch = await sketch_store.load(metric, org_id, start_time, end_time)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        logger.error("Failed to get hourly metrics: %s", str(e))
+        logger.error("Failed to get latency percentiles: %s", str(e))
         raise
+
+    return {
+        "metric": metric,
+        "start_time": start_time,
+        "end_time": end_time,
+        "count": sketch.count,
+        "mean": sketch.mean,
+        "relative_accuracy": sketch.relative_accuracy,
+        "percentiles": {f"p{q * 100:g}": sketch.quantile(q) for q in quantiles},
+    }
+
+
+@router.get("/metrics/revenue")
+async def get_revenue_metrics(
+    group_by: List[str] = Query(default=["day"]),
+    start_date: Optional[date] = Query(default=None),
+    end_date: Optional[date] = Query(default=None),
+    status: Optional[List[str]] = Query(default=None),
+    session: AsyncSession = Depends(get_session),
+    current_user: Dict = Depends(get_current_user),
+) -> Dict:
+    """
+    Get order count and revenue grouped by day, provider, state or status.
+
+    Aggregated in SQL from the write-time revenue summary, so no order is
+    decrypted. Requires the ``analytics:revenue`` permission.
+    """
+    if not current_user.get("is_superuser") and not can_view_revenue(
+        current_user.get("role"), current_user.get("permissions") or []
+    ):
+        raise HTTPException(status_code=403, detail="Operation not permitted")
+    if set(group_by) - set(GROUP_BY):
+        raise HTTPException(
+            status_code=400, detail=f"group_by must be one of {', '.join(GROUP_BY)}"
+        )
+
+    group_by = list(dict.fromkeys(group_by))
+    org_id = current_user["organization_id"]
+    try:
+        result = await session.execute(
+            revenue_query(org_id, group_by, start_date, end_date, status)
+        )
+    except Exception as e:
+        logger.error("Failed to get revenue metrics: %s", str(e))
+        raise
+
+    return {
+        "group_by": group_by,
+        "rows": [
+            {**row._asdict(), "revenue": float(row.revenue or 0)}
+            for row in result.all()
+        ],
+    }
+
+
+@router.get("/metrics/cache-stats")
+async def get_metrics_cache_stats(
+    current_user: Dict = Depends(require_roles([settings.ROLE_ADMIN])),
+) -> Dict:
+    """Get hit ratios of the read-through and service-layer caches."""
+    return {**get_cache_stats(), "service": get_cached_stats()}
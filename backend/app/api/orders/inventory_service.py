@@ -1,12 +1,18 @@
 from datetime import datetime
 from typing import List, Optional, Dict, Tuple
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from sqlalchemy import and_, or_, select
 
 from app.core.security import verify_territory_access
-from app.core.exceptions import InventoryException, AccessDeniedException
+from app.core.exceptions import (
+    InventoryException,
+    AccessDeniedException,
+    ValidationError,
+)
 from app.core.audit import audit_inventory_change
-from .models import Product, ProductInventory, ProductPricing, ProductCompliance
+from app.models.product import ProductInventory, ProductInventoryShard
+from app.services.inventory_shards import ShardedInventory, stock_totals
+from .models import Product, ProductPricing, ProductCompliance
 
 
 class InventoryService:
@@ -17,25 +23,18 @@ class InventoryService:
         self, product_id: str, territory_id: str, quantity: int = 1
     ) -> Tuple[bool, str]:
         """Check if a product is available in the specified territory."""
-        inventory = (
-            self.db.query(ProductInventory)
-            .filter(
-                and_(
-                    ProductInventory.product_id == product_id,
-                    ProductInventory.territory_id == territory_id,
-                )
+        # product_inventory is only a compaction snapshot; sum the shards
+        stock = self.db.execute(
+            stock_totals(territory_id).where(
+                ProductInventoryShard.product_id == product_id
             )
-            .first()
-        )
+        ).first()
 
-        if not inventory:
+        if not stock:
             return False, "Product not available in this territory"
 
-        if inventory.available_quantity < quantity:
-            return (
-                False,
-                f"Insufficient stock. Available: {inventory.available_quantity}",
-            )
+        if stock.available < quantity:
+            return False, f"Insufficient stock. Available: {stock.available}"
 
         # Check compliance
         compliance = (
@@ -53,123 +52,101 @@ class InventoryService:
         self, product_id: str, territory_id: str, quantity: int, order_id: str
     ) -> bool:
         """Reserve product inventory for an order."""
-        inventory = (
-            self.db.query(ProductInventory)
-            .filter(
-                and_(
-                    ProductInventory.product_id == product_id,
-                    ProductInventory.territory_id == territory_id,
-                )
-            )
-            .with_for_update()
-            .first()
-        )
-
-        if not inventory or inventory.available_quantity < quantity:
-            raise InventoryException("Insufficient inventory")
-
         try:
-            inventory.reserved_quantity += quantity
+            ShardedInventory(self.db).reserve(territory_id, {product_id: quantity})
             self.db.commit()
-
-            await audit_inventory_change(
-                self.db, "reserve", product_id, quantity, order_id
-            )
-            return True
+        except ValidationError:
+            self.db.rollback()
+            raise InventoryException("Insufficient inventory")
         except Exception as e:
             self.db.rollback()
             raise InventoryException(f"Failed to reserve inventory: {str(e)}")
 
+        await audit_inventory_change(self.db, "reserve", product_id, quantity, order_id)
+        return True
+
     async def release_inventory(
         self, product_id: str, territory_id: str, quantity: int, order_id: str
     ) -> bool:
         """Release reserved inventory back to available stock."""
-        inventory = (
-            self.db.query(ProductInventory)
-            .filter(
-                and_(
-                    ProductInventory.product_id == product_id,
-                    ProductInventory.territory_id == territory_id,
-                )
-            )
-            .with_for_update()
-            .first()
-        )
-
-        if not inventory or inventory.reserved_quantity < quantity:
-            raise InventoryException("Invalid release quantity")
-
         try:
-            inventory.reserved_quantity -= quantity
+            ShardedInventory(self.db).release(territory_id, {product_id: quantity})
             self.db.commit()
-
-            await audit_inventory_change(
-                self.db, "release", product_id, quantity, order_id
-            )
-            return True
+        except ValidationError:
+            self.db.rollback()
+            raise InventoryException("Invalid release quantity")
         except Exception as e:
             self.db.rollback()
             raise InventoryException(f"Failed to release inventory: {str(e)}")
 
+        await audit_inventory_change(self.db, "release", product_id, quantity, order_id)
+        return True
+
     async def update_stock_level(
         self, product_id: str, territory_id: str, quantity: int, operation: str
     ) -> ProductInventory:
         """Update product stock levels."""
-        inventory = (
-            self.db.query(ProductInventory)
-            .filter(
-                and_(
-                    ProductInventory.product_id == product_id,
-                    ProductInventory.territory_id == territory_id,
-                )
-            )
-            .with_for_update()
-            .first()
-        )
-
-        if not inventory:
-            raise InventoryException("Inventory record not found")
-
+        inventory = ShardedInventory(self.db)
         try:
             if operation == "add":
-                inventory.quantity += quantity
-                inventory.last_restock_date = datetime.utcnow()
+                inventory.add_stock(product_id, territory_id, quantity)
             elif operation == "remove":
-                if inventory.available_quantity < quantity:
-                    raise InventoryException("Insufficient available quantity")
-                inventory.quantity -= quantity
+                inventory.remove_stock(product_id, territory_id, quantity)
             else:
                 raise InventoryException("Invalid operation")
-
+            inventory.compact_products([product_id])
             self.db.commit()
-
-            await audit_inventory_change(self.db, operation, product_id, quantity)
-            return inventory
+        except ValidationError:
+            self.db.rollback()
+            raise InventoryException("Insufficient available quantity")
+        except InventoryException:
+            self.db.rollback()
+            raise
         except Exception as e:
             self.db.rollback()
             raise InventoryException(f"Failed to update stock level: {str(e)}")
 
-    async def check_reorder_points(self) -> List[Dict]:
-        """Check all products against their reorder points."""
-        alerts = []
-        inventories = (
+        await audit_inventory_change(self.db, operation, product_id, quantity)
+        return (
             self.db.query(ProductInventory)
-            .filter(ProductInventory.quantity <= ProductInventory.reorder_point)
-            .all()
+            .filter(
+                and_(
+                    ProductInventory.product_id == product_id,
+                    ProductInventory.territory_id == territory_id,
+                )
+            )
+            .first()
         )
 
-        for inventory in inventories:
-            alerts.append(
-                {
-                    "product_id": inventory.product_id,
-                    "territory_id": inventory.territory_id,
-                    "current_quantity": inventory.quantity,
-                    "reorder_point": inventory.reorder_point,
-                    "reorder_quantity": inventory.reorder_quantity,
-                }
+    async def check_reorder_points(self) -> List[Dict]:
+        """Check all products against their reorder points."""
+        stock = stock_totals().subquery("stock")
+        rows = self.db.execute(
+            select(
+                ProductInventory.product_id,
+                ProductInventory.territory_id,
+                stock.c.quantity,
+                ProductInventory.reorder_point,
             )
-
-        return alerts
+            .join(
+                stock,
+                and_(
+                    stock.c.product_id == ProductInventory.product_id,
+                    stock.c.territory_id == ProductInventory.territory_id,
+                ),
+            )
+            .where(stock.c.quantity <= ProductInventory.reorder_point)
+        ).all()
+
+        return [
+            {
+                "product_id": row.product_id,
+                "territory_id": row.territory_id,
+                "current_quantity": row.quantity,
+                "reorder_point": row.reorder_point,
+            }
+            for row in rows
+        ]
 
     async def get_territory_pricing(self, product_id: str, territory_id: str) -> float:
         """Get territory-specific pricing for a product."""
@@ -227,13 +204,9 @@ class InventoryService:
             )
 
         if in_stock_only:
+            stock = stock_totals(territory_id).subquery("stock")
             base_query = base_query.filter(
-                Product.inventory.any(
-                    and_(
-                        ProductInventory.territory_id == territory_id,
-                        ProductInventory.available_quantity > 0,
-                    )
-                )
+                Product.id.in_(select(stock.c.product_id).where(stock.c.available > 0))
             )
 
         return base_query.all()
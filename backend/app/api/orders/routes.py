@@ -7,6 +7,7 @@ from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 from uuid import UUID
 
+from app.core.cache import invalidates
 from app.core.database import get_db
 from app.core.security import get_current_user, verify_territory_access
 from app.core.audit import audit_product_change
@@ -113,6 +114,7 @@ async def create_product(
 
 
 @router.put("/products/{product_id}", response_model=ProductResponse)
+@invalidates("product_price", key=("product_id",), tenant_arg=None)
 async def update_product(
     product_id: str,
     product: ProductUpdate,
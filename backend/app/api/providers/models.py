@@ -46,6 +46,7 @@ class ProviderInDB(ProviderBase):
     """Provider database model."""
 
     id: UUID
+    organization_id: UUID
     created_at: datetime
     updated_at: datetime
     created_by_id: UUID
@@ -4,13 +4,26 @@ Order management endpoints.
 
 from typing import List, Optional
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
 from app.core.security import get_current_user
-from app.schemas.orders import OrderCreate, OrderUpdate, OrderResponse
+from app.schemas.orders import (
+    OrderCreate,
+    OrderUpdate,
+    OrderResponse,
+    OrderTimelineResponse,
+)
+from app.schemas.token import TokenData
 from app.models.order import Order
+from app.services.order_timeline import (
+    EVENT_TYPES,
+    get_timeline,
+    serialize_timeline,
+    timeline_etag,
+)
 
 router = APIRouter()
 
@@ -53,6 +66,34 @@ async def get_order(
     return order
 
 
+@router.get("/{order_id}/timeline", response_model=OrderTimelineResponse)
+async def get_order_timeline(
+    order_id: UUID,
+    request: Request,
+    response: Response,
+    types: Optional[List[str]] = Query(None, description=f"Any of {EVENT_TYPES}"),
+    db: AsyncSession = Depends(get_db),
+    current_user: TokenData = Depends(get_current_user),
+):
+    """Get an order's status, shipment and tracking timeline.
+
+    Clients poll with If-None-Match and get 304 until the version changes.
+    """
+    timeline = await get_timeline(db, order_id, current_user.organization_id)
+    if timeline is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Order not found"
+        )
+    etag = timeline_etag(order_id, timeline.version)
+    if request.headers.get("if-none-match") == etag:
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag}
+        )
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "private, no-cache"
+    return serialize_timeline(timeline, types)
+
+
 @router.put("/{order_id}", response_model=OrderResponse)
 async def update_order(
     order_id: UUID,
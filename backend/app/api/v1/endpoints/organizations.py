@@ -7,6 +7,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
+from app.core.cache import cached, invalidates
 from app.core.database import get_db
 from app.core.security import get_current_user
 from app.models.organization import Organization
@@ -22,10 +23,37 @@ from app.core.audit import AuditLogger
 router = APIRouter()
 audit_logger = AuditLogger()
 
+ORGANIZATION_CACHE_TTL = 600
+
+
+@cached(
+    "organization",
+    ttl=ORGANIZATION_CACHE_TTL,
+    key=("org_id",),
+    tenant_arg=None,
+    schema=OrganizationResponse,
+)
+async def _fetch_organization(db: Session, org_id: UUID) -> OrganizationResponse:
+    """Load an organization by ID through the service cache."""
+    return db.query(Organization).filter(Organization.id == org_id).first()
+
+
+@cached(
+    "organization",
+    ttl=ORGANIZATION_CACHE_TTL,
+    key=(),
+    tenant_arg=None,
+    schema=OrganizationResponse,
+)
+async def _fetch_all_organizations(db: Session) -> List[OrganizationResponse]:
+    """Load every organization through the service cache."""
+    return db.query(Organization).all()
+
 
 @router.post(
     "/", response_model=OrganizationResponse, status_code=status.HTTP_201_CREATED
 )
+@invalidates("organization", tenant_arg=None)
 async def create_organization(
     org: OrganizationCreate,
     db: Session = Depends(get_db),
@@ -119,7 +147,7 @@ async def get_organization(
             detail="Not authorized to view this organization",
         )
 
-    org = db.query(Organization).filter(Organization.id == org_id).first()
+    org = await _fetch_organization(db, org_id)
     if not org:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Organization not found"
@@ -144,17 +172,14 @@ async def list_organizations(
     """
     # Check if user can view all organizations
     if current_user.role.permissions.get("view_all_organizations"):
-        return db.query(Organization).all()
+        return await _fetch_all_organizations(db)
 
     # Otherwise, return only user's organization
-    return [
-        db.query(Organization)
-        .filter(Organization.id == current_user.organization_id)
-        .first()
-    ]
+    return [await _fetch_organization(db, current_user.organization_id)]
 
 
 @router.put("/{org_id}", response_model=OrganizationResponse)
+@invalidates("organization", tenant_arg=None)
 async def update_organization(
     org_id: UUID,
     org_update: OrganizationUpdate,
@@ -1,6 +1,6 @@
 """Patient endpoints for the API."""
 
-from typing import Optional
+from typing import List, Optional
 from fastapi import (
     APIRouter,
     Depends,
@@ -18,15 +18,22 @@ import logging
 
 from app.core.database import get_db
 from app.core.security import get_current_user
-from app.models.patient import Patient, PatientDocument
+from app.models.patient import Patient, PatientDocument, PatientDuplicateCandidate
 from app.schemas.patient import (
     Patient as PatientSchema,
     PatientUpdate,
     PatientSearchResults,
     PatientDocument as PatientDocumentSchema,
     PatientRegistration,
+    PatientDuplicate as PatientDuplicateSchema,
+    PatientDuplicateResolution,
 )
 from app.schemas.token import TokenData
+from app.services.patient_index import (
+    patient_search_indexes,
+    text_search_filter,
+    text_search_rank,
+)
 
 # Set up logger
 logger = logging.getLogger(__name__)
@@ -51,18 +58,20 @@ async def search_patients(
             Patient.organization_id == current_user.organization_id
         )
 
-        # Apply search filter if query provided
-        if query:
-            query_filter = query_filter.where(Patient.status == "active")
-
         # Get total count
         count_query = (
             select(func.count())
             .select_from(Patient)
             .where(Patient.organization_id == current_user.organization_id)
         )
+
+        # Apply full-text search over non-PHI fields, best matches first
         if query:
-            count_query = count_query.where(Patient.status == "active")
+            matches = (Patient.status == "active", text_search_filter(query))
+            query_filter = query_filter.where(*matches).order_by(
+                text_search_rank(query).desc(), Patient.id
+            )
+            count_query = count_query.where(*matches)
 
         total = await db.scalar(count_query)
 
@@ -94,6 +103,7 @@ async def register_patient(
         # Create patient instance with organization
         db_patient = Patient(
             **patient_data.dict(),
+            **patient_search_indexes(**patient_data.dict()),
             status="active",
             organization_id=current_user.organization_id,
             created_by_id=current_user.id,
@@ -112,6 +122,59 @@ async def register_patient(
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 
+@router.get("/duplicates", response_model=List[PatientDuplicateSchema])
+async def list_duplicate_patients(
+    candidate_status: str = Query("pending", alias="status"),
+    min_score: float = Query(0.0, ge=0, le=1),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=500),
+    db: AsyncSession = Depends(get_db),
+    current_user: TokenData = Depends(get_current_user),
+) -> List[PatientDuplicateSchema]:
+    """List likely duplicate patients found by the dedup engine."""
+    result = await db.execute(
+        select(PatientDuplicateCandidate)
+        .where(
+            PatientDuplicateCandidate.organization_id == current_user.organization_id,
+            PatientDuplicateCandidate.status == candidate_status,
+            PatientDuplicateCandidate.score >= min_score,
+        )
+        .order_by(PatientDuplicateCandidate.score.desc())
+        .offset(skip)
+        .limit(limit)
+    )
+    return [PatientDuplicateSchema.from_orm(c) for c in result.scalars().all()]
+
+
+@router.put("/duplicates/{candidate_id}", response_model=PatientDuplicateSchema)
+async def resolve_duplicate_patient(
+    candidate_id: UUID,
+    resolution: PatientDuplicateResolution,
+    db: AsyncSession = Depends(get_db),
+    current_user: TokenData = Depends(get_current_user),
+) -> PatientDuplicateSchema:
+    """Confirm or dismiss a likely duplicate pair."""
+    candidate = await db.get(PatientDuplicateCandidate, candidate_id)
+    if not candidate:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Duplicate pair not found"
+        )
+
+    # Check organization access
+    if candidate.organization_id != current_user.organization_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to resolve this duplicate pair",
+        )
+
+    candidate.status = resolution.status
+    candidate.resolved_by_id = current_user.id
+    await db.commit()
+    await db.refresh(candidate)
+
+    return PatientDuplicateSchema.from_orm(candidate)
+
+
 @router.get("/{patient_id}", response_model=PatientSchema)
 async def get_patient(
     patient_id: UUID,
@@ -161,6 +224,8 @@ async def update_patient(
     patient_data = patient_in.dict(exclude_unset=True)
     for field, value in patient_data.items():
         setattr(patient, field, value)
+    for field, value in patient_search_indexes(**patient_data).items():
+        setattr(patient, field, value)
 
     patient.updated_by_id = current_user.id
     await db.commit()
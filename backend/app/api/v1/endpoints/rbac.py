@@ -7,6 +7,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
+from app.core.cache import cached, invalidates
 from app.core.database import get_db
 from app.core.security import get_current_user
 from app.models.rbac import Role, Permission
@@ -25,6 +26,32 @@ from app.core.audit import AuditLogger
 router = APIRouter()
 audit_logger = AuditLogger()
 
+PERMISSION_CACHE_TTL = 900
+
+
+@cached(
+    "permission",
+    ttl=PERMISSION_CACHE_TTL,
+    key=("permission_id",),
+    tenant_arg=None,
+    schema=PermissionResponse,
+)
+async def _fetch_permission(db: Session, permission_id: UUID) -> PermissionResponse:
+    """Load a permission by ID through the service cache."""
+    return db.query(Permission).filter(Permission.id == permission_id).first()
+
+
+@cached(
+    "permission",
+    ttl=PERMISSION_CACHE_TTL,
+    key=(),
+    tenant_arg=None,
+    schema=PermissionResponse,
+)
+async def _fetch_all_permissions(db: Session) -> List[PermissionResponse]:
+    """Load every permission through the service cache."""
+    return db.query(Permission).all()
+
 
 @router.post(
     "/roles/", response_model=RoleResponse, status_code=status.HTTP_201_CREATED
@@ -280,6 +307,7 @@ async def update_role(
     response_model=PermissionResponse,
     status_code=status.HTTP_201_CREATED,
 )
+@invalidates("permission", tenant_arg=None)
 async def create_permission(
     permission: PermissionCreate,
     db: Session = Depends(get_db),
@@ -375,7 +403,7 @@ async def get_permission(
             detail="Not authorized to view permissions",
         )
 
-    permission = db.query(Permission).filter(Permission.id == permission_id).first()
+    permission = await _fetch_permission(db, permission_id)
     if not permission:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Permission not found"
@@ -408,10 +436,11 @@ async def list_permissions(
             detail="Not authorized to view permissions",
         )
 
-    return db.query(Permission).all()
+    return await _fetch_all_permissions(db)
 
 
 @router.put("/permissions/{permission_id}", response_model=PermissionResponse)
+@invalidates("permission", tenant_arg=None)
 async def update_permission(
     permission_id: UUID,
     permission_update: PermissionUpdate,
@@ -0,0 +1,230 @@
+"""
+Declarative caching for service-layer reads.
+
+``@cached`` stores the result of an async read in Redis under a key derived
+from its arguments, scoped per tenant. ``@invalidates`` marks the write
+methods that change that data so the matching entries are dropped as soon
+as the write succeeds.
+"""
+
+import functools
+import hashlib
+import inspect
+import logging
+from typing import Any, Callable, Dict, Optional, Sequence, Type
+
+import orjson
+from pydantic import BaseModel
+
+from app.services.redis_cache import RedisCache
+
+logger = logging.getLogger(__name__)
+
+# Arguments that never take part in a cache key
+_IGNORED_ARGS = {"self", "cls", "db", "session", "current_user"}
+
+# Per-function hit/miss counters, keyed by "<namespace>"
+_stats: Dict[str, Dict[str, int]] = {}
+
+_cache: Optional[RedisCache] = None
+
+
+def _redis() -> RedisCache:
+    global _cache
+    if _cache is None:
+        _cache = RedisCache()
+    return _cache
+
+
+def _bound_arguments(func: Callable, args: tuple, kwargs: dict) -> Dict[str, Any]:
+    bound = inspect.signature(func).bind(*args, **kwargs)
+    bound.apply_defaults()
+    return dict(bound.arguments)
+
+
+def _resolve_tenant(arguments: Dict[str, Any], tenant_arg: Optional[str]) -> str:
+    """
+    Find the tenant a call belongs to.
+
+    Uses ``tenant_arg`` when given, otherwise an ``organization_id`` argument
+    or the ``current_user`` held by the service instance.
+    """
+    if tenant_arg is None:
+        return "global"
+    if arguments.get(tenant_arg) is not None:
+        return str(arguments[tenant_arg])
+    service = arguments.get("self")
+    current_user = getattr(service, "current_user", None) or arguments.get(
+        "current_user"
+    )
+    if isinstance(current_user, dict):
+        tenant = current_user.get(tenant_arg)
+    else:
+        tenant = getattr(current_user, tenant_arg, None)
+    return str(tenant) if tenant is not None else "global"
+
+
+def _key_part(arguments: Dict[str, Any], key: Optional[Sequence[str]]) -> str:
+    names = key if key is not None else sorted(set(arguments) - _IGNORED_ARGS)
+    values = [f"{name}={arguments.get(name)}" for name in names]
+    raw = "|".join(values)
+    # Keep keys short and free of user-controlled separators
+    if len(raw) > 120 or ":" in raw:
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+    return raw or "all"
+
+
+def cache_key(namespace: str, tenant: str, key_part: str) -> str:
+    """Build the Redis key of a cached service read."""
+    return f"svc:{namespace}:{tenant}:{key_part}"
+
+
+def _encode(value: Any, schema: Optional[Type[BaseModel]]) -> bytes:
+    if schema is not None and value is not None:
+        if isinstance(value, list):
+            value = [schema.model_validate(v).model_dump(mode="json") for v in value]
+        else:
+            value = schema.model_validate(value).model_dump(mode="json")
+    return orjson.dumps({"value": value})
+
+
+def _decode(raw: Any, schema: Optional[Type[BaseModel]]) -> Any:
+    value = orjson.loads(raw)["value"]
+    if schema is not None and value is not None:
+        if isinstance(value, list):
+            return [schema.model_validate(v) for v in value]
+        return schema.model_validate(value)
+    return value
+
+
+def cached(
+    namespace: str,
+    ttl: int = 300,
+    key: Optional[Sequence[str]] = None,
+    tenant_arg: Optional[str] = "organization_id",
+    schema: Optional[Type[BaseModel]] = None,
+    cache_none: bool = False,
+) -> Callable:
+    """
+    Cache the result of an async service read in Redis.
+
+    Args:
+        namespace: Cache namespace shared with the matching ``@invalidates``
+        ttl: Time to live in seconds
+        key: Argument names forming the key; all arguments except the
+            session and current user when omitted
+        tenant_arg: Argument (or current_user attribute) identifying the
+            tenant; None for data shared across tenants
+        schema: Pydantic model used to serialize ORM results; the wrapped
+            function then always returns instances of this model
+        cache_none: Also cache ``None`` results (negative caching)
+    """
+
+    def decorator(func: Callable) -> Callable:
+        stats = _stats.setdefault(namespace, {"hits": 0, "misses": 0, "errors": 0})
+
+        @functools.wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            arguments = _bound_arguments(func, args, kwargs)
+            tenant = _resolve_tenant(arguments, tenant_arg)
+            redis_key = cache_key(namespace, tenant, _key_part(arguments, key))
+
+            try:
+                raw = await _redis().redis.get(redis_key)
+            except Exception as e:
+                logger.warning(f"Cache read failed for {redis_key}: {str(e)}")
+                stats["errors"] += 1
+                raw = None
+
+            if raw is not None:
+                stats["hits"] += 1
+                return _decode(raw, schema)
+
+            stats["misses"] += 1
+            result = await func(*args, **kwargs)
+            if result is None and not cache_none:
+                return result
+
+            encoded = _encode(result, schema)
+            try:
+                await _redis().set_tagged(
+                    redis_key,
+                    encoded.decode("utf-8"),
+                    [f"svc:{namespace}", f"svc:{namespace}:{tenant}"],
+                    ttl=ttl,
+                )
+            except Exception as e:
+                logger.warning(f"Cache write failed for {redis_key}: {str(e)}")
+                stats["errors"] += 1
+            # Misses return the same type as hits so callers see one shape
+            return _decode(encoded, schema) if schema is not None else result
+
+        wrapper.cache_namespace = namespace
+        return wrapper
+
+    return decorator
+
+
+async def invalidate(
+    namespace: str, tenant: Optional[str] = None, key_part: Optional[str] = None
+) -> None:
+    """
+    Drop cached entries of ``namespace``.
+
+    With ``key_part`` a single entry is removed, with only ``tenant`` every
+    entry of that tenant, and with neither the whole namespace.
+    """
+    if key_part is not None:
+        await _redis().delete(cache_key(namespace, tenant or "global", key_part))
+    elif tenant is not None:
+        await _redis().invalidate_tags(f"svc:{namespace}:{tenant}")
+    else:
+        await _redis().invalidate_tags(f"svc:{namespace}")
+
+
+def invalidates(
+    namespace: str,
+    key: Optional[Sequence[str]] = None,
+    tenant_arg: Optional[str] = "organization_id",
+) -> Callable:
+    """
+    Invalidate cached reads of ``namespace`` after a successful write.
+
+    Args:
+        namespace: Namespace used by the ``@cached`` read
+        key: Argument names identifying the single entry the write changes;
+            when omitted every entry of the tenant is dropped (creates and
+            bulk writes change list results)
+        tenant_arg: Same tenant resolution as the ``@cached`` read
+    """
+
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            result = await func(*args, **kwargs)
+            arguments = _bound_arguments(func, args, kwargs)
+            tenant = _resolve_tenant(arguments, tenant_arg)
+            try:
+                if key is not None:
+                    await invalidate(namespace, tenant, _key_part(arguments, key))
+                else:
+                    await invalidate(namespace, tenant)
+            except Exception as e:
+                logger.warning(f"Cache invalidation failed for {namespace}: {str(e)}")
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+def get_cached_stats() -> Dict[str, Dict[str, Any]]:
+    """Return hit/miss counters and hit ratio per cached namespace."""
+    report = {}
+    for namespace, stats in _stats.items():
+        total = stats["hits"] + stats["misses"]
+        report[namespace] = {
+            **stats,
+            "hit_ratio": round(stats["hits"] / total, 4) if total else 0.0,
+        }
+    return report
@@ -5,7 +5,7 @@ Application configuration.
 import base64
 import os
 from functools import lru_cache
-from typing import Dict, List
+from typing import Dict, List, Optional
 from pydantic import Field, ConfigDict
 from pydantic_settings import BaseSettings
 
@@ -27,12 +27,54 @@ class Settings(BaseSettings):
     ENCRYPTION_KEY: str = Field(
         base64.urlsafe_b64encode(os.urandom(32)).decode(), env="ENCRYPTION_KEY"
     )
+    # HMAC key for searchable blind indexes of encrypted PHI. No default: a
+    # per-process key would write digests no other process can match
+    BLIND_INDEX_KEY: Optional[str] = Field(None, env="BLIND_INDEX_KEY")
 
     # Database
     DATABASE_URL: str = Field(
         "postgresql://postgres:password@db:5432/healthcare_ivr", env="DATABASE_URL"
     )
 
+    # Redis (shared asyncio connection pool, see app.services.redis_cache)
+    REDIS_HOST: str = Field("localhost", env="REDIS_HOST")
+    REDIS_PORT: int = Field(6379, env="REDIS_PORT")
+    REDIS_PASSWORD: Optional[str] = Field(None, env="REDIS_PASSWORD")
+    REDIS_MAX_CONNECTIONS: int = Field(50, env="REDIS_MAX_CONNECTIONS")
+
+    # Cold storage for archived audit partitions (s3://bucket/prefix or a
+    # local directory in development)
+    AUDIT_ARCHIVE_URI: str = Field("./audit_archive", env="AUDIT_ARCHIVE_URI")
+    # Audit partitions older than this are moved to cold storage; the archive
+    # keeps them for the rest of the PHI retention period
+    AUDIT_HOT_RETENTION_DAYS: int = Field(365, env="AUDIT_HOT_RETENTION_DAYS")
+
+    # Seconds between drains of the analytics read-model refresh queue
+    ANALYTICS_REFRESH_INTERVAL: int = Field(30, env="ANALYTICS_REFRESH_INTERVAL")
+
+    # Raw hourly metrics and their daily rollups are kept this long; weekly
+    # rollups are kept indefinitely
+    HOURLY_METRICS_RETENTION_DAYS: int = Field(90, env="HOURLY_METRICS_RETENTION_DAYS")
+    DAILY_ROLLUP_RETENTION_DAYS: int = Field(730, env="DAILY_ROLLUP_RETENTION_DAYS")
+
+    # Pairs scoring at least this are surfaced as likely duplicate patients
+    PATIENT_DEDUP_THRESHOLD: float = Field(0.85, env="PATIENT_DEDUP_THRESHOLD")
+    PATIENT_DEDUP_BATCH_SIZE: int = Field(1000, env="PATIENT_DEDUP_BATCH_SIZE")
+    # Names shared by more patients of an organization block only with a
+    # matching date of birth or phone
+    PATIENT_DEDUP_MAX_BLOCK_SIZE: int = Field(50, env="PATIENT_DEDUP_MAX_BLOCK_SIZE")
+
+    # Counter rows each product's territory stock is spread over
+    INVENTORY_SHARDS: int = Field(8, env="INVENTORY_SHARDS")
+
+    # Stored responses of Idempotency-Key requests, and how long one may run
+    IDEMPOTENCY_TTL_SECONDS: int = Field(86400, env="IDEMPOTENCY_TTL_SECONDS")
+    IDEMPOTENCY_LOCK_SECONDS: int = Field(60, env="IDEMPOTENCY_LOCK_SECONDS")
+
+    # Revenue analytics leave out groups of fewer orders than this; raise it
+    # so a group cannot reveal the total of a single order
+    REVENUE_MIN_GROUP_SIZE: int = Field(1, env="REVENUE_MIN_GROUP_SIZE")
+
     # Authentication
     AUTH_MODE: str = Field("local", env="AUTH_MODE")  # local or cognito
     USE_COGNITO: bool = Field(False, env="USE_COGNITO")
@@ -7,6 +7,8 @@ from typing import Dict, Optional
 from datetime import datetime, timedelta
 from fastapi import HTTPException
 import base64
+import hashlib
+import hmac
 import os
 import boto3
 from botocore.exceptions import ClientError
@@ -273,3 +275,31 @@ def decrypt_field(encrypted_value: str) -> str:
         return decrypted
     except Exception as e:
         raise EncryptionError(f"Failed to decrypt field: {str(e)}")
+
+
+def normalize_search_value(value: str) -> str:
+    """Normalize a value for blind indexing (case and whitespace folded)."""
+    return " ".join(str(value).casefold().split())
+
+
+def blind_index_key() -> bytes:
+    """The configured blind-index key; fails when BLIND_INDEX_KEY is unset."""
+    if not settings.BLIND_INDEX_KEY:
+        raise EncryptionError("BLIND_INDEX_KEY is not configured")
+    return settings.BLIND_INDEX_KEY.encode()
+
+
+def blind_index(field: str, value: Optional[str]) -> Optional[str]:
+    """
+    Keyed HMAC-SHA256 digest of a PHI value for equality search.
+
+    ``field`` separates domains, so the same value indexed under two fields
+    yields unrelated digests.
+    """
+    if value is None:
+        return None
+    normalized = normalize_search_value(value)
+    if not normalized:
+        return None
+    message = f"{field}:{normalized}".encode()
+    return hmac.new(blind_index_key(), message, hashlib.sha256).hexdigest()
@@ -0,0 +1,265 @@
+"""
+Idempotency keys for non-idempotent creation endpoints.
+
+A client that sends an ``Idempotency-Key`` header on a guarded POST gets at
+most one execution of the request per key: the first request claims the
+key in Redis, and its response is stored for ``IDEMPOTENCY_TTL_SECONDS``
+and replayed to every retry. Duplicates that arrive while it is still
+running wait for its response instead of running the endpoint again.
+Reusing a key with a different request body is rejected.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.services.redis_cache import RedisCache
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENCY_HEADER = b"idempotency-key"
+REPLAY_HEADER = b"idempotent-replayed"
+# POST endpoints whose retries must not create duplicates
+IDEMPOTENT_PATHS = ("/api/v1/orders", "/api/v1/ivr/requests")
+MAX_KEY_LENGTH = 255
+# Poll interval bounds while waiting on another worker's request, in seconds
+POLL_MIN_INTERVAL = 0.02
+POLL_MAX_INTERVAL = 0.25
+
+
+def fingerprint(method: str, path: str, query: bytes, body: bytes) -> str:
+    """Digest of everything that makes two requests the same request."""
+    digest = hashlib.sha256()
+    for part in (method.encode(), path.encode(), query, body):
+        digest.update(len(part).to_bytes(8, "big"))
+        digest.update(part)
+    return digest.hexdigest()
+
+
+def _header(scope: Scope, name: bytes) -> Optional[bytes]:
+    for key, value in scope.get("headers", []):
+        if key == name:
+            return value
+    return None
+
+
+class IdempotencyMiddleware:
+    """
+    Stores and replays responses of POSTs carrying an ``Idempotency-Key``.
+
+    Keys are scoped to the caller's credentials and path. Only responses
+    below 500 are stored; after a server error or a crash (the claim
+    expires after ``lock_ttl`` seconds) a retry runs the request again.
+    If Redis is unavailable requests run unguarded.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        paths: Iterable[str] = IDEMPOTENT_PATHS,
+        ttl: int = settings.IDEMPOTENCY_TTL_SECONDS,
+        lock_ttl: int = settings.IDEMPOTENCY_LOCK_SECONDS,
+        redis_cache: Optional[RedisCache] = None,
+    ):
+        self.app = app
+        self.paths = {path.rstrip("/") for path in paths}
+        self.ttl = ttl
+        self.lock_ttl = lock_ttl
+        self._redis = redis_cache
+        # Duplicates within this worker wait on the first request's future
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    @property
+    def redis(self) -> RedisCache:
+        if self._redis is None:
+            self._redis = RedisCache()
+        return self._redis
+
+    def _guarded(self, scope: Scope) -> Optional[str]:
+        """Return the idempotency key of a guarded request, if any."""
+        if scope["type"] != "http" or scope["method"] != "POST":
+            return None
+        if scope["path"].rstrip("/") not in self.paths:
+            return None
+        key = _header(scope, IDEMPOTENCY_HEADER)
+        if not key:
+            return None
+        return key.decode("latin-1").strip()[:MAX_KEY_LENGTH] or None
+
+    def _storage_key(self, scope: Scope, key: str) -> str:
+        caller = hashlib.sha256(_header(scope, b"authorization") or b"").hexdigest()
+        # The exact path, so a trailing-slash redirect never shares a key
+        return f"idem:{caller[:32]}:{scope['path']}:{key}"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        key = self._guarded(scope)
+        if key is None:
+            await self.app(scope, receive, send)
+            return
+
+        body = await _read_body(receive)
+        request = fingerprint(
+            scope["method"], scope["path"], scope.get("query_string", b""), body
+        )
+        storage_key = self._storage_key(scope, key)
+        replay_receive = _replaying(body, receive)
+
+        inflight = self._inflight.get(storage_key)
+        if inflight is not None:
+            record = await asyncio.shield(inflight)
+            if record is not None:
+                await self._reply(record, request, send)
+                return
+
+        deadline = time.monotonic() + self.lock_ttl
+        interval = POLL_MIN_INTERVAL
+        while True:
+            try:
+                claimed, record = await self._claim(storage_key, request)
+            except Exception as e:
+                logger.warning(f"Idempotency store unavailable, running once: {e}")
+                await self.app(scope, replay_receive, send)
+                return
+            if claimed:
+                await self._run(scope, replay_receive, send, storage_key, request)
+                return
+            if record is None:
+                # The first request failed and released the key; claim it
+                continue
+            if record["state"] == "done" or record["fingerprint"] != request:
+                await self._reply(record, request, send)
+                return
+            if time.monotonic() >= deadline:
+                await _send_error(
+                    send, 409, "A request with this Idempotency-Key is in progress"
+                )
+                return
+            await asyncio.sleep(interval)
+            interval = min(interval * 2, POLL_MAX_INTERVAL)
+
+    async def _claim(
+        self, storage_key: str, request: str
+    ) -> Tuple[bool, Optional[Dict[str, Any]]]:
+        """Claim the key, or return the record of whoever holds it."""
+        pending = json.dumps({"state": "pending", "fingerprint": request})
+        if await self.redis.redis.set(storage_key, pending, nx=True, ex=self.lock_ttl):
+            return True, None
+        raw = await self.redis.redis.get(storage_key)
+        return False, json.loads(raw) if raw else None
+
+    async def _run(
+        self,
+        scope: Scope,
+        receive: Receive,
+        send: Send,
+        storage_key: str,
+        request: str,
+    ) -> None:
+        """Run the request once, streaming and recording its response."""
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[storage_key] = future
+        response: Dict[str, Any] = {"status": 500, "headers": [], "body": []}
+
+        async def recording_send(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+                response["headers"] = [
+                    [k.decode("latin-1"), v.decode("latin-1")]
+                    for k, v in message.get("headers", [])
+                ]
+            elif message["type"] == "http.response.body":
+                response["body"].append(message.get("body", b""))
+            await send(message)
+
+        record = None
+        try:
+            await self.app(scope, receive, recording_send)
+            if response["status"] < 500:
+                record = {
+                    "state": "done",
+                    "fingerprint": request,
+                    "status": response["status"],
+                    "headers": response["headers"],
+                    "body": b"".join(response["body"]).decode("latin-1"),
+                }
+        finally:
+            self._inflight.pop(storage_key, None)
+            future.set_result(record)
+            try:
+                if record is not None:
+                    await self.redis.redis.set(
+                        storage_key, json.dumps(record), ex=self.ttl
+                    )
+                else:
+                    await self.redis.redis.delete(storage_key)
+            except Exception as e:
+                logger.warning(f"Failed to store idempotent response: {e}")
+
+    async def _reply(self, record: Dict[str, Any], request: str, send: Send) -> None:
+        """Replay a stored response, or reject a reused key."""
+        if record["fingerprint"] != request:
+            await _send_error(
+                send, 422, "Idempotency-Key was already used for a different request"
+            )
+            return
+        headers = [
+            (k.encode("latin-1"), v.encode("latin-1")) for k, v in record["headers"]
+        ]
+        headers.append((REPLAY_HEADER, b"true"))
+        await send(
+            {
+                "type": "http.response.start",
+                "status": record["status"],
+                "headers": headers,
+            }
+        )
+        await send(
+            {"type": "http.response.body", "body": record["body"].encode("latin-1")}
+        )
+
+
+async def _read_body(receive: Receive) -> bytes:
+    chunks: List[bytes] = []
+    while True:
+        message = await receive()
+        if message["type"] != "http.request":
+            break
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body", False):
+            break
+    return b"".join(chunks)
+
+
+def _replaying(body: bytes, receive: Receive) -> Receive:
+    """A receive channel that yields the buffered body, then the original."""
+    sent = False
+
+    async def replay() -> Message:
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        return await receive()
+
+    return replay
+
+
+async def _send_error(send: Send, status: int, detail: str) -> None:
+    body = json.dumps({"detail": detail}).encode()
+    await send(
+        {
+            "type": "http.response.start",
+            "status": status,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+            ],
+        }
+    )
+    await send({"type": "http.response.body", "body": body})
@@ -1,11 +1,19 @@
 """Main FastAPI application."""
 
+import asyncio
 import logging
 import os
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from app.analytics import revenue  # noqa: F401 - folds order writes into revenue
+from app.analytics.read_models import ReadModelRefresher
 from app.api.v1.api import api_router
-from app.core.database import init_db
+from app.core.config import settings
+from app.core.database import init_db, async_session_factory
+from app.core.encryption import blind_index_key
+from app.core.idempotency import IdempotencyMiddleware
+from app.services.audit_partition_service import AuditPartitionService
+from app.services.redis_cache import close_redis_pool
 
 
 # Configure logging
@@ -17,6 +25,9 @@ logger = logging.getLogger(__name__)
 
 app = FastAPI(title="Healthcare IVR Platform")
 
+# Retried order and IVR request creation replays the first response
+app.add_middleware(IdempotencyMiddleware)
+
 
 # Configure CORS based on environment
 IS_DEVELOPMENT = os.getenv("ENVIRONMENT", "development") == "development"
@@ -44,8 +55,8 @@ else:
         allow_origins=[os.getenv("FRONTEND_URL", "http://localhost:3000")],
         allow_credentials=True,
         allow_methods=["GET", "POST", "PUT", "DELETE", "PATCH"],
-        allow_headers=["Authorization", "Content-Type"],
-        expose_headers=["Content-Range", "X-Total-Count"],
+        allow_headers=["Authorization", "Content-Type", "Idempotency-Key"],
+        expose_headers=["Content-Range", "X-Total-Count", "Idempotent-Replayed"],
     )
 
 
@@ -60,6 +71,9 @@ async def startup_event():
     """Initialize application on startup."""
     logger.info("Starting Healthcare IVR Platform API")
 
+    # Patient search digests must match across processes and restarts
+    blind_index_key()
+
     # Initialize database
     try:
         db_success = await init_db()
@@ -71,6 +85,18 @@ async def startup_event():
         logger.error(f"Database initialization error: {str(e)}")
         raise
 
+    # Make sure audit inserts always have a monthly partition to land in
+    try:
+        async with async_session_factory() as db:
+            await AuditPartitionService(db).ensure_partitions()
+    except Exception as e:
+        logger.warning(f"Audit partition check failed: {str(e)}")
+
+    # Keep analytics read models current as orders, patients and providers change
+    app.state.read_model_refresher = asyncio.create_task(
+        ReadModelRefresher().run(settings.ANALYTICS_REFRESH_INTERVAL)
+    )
+
     # Include API routes
     try:
         app.include_router(api_router, prefix="/api/v1")
@@ -80,6 +106,15 @@ async def startup_event():
         raise
 
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Release shared connections on shutdown."""
+    refresher = getattr(app.state, "read_model_refresher", None)
+    if refresher is not None:
+        refresher.cancel()
+    await close_redis_pool()
+
+
 # Comment out all startup events for now
 # @app.on_event("startup")
 # async def startup_event():
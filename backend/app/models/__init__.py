@@ -7,7 +7,7 @@ from app.models.sensitive_data import SensitiveData
 from app.models.facility import Facility
 from app.models.patient import Patient
 from app.models.provider import Provider
-from app.models.order import Order, OrderStatusHistory
+from app.models.order import Order, OrderStatusHistory, OrderTimeline
 from app.models.insurance import SecondaryInsurance
 from app.models.logistics import QualityCheck
 from app.models.audit import PHIAccess as PHIAccessLog
@@ -31,6 +31,7 @@ __all__ = [
     "Provider",
     "Order",
     "OrderStatusHistory",
+    "OrderTimeline",
     "SecondaryInsurance",
     "QualityCheck",
     "PHIAccessLog",
@@ -17,6 +17,8 @@ class PHIAccess(Base, AuditMixin):
     """Tracks all PHI access events for HIPAA compliance."""
 
     __tablename__ = "phi_access_logs"
+    # Monthly range partitions, see AuditPartitionService
+    __table_args__ = {"postgresql_partition_by": "RANGE (created_at)"}
 
     id: Mapped[PyUUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, default=uuid4
@@ -46,8 +48,9 @@ class PHIAccess(Base, AuditMixin):
     user_agent: Mapped[str] = mapped_column(String(500))
     request_id: Mapped[str] = mapped_column(String(100))
     session_id: Mapped[str] = mapped_column(String(100))
+    # Partition key, so it must be part of the primary key
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), default=datetime.utcnow
+        DateTime(timezone=True), primary_key=True, default=datetime.utcnow
     )
     updated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), onupdate=datetime.utcnow
@@ -64,6 +67,8 @@ class AuditLog(Base, AuditMixin):
     """General purpose audit logging."""
 
     __tablename__ = "audit_logs"
+    # Monthly range partitions, see AuditPartitionService
+    __table_args__ = {"postgresql_partition_by": "RANGE (created_at)"}
 
     id: Mapped[PyUUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, default=uuid4
@@ -79,8 +84,9 @@ class AuditLog(Base, AuditMixin):
     resource_type: Mapped[str] = mapped_column(String(50), nullable=False)
     resource_id: Mapped[PyUUID] = mapped_column(UUID(as_uuid=True), nullable=False)
     details: Mapped[dict] = mapped_column(JSONB)
+    # Partition key, so it must be part of the primary key
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), default=datetime.utcnow
+        DateTime(timezone=True), primary_key=True, default=datetime.utcnow
     )
     created_by_id: Mapped[PyUUID] = mapped_column(
         UUID(as_uuid=True), ForeignKey("users.id"), nullable=False
@@ -104,6 +110,8 @@ class ComplianceCheck(Base, AuditMixin):
     """Records automated compliance checks."""
 
     __tablename__ = "compliance_checks"
+    # Monthly range partitions, see AuditPartitionService
+    __table_args__ = {"postgresql_partition_by": "RANGE (created_at)"}
 
     id: Mapped[PyUUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, default=uuid4
@@ -112,8 +120,9 @@ class ComplianceCheck(Base, AuditMixin):
     # pending, completed, failed
     status: Mapped[str] = mapped_column(String(20), nullable=False)
     results: Mapped[dict] = mapped_column(JSONB, nullable=False)
+    # Partition key, so it must be part of the primary key
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), default=datetime.utcnow
+        DateTime(timezone=True), primary_key=True, default=datetime.utcnow
     )
     completed_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), nullable=True
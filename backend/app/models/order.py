@@ -4,8 +4,8 @@ Order model for managing medical supply orders.
 
 from datetime import datetime
 from uuid import UUID as PyUUID, uuid4
-from sqlalchemy import String, Enum, DateTime, ForeignKey, Text
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import BigInteger, String, Enum, DateTime, ForeignKey, Text
+from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 
 from app.core.database import Base
@@ -22,15 +22,23 @@ class Order(Base, AuditMixin):
         UUID(as_uuid=True), primary_key=True, default=uuid4
     )
     # Organization
+    # Columns keyed on by the revenue summary load their old value when set,
+    # so a change can be subtracted from the summary (app.analytics.revenue)
     organization_id: Mapped[PyUUID] = mapped_column(
-        UUID(as_uuid=True), ForeignKey("organizations.id"), nullable=False
+        UUID(as_uuid=True),
+        ForeignKey("organizations.id"),
+        nullable=False,
+        active_history=True,
     )
     order_number: Mapped[str] = mapped_column(String(50), unique=True, nullable=False)
     patient_id: Mapped[PyUUID] = mapped_column(
         UUID(as_uuid=True), ForeignKey("patients.id"), nullable=False
     )
     provider_id: Mapped[PyUUID] = mapped_column(
-        UUID(as_uuid=True), ForeignKey("providers.id"), nullable=False
+        UUID(as_uuid=True),
+        ForeignKey("providers.id"),
+        nullable=False,
+        active_history=True,
     )
     created_by_id: Mapped[PyUUID] = mapped_column(
         UUID(as_uuid=True), ForeignKey("users.id"), nullable=False
@@ -51,6 +59,7 @@ class Order(Base, AuditMixin):
         ),
         nullable=False,
         default="pending",
+        active_history=True,
     )
     order_type: Mapped[str] = mapped_column(
         Enum(
@@ -67,14 +76,16 @@ class Order(Base, AuditMixin):
         nullable=False,
         default="routine",
     )
-    _total_amount: Mapped[str] = mapped_column(String(500))  # Encrypted
+    _total_amount: Mapped[str] = mapped_column(
+        String(500), active_history=True
+    )  # Encrypted
     _notes: Mapped[str] = mapped_column(Text)  # Encrypted
     _insurance_data: Mapped[str] = mapped_column(String(2000))  # Encrypted JSON
     _payment_info: Mapped[str] = mapped_column(String(2000))  # Encrypted JSON
     _delivery_info: Mapped[str] = mapped_column(String(2000))  # Encrypted JSON
     completion_date: Mapped[datetime] = mapped_column(DateTime(timezone=True))
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), default=datetime.utcnow
+        DateTime(timezone=True), default=datetime.utcnow, active_history=True
     )
     updated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), default=datetime.utcnow, onupdate=datetime.utcnow
@@ -231,3 +242,30 @@ class OrderStatusHistory(Base):
     changed_by = relationship(
         "User", foreign_keys=[changed_by_id], back_populates="order_status_changes"
     )
+
+
+class OrderTimeline(Base):
+    """Denormalized timeline of an order, maintained by database triggers.
+
+    Status changes, shipments and tracking events are appended to ``events``
+    in the transaction that writes them and ``version`` is bumped, so order
+    detail views are a single primary-key read and clients can poll by
+    version.
+    """
+
+    __tablename__ = "order_timelines"
+
+    order_id: Mapped[PyUUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("orders.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    organization_id: Mapped[PyUUID] = mapped_column(UUID(as_uuid=True), nullable=False)
+    status: Mapped[str] = mapped_column(String(50), nullable=True)
+    version: Mapped[int] = mapped_column(BigInteger, nullable=False, default=1)
+    # Latest state of each shipment, keyed by shipment id
+    shipments: Mapped[dict] = mapped_column(JSONB, nullable=False, default=dict)
+    events: Mapped[list] = mapped_column(JSONB, nullable=False, default=list)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, default=datetime.utcnow
+    )
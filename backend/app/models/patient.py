@@ -3,8 +3,21 @@
 from datetime import datetime
 from typing import List, Optional
 from uuid import UUID, uuid4
-from sqlalchemy import String, DateTime, ForeignKey, Text, JSON, LargeBinary, ARRAY
-from sqlalchemy.dialects.postgresql import UUID as PGUUID
+from sqlalchemy import (
+    String,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    Text,
+    JSON,
+    LargeBinary,
+    SmallInteger,
+    UniqueConstraint,
+    ARRAY,
+)
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID as PGUUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql import func
 
@@ -16,6 +29,18 @@ class Patient(Base):
     """Patient model with encrypted PHI fields."""
 
     __tablename__ = "patients"
+    __table_args__ = (
+        Index("idx_patients_first_name_bidx", "first_name_bidx"),
+        Index("idx_patients_last_name_bidx", "last_name_bidx"),
+        Index("idx_patients_dob_bidx", "dob_bidx"),
+        Index("idx_patients_phone_bidx", "phone_bidx"),
+        Index("idx_patients_updated_at", "updated_at"),
+        Index("idx_patients_search_vector", "search_vector", postgresql_using="gin"),
+        Index(
+            "idx_patients_org_birth_year_bucket", "organization_id", "birth_year_bucket"
+        ),
+        Index("idx_patients_territory_org", "territory_id", "organization_id"),
+    )
 
     id: Mapped[UUID] = mapped_column(
         PGUUID(as_uuid=True),
@@ -34,10 +59,23 @@ class Patient(Base):
     encrypted_address: Mapped[Optional[bytes]] = mapped_column(
         LargeBinary, nullable=True
     )
+    # Blind indexes (keyed HMAC digests) for equality search on encrypted PHI
+    first_name_bidx: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
+    last_name_bidx: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
+    dob_bidx: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
+    phone_bidx: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
+    # First year of the 5-year span of birth, for indexed age-range cohorts
+    birth_year_bucket: Mapped[Optional[int]] = mapped_column(
+        SmallInteger, nullable=True
+    )
     status: Mapped[str] = mapped_column(String(20), nullable=False, default="active")
     notes: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     patient_metadata: Mapped[dict] = mapped_column(JSON, default=dict)
     tags: Mapped[List[str]] = mapped_column(ARRAY(String), default=list)
+    # Full-text index of the non-PHI fields above, kept by a database trigger
+    search_vector: Mapped[Optional[str]] = mapped_column(
+        TSVECTOR, nullable=True, deferred=True
+    )
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         server_default=func.now(),
@@ -62,6 +100,10 @@ class Patient(Base):
         ForeignKey("organizations.id", ondelete="CASCADE"),
         nullable=False,
     )
+    # Territory the patient is served in, for territory access control
+    territory_id: Mapped[Optional[UUID]] = mapped_column(
+        PGUUID(as_uuid=True), nullable=True
+    )
 
     # Facility and Provider
     facility_id: Mapped[UUID] = mapped_column(
@@ -149,3 +191,80 @@ class PatientDocument(Base):
     def full_name(self) -> str:
         """Get patient's full name."""
         return f"{self.first_name} {self.last_name}"
+
+
+class PatientDuplicateCandidate(Base):
+    """Pair of patients the dedup engine scored as likely duplicates."""
+
+    __tablename__ = "patient_duplicate_candidates"
+    __table_args__ = (
+        UniqueConstraint(
+            "patient_id", "duplicate_id", name="uq_patient_duplicate_candidates_pair"
+        ),
+        Index(
+            "idx_patient_duplicate_candidates_org_status_score",
+            "organization_id",
+            "status",
+            "score",
+        ),
+    )
+
+    id: Mapped[UUID] = mapped_column(
+        PGUUID(as_uuid=True), primary_key=True, default=uuid4
+    )
+    organization_id: Mapped[UUID] = mapped_column(
+        PGUUID(as_uuid=True),
+        ForeignKey("organizations.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    # The pair is stored ordered (patient_id < duplicate_id)
+    patient_id: Mapped[UUID] = mapped_column(
+        PGUUID(as_uuid=True),
+        ForeignKey("patients.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    duplicate_id: Mapped[UUID] = mapped_column(
+        PGUUID(as_uuid=True),
+        ForeignKey("patients.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    score: Mapped[float] = mapped_column(Float, nullable=False)
+    # Per-field similarity and the blocking keys that paired them
+    field_scores: Mapped[dict] = mapped_column(JSON, default=dict)
+    blocking_keys: Mapped[List[str]] = mapped_column(ARRAY(String), default=list)
+    # pending | confirmed | dismissed
+    status: Mapped[str] = mapped_column(String(20), nullable=False, default="pending")
+    resolved_by_id: Mapped[Optional[UUID]] = mapped_column(
+        PGUUID(as_uuid=True), ForeignKey("users.id"), nullable=True
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+    )
+
+
+class PatientDedupRun(Base):
+    """One run of the dedup engine; the last finished run is the watermark."""
+
+    __tablename__ = "patient_dedup_runs"
+
+    id: Mapped[UUID] = mapped_column(
+        PGUUID(as_uuid=True), primary_key=True, default=uuid4
+    )
+    # Patients updated at or after this were considered (None for full runs)
+    since: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    started_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False
+    )
+    finished_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    pairs_scored: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    candidates: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
@@ -2,7 +2,18 @@
 
 from datetime import datetime
 from uuid import UUID as PyUUID, uuid4
-from sqlalchemy import String, DateTime, Boolean, Float, JSON
+from sqlalchemy import (
+    String,
+    DateTime,
+    Boolean,
+    Float,
+    JSON,
+    ForeignKey,
+    Integer,
+    SmallInteger,
+    CheckConstraint,
+    UniqueConstraint,
+)
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -34,7 +45,73 @@ class Product(Base):
 
     # Relationships
     ivr_session_items = relationship("IVRSessionItem", back_populates="product")
+    inventory = relationship("ProductInventory", back_populates="product")
 
     def __repr__(self):
         """String representation of the product."""
         return f"<Product(name='{self.name}', sku='{self.sku}')>"
+
+
+class ProductInventory(Base):
+    """Stock of a product held for a territory.
+
+    ``reserved_quantity`` is stock promised to open orders; only
+    ``quantity - reserved_quantity`` can be reserved by new ones. The live
+    counts are spread over ``ProductInventoryShard`` rows; these totals are
+    a snapshot refreshed by inventory compaction.
+    """
+
+    __tablename__ = "product_inventory"
+    __table_args__ = (
+        UniqueConstraint(
+            "product_id", "territory_id", name="uq_product_inventory_territory"
+        ),
+    )
+
+    id: Mapped[PyUUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, default=uuid4
+    )
+    product_id: Mapped[PyUUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("products.id"), nullable=False
+    )
+    territory_id: Mapped[PyUUID] = mapped_column(UUID(as_uuid=True), nullable=False)
+    quantity: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    reserved_quantity: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    reorder_point: Mapped[int] = mapped_column(Integer, nullable=False, default=10)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        default=datetime.utcnow,
+        onupdate=datetime.utcnow,
+    )
+
+    product = relationship("Product", back_populates="inventory")
+
+    @property
+    def available_quantity(self) -> int:
+        """Stock not reserved by open orders."""
+        return self.quantity - self.reserved_quantity
+
+
+class ProductInventoryShard(Base):
+    """One slice of a product's territory stock.
+
+    Reservations take a row lock on a single shard, so concurrent orders for
+    the same product only contend when they land on the same shard.
+    """
+
+    __tablename__ = "product_inventory_shards"
+    __table_args__ = (
+        CheckConstraint(
+            "reserved_quantity >= 0 AND reserved_quantity <= quantity",
+            name="ck_product_inventory_shards_reserved",
+        ),
+    )
+
+    product_id: Mapped[PyUUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("products.id"), primary_key=True
+    )
+    territory_id: Mapped[PyUUID] = mapped_column(UUID(as_uuid=True), primary_key=True)
+    shard: Mapped[int] = mapped_column(SmallInteger, primary_key=True)
+    quantity: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    reserved_quantity: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
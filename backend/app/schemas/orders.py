@@ -3,7 +3,7 @@ Pydantic schemas for order-related entities.
 """
 
 from datetime import datetime
-from typing import Optional
+from typing import Any, Dict, List, Optional
 from uuid import UUID
 from pydantic import BaseModel, Field
 
@@ -55,3 +55,14 @@ class OrderResponse(OrderBase):
 
     class Config:
         from_attributes = True
+
+
+class OrderTimelineResponse(BaseModel):
+    """Schema for the order timeline read model."""
+
+    order_id: UUID
+    status: Optional[str] = None
+    version: int
+    updated_at: datetime
+    shipments: List[Dict[str, Any]] = []
+    events: List[Dict[str, Any]] = []
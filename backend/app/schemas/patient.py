@@ -87,3 +87,28 @@ class PatientSearchResults(BaseModel):
     class Config:
         from_attributes = True
         json_encoders = {datetime: lambda dt: dt.isoformat(), UUID: str}
+
+
+class PatientDuplicate(BaseModel):
+    """Schema for a likely duplicate patient pair."""
+
+    id: UUID
+    patient_id: UUID
+    duplicate_id: UUID
+    score: float
+    field_scores: Dict[str, float] = {}
+    blocking_keys: List[str] = []
+    status: str
+    resolved_by_id: Optional[UUID] = None
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+        json_encoders = {datetime: lambda dt: dt.isoformat(), UUID: str}
+
+
+class PatientDuplicateResolution(BaseModel):
+    """Schema for confirming or dismissing a duplicate pair."""
+
+    status: str = Field(..., pattern="^(confirmed|dismissed)$")
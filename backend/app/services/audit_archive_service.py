@@ -0,0 +1,405 @@
+"""
+Audit Archive Service.
+Exports detached audit partitions to compressed Parquet files in cold
+storage and answers audit report queries directly from those files.
+"""
+
+import json
+import logging
+import os
+import posixpath
+from datetime import date, datetime, time, timezone
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Tuple
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.fs as pafs
+import pyarrow.parquet as pq
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.services.audit_partition_service import (
+    AUDIT_ARCHIVE_SCHEMA,
+    PARTITIONED_AUDIT_TABLES,
+    parse_partition_month,
+    partition_bounds,
+)
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILE = "manifest.json"
+
+# Rows fetched per round trip while exporting a partition
+EXPORT_BATCH_SIZE = 50_000
+
+PARQUET_COMPRESSION = "zstd"
+
+
+def open_archive_filesystem(uri: str) -> Tuple[pafs.FileSystem, str]:
+    """
+    Resolve an archive location into a filesystem and base path.
+
+    ``s3://bucket/prefix`` uses S3, anything else is treated as a local
+    directory so dev and tests need no AWS credentials.
+    """
+    if "://" in uri:
+        return pafs.FileSystem.from_uri(uri)
+    path = os.path.abspath(uri)
+    return pafs.LocalFileSystem(), path
+
+
+def _month_key(month: date) -> str:
+    return f"{month.year:04d}-{month.month:02d}"
+
+
+# Arrow types of Postgres columns; anything else is exported as text
+ARROW_TYPES = {
+    "boolean": pa.bool_(),
+    "smallint": pa.int16(),
+    "integer": pa.int32(),
+    "bigint": pa.int64(),
+    "real": pa.float32(),
+    "double precision": pa.float64(),
+    "timestamp with time zone": pa.timestamp("us", tz="UTC"),
+    "timestamp without time zone": pa.timestamp("us"),
+    "ARRAY": pa.list_(pa.string()),
+}
+
+
+def _to_arrow_value(value: Any, arrow_type: pa.DataType) -> Any:
+    """Convert a DB value to the Python value of its column's Arrow type."""
+    if value is None:
+        return None
+    if pa.types.is_list(arrow_type):
+        return [None if v is None else str(v) for v in value]
+    if pa.types.is_string(arrow_type):
+        if isinstance(value, str):
+            return value
+        if isinstance(value, (dict, list)):
+            return json.dumps(value, default=str)
+        return str(value)
+    return value
+
+
+class AuditArchiveManifest:
+    """JSON index of every archived partition file."""
+
+    def __init__(self, filesystem: pafs.FileSystem, base_path: str):
+        self.filesystem = filesystem
+        self.path = posixpath.join(base_path, MANIFEST_FILE)
+
+    def load(self) -> Dict[str, Any]:
+        """Load the manifest, returning an empty one if none exists yet."""
+        info = self.filesystem.get_file_info(self.path)
+        if info.type == pafs.FileType.NotFound:
+            return {"version": 1, "partitions": []}
+        with self.filesystem.open_input_stream(self.path) as stream:
+            return json.loads(stream.read().decode("utf-8"))
+
+    def save(self, manifest: Dict[str, Any]) -> None:
+        """Write the manifest back to storage."""
+        manifest["updated_at"] = datetime.utcnow().isoformat()
+        payload = json.dumps(manifest, indent=2, sort_keys=True).encode("utf-8")
+        with self.filesystem.open_output_stream(self.path) as stream:
+            stream.write(payload)
+
+    def entries(
+        self,
+        table: str,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> List[Dict[str, Any]]:
+        """Return manifest entries for ``table`` overlapping [start, end]."""
+        selected = []
+        for entry in self.load()["partitions"]:
+            if entry["table"] != table:
+                continue
+            if end is not None and entry["range_start"] > end.date().isoformat():
+                continue
+            if start is not None and entry["range_end"] <= start.date().isoformat():
+                continue
+            selected.append(entry)
+        return selected
+
+
+class AuditArchiver:
+    """Moves detached audit partitions from Postgres to Parquet files."""
+
+    def __init__(
+        self,
+        db: AsyncSession,
+        archive_uri: Optional[str] = None,
+        archive_schema: str = AUDIT_ARCHIVE_SCHEMA,
+    ):
+        self.db = db
+        uri = archive_uri or get_settings().AUDIT_ARCHIVE_URI
+        self.filesystem, self.base_path = open_archive_filesystem(uri)
+        self.manifest = AuditArchiveManifest(self.filesystem, self.base_path)
+        self.archive_schema = archive_schema
+
+    def _file_path(self, table: str, month: date, name: str) -> str:
+        return posixpath.join(
+            self.base_path, table, f"month={_month_key(month)}", f"{name}.parquet"
+        )
+
+    async def _pending_partitions(self) -> List[Tuple[str, str, date]]:
+        """Return (table, partition, month) for every detached partition."""
+        result = await self.db.execute(
+            text(
+                "SELECT table_name FROM information_schema.tables "
+                "WHERE table_schema = :schema ORDER BY table_name"
+            ),
+            {"schema": self.archive_schema},
+        )
+        pending = []
+        for (name,) in result.all():
+            for table in PARTITIONED_AUDIT_TABLES:
+                month = parse_partition_month(table, name)
+                if month is not None:
+                    pending.append((table, name, month))
+                    break
+        return pending
+
+    async def _schema(self, name: str) -> pa.Schema:
+        """Arrow schema of a detached partition, from its column types."""
+        result = await self.db.execute(
+            text(
+                "SELECT column_name, data_type FROM information_schema.columns "
+                "WHERE table_schema = :schema AND table_name = :name "
+                "ORDER BY ordinal_position"
+            ),
+            {"schema": self.archive_schema, "name": name},
+        )
+        return pa.schema(
+            [
+                (column, ARROW_TYPES.get(data_type, pa.string()))
+                for column, data_type in result.all()
+            ]
+        )
+
+    async def _read_batches(
+        self, name: str, schema: pa.Schema
+    ) -> AsyncIterator[pa.RecordBatch]:
+        """
+        Stream a detached partition out of Postgres as record batches.
+
+        Rows come through a server-side cursor ``EXPORT_BATCH_SIZE`` at a
+        time, so only one batch of the partition is in memory at once.
+        """
+        columns = ", ".join(f'"{field.name}"' for field in schema)
+        result = await self.db.stream(
+            text(
+                f'SELECT {columns} FROM "{self.archive_schema}"."{name}" '
+                f"ORDER BY created_at"
+            ),
+            execution_options={"yield_per": EXPORT_BATCH_SIZE},
+        )
+        async for chunk in result.partitions(EXPORT_BATCH_SIZE):
+            yield pa.RecordBatch.from_pydict(
+                {
+                    field.name: [_to_arrow_value(row[i], field.type) for row in chunk]
+                    for i, field in enumerate(schema)
+                },
+                schema=schema,
+            )
+
+    async def archive_partition(
+        self, table: str, name: str, month: date, drop: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Export one detached partition to Parquet and record it in the
+        manifest.
+
+        Args:
+            table: Parent audit table the partition belonged to
+            name: Partition table name inside the archive schema
+            month: Month covered by the partition
+            drop: Drop the Postgres partition once the file is verified
+
+        Returns:
+            The manifest entry describing the archived file
+        """
+        schema = await self._schema(name)
+        path = self._file_path(table, month, name)
+        self.filesystem.create_dir(posixpath.dirname(path), recursive=True)
+
+        row_count = 0
+        stream = writer = None
+        try:
+            # Each batch is written as it arrives, one row group per batch
+            async for batch in self._read_batches(name, schema):
+                if writer is None:
+                    stream = self.filesystem.open_output_stream(path)
+                    writer = pq.ParquetWriter(
+                        stream, schema, compression=PARQUET_COMPRESSION
+                    )
+                writer.write_batch(batch)
+                row_count += batch.num_rows
+        finally:
+            if writer is not None:
+                writer.close()
+                stream.close()
+
+        if writer is not None:
+            # Verify what landed in storage before giving up the source rows
+            written = pq.ParquetFile(self.filesystem.open_input_file(path))
+            if written.metadata.num_rows != row_count:
+                raise RuntimeError(
+                    f"Archive verification failed for {name}: "
+                    f"{written.metadata.num_rows} != {row_count} rows"
+                )
+
+        start, end = partition_bounds(month)
+        entry = {
+            "table": table,
+            "partition": name,
+            "path": path if row_count else None,
+            "range_start": start.isoformat(),
+            "range_end": end.isoformat(),
+            "row_count": row_count,
+            "compression": PARQUET_COMPRESSION,
+            "archived_at": datetime.utcnow().isoformat(),
+        }
+
+        manifest = self.manifest.load()
+        manifest["partitions"] = [
+            p for p in manifest["partitions"] if p["partition"] != name
+        ] + [entry]
+        self.manifest.save(manifest)
+
+        if drop:
+            await self.db.execute(text(f'DROP TABLE "{self.archive_schema}"."{name}"'))
+            await self.db.commit()
+
+        logger.info(f"Archived {row_count} rows from {name} to {path}")
+        return entry
+
+    async def archive_pending(self, drop: bool = True) -> List[Dict[str, Any]]:
+        """Archive every partition waiting in the archive schema."""
+        entries = []
+        for table, name, month in await self._pending_partitions():
+            entries.append(await self.archive_partition(table, name, month, drop))
+        return entries
+
+
+class AuditArchiveQuery:
+    """Reads archived audit partitions with partition and predicate pushdown."""
+
+    def __init__(self, archive_uri: Optional[str] = None):
+        uri = archive_uri or get_settings().AUDIT_ARCHIVE_URI
+        self.filesystem, self.base_path = open_archive_filesystem(uri)
+        self.manifest = AuditArchiveManifest(self.filesystem, self.base_path)
+
+    def archived_until(self, table: str) -> Optional[datetime]:
+        """Return the exclusive upper bound of archived data for ``table``."""
+        ends = [e["range_end"] for e in self.manifest.entries(table) if e["path"]]
+        if not ends:
+            return None
+        return datetime.combine(
+            date.fromisoformat(max(ends)), time.min, tzinfo=timezone.utc
+        )
+
+    def split_period(
+        self, table: str, start: datetime, end: datetime
+    ) -> Tuple[datetime, datetime, Optional[datetime], datetime]:
+        """
+        Split a report period at the boundary of archived data.
+
+        The archive boundary is UTC, so naive period bounds are taken as UTC.
+        Returns the normalized start and end, the end of the archived slice
+        (None when nothing in the period is archived) and the start of the
+        slice still in Postgres; both slices are queried with these values.
+        """
+        start, end = (
+            value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+            for value in (start, end)
+        )
+        archived_until = self.archived_until(table)
+        if archived_until is None or start >= archived_until:
+            return start, end, None, start
+        return start, end, min(end, archived_until), archived_until
+
+    def scan(
+        self,
+        table: str,
+        start: datetime,
+        end: datetime,
+        columns: Optional[List[str]] = None,
+        filters: Optional[Dict[str, Any]] = None,
+    ) -> pa.Table:
+        """
+        Read archived rows of ``table`` with ``start <= created_at <= end``.
+
+        Only files whose month overlaps the range are opened, and the
+        timestamp and equality filters are pushed down to the Parquet row
+        group statistics so unrelated row groups are never decoded.
+        """
+        paths = [e["path"] for e in self.manifest.entries(table, start, end)]
+        paths = [p for p in paths if p]
+        if not paths:
+            return pa.table({column: [] for column in columns or []})
+
+        dataset = ds.dataset(paths, filesystem=self.filesystem, format="parquet")
+        timestamp_type = dataset.schema.field("created_at").type
+        expression = (
+            ds.field("created_at") >= pa.scalar(start, type=timestamp_type)
+        ) & (ds.field("created_at") <= pa.scalar(end, type=timestamp_type))
+        for column, value in (filters or {}).items():
+            expression = expression & (ds.field(column) == str(value))
+
+        return dataset.to_table(columns=columns, filter=expression)
+
+    @staticmethod
+    def _count_by(arrow_table: pa.Table, column: str) -> Dict[str, int]:
+        if arrow_table.num_rows == 0:
+            return {}
+        counts = pc.value_counts(arrow_table[column]).to_pylist()
+        return {item["values"]: item["counts"] for item in counts}
+
+    def phi_access_stats(
+        self, start: datetime, end: datetime, filters: Optional[Dict] = None
+    ) -> Dict[str, Any]:
+        """PHI access statistics for an archived period."""
+        rows = self.scan(
+            "phi_access_logs",
+            start,
+            end,
+            columns=["user_id", "patient_id", "action"],
+            filters=filters,
+        )
+        return {
+            "total_access": rows.num_rows,
+            "user_ids": self._distinct(rows, "user_id"),
+            "patient_ids": self._distinct(rows, "patient_id"),
+            "by_action": self._count_by(rows, "action"),
+        }
+
+    def compliance_check_stats(
+        self, start: datetime, end: datetime, filters: Optional[Dict] = None
+    ) -> Dict[str, Any]:
+        """Compliance check statistics for an archived period."""
+        rows = self.scan(
+            "compliance_checks",
+            start,
+            end,
+            columns=["check_type", "results"],
+            filters=filters,
+        )
+        violations = 0
+        if rows.num_rows:
+            for results in rows["results"].to_pylist():
+                if json.loads(results or "{}").get("violations"):
+                    violations += 1
+        return {
+            "total_checks": rows.num_rows,
+            "by_type": self._count_by(rows, "check_type"),
+            "violations_found": violations,
+        }
+
+    @staticmethod
+    def _distinct(arrow_table: pa.Table, column: str) -> Set[str]:
+        if arrow_table.num_rows == 0:
+            return set()
+        return set(pc.unique(arrow_table[column]).to_pylist())
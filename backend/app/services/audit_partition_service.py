@@ -0,0 +1,257 @@
+"""
+Audit Partition Service.
+Maintains monthly range partitions for the HIPAA audit tables and detaches
+partitions older than the hot window so they can be moved to cold storage.
+"""
+
+import logging
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Audit tables partitioned by RANGE (created_at)
+PARTITIONED_AUDIT_TABLES: List[str] = [
+    "phi_access_logs",
+    "audit_logs",
+    "compliance_checks",
+    "security_events",
+]
+
+# Schema that receives detached partitions until they are archived
+AUDIT_ARCHIVE_SCHEMA = "audit_archive"
+
+# Number of future monthly partitions kept ready for inserts
+DEFAULT_MONTHS_AHEAD = 3
+
+# HIPAA requires audit records to be retained for six years
+PHI_RETENTION_PERIOD = timedelta(days=365 * 6)
+
+# Audit rows stay in Postgres this long before moving to cold storage
+AUDIT_HOT_PERIOD = timedelta(days=settings.AUDIT_HOT_RETENTION_DAYS)
+
+
+def month_start(value: date) -> date:
+    """Return the first day of the month containing ``value``."""
+    return date(value.year, value.month, 1)
+
+
+def add_months(value: date, months: int) -> date:
+    """Shift a first-of-month date by ``months`` (may be negative)."""
+    index = value.year * 12 + (value.month - 1) + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table: str, month: date) -> str:
+    """Return the partition name for ``table`` covering ``month``."""
+    return f"{table}_p{month.year:04d}{month.month:02d}"
+
+
+def default_partition_name(table: str) -> str:
+    """Return the name of the partition catching rows outside every month."""
+    return f"{table}_default"
+
+
+def partition_bounds(month: date) -> Tuple[date, date]:
+    """Return the [from, to) bounds of the partition covering ``month``."""
+    start = month_start(month)
+    return start, add_months(start, 1)
+
+
+def parse_partition_month(table: str, name: str) -> Optional[date]:
+    """Return the month encoded in a partition name, if it is one of ours."""
+    prefix = f"{table}_p"
+    suffix = name[len(prefix) :]
+    if not name.startswith(prefix) or len(suffix) != 6 or not suffix.isdigit():
+        return None
+    return date(int(suffix[:4]), int(suffix[4:]), 1)
+
+
+class AuditPartitionService:
+    """Creates, lists and retires monthly audit table partitions."""
+
+    def __init__(
+        self,
+        db: AsyncSession,
+        tables: Optional[List[str]] = None,
+        archive_schema: str = AUDIT_ARCHIVE_SCHEMA,
+    ):
+        self.db = db
+        self.tables = tables or PARTITIONED_AUDIT_TABLES
+        self.archive_schema = archive_schema
+
+    async def is_partitioned(self, table: str) -> bool:
+        """Check whether ``table`` exists as a partitioned parent table."""
+        result = await self.db.execute(
+            text(
+                "SELECT 1 FROM pg_partitioned_table pt "
+                "JOIN pg_class c ON c.oid = pt.partrelid "
+                "WHERE c.oid = to_regclass(:table)"
+            ),
+            {"table": table},
+        )
+        return result.scalar() is not None
+
+    async def list_partitions(self, table: str) -> List[str]:
+        """List attached partitions of ``table`` ordered by name."""
+        result = await self.db.execute(
+            text(
+                "SELECT c.relname FROM pg_inherits i "
+                "JOIN pg_class c ON c.oid = i.inhrelid "
+                "WHERE i.inhparent = to_regclass(:table) "
+                "ORDER BY c.relname"
+            ),
+            {"table": table},
+        )
+        return [row[0] for row in result.all()]
+
+    async def ensure_partitions(
+        self,
+        months_ahead: int = DEFAULT_MONTHS_AHEAD,
+        today: Optional[date] = None,
+    ) -> Dict[str, List[str]]:
+        """
+        Create missing partitions from the current month up to
+        ``months_ahead`` months in the future.
+
+        Args:
+            months_ahead: Number of future months to pre-create
+            today: Reference date, defaults to the current UTC date
+
+        Returns:
+            Mapping of table name to the partitions that were created
+        """
+        current = month_start(today or datetime.utcnow().date())
+        created: Dict[str, List[str]] = {}
+
+        for table in self.tables:
+            if not await self.is_partitioned(table):
+                logger.warning(f"Skipping {table}: not a partitioned table")
+                continue
+
+            existing = set(await self.list_partitions(table))
+            created[table] = []
+            for offset in range(months_ahead + 1):
+                month = add_months(current, offset)
+                name = partition_name(table, month)
+                if name in existing:
+                    continue
+                await self._create_partition(
+                    table, name, month, default_partition_name(table) in existing
+                )
+                created[table].append(name)
+
+        await self.db.commit()
+        for table, names in created.items():
+            if names:
+                logger.info(f"Created partitions for {table}: {', '.join(names)}")
+        return created
+
+    async def _create_partition(
+        self, table: str, name: str, month: date, has_default: bool
+    ) -> None:
+        """
+        Create the partition of ``table`` covering ``month``.
+
+        Rows of the month that already landed in the default partition would
+        make a plain CREATE ... PARTITION OF fail, so with a default
+        partition the new table is filled from it first and then attached.
+        """
+        start, end = partition_bounds(month)
+        bounds = f"FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+        if not has_default:
+            await self.db.execute(
+                text(
+                    f'CREATE TABLE IF NOT EXISTS "{name}" '
+                    f'PARTITION OF "{table}" FOR VALUES {bounds}'
+                )
+            )
+            return
+
+        default = default_partition_name(table)
+        await self.db.execute(
+            text(
+                f'CREATE TABLE "{name}" (LIKE "{table}" '
+                f"INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+            )
+        )
+        await self.db.execute(
+            text(
+                f'WITH moved AS (DELETE FROM "{default}" '
+                f"WHERE created_at >= :start AND created_at < :end RETURNING *) "
+                f'INSERT INTO "{name}" SELECT * FROM moved'
+            ),
+            {"start": start, "end": end},
+        )
+        await self.db.execute(
+            text(f'ALTER TABLE "{table}" ATTACH PARTITION "{name}" FOR VALUES {bounds}')
+        )
+
+    async def detach_expired_partitions(
+        self,
+        retention: timedelta = AUDIT_HOT_PERIOD,
+        today: Optional[date] = None,
+    ) -> Dict[str, List[str]]:
+        """
+        Detach partitions whose whole range is older than ``retention``.
+
+        Detached partitions are moved into the archive schema rather than
+        deleted, so they can be exported to cold storage before dropping.
+        Archived rows remain queryable for the PHI retention period.
+
+        Args:
+            retention: How long audit rows stay in the live tables
+            today: Reference date, defaults to the current UTC date
+
+        Returns:
+            Mapping of table name to the archived partition names
+        """
+        cutoff = (today or datetime.utcnow().date()) - retention
+        detached: Dict[str, List[str]] = {}
+
+        await self.db.execute(
+            text(f'CREATE SCHEMA IF NOT EXISTS "{self.archive_schema}"')
+        )
+
+        for table in self.tables:
+            if not await self.is_partitioned(table):
+                continue
+
+            detached[table] = []
+            for name in await self.list_partitions(table):
+                month = parse_partition_month(table, name)
+                if month is None:
+                    continue
+                _, end = partition_bounds(month)
+                # Only retire partitions that are entirely past the cutoff
+                if end > cutoff:
+                    continue
+                await self.db.execute(
+                    text(f'ALTER TABLE "{table}" DETACH PARTITION "{name}"')
+                )
+                await self.db.execute(
+                    text(f'ALTER TABLE "{name}" SET SCHEMA "{self.archive_schema}"')
+                )
+                detached[table].append(name)
+
+        await self.db.commit()
+        for table, names in detached.items():
+            if names:
+                logger.info(f"Archived partitions for {table}: {', '.join(names)}")
+        return detached
+
+    async def list_archived_partitions(self) -> List[str]:
+        """List detached partitions waiting in the archive schema."""
+        result = await self.db.execute(
+            text(
+                "SELECT table_name FROM information_schema.tables "
+                "WHERE table_schema = :schema ORDER BY table_name"
+            ),
+            {"schema": self.archive_schema},
+        )
+        return [row[0] for row in result.all()]
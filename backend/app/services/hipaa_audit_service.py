@@ -17,6 +17,8 @@ from app.models.audit import (
     SecurityIncident,
     AuditReport,
 )
+from app.services.audit_archive_service import AuditArchiveQuery
+from app.services.audit_partition_service import PHI_RETENTION_PERIOD
 
 
 class HIPAAComplianceService:
@@ -26,12 +28,16 @@ class HIPAAComplianceService:
         self.db = db
         self.settings = get_settings()
 
-        # HIPAA compliance requirements
-        self.phi_retention_period = timedelta(days=365 * 6)  # 6 years
+        # HIPAA compliance requirements; audit partitions past the hot window
+        # are archived to cold storage and read from there
+        self.phi_retention_period = PHI_RETENTION_PERIOD  # 6 years
         self.max_failed_logins = 3
         self.password_expiry_days = 90
         self.session_timeout_minutes = 15
 
+        # Reads audit periods that were moved out of Postgres
+        self.archive = AuditArchiveQuery()
+
         # PHI access patterns to monitor
         self.suspicious_patterns = {
             "bulk_access": 50,  # Max records per minute
@@ -110,6 +116,49 @@ class HIPAAComplianceService:
                 status_code=500, detail=(f"Failed to log PHI access: {str(e)}")
             )
 
+    async def log_bulk_phi_access(
+        self,
+        user_id: int,
+        patient_ids: List[int],
+        action: str,
+        territory_id: int,
+        resource_type: str,
+        resource_ids: List[int],
+        accessed_fields: List[str],
+        request_metadata: Dict[str, Any],
+    ) -> None:
+        """
+        Log PHI access to a batch of resources as a single audit record.
+
+        Unlike ``log_phi_access`` this does not commit, so the record is
+        written in the caller's transaction with the change it audits.
+
+        Args:
+            user_id: ID of user accessing PHI
+            patient_ids: IDs of patients whose PHI is being accessed
+            action: Type of action being performed
+            territory_id: Territory where access occurred
+            resource_type: Type of resources being accessed
+            resource_ids: IDs of the resources being accessed
+            accessed_fields: List of PHI fields that were accessed
+            request_metadata: Additional request context
+        """
+        self.db.add(
+            AuditLog(
+                user_id=user_id,
+                action=f"phi_access_{action}",
+                resource_type=resource_type,
+                territory_id=territory_id,
+                details={
+                    "resource_ids": [str(r) for r in resource_ids],
+                    "patient_ids": sorted({str(p) for p in patient_ids}),
+                    "record_count": len(resource_ids),
+                    "accessed_fields": accessed_fields,
+                    "metadata": request_metadata,
+                },
+            )
+        )
+
     async def run_compliance_check(
         self, check_type: str, territory_id: Optional[int] = None
     ) -> Dict[str, Any]:
@@ -389,25 +438,64 @@ class HIPAAComplianceService:
         self, start_date: datetime, end_date: datetime, territory_id: Optional[int]
     ) -> Dict[str, Any]:
         """Get PHI access statistics."""
+        filters = {"territory_id": territory_id} if territory_id else None
+        start_date, end_date, archived_end, live_start = self.archive.split_period(
+            "phi_access_logs", start_date, end_date
+        )
+
         # Base query
         query = self.db.query(PHIAccess).filter(
-            and_(PHIAccess.created_at >= start_date, PHIAccess.created_at <= end_date)
+            and_(PHIAccess.created_at >= live_start, PHIAccess.created_at <= end_date)
         )
 
         if territory_id:
             query = query.filter(PHIAccess.territory_id == territory_id)
 
-        return {
-            "total_access": query.count(),
-            "unique_users": query.with_entities(PHIAccess.user_id).distinct().count(),
-            "unique_patients": query.with_entities(PHIAccess.patient_id)
-            .distinct()
-            .count(),
-            "by_action": dict(
+        if archived_end is None:
+            return {
+                "total_access": query.count(),
+                "unique_users": query.with_entities(PHIAccess.user_id)
+                .distinct()
+                .count(),
+                "unique_patients": query.with_entities(PHIAccess.patient_id)
+                .distinct()
+                .count(),
+                "by_action": dict(
+                    query.with_entities(PHIAccess.action, func.count(PHIAccess.id))
+                    .group_by(PHIAccess.action)
+                    .all()
+                ),
+            }
+
+        # Period reaches into cold storage: merge archived and live slices
+        stats = self.archive.phi_access_stats(start_date, archived_end, filters)
+        user_ids = stats["user_ids"]
+        patient_ids = stats["patient_ids"]
+        by_action = stats["by_action"]
+        total = stats["total_access"]
+
+        if live_start <= end_date:
+            total += query.count()
+            user_ids |= {
+                str(row[0])
+                for row in query.with_entities(PHIAccess.user_id).distinct().all()
+            }
+            patient_ids |= {
+                str(row[0])
+                for row in query.with_entities(PHIAccess.patient_id).distinct().all()
+            }
+            for action, count in (
                 query.with_entities(PHIAccess.action, func.count(PHIAccess.id))
                 .group_by(PHIAccess.action)
                 .all()
-            ),
+            ):
+                by_action[action] = by_action.get(action, 0) + count
+
+        return {
+            "total_access": total,
+            "unique_users": len(user_ids),
+            "unique_patients": len(patient_ids),
+            "by_action": by_action,
         }
 
     async def _get_security_incidents(
@@ -448,10 +536,15 @@ class HIPAAComplianceService:
         self, start_date: datetime, end_date: datetime, territory_id: Optional[int]
     ) -> Dict[str, Any]:
         """Get compliance check statistics."""
+        filters = {"territory_id": territory_id} if territory_id else None
+        start_date, end_date, archived_end, live_start = self.archive.split_period(
+            "compliance_checks", start_date, end_date
+        )
+
         # Base query
         query = self.db.query(ComplianceCheck).filter(
             and_(
-                ComplianceCheck.created_at >= start_date,
+                ComplianceCheck.created_at >= live_start,
                 ComplianceCheck.created_at <= end_date,
             )
         )
@@ -459,7 +552,7 @@ class HIPAAComplianceService:
         if territory_id:
             query = query.filter(ComplianceCheck.territory_id == territory_id)
 
-        return {
+        stats = {
             "total_checks": query.count(),
             "by_type": dict(
                 query.with_entities(
@@ -473,6 +566,19 @@ class HIPAAComplianceService:
             ).count(),
         }
 
+        if archived_end is not None:
+            archived = self.archive.compliance_check_stats(
+                start_date, archived_end, filters
+            )
+            stats["total_checks"] += archived["total_checks"]
+            stats["violations_found"] += archived["violations_found"]
+            for check_type, count in archived["by_type"].items():
+                stats["by_type"][check_type] = (
+                    stats["by_type"].get(check_type, 0) + count
+                )
+
+        return stats
+
     async def _find_audit_log_gaps(self, query: Any) -> List[Dict[str, Any]]:
         """Find gaps in audit log timeline."""
         gaps = []
@@ -3,14 +3,32 @@ Inventory management service for warehouse operations.
 Implements HIPAA-compliant inventory tracking.
 """
 
-from typing import List, Dict, Optional
+from typing import List, Dict, NamedTuple, Optional
 from datetime import datetime
 from uuid import UUID
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from fastapi import HTTPException
 
 from app.models.logistics import WarehouseLocation, InventoryTransaction, StockLevel
-from app.core.exceptions import ValidationError
+from app.models.product import Product, ProductInventoryShard
+from app.core.cache import cached
+from app.core.exceptions import NotFoundException, ValidationError
+from app.services.inventory_shards import ShardedInventory, stock_totals
+
+# Catalog prices change rarely and are shared by every tenant; product
+# updates drop the entry (see update_product in app.api.orders.routes)
+PRODUCT_PRICE_CACHE_TTL = 3600
+
+
+class OrderProduct(NamedTuple):
+    """Price, compliance and stock of one product for an order."""
+
+    product_id: UUID
+    unit_price: float
+    is_active: bool
+    # None when the territory holds no stock record for the product
+    available: Optional[int]
 
 
 class InventoryService:
@@ -173,3 +191,72 @@ class InventoryService:
             raise HTTPException(
                 status_code=500, detail=f"Failed to get low stock items: {str(e)}"
             )
+
+    @cached(
+        "product_price",
+        ttl=PRODUCT_PRICE_CACHE_TTL,
+        key=("product_id",),
+        tenant_arg=None,
+    )
+    async def get_product_price(
+        self, product_id: UUID, territory_id: Optional[UUID] = None
+    ) -> float:
+        """Get the unit price of a product.
+
+        Prices are catalog-wide today, so ``territory_id`` is accepted for
+        callers but does not take part in the lookup or the cache key.
+        """
+        price = (
+            self.db.query(Product.unit_price)
+            .filter(Product.id == product_id, Product.is_active.is_(True))
+            .scalar()
+        )
+        if price is None:
+            raise NotFoundException(f"Product {product_id} not found")
+        return price
+
+    async def get_order_products(
+        self, product_ids: List[UUID], territory_id: UUID
+    ) -> Dict[UUID, OrderProduct]:
+        """Fetch price, compliance and territory stock of products in one query.
+
+        Products that do not exist are missing from the result.
+        """
+        if not product_ids:
+            return {}
+        stock = (
+            stock_totals(territory_id)
+            .where(ProductInventoryShard.product_id.in_(product_ids))
+            .subquery("stock")
+        )
+        rows = self.db.execute(
+            select(Product.id, Product.unit_price, Product.is_active, stock.c.available)
+            .outerjoin(stock, stock.c.product_id == Product.id)
+            .where(Product.id.in_(product_ids))
+        ).all()
+        return {row[0]: OrderProduct(*row) for row in rows}
+
+    async def reserve_items(
+        self, territory_id: UUID, quantities: Dict[UUID, int]
+    ) -> None:
+        """Reserve stock for several products across their counter shards.
+
+        Each product takes a row lock on one shard only, so concurrent
+        orders for the same product rarely wait on each other. Nothing is
+        committed: on a shortfall the caller must roll back, which releases
+        the products that were reserved.
+
+        Raises:
+            ValidationError: If any product lacks the requested stock
+        """
+        ShardedInventory(self.db).reserve(territory_id, quantities)
+
+    async def release_items(
+        self, territory_id: UUID, quantities: Dict[UUID, int]
+    ) -> None:
+        """Release reserved stock of several products; nothing is committed.
+
+        Raises:
+            ValidationError: If more is released than is reserved
+        """
+        ShardedInventory(self.db).release(territory_id, quantities)
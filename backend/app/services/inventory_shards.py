@@ -0,0 +1,419 @@
+"""
+Sharded product stock counters.
+
+Each product's territory stock is split over ``INVENTORY_SHARDS`` rows of
+``product_inventory_shards``. A reservation picks a random shard and only
+updates it if no other transaction holds it (``FOR UPDATE SKIP LOCKED``)
+and it covers the quantity; products that were skipped retry on a shard
+they have not tried yet, so concurrent orders for a hot product spread
+over the shards instead of queueing on one row lock. Only when no single
+shard can serve a product does it fall back to locking the product's
+shards and taking stock from several. A change that loses a deadlock or
+serialization conflict is rolled back to a savepoint and retried with
+backoff. Periodic compaction evens free stock out across shards and
+snapshots the totals into product_inventory, which is only a snapshot:
+current stock is read by summing the shards (``stock_totals``).
+"""
+
+import random
+import time
+from typing import Dict, List, Optional, Set, Tuple
+from uuid import UUID
+
+from sqlalchemy import (
+    Integer,
+    Select,
+    and_,
+    case,
+    column,
+    func,
+    select,
+    text,
+    update,
+    values,
+)
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.dialects.postgresql import UUID as PGUUID, insert as pg_insert
+from sqlalchemy.orm import Session, aliased
+
+from app.core.config import settings
+from app.core.exceptions import ValidationError
+from app.models.product import ProductInventory, ProductInventoryShard as Shard
+
+# Optimistic single-shard rounds before falling back to locking every shard
+RESERVE_ATTEMPTS = 3
+# Retries of a change that lost a deadlock or serialization conflict
+CONFLICT_RETRIES = 3
+# Seconds before the first retry; doubled per retry, plus jitter
+CONFLICT_BACKOFF = 0.05
+# SQLSTATEs of a deadlock victim and a serialization failure
+CONFLICT_SQLSTATES = ("40P01", "40001")
+# Products whose shards are locked together by one compaction statement
+COMPACT_BATCH_SIZE = 500
+
+# Reserving and removing draw on free stock, releasing on reserved stock
+MODES = ("reserve", "release", "remove")
+
+COMPACT_PAGE_SQL = """
+    SELECT DISTINCT product_id FROM product_inventory_shards
+    WHERE CAST(:after AS uuid) IS NULL OR product_id > :after
+    ORDER BY product_id
+    LIMIT :limit
+"""
+
+# Lock a page of products' shards, spread their free stock evenly (the
+# first ``free % shards`` shards take one extra unit) and snapshot totals
+COMPACT_SQL = """
+    WITH locked AS (
+        SELECT product_id, territory_id, shard, quantity, reserved_quantity
+        FROM product_inventory_shards
+        WHERE product_id = ANY(:product_ids)
+        ORDER BY product_id, territory_id, shard
+        FOR UPDATE
+    ),
+    totals AS (
+        SELECT
+            product_id,
+            territory_id,
+            sum(quantity - reserved_quantity) AS free,
+            sum(reserved_quantity) AS reserved,
+            count(*) AS shards
+        FROM locked
+        GROUP BY product_id, territory_id
+    ),
+    rebalanced AS (
+        UPDATE product_inventory_shards s
+        SET quantity = s.reserved_quantity + t.free / t.shards
+            + CASE WHEN s.shard < t.free % t.shards THEN 1 ELSE 0 END
+        FROM totals t
+        WHERE s.product_id = t.product_id AND s.territory_id = t.territory_id
+    )
+    UPDATE product_inventory i
+    SET quantity = t.free + t.reserved,
+        reserved_quantity = t.reserved,
+        updated_at = now()
+    FROM totals t
+    WHERE i.product_id = t.product_id AND i.territory_id = t.territory_id
+"""
+
+
+def stock_totals(territory_id: Optional[UUID] = None) -> Select:
+    """Current and free stock per product and territory, summed over shards."""
+    query = select(
+        Shard.product_id,
+        Shard.territory_id,
+        func.sum(Shard.quantity).label("quantity"),
+        func.sum(Shard.quantity - Shard.reserved_quantity).label("available"),
+    ).group_by(Shard.product_id, Shard.territory_id)
+    if territory_id is not None:
+        query = query.where(Shard.territory_id == territory_id)
+    return query
+
+
+def is_conflict(error: DBAPIError) -> bool:
+    """Whether the database aborted a statement to resolve a lock conflict."""
+    sqlstate = getattr(error.orig, "pgcode", None) or getattr(
+        error.orig, "sqlstate", None
+    )
+    return sqlstate in CONFLICT_SQLSTATES
+
+
+def _capacity(mode: str, shard):
+    """Stock of a shard that ``mode`` can draw on."""
+    if mode == "release":
+        return shard.reserved_quantity
+    return shard.quantity - shard.reserved_quantity
+
+
+def _change(mode: str, amount) -> Dict:
+    """Column assignments applying ``amount`` of ``mode`` to a shard."""
+    if mode == "reserve":
+        return {"reserved_quantity": Shard.reserved_quantity + amount}
+    if mode == "release":
+        return {"reserved_quantity": Shard.reserved_quantity - amount}
+    return {"quantity": Shard.quantity - amount}
+
+
+class ShardedInventory:
+    """
+    Reserves, releases and restocks product stock across counter shards.
+
+    Nothing is committed: callers commit with the rest of their unit of
+    work, or roll back to undo a partial reservation.
+    """
+
+    def __init__(
+        self,
+        db: Session,
+        shards: int = settings.INVENTORY_SHARDS,
+        attempts: int = RESERVE_ATTEMPTS,
+        rng: Optional[random.Random] = None,
+        retries: int = CONFLICT_RETRIES,
+    ):
+        self.db = db
+        self.shards = shards
+        self.attempts = attempts
+        self.rng = rng or random.Random()
+        self.retries = retries
+
+    def _try_shards(
+        self, mode: str, territory_id: UUID, picks: List[Tuple[UUID, int, int]]
+    ) -> Set[UUID]:
+        """
+        Apply ``(product_id, shard, quantity)`` picks in one statement.
+
+        Shards that are locked elsewhere or lack the stock are skipped
+        without waiting. Returns the products that were applied.
+        """
+        requested = values(
+            column("product_id", PGUUID(as_uuid=True)),
+            column("shard", Integer),
+            column("quantity", Integer),
+            name="requested",
+        ).data(picks)
+        locked = aliased(Shard, name="locked")
+        picked = (
+            select(locked.product_id, locked.shard, requested.c.quantity)
+            .join_from(
+                locked,
+                requested,
+                and_(
+                    locked.product_id == requested.c.product_id,
+                    locked.shard == requested.c.shard,
+                ),
+            )
+            .where(
+                locked.territory_id == territory_id,
+                _capacity(mode, locked) >= requested.c.quantity,
+            )
+            .with_for_update(of=locked, skip_locked=True)
+            .subquery("picked")
+        )
+        return set(
+            self.db.execute(
+                update(Shard)
+                .where(
+                    Shard.product_id == picked.c.product_id,
+                    Shard.territory_id == territory_id,
+                    Shard.shard == picked.c.shard,
+                )
+                .values(**_change(mode, picked.c.quantity))
+                .returning(Shard.product_id)
+            ).scalars()
+        )
+
+    def _take_locked(
+        self, mode: str, territory_id: UUID, product_id: UUID, quantity: int
+    ) -> bool:
+        """
+        Apply ``quantity`` across several shards of one product.
+
+        Free shards are tried first without waiting; only if they cannot
+        cover the quantity are all of the product's shards locked.
+        """
+        for skip_locked in (True, False):
+            rows = self.db.execute(
+                select(Shard.shard, _capacity(mode, Shard))
+                .where(
+                    Shard.product_id == product_id,
+                    Shard.territory_id == territory_id,
+                )
+                .order_by(Shard.shard)
+                .with_for_update(skip_locked=skip_locked)
+            ).all()
+            if sum(capacity for _, capacity in rows) >= quantity:
+                break
+        else:
+            return False
+        left = quantity
+        for shard, capacity in rows:
+            take = min(capacity, left)
+            if take <= 0:
+                continue
+            self.db.execute(
+                update(Shard)
+                .where(
+                    Shard.product_id == product_id,
+                    Shard.territory_id == territory_id,
+                    Shard.shard == shard,
+                )
+                .values(**_change(mode, take))
+            )
+            left -= take
+            if not left:
+                break
+        return True
+
+    def apply(
+        self, mode: str, territory_id: UUID, quantities: Dict[UUID, int]
+    ) -> List[UUID]:
+        """
+        Reserve, release or remove stock of several products.
+
+        The change runs in a savepoint. If it is chosen as a deadlock victim
+        or fails serialization, the savepoint is rolled back, which releases
+        the shard locks it took, and the change is retried with backoff.
+
+        Returns:
+            The products that lack the stock; the others are applied
+
+        Raises:
+            DBAPIError: If the change still conflicts after ``retries``
+        """
+        if mode not in MODES:
+            raise ValueError(f"Unknown inventory mode: {mode}")
+        for retry in range(self.retries + 1):
+            try:
+                with self.db.begin_nested():
+                    return self._apply(mode, territory_id, quantities)
+            except DBAPIError as error:
+                if retry == self.retries or not is_conflict(error):
+                    raise
+                time.sleep(CONFLICT_BACKOFF * 2**retry * (1 + self.rng.random()))
+
+    def _apply(
+        self, mode: str, territory_id: UUID, quantities: Dict[UUID, int]
+    ) -> List[UUID]:
+        """One attempt at ``apply``; see there."""
+        remaining = {pid: qty for pid, qty in quantities.items() if qty > 0}
+        tried: Dict[UUID, Set[int]] = {pid: set() for pid in remaining}
+        for _ in range(self.attempts):
+            picks = []
+            for product_id, quantity in remaining.items():
+                untried = [s for s in range(self.shards) if s not in tried[product_id]]
+                if untried:
+                    shard = self.rng.choice(untried)
+                    tried[product_id].add(shard)
+                    picks.append((product_id, shard, quantity))
+            if not picks:
+                break
+            applied = self._try_shards(mode, territory_id, picks)
+            remaining = {
+                pid: qty for pid, qty in remaining.items() if pid not in applied
+            }
+            if not remaining:
+                return []
+        # Sorted so concurrent fallbacks lock products in the same order
+        return [
+            product_id
+            for product_id in sorted(remaining)
+            if not self._take_locked(
+                mode, territory_id, product_id, remaining[product_id]
+            )
+        ]
+
+    def reserve(self, territory_id: UUID, quantities: Dict[UUID, int]) -> None:
+        """
+        Reserve stock for several products.
+
+        Raises:
+            ValidationError: If any product lacks the requested stock; the
+                caller must roll back to release the rest
+        """
+        short = self.apply("reserve", territory_id, quantities)
+        if short:
+            raise ValidationError(
+                f"Insufficient stock for products: {', '.join(map(str, short))}"
+            )
+
+    def release(self, territory_id: UUID, quantities: Dict[UUID, int]) -> None:
+        """
+        Return reserved stock of several products to free stock.
+
+        Raises:
+            ValidationError: If more is released than is reserved
+        """
+        short = self.apply("release", territory_id, quantities)
+        if short:
+            raise ValidationError(
+                "Release exceeds reserved stock for products: "
+                f"{', '.join(map(str, short))}"
+            )
+
+    def ensure_shards(self, product_id: UUID, territory_id: UUID) -> None:
+        """Create the inventory row and counter shards of a product."""
+        stmt = pg_insert(ProductInventory).values(
+            product_id=product_id, territory_id=territory_id
+        )
+        self.db.execute(
+            stmt.on_conflict_do_nothing(constraint="uq_product_inventory_territory")
+        )
+        self.db.execute(
+            pg_insert(Shard)
+            .values(
+                [
+                    {
+                        "product_id": product_id,
+                        "territory_id": territory_id,
+                        "shard": shard,
+                        "quantity": 0,
+                        "reserved_quantity": 0,
+                    }
+                    for shard in range(self.shards)
+                ]
+            )
+            .on_conflict_do_nothing()
+        )
+
+    def add_stock(self, product_id: UUID, territory_id: UUID, quantity: int) -> None:
+        """Spread received stock evenly over the product's shards."""
+        self.ensure_shards(product_id, territory_id)
+        share, extra = divmod(quantity, self.shards)
+        self.db.execute(
+            update(Shard)
+            .where(
+                Shard.product_id == product_id,
+                Shard.territory_id == territory_id,
+                Shard.shard < self.shards,
+            )
+            .values(
+                quantity=Shard.quantity
+                + share
+                + case((Shard.shard < extra, 1), else_=0)
+            )
+        )
+
+    def remove_stock(self, product_id: UUID, territory_id: UUID, quantity: int) -> None:
+        """
+        Remove free (unreserved) stock of a product.
+
+        Raises:
+            ValidationError: If less than ``quantity`` is free
+        """
+        if self.apply("remove", territory_id, {product_id: quantity}):
+            raise ValidationError(f"Insufficient available quantity for {product_id}")
+
+    def compact_products(self, product_ids: List[UUID]) -> int:
+        """
+        Rebalance the given products' shards and refresh their totals.
+
+        Returns:
+            Number of product_inventory rows refreshed
+        """
+        return self.db.execute(
+            text(COMPACT_SQL), {"product_ids": list(product_ids)}
+        ).rowcount
+
+    def compact(self, batch_size: int = COMPACT_BATCH_SIZE) -> Dict[str, int]:
+        """
+        Rebalance shards and refresh product_inventory totals.
+
+        Each page of products is locked, rebalanced and committed on its own
+        so reservations only wait for one page at a time.
+        """
+        after, products, rows = None, 0, 0
+        while True:
+            page = (
+                self.db.execute(
+                    text(COMPACT_PAGE_SQL), {"after": after, "limit": batch_size}
+                )
+                .scalars()
+                .all()
+            )
+            if not page:
+                break
+            rows += self.compact_products(page)
+            self.db.commit()
+            products += len(page)
+            after = page[-1]
+        return {"products": products, "inventory_rows": rows}
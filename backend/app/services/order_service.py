@@ -83,6 +83,36 @@ class OrderService:
             f"ORD-{datetime.utcnow().strftime('%Y%m%d')}-" f"{uuid4().hex[:8]}"
         )
 
+        # Price, compliance and stock of every product in one query
+        quantities: Dict[UUID, int] = {}
+        for item_data in order_data.items:
+            quantities[item_data.product_id] = (
+                quantities.get(item_data.product_id, 0) + item_data.quantity
+            )
+        products = await self.inventory_service.get_order_products(
+            list(quantities), order_data.territory_id
+        )
+        for product_id, quantity in quantities.items():
+            product = products.get(product_id)
+            if (
+                product is None
+                or not product.is_active
+                or product.available is None
+                or product.available < quantity
+            ):
+                raise ValidationError(
+                    f"Product {product_id} not available in requested quantity"
+                )
+
+        # Reserve all stock atomically; a concurrent order may have taken it
+        try:
+            await self.inventory_service.reserve_items(
+                order_data.territory_id, quantities
+            )
+        except ValidationError:
+            self.db.rollback()
+            raise
+
         # Create order
         order = Order(
             order_number=order_number,
@@ -98,34 +128,21 @@ class OrderService:
         self.db.add(order)
 
         # Create order items
-        total_amount = 0.0
-        for item_data in order_data.items:
-            # Verify product availability
-            if not await self.inventory_service.check_availability(
-                item_data.product_id, order_data.territory_id, item_data.quantity
-            ):
-                raise ValidationError(
-                    f"Product {item_data.product_id} not available "
-                    f"in requested quantity"
-                )
-
-            # Get product pricing
-            product_price = await self.inventory_service.get_product_price(
-                item_data.product_id, order_data.territory_id
-            )
-
-            # Create order item
-            item = OrderItem(
+        items = [
+            OrderItem(
                 order=order,
                 product_id=item_data.product_id,
                 quantity=item_data.quantity,
-                unit_price=product_price,
-                total_price=product_price * item_data.quantity,
+                unit_price=products[item_data.product_id].unit_price,
+                total_price=products[item_data.product_id].unit_price
+                * item_data.quantity,
                 insurance_coverage=item_data.insurance_coverage,
                 notes=item_data.notes,
             )
-            self.db.add(item)
-            total_amount += item.total_price
+            for item_data in order_data.items
+        ]
+        self.db.add_all(items)
+        total_amount = sum(item.total_price for item in items)
 
         # Update order total
         order.total_amount = total_amount
@@ -428,11 +445,13 @@ class OrderService:
 
     async def _cancel_order(self, order: Order) -> None:
         """Handle order cancellation."""
-        # Release reserved inventory
+        # Release reserved inventory in one pass over the shards
+        quantities: Dict[UUID, int] = {}
         for item in order.items:
-            await self.inventory_service.release_reservation(
-                item.product_id, order.territory_id, item.quantity, order.id
+            quantities[item.product_id] = (
+                quantities.get(item.product_id, 0) + item.quantity
             )
+        await self.inventory_service.release_items(order.territory_id, quantities)
 
     async def _check_all_approvals(self, order: Order) -> None:
         """Check if all approvals are complete and update order status."""
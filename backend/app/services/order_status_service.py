@@ -6,38 +6,18 @@ from fastapi import HTTPException  # type: ignore
 from app.services.hipaa_audit_service import HIPAAComplianceService
 from app.services.websocket_service import broadcast_to_territory
 from app.api.orders.models import Order, OrderStatusHistory
+from app.models.order import OrderTimeline
+from app.services.order_status_workflow import (
+    ORDER_STATUS_DESCRIPTIONS,
+    STATUS_DESCRIPTIONS,
+    STATUS_TRANSITIONS,
+    apply_bulk_status_update,
+    lock_orders,
+    plan_bulk_status_update,
+)
+from app.services.order_timeline import timeline_events
 from app.api.notifications.notification_service import NotificationService
 
-# Valid order status transitions
-STATUS_TRANSITIONS = {
-    "DRAFT": ["PENDING_VERIFICATION"],
-    "PENDING_VERIFICATION": ["VERIFIED", "REJECTED"],
-    "VERIFIED": ["PROCESSING", "CANCELLED"],
-    "PROCESSING": ["READY_TO_SHIP", "ON_HOLD", "CANCELLED"],
-    "READY_TO_SHIP": ["SHIPPED", "ON_HOLD", "CANCELLED"],
-    "SHIPPED": ["DELIVERED", "RETURNED"],
-    "DELIVERED": ["COMPLETED", "RETURNED"],
-    "RETURNED": ["COMPLETED", "PROCESSING"],
-    "ON_HOLD": ["PROCESSING", "CANCELLED"],
-    "CANCELLED": [],
-    "COMPLETED": [],
-}
-
-# Status descriptions for audit logs
-STATUS_DESCRIPTIONS = {
-    "DRAFT": "Order created but not submitted",
-    "PENDING_VERIFICATION": "Awaiting insurance verification",
-    "VERIFIED": "Insurance verification completed",
-    "PROCESSING": "Order is being processed",
-    "READY_TO_SHIP": "Order ready for shipment",
-    "SHIPPED": "Order has been shipped",
-    "DELIVERED": "Order delivered to recipient",
-    "RETURNED": "Order returned by recipient",
-    "ON_HOLD": "Order processing paused",
-    "CANCELLED": "Order cancelled",
-    "COMPLETED": "Order fulfillment completed",
-}
-
 
 class OrderStatusService:
     def __init__(self, db: Session):
@@ -156,24 +136,24 @@ class OrderStatusService:
                 request_metadata=request_metadata or {},
             )
 
-            # Get status history
-            history = (
-                self.db.query(OrderStatusHistory)
-                .filter(OrderStatusHistory.order_id == order_id)
-                .order_by(OrderStatusHistory.timestamp.desc())
-                .all()
+            # One primary-key read of the trigger-maintained timeline
+            timeline = (
+                self.db.query(OrderTimeline)
+                .filter(OrderTimeline.order_id == order_id)
+                .first()
             )
+            history = timeline_events(timeline, ["status"]) if timeline else []
 
             return [
                 {
-                    "timestamp": h.timestamp.isoformat(),
-                    "previous_status": h.previous_status,
-                    "new_status": h.new_status,
-                    "changed_by": h.changed_by,
-                    "notes": h.notes,
-                    "description": STATUS_DESCRIPTIONS[h.new_status],
+                    "timestamp": event["at"],
+                    "previous_status": event["from"],
+                    "new_status": event["to"],
+                    "changed_by": event["by"],
+                    "notes": event["reason"],
+                    "description": STATUS_DESCRIPTIONS.get(event["to"]),
                 }
-                for h in history
+                for event in reversed(history)
             ]
 
         except Exception:
@@ -190,23 +170,74 @@ class OrderStatusService:
         notes: Optional[str] = None,
         request_metadata: Optional[Dict] = None,
     ) -> Dict:
-        """Update status for multiple orders"""
+        """
+        Update status for multiple orders in one transaction.
+
+        The orders are locked and validated in one query, moved with a
+        single UPDATE and their history bulk-inserted, all on the
+        ``app.models.order`` mappings; ``new_status`` is one of their
+        ``order_status_enum`` values, in any case. An order's territory is
+        its patient's. The batch writes one
+        audit record and one notification and broadcast per territory.
+        Orders that are missing, in another territory or not allowed to move
+        to ``new_status`` are reported as failed; the rest still update.
+        """
+        new_status = new_status.lower()
+        if new_status not in ORDER_STATUS_DESCRIPTIONS:
+            raise HTTPException(status_code=400, detail=f"Unknown status {new_status}")
+
         results = {"successful": [], "failed": []}
+        try:
+            # Lock and validate every order in one round trip
+            rows = lock_orders(self.db, order_ids)
+            eligible, results["failed"] = plan_bulk_status_update(
+                order_ids, rows, new_status, territory_id
+            )
+            if not eligible:
+                self.db.rollback()
+                return results
 
-        for order_id in order_ids:
-            try:
-                result = await self.update_status(
-                    order_id=order_id,
-                    new_status=new_status,
-                    user_id=user_id,
-                    territory_id=territory_id,
-                    notes=notes,
-                    request_metadata=request_metadata,
-                )
-                results["successful"].append(result)
-            except Exception as e:
-                results["failed"].append({"order_id": order_id, "error": str(e)})
+            now = datetime.utcnow()
+            apply_bulk_status_update(self.db, eligible, new_status, user_id, now, notes)
+            await self.hipaa_service.log_bulk_phi_access(
+                user_id=user_id,
+                patient_ids=[row.patient_id for row in eligible],
+                action="bulk_update_order_status",
+                territory_id=territory_id,
+                resource_type="order",
+                resource_ids=[row.id for row in eligible],
+                accessed_fields=["status", "patient_id", "territory_id"],
+                request_metadata=request_metadata or {},
+            )
+            self.db.commit()
 
+        except Exception:
+            # Log error without exposing PHI
+            self.db.rollback()
+            raise HTTPException(status_code=500, detail="Error updating order status")
+
+        by_territory: Dict[int, List] = {}
+        for row in eligible:
+            by_territory.setdefault(row.territory_id, []).append(row)
+        for territory, territory_rows in by_territory.items():
+            await self._send_bulk_status_notifications(
+                territory, territory_rows, new_status
+            )
+            await self._broadcast_bulk_status_update(
+                territory, [row.id for row in territory_rows], new_status
+            )
+
+        timestamp = now.isoformat()
+        results["successful"] = [
+            {
+                "order_id": row.id,
+                "status": new_status,
+                "timestamp": timestamp,
+                "updated_by": user_id,
+                "description": ORDER_STATUS_DESCRIPTIONS[new_status],
+            }
+            for row in eligible
+        ]
         return results
 
     def _is_valid_transition(self, current_status: str, new_status: str) -> bool:
@@ -242,3 +273,35 @@ class OrderStatusService:
             "timestamp": datetime.utcnow().isoformat(),
         }
         await broadcast_to_territory(territory_id=order.territory_id, message=message)
+
+    async def _send_bulk_status_notifications(
+        self, territory_id: int, orders: List, new_status: str
+    ) -> None:
+        """Send one notification for a batch of status changes in a territory"""
+        recipients = {order.patient_id for order in orders} | {
+            order.provider_id for order in orders if order.provider_id
+        }
+        await self.notification_service.send_notification(
+            user_ids=list(recipients),
+            notification_type="ORDER_STATUS_UPDATE",
+            data={
+                "order_ids": [order.id for order in orders],
+                "new_status": new_status,
+                "description": ORDER_STATUS_DESCRIPTIONS[new_status],
+                "timestamp": datetime.utcnow().isoformat(),
+            },
+            territory_id=territory_id,
+        )
+
+    async def _broadcast_bulk_status_update(
+        self, territory_id: int, order_ids: List, new_status: str
+    ) -> None:
+        """Broadcast a batch of status updates via WebSocket"""
+        message = {
+            "type": "ORDER_STATUS_BULK_UPDATE",
+            "order_ids": order_ids,
+            "status": new_status,
+            "description": ORDER_STATUS_DESCRIPTIONS[new_status],
+            "timestamp": datetime.utcnow().isoformat(),
+        }
+        await broadcast_to_territory(territory_id=territory_id, message=message)
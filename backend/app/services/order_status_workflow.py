@@ -0,0 +1,169 @@
+"""
+Order status workflow rules and the set-based bulk status change.
+
+Kept apart from ``OrderStatusService`` so a bulk change can be planned and
+written without the service's audit, notification and websocket
+dependencies. Bulk changes run on the ``orders`` and
+``order_status_history`` mappings of ``app.models.order`` and their
+``order_status_enum`` statuses, so the history rows they write are the
+ones the order timeline triggers read.
+"""
+
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.orm import Session
+
+from app.analytics.revenue import record_status_change
+from app.models.order import Order, OrderStatusHistory
+from app.models.patient import Patient
+
+# Valid order status transitions
+STATUS_TRANSITIONS = {
+    "DRAFT": ["PENDING_VERIFICATION"],
+    "PENDING_VERIFICATION": ["VERIFIED", "REJECTED"],
+    "VERIFIED": ["PROCESSING", "CANCELLED"],
+    "PROCESSING": ["READY_TO_SHIP", "ON_HOLD", "CANCELLED"],
+    "READY_TO_SHIP": ["SHIPPED", "ON_HOLD", "CANCELLED"],
+    "SHIPPED": ["DELIVERED", "RETURNED"],
+    "DELIVERED": ["COMPLETED", "RETURNED"],
+    "RETURNED": ["COMPLETED", "PROCESSING"],
+    "ON_HOLD": ["PROCESSING", "CANCELLED"],
+    "CANCELLED": [],
+    "COMPLETED": [],
+}
+
+# Status descriptions for audit logs
+STATUS_DESCRIPTIONS = {
+    "DRAFT": "Order created but not submitted",
+    "PENDING_VERIFICATION": "Awaiting insurance verification",
+    "VERIFIED": "Insurance verification completed",
+    "PROCESSING": "Order is being processed",
+    "READY_TO_SHIP": "Order ready for shipment",
+    "SHIPPED": "Order has been shipped",
+    "DELIVERED": "Order delivered to recipient",
+    "RETURNED": "Order returned by recipient",
+    "ON_HOLD": "Order processing paused",
+    "CANCELLED": "Order cancelled",
+    "COMPLETED": "Order fulfillment completed",
+}
+
+# Transitions between the stored order statuses (order_status_enum)
+ORDER_STATUS_TRANSITIONS = {
+    "pending": ["verified", "cancelled"],
+    "verified": ["approved", "cancelled"],
+    "approved": ["processing", "cancelled"],
+    "processing": ["completed", "cancelled"],
+    "completed": [],
+    "cancelled": [],
+}
+
+ORDER_STATUS_DESCRIPTIONS = {
+    "pending": "Order awaiting verification",
+    "verified": "Insurance verification completed",
+    "approved": "Order approved for processing",
+    "processing": "Order is being processed",
+    "completed": "Order fulfillment completed",
+    "cancelled": "Order cancelled",
+}
+
+
+def lock_orders(db: Session, order_ids: Sequence[Any]) -> List[Any]:
+    """
+    Lock ``order_ids`` and read what a bulk status change needs.
+
+    Orders carry no territory of their own; it is read from the patient.
+    Only the order rows are locked.
+    """
+    return db.execute(
+        select(
+            Order.id,
+            Order.status,
+            Patient.territory_id,
+            Order.patient_id,
+            Order.provider_id,
+        )
+        .join(Patient, Patient.id == Order.patient_id)
+        .where(Order.id.in_(order_ids))
+        .with_for_update(of=Order)
+    ).all()
+
+
+def plan_bulk_status_update(
+    order_ids: Sequence[Any],
+    rows: Sequence[Any],
+    new_status: str,
+    territory_id: Any,
+) -> Tuple[List[Any], List[Dict]]:
+    """
+    Split locked order rows into those that may move to ``new_status``.
+
+    Args:
+        order_ids: Requested order IDs, in request order
+        rows: Locked rows with ``id``, ``status`` and ``territory_id``
+        new_status: Target status
+        territory_id: Territory the caller may change orders in
+
+    Returns:
+        The eligible rows and a ``{"order_id", "error"}`` failure for every
+        other requested order
+    """
+    allowed_from = {
+        status
+        for status, targets in ORDER_STATUS_TRANSITIONS.items()
+        if new_status in targets
+    }
+    found = {row.id: row for row in rows}
+    eligible, failed = [], []
+    for order_id in dict.fromkeys(order_ids):
+        row = found.get(order_id)
+        if row is None:
+            error = "Order not found"
+        elif row.territory_id != territory_id:
+            error = "Not authorized for this territory"
+        elif row.status not in allowed_from:
+            error = f"Invalid transition from {row.status} to {new_status}"
+        else:
+            eligible.append(row)
+            continue
+        failed.append({"order_id": order_id, "error": error})
+    return eligible, failed
+
+
+def apply_bulk_status_update(
+    db: Session,
+    eligible: Sequence[Any],
+    new_status: str,
+    user_id: Any,
+    now: datetime,
+    notes: Optional[str] = None,
+) -> None:
+    """
+    Move ``eligible`` orders with one UPDATE and record their history rows
+    with one executemany INSERT.
+
+    The ORM flush listener does not see the Core UPDATE, so the orders'
+    revenue summary rows are moved to ``new_status`` first.
+    """
+    order_ids = [row.id for row in eligible]
+    record_status_change(db.connection(), order_ids, new_status)
+    db.execute(
+        update(Order)
+        .where(Order.id.in_(order_ids))
+        .values(status=new_status, updated_at=now, updated_by_id=user_id)
+    )
+    db.execute(
+        insert(OrderStatusHistory),
+        [
+            {
+                "order_id": row.id,
+                "from_status": row.status,
+                "to_status": new_status,
+                "changed_by_id": user_id,
+                "reason": notes,
+                "created_at": now,
+            }
+            for row in eligible
+        ],
+    )
@@ -0,0 +1,63 @@
+"""
+Order timeline read model.
+
+``order_timelines`` holds one row per order with its current status, the
+latest state of each shipment and every status, shipment and tracking
+event, appended by database triggers in the transaction that writes the
+source row. Reads are a single primary-key lookup, and the row version
+doubles as an ETag so clients can poll without transferring the timeline.
+"""
+
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.order import OrderTimeline
+
+EVENT_TYPES = ("status", "shipment", "tracking")
+
+
+def timeline_etag(order_id: UUID, version: int) -> str:
+    """Weak ETag naming one version of an order timeline."""
+    return f'W/"timeline-{order_id}-{version}"'
+
+
+async def get_timeline(
+    db: AsyncSession, order_id: UUID, organization_id: Optional[UUID] = None
+) -> Optional[OrderTimeline]:
+    """Load an order's timeline, scoped to an organization when given."""
+    query = select(OrderTimeline).where(OrderTimeline.order_id == order_id)
+    if organization_id is not None:
+        query = query.where(OrderTimeline.organization_id == organization_id)
+    return (await db.execute(query)).scalar_one_or_none()
+
+
+def timeline_events(
+    timeline: OrderTimeline, types: Optional[List[str]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Events in chronological order, optionally of the given types only.
+
+    Carrier tracking events can arrive after later ones, so events are
+    ordered by when they happened rather than when they were appended.
+    """
+    events = timeline.events or []
+    if types:
+        events = [event for event in events if event.get("type") in types]
+    return sorted(events, key=lambda event: event.get("at") or "")
+
+
+def serialize_timeline(
+    timeline: OrderTimeline, types: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    """Response body of an order timeline."""
+    return {
+        "order_id": timeline.order_id,
+        "status": timeline.status,
+        "version": timeline.version,
+        "updated_at": timeline.updated_at,
+        "shipments": list((timeline.shipments or {}).values()),
+        "events": timeline_events(timeline, types),
+    }
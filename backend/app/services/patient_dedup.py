@@ -0,0 +1,358 @@
+"""
+Patient record-linkage: blocking on blind indexes, then batched scoring.
+
+Candidate pairs come from equality joins on the blind-index columns (name,
+date of birth, phone), so only blocked pairs are ever decrypted. Each batch
+of changed patients is paired, decrypted once per patient and scored with
+vectorized bigram similarity; likely duplicates are upserted for review.
+"""
+
+import zlib
+from datetime import datetime, timezone
+from typing import Callable, Dict, Optional, Sequence, Tuple
+from uuid import UUID
+
+import numpy as np
+from cryptography.fernet import Fernet
+from sqlalchemy import delete, func, select, text, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.encryption import get_encryption_key, normalize_search_value
+from app.models.patient import Patient, PatientDedupRun, PatientDuplicateCandidate
+
+# Relative weight of each field in the pair score
+FIELD_WEIGHTS = {
+    "first_name": 0.25,
+    "last_name": 0.3,
+    "date_of_birth": 0.3,
+    "phone": 0.15,
+}
+ENCRYPTED_COLUMNS = {
+    "first_name": Patient.encrypted_first_name,
+    "last_name": Patient.encrypted_last_name,
+    "date_of_birth": Patient.encrypted_dob,
+    "phone": Patient.encrypted_phone,
+}
+# Hashed bigram dimensions per string
+NGRAM_DIM = 256
+
+CHANGED_PAGE_SQL = """
+    SELECT id FROM patients
+    WHERE (CAST(:since AS timestamptz) IS NULL OR updated_at >= :since)
+        AND (CAST(:after AS uuid) IS NULL OR id > :after)
+    ORDER BY id
+    LIMIT :limit
+"""
+
+# Pairs of a page of changed patients with any patient of the same
+# organization sharing a blocking key. A pair of two changed patients is
+# only emitted from the page of the lower id.
+_BLOCK_SQL = """
+    SELECT c.id AS a, p.id AS b, c.organization_id, '{key}' AS key
+    FROM changed c
+    JOIN patients p ON {join}
+    WHERE p.organization_id = c.organization_id
+        AND p.id <> c.id
+        AND NOT (
+            p.id < c.id
+            AND (CAST(:since AS timestamptz) IS NULL OR p.updated_at >= :since)
+        )
+        {where}
+"""
+# A name alone (no shared date of birth or phone) only blocks patients whose
+# name is uncommon in their organization; common names would pair everyone
+# sharing them
+BLOCKING_SQL = f"""
+    WITH changed AS (
+        SELECT id, organization_id,
+            first_name_bidx, last_name_bidx, dob_bidx, phone_bidx
+        FROM patients
+        WHERE id = ANY(:ids)
+    ),
+    common_names AS (
+        SELECT c.id
+        FROM changed c
+        JOIN patients p ON p.last_name_bidx = c.last_name_bidx
+            AND p.first_name_bidx = c.first_name_bidx
+            AND p.organization_id = c.organization_id
+        GROUP BY c.id
+        HAVING count(*) > :max_block_size
+    ),
+    blocked AS (
+        {_BLOCK_SQL.format(
+            key="dob_name",
+            join="p.dob_bidx = c.dob_bidx AND (p.last_name_bidx = c.last_name_bidx"
+            " OR p.first_name_bidx = c.first_name_bidx)",
+            where="",
+        )}
+        UNION ALL
+        {_BLOCK_SQL.format(key="phone", join="p.phone_bidx = c.phone_bidx", where="")}
+        UNION ALL
+        {_BLOCK_SQL.format(
+            key="full_name",
+            join="p.last_name_bidx = c.last_name_bidx"
+            " AND p.first_name_bidx = c.first_name_bidx",
+            where="AND c.id NOT IN (SELECT id FROM common_names)",
+        )}
+    )
+    SELECT pairs.* FROM (
+        SELECT
+            LEAST(a, b) AS patient_id,
+            GREATEST(a, b) AS duplicate_id,
+            organization_id,
+            array_agg(DISTINCT key ORDER BY key) AS blocking_keys
+        FROM blocked
+        GROUP BY 1, 2, 3
+    ) pairs
+    -- Reviewed pairs are settled
+    WHERE NOT EXISTS (
+        SELECT 1 FROM patient_duplicate_candidates d
+        WHERE d.patient_id = pairs.patient_id
+            AND d.duplicate_id = pairs.duplicate_id
+            AND d.status <> 'pending'
+    )
+"""
+
+Record = Dict[str, Optional[str]]
+
+
+def _normalize(field: str, value: Optional[str]) -> Optional[str]:
+    if value is None:
+        return None
+    if field == "phone":
+        value = "".join(c for c in value if c.isdigit())[-10:]
+    else:
+        value = normalize_search_value(value)
+    return value or None
+
+
+def ngram_matrix(values: Sequence[Optional[str]]) -> np.ndarray:
+    """Hashed bigram counts of each string (a zero row for missing values)."""
+    matrix = np.zeros((len(values), NGRAM_DIM), dtype=np.float32)
+    for row, value in enumerate(values):
+        if not value:
+            continue
+        padded = f" {value} "
+        for i in range(len(padded) - 1):
+            matrix[row, zlib.crc32(padded[i : i + 2].encode()) % NGRAM_DIM] += 1
+    return matrix
+
+
+def dice_similarity(left: np.ndarray, right: np.ndarray) -> np.ndarray:
+    """Row-wise Dice coefficient of two bigram count matrices."""
+    overlap = np.minimum(left, right).sum(axis=1)
+    total = left.sum(axis=1) + right.sum(axis=1)
+    return np.divide(2 * overlap, total, out=np.zeros_like(overlap), where=total > 0)
+
+
+def score_pairs(
+    records: Dict[UUID, Record], pairs: Sequence[Tuple[UUID, UUID]]
+) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+    """
+    Score patient pairs by weighted per-field string similarity.
+
+    Fields missing on either side are left out of that pair's weights.
+
+    Returns:
+        The overall score of each pair and the per-field similarities
+    """
+    ids = list(records)
+    position = {patient_id: i for i, patient_id in enumerate(ids)}
+    left = np.fromiter((position[a] for a, _ in pairs), dtype=np.intp)
+    right = np.fromiter((position[b] for _, b in pairs), dtype=np.intp)
+
+    weighted = np.zeros(len(pairs), dtype=np.float32)
+    weights = np.zeros(len(pairs), dtype=np.float32)
+    field_scores = {}
+    for field, weight in FIELD_WEIGHTS.items():
+        values = [_normalize(field, records[i].get(field)) for i in ids]
+        present = np.array([v is not None for v in values])
+        matrix = ngram_matrix(values)
+        similarity = dice_similarity(matrix[left], matrix[right])
+        compared = present[left] & present[right]
+        field_scores[field] = np.where(compared, similarity, np.nan)
+        weighted += np.where(compared, similarity * weight, 0)
+        weights += np.where(compared, weight, 0)
+    scores = np.divide(
+        weighted, weights, out=np.zeros_like(weighted), where=weights > 0
+    )
+    return scores, field_scores
+
+
+class PatientDedupEngine:
+    """
+    Finds likely duplicate patients among new or changed records.
+
+    Runs page through patients updated since the start of the last finished
+    run (all patients on a full run), block each page against the whole
+    organization and commit its candidates before moving on.
+    """
+
+    def __init__(
+        self,
+        db: AsyncSession,
+        threshold: float = settings.PATIENT_DEDUP_THRESHOLD,
+        batch_size: int = settings.PATIENT_DEDUP_BATCH_SIZE,
+        decrypt: Optional[Callable[[bytes], str]] = None,
+        max_block_size: int = settings.PATIENT_DEDUP_MAX_BLOCK_SIZE,
+    ):
+        self.db = db
+        self.threshold = threshold
+        self.batch_size = batch_size
+        self.max_block_size = max_block_size
+        self._decrypt = decrypt
+        self._fernet: Optional[Fernet] = None
+
+    def decrypt(self, value: Optional[bytes]) -> Optional[str]:
+        """Decrypt one PHI column value."""
+        if value is None:
+            return None
+        if self._decrypt is not None:
+            return self._decrypt(value)
+        if self._fernet is None:
+            self._fernet = get_encryption_key()
+        return self._fernet.decrypt(value).decode()
+
+    async def last_watermark(self) -> Optional[datetime]:
+        """Start time of the last finished run."""
+        return await self.db.scalar(
+            select(func.max(PatientDedupRun.started_at)).where(
+                PatientDedupRun.finished_at.is_not(None)
+            )
+        )
+
+    async def load_records(self, ids: Sequence[UUID]) -> Dict[UUID, Record]:
+        """Load and decrypt the compared fields of the given patients."""
+        result = await self.db.execute(
+            select(Patient.id, *ENCRYPTED_COLUMNS.values()).where(Patient.id.in_(ids))
+        )
+        return {
+            row[0]: {
+                field: self.decrypt(value)
+                for field, value in zip(ENCRYPTED_COLUMNS, row[1:])
+            }
+            for row in result.all()
+        }
+
+    async def score_batch(self, pairs: Sequence) -> Tuple[int, int]:
+        """
+        Score blocked pairs and store those at or above the threshold.
+
+        Pending candidates that now score below it are removed; reviewed
+        ones are never touched.
+
+        Returns:
+            ``(pairs scored, candidates stored)``
+        """
+        if not pairs:
+            return 0, 0
+        ids = {p.patient_id for p in pairs} | {p.duplicate_id for p in pairs}
+        records = await self.load_records(list(ids))
+        pairs = [
+            p for p in pairs if p.patient_id in records and p.duplicate_id in records
+        ]
+        if not pairs:
+            return 0, 0
+        scores, field_scores = score_pairs(
+            records, [(p.patient_id, p.duplicate_id) for p in pairs]
+        )
+
+        matches, misses = [], []
+        for i, pair in enumerate(pairs):
+            if scores[i] < self.threshold:
+                misses.append((pair.patient_id, pair.duplicate_id))
+                continue
+            matches.append(
+                {
+                    "organization_id": pair.organization_id,
+                    "patient_id": pair.patient_id,
+                    "duplicate_id": pair.duplicate_id,
+                    "score": round(float(scores[i]), 4),
+                    "field_scores": {
+                        field: round(float(values[i]), 4)
+                        for field, values in field_scores.items()
+                        if not np.isnan(values[i])
+                    },
+                    "blocking_keys": list(pair.blocking_keys),
+                    "status": "pending",
+                }
+            )
+        if matches:
+            stmt = pg_insert(PatientDuplicateCandidate).values(matches)
+            await self.db.execute(
+                stmt.on_conflict_do_update(
+                    constraint="uq_patient_duplicate_candidates_pair",
+                    set_={
+                        "score": stmt.excluded.score,
+                        "field_scores": stmt.excluded.field_scores,
+                        "blocking_keys": stmt.excluded.blocking_keys,
+                        "updated_at": func.now(),
+                    },
+                    where=PatientDuplicateCandidate.status == "pending",
+                )
+            )
+        if misses:
+            await self.db.execute(
+                delete(PatientDuplicateCandidate).where(
+                    PatientDuplicateCandidate.status == "pending",
+                    tuple_(
+                        PatientDuplicateCandidate.patient_id,
+                        PatientDuplicateCandidate.duplicate_id,
+                    ).in_(misses),
+                )
+            )
+        return len(pairs), len(matches)
+
+    async def run(self, full: bool = False) -> Dict:
+        """Run one incremental (or full) dedup pass."""
+        since = None if full else await self.last_watermark()
+        run = PatientDedupRun(
+            since=since,
+            started_at=datetime.now(timezone.utc),
+            pairs_scored=0,
+            candidates=0,
+        )
+        self.db.add(run)
+        await self.db.commit()
+
+        after, patients = None, 0
+        while True:
+            page = (
+                (
+                    await self.db.execute(
+                        text(CHANGED_PAGE_SQL),
+                        {"since": since, "after": after, "limit": self.batch_size},
+                    )
+                )
+                .scalars()
+                .all()
+            )
+            if not page:
+                break
+            pairs = (
+                await self.db.execute(
+                    text(BLOCKING_SQL),
+                    {
+                        "ids": list(page),
+                        "since": since,
+                        "max_block_size": self.max_block_size,
+                    },
+                )
+            ).all()
+            scored, stored = await self.score_batch(pairs)
+            run.pairs_scored += scored
+            run.candidates += stored
+            patients += len(page)
+            after = page[-1]
+            await self.db.commit()
+
+        run.finished_at = datetime.now(timezone.utc)
+        await self.db.commit()
+        return {
+            "since": since.isoformat() if since else None,
+            "patients": patients,
+            "pairs_scored": run.pairs_scored,
+            "candidates": run.candidates,
+        }
@@ -0,0 +1,301 @@
+"""
+Blind-index lookups over encrypted patient PHI.
+
+Names and dates of birth are stored encrypted, so they are matched through
+keyed HMAC digests (see ``app.core.encryption.blind_index``). First and last
+names share the ``name`` domain so a single term can match either column.
+Age cohorts use a coarse birth-year bucket instead, narrowed by exact date
+checks after decryption. Free text searches the trigger-maintained
+``search_vector`` over the non-PHI fields.
+
+Indexes are written with each patient; ``reindex_patients`` recomputes them
+for rows written before the columns existed or under another key.
+"""
+
+from datetime import date, datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import (
+    Integer,
+    String,
+    and_,
+    column,
+    func,
+    or_,
+    select,
+    update,
+    values,
+)
+from sqlalchemy.orm import Session
+
+from app.core.encryption import blind_index, blind_index_key, get_encryption_key
+from app.models.patient import Patient
+
+DATE_FORMATS = ("%Y-%m-%d", "%m/%d/%Y", "%m-%d-%Y")
+# Width of the stored birth-year bucket, in years
+BIRTH_YEAR_BUCKET = 5
+# Text search configuration the patients_search_vector_update trigger uses
+SEARCH_CONFIG = "english"
+
+# Columns written by patient_search_indexes
+INDEX_COLUMNS = (
+    "first_name_bidx",
+    "last_name_bidx",
+    "dob_bidx",
+    "phone_bidx",
+    "birth_year_bucket",
+)
+
+# (search_id, first_name, last_name, either_name, dob, external_id)
+TermRow = Tuple[int, Optional[str], Optional[str], Optional[str], Optional[str], str]
+
+
+def _parse_date(value: Any) -> Optional[date]:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(str(value).strip(), fmt).date()
+        except ValueError:
+            continue
+    return None
+
+
+def dob_index(value: Any) -> Optional[str]:
+    """Blind index of a date of birth in any accepted date format."""
+    parsed = _parse_date(value)
+    return blind_index("dob", parsed.isoformat()) if parsed else None
+
+
+def phone_index(value: Any) -> Optional[str]:
+    """Blind index of a phone number's last ten digits."""
+    digits = "".join(c for c in str(value) if c.isdigit())[-10:]
+    return blind_index("phone", digits) if digits else None
+
+
+def birth_year_bucket(value: Any) -> Optional[int]:
+    """First year of the ``BIRTH_YEAR_BUCKET``-year span a birth date is in."""
+    parsed = _parse_date(value)
+    if parsed is None:
+        return None
+    return parsed.year // BIRTH_YEAR_BUCKET * BIRTH_YEAR_BUCKET
+
+
+def patient_search_indexes(
+    first_name: Optional[str] = None,
+    last_name: Optional[str] = None,
+    date_of_birth: Any = None,
+    phone: Optional[str] = None,
+    **_: Any,
+) -> Dict[str, Any]:
+    """
+    Return the search-index column values for the given plaintext fields.
+
+    Only fields that are passed are returned, so partial updates refresh
+    just the indexes of the fields they change.
+    """
+    indexes = {}
+    if first_name is not None:
+        indexes["first_name_bidx"] = blind_index("name", first_name)
+    if last_name is not None:
+        indexes["last_name_bidx"] = blind_index("name", last_name)
+    if date_of_birth is not None:
+        indexes["dob_bidx"] = dob_index(date_of_birth)
+        indexes["birth_year_bucket"] = birth_year_bucket(date_of_birth)
+    if phone is not None:
+        indexes["phone_bidx"] = phone_index(phone)
+    return indexes
+
+
+def reindex_patients(
+    db: Session,
+    batch_size: int = 1000,
+    decrypt: Optional[Callable[[bytes], str]] = None,
+) -> Dict[str, int]:
+    """
+    Recompute the search indexes of every patient from the decrypted PHI.
+
+    Patients are paged by id; each page is decrypted, indexed, written with
+    one executemany UPDATE and committed, so an interrupted run can simply
+    be started again.
+    """
+    blind_index_key()
+    if decrypt is None:
+        fernet = get_encryption_key()
+
+        def decrypt(value: bytes) -> str:
+            return fernet.decrypt(value).decode()
+
+    encrypted = (
+        Patient.encrypted_first_name,
+        Patient.encrypted_last_name,
+        Patient.encrypted_dob,
+        Patient.encrypted_phone,
+    )
+    after, patients = None, 0
+    while True:
+        page = select(Patient.id, *encrypted).order_by(Patient.id).limit(batch_size)
+        if after is not None:
+            page = page.where(Patient.id > after)
+        rows = db.execute(page).all()
+        if not rows:
+            break
+
+        updates = []
+        for patient_id, *phi in rows:
+            first_name, last_name, date_of_birth, phone = (
+                decrypt(value) if value is not None else None for value in phi
+            )
+            indexes = patient_search_indexes(
+                first_name=first_name,
+                last_name=last_name,
+                date_of_birth=date_of_birth,
+                phone=phone,
+            )
+            # Every row sets every column, clearing digests of removed values
+            updates.append(
+                {"id": patient_id, **dict.fromkeys(INDEX_COLUMNS), **indexes}
+            )
+        db.execute(update(Patient), updates)
+        db.commit()
+        patients += len(rows)
+        after = rows[-1][0]
+    return {"patients": patients}
+
+
+def age_on(date_of_birth: Any, today: Optional[date] = None) -> Optional[int]:
+    """Age in whole years on ``today``."""
+    born = _parse_date(date_of_birth)
+    if born is None:
+        return None
+    today = today or date.today()
+    return today.year - born.year - ((today.month, today.day) < (born.month, born.day))
+
+
+def age_range_filter(min_age: int, max_age: int, today: Optional[date] = None):
+    """
+    Indexed candidate filter for patients aged ``min_age`` to ``max_age``.
+
+    Matches every bucket that can hold such a birth date, so it is a
+    superset; confirm candidates with ``age_on`` after decryption.
+    """
+    today = today or date.today()
+    oldest = birth_year_bucket(date(today.year - max_age - 1, 1, 1))
+    youngest = birth_year_bucket(date(today.year - min_age, 1, 1))
+    return Patient.birth_year_bucket.between(oldest, youngest)
+
+
+def search_term_rows(terms: Sequence[str], match_type: str = "exact") -> List[TermRow]:
+    """
+    Expand search terms into blind-index rows tagged by their position.
+
+    A term matches an external ID or date of birth exactly. Otherwise an
+    exact term is a full name ("first last" or "last, first") or a single
+    name matching either column; partial and fuzzy terms match on any of
+    their name tokens, since digests only support equality.
+    """
+    rows: List[TermRow] = []
+    for search_id, term in enumerate(terms):
+        term = term.strip()
+        if not term:
+            continue
+        dob = dob_index(term)
+        if "," in term:
+            last, _, first = term.partition(",")
+            tokens = first.split() + last.split()
+        else:
+            tokens = term.split()
+        if match_type == "exact" and len(tokens) > 1:
+            rows.append(
+                (
+                    search_id,
+                    blind_index("name", " ".join(tokens[:-1])),
+                    blind_index("name", tokens[-1]),
+                    None,
+                    dob,
+                    term,
+                )
+            )
+            continue
+        rows.extend(
+            (search_id, None, None, blind_index("name", name), dob, term)
+            for name in tokens
+        )
+    return rows
+
+
+def bulk_match_query(
+    rows: Iterable[TermRow],
+    max_results_per_term: int,
+    organization_ids: Optional[Sequence[Any]] = None,
+    territory_ids: Optional[Sequence[Any]] = None,
+):
+    """
+    Build one query matching every term row against the blind indexes.
+
+    The rows are joined as a VALUES list, each patient is counted once per
+    term and at most ``max_results_per_term`` of the most recently updated
+    matches in the given organizations and territories are kept per term.
+    Returns ``(search_id, Patient)`` rows.
+    """
+    terms = values(
+        column("search_id", Integer),
+        column("first_name", String),
+        column("last_name", String),
+        column("either_name", String),
+        column("dob", String),
+        column("external_id", String),
+        name="terms",
+    ).data(list(rows))
+    matches = or_(
+        Patient.external_id == terms.c.external_id,
+        Patient.dob_bidx == terms.c.dob,
+        and_(
+            Patient.first_name_bidx == terms.c.first_name,
+            Patient.last_name_bidx == terms.c.last_name,
+        ),
+        Patient.first_name_bidx == terms.c.either_name,
+        Patient.last_name_bidx == terms.c.either_name,
+    )
+    hits = (
+        select(
+            terms.c.search_id,
+            Patient.id.label("patient_id"),
+            func.row_number()
+            .over(
+                partition_by=terms.c.search_id,
+                order_by=(Patient.updated_at.desc(), Patient.id),
+            )
+            .label("rank"),
+        )
+        .select_from(terms.join(Patient, matches))
+        .group_by(terms.c.search_id, Patient.id)
+    )
+    if organization_ids:
+        hits = hits.where(Patient.organization_id.in_(organization_ids))
+    if territory_ids:
+        hits = hits.where(Patient.territory_id.in_(territory_ids))
+    hits = hits.subquery()
+    return (
+        select(hits.c.search_id, Patient)
+        .join(Patient, Patient.id == hits.c.patient_id)
+        .where(hits.c.rank <= max_results_per_term)
+        .order_by(hits.c.search_id, hits.c.rank)
+    )
+
+
+def text_search_query(query_text: str):
+    """Parse user search text (quotes, OR and -negation) into a tsquery."""
+    return func.websearch_to_tsquery(SEARCH_CONFIG, query_text)
+
+
+def text_search_filter(query_text: str):
+    """Match patients whose non-PHI fields contain the search text (GIN)."""
+    return Patient.search_vector.op("@@")(text_search_query(query_text))
+
+
+def text_search_rank(query_text: str):
+    """Relevance of a patient to the search text, identifiers weighted highest."""
+    return func.ts_rank_cd(Patient.search_vector, text_search_query(query_text))
@@ -3,8 +3,9 @@ Patient search service with HIPAA-compliant search functionality.
 Implements secure search with encryption and audit logging.
 """
 
+import asyncio
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Optional, Tuple
 from sqlalchemy import or_, and_, func
 from sqlalchemy.orm import Session
 from sqlalchemy.sql import select
@@ -24,6 +25,18 @@ from app.api.patients.schemas import (
     PatientResponse,
 )
 from app.api.patients.encryption_service import PatientEncryptionService
+from app.services.patient_index import (
+    age_on,
+    age_range_filter,
+    bulk_match_query,
+    search_term_rows,
+    text_search_filter,
+    text_search_rank,
+)
+
+
+# Age-range candidates decrypted per query when paging on exact age
+AGE_CANDIDATE_BATCH = 200
 
 
 class PatientSearchService:
@@ -92,11 +105,7 @@ class PatientSearchService:
 
         # Text search filters
         if search_request.query:
-            filters.append(
-                Patient.search_vector.op("@@")(
-                    func.plainto_tsquery("english", search_request.query)
-                )
-            )
+            filters.append(text_search_filter(search_request.query))
 
         # Encrypted field filters
         if search_request.first_name:
@@ -128,15 +137,8 @@ class PatientSearchService:
     ) -> Any:
         """Apply advanced search filters."""
         if advanced_filters.age_range:
-            min_age, max_age = advanced_filters.age_range
-            min_date = datetime.utcnow() - timedelta(days=max_age * 365)
-            max_date = datetime.utcnow() - timedelta(days=min_age * 365)
-            query = query.filter(
-                and_(
-                    Patient.date_of_birth_encrypted >= min_date,
-                    Patient.date_of_birth_encrypted <= max_date,
-                )
-            )
+            # Coarse indexed candidates; exact ages are checked post-decrypt
+            query = query.filter(age_range_filter(*advanced_filters.age_range))
 
         if advanced_filters.diagnosis_codes:
             query = query.join(MedicalCondition).filter(
@@ -166,14 +168,24 @@ class PatientSearchService:
         return query
 
     async def _apply_sorting_pagination(
-        self, query: Any, sort_by: str, sort_order: str, skip: int, limit: int
+        self,
+        query: Any,
+        sort_by: str,
+        sort_order: str,
+        skip: int,
+        limit: Optional[int],
+        rank_by: Optional[str] = None,
     ) -> Tuple[Any, int]:
-        """Apply sorting and pagination to query."""
+        """Apply sorting and pagination (none when ``limit`` is None) to query."""
         # Get total count before pagination
         total_count = await self.db.scalar(
             select(func.count()).select_from(query.subquery())
         )
 
+        # Full-text matches sort by relevance first
+        if rank_by:
+            query = query.order_by(text_search_rank(rank_by).desc())
+
         # Apply sorting
         if sort_order == "desc":
             query = query.order_by(getattr(Patient, sort_by).desc())
@@ -185,6 +197,45 @@ class PatientSearchService:
 
         return query, total_count
 
+    async def _exact_age_page(
+        self,
+        query: Any,
+        age_range: Tuple[int, int],
+        skip: int,
+        limit: int,
+        candidates: int,
+    ) -> Tuple[List[PatientResponse], int]:
+        """
+        Page the patients of a sorted candidate query by their exact age.
+
+        Candidates are decrypted in batches, in sort order, until the page
+        is filled. The total is exact when every candidate was checked and
+        otherwise estimated from the share of checked candidates that
+        matched.
+        """
+        min_age, max_age = age_range
+        matches: List[PatientResponse] = []
+        scanned = 0
+        while len(matches) < skip + limit and scanned < candidates:
+            results = await self.db.execute(
+                query.offset(scanned).limit(AGE_CANDIDATE_BATCH)
+            )
+            batch = results.scalars().all()
+            if not batch:
+                break
+            scanned += len(batch)
+            for patient in batch:
+                decrypted = await self.encryption_service.decrypt_patient(patient)
+                age = age_on(decrypted.date_of_birth)
+                if age is not None and min_age <= age <= max_age:
+                    matches.append(decrypted)
+
+        if scanned >= candidates or not scanned:
+            total = len(matches)
+        else:
+            total = max(len(matches), round(len(matches) * candidates / scanned))
+        return matches[skip : skip + limit], total
+
     async def search_patients(
         self, search_request: PatientSearchRequest
     ) -> PatientSearchResponse:
@@ -205,6 +256,7 @@ class PatientSearchService:
                 search_request.sort_order,
                 search_request.skip,
                 search_request.limit,
+                rank_by=search_request.query,
             )
 
             # Execute query
@@ -250,32 +302,52 @@ class PatientSearchService:
             # Apply advanced filters
             query = await self._apply_advanced_filters(query, advanced_filters)
 
-            # Apply sorting and pagination
-            query, total_count = await self._apply_sorting_pagination(
-                query,
-                search_request.sort_by,
-                search_request.sort_order,
-                search_request.skip,
-                search_request.limit,
-            )
+            if advanced_filters.age_range:
+                # The birth-year bucket over-matches, so exact ages are
+                # checked before paging rather than in SQL
+                query, candidates = await self._apply_sorting_pagination(
+                    query,
+                    search_request.sort_by,
+                    search_request.sort_order,
+                    0,
+                    None,
+                    rank_by=search_request.query,
+                )
+                decrypted_patients, total_count = await self._exact_age_page(
+                    query,
+                    advanced_filters.age_range,
+                    search_request.skip,
+                    search_request.limit,
+                    candidates,
+                )
+            else:
+                # Apply sorting and pagination
+                query, total_count = await self._apply_sorting_pagination(
+                    query,
+                    search_request.sort_by,
+                    search_request.sort_order,
+                    search_request.skip,
+                    search_request.limit,
+                    rank_by=search_request.query,
+                )
 
-            # Execute query
-            results = await self.db.execute(query)
-            patients = results.scalars().all()
+                # Execute query
+                results = await self.db.execute(query)
+                patients = results.scalars().all()
+
+                # Decrypt patient data
+                decrypted_patients = [
+                    await self.encryption_service.decrypt_patient(patient)
+                    for patient in patients
+                ]
 
             # Log search operation
             await self._log_search(
                 "advanced",
                 {**search_request.dict(), **advanced_filters.dict()},
-                len(patients),
+                len(decrypted_patients),
             )
 
-            # Decrypt patient data
-            decrypted_patients = [
-                await self.encryption_service.decrypt_patient(patient)
-                for patient in patients
-            ]
-
             return PatientSearchResponse(
                 items=decrypted_patients,
                 total=total_count,
@@ -292,31 +364,81 @@ class PatientSearchService:
         self, bulk_request: BulkSearchRequest
     ) -> Dict[str, List[PatientResponse]]:
         """
-        Perform bulk search for multiple search terms.
+        Perform bulk search for multiple search terms in one round trip.
+
+        Every distinct term is matched against the blind indexes in a single
+        query, each matched patient is decrypted once however many terms hit
+        it, and the whole search writes one audit record. Repeated terms
+        share one entry of the result.
         """
         try:
-            results = {}
-
-            for search_id, search_params in bulk_request.searches.items():
-                # Create search request
-                search_request = PatientSearchRequest(**search_params)
-
-                # Perform search
-                search_results = await self.search_patients(search_request)
-
-                # Store results
-                results[search_id] = search_results.items
+            terms = list(dict.fromkeys(bulk_request.search_terms))
+            rows = search_term_rows(terms, bulk_request.match_type)
+            results: Dict[str, List[PatientResponse]] = {term: [] for term in terms}
+            if not rows:
+                await self._log_search("bulk", self._bulk_audit(bulk_request, {}), 0)
+                return results
+
+            # Organization and territory access control narrow the request
+            organization_ids = bulk_request.organization_ids
+            if self.current_user.get("organization_id"):
+                organization_ids = [self.current_user["organization_id"]]
+            territory_ids = bulk_request.territory_ids
+            if self.current_user.get("primary_territory_id"):
+                territory_ids = [self.current_user["primary_territory_id"]]
+
+            matches = (
+                await self.db.execute(
+                    bulk_match_query(
+                        rows,
+                        bulk_request.max_results_per_term,
+                        organization_ids,
+                        territory_ids,
+                    )
+                )
+            ).all()
+
+            # Decrypt each matched patient once, concurrently
+            patients = {patient.id: patient for _, patient in matches}
+            decrypted = dict(
+                zip(
+                    patients,
+                    await asyncio.gather(
+                        *(
+                            self.encryption_service.decrypt_patient(patient)
+                            for patient in patients.values()
+                        )
+                    ),
+                )
+            )
+            hits: Dict[str, int] = {}
+            for search_id, patient in matches:
+                term = terms[search_id]
+                results[term].append(decrypted[patient.id])
+                hits[term] = hits.get(term, 0) + 1
 
-            # Log bulk search operation
             await self._log_search(
                 "bulk",
-                bulk_request.dict(),
-                sum(len(items) for items in results.values()),
+                self._bulk_audit(bulk_request, hits),
+                len(matches),
             )
-
             return results
 
         except Exception as e:
             # Log error without exposing PHI
             await self._log_search("bulk_error", {"error": str(e)}, 0)
             raise
+
+    @staticmethod
+    def _bulk_audit(
+        bulk_request: BulkSearchRequest, hits: Dict[str, int]
+    ) -> Dict[str, Any]:
+        """Audit parameters of a bulk search (terms are PHI, so counts only)."""
+        return {
+            "term_count": len(bulk_request.search_terms),
+            "match_type": bulk_request.match_type,
+            "max_results_per_term": bulk_request.max_results_per_term,
+            "organization_ids": bulk_request.organization_ids,
+            "territory_ids": bulk_request.territory_ids,
+            "hits_per_term": [hits.get(term, 0) for term in bulk_request.search_terms],
+        }
@@ -5,8 +5,11 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.providers.models import ProviderCreate, ProviderUpdate, ProviderInDB
+from app.core.cache import cached, invalidates
 from app.models.provider import Provider
 
+PROVIDER_CACHE_TTL = 600
+
 
 class ProviderService:
     """Service for managing healthcare providers."""
@@ -25,23 +28,35 @@ class ProviderService:
         await self.db.refresh(provider)
         return provider
 
-    async def get_provider(self, provider_id: UUID) -> Optional[Provider]:
-        """Get a provider by ID."""
+    async def _load_provider(self, provider_id: UUID) -> Optional[Provider]:
+        """Load the provider row itself, bypassing the cache."""
         result = await self.db.execute(
             select(Provider).where(Provider.id == provider_id)
         )
         return result.scalar_one_or_none()
 
+    @cached(
+        "provider",
+        ttl=PROVIDER_CACHE_TTL,
+        key=("provider_id",),
+        tenant_arg=None,
+        schema=ProviderInDB,
+    )
+    async def get_provider(self, provider_id: UUID) -> Optional[ProviderInDB]:
+        """Get a provider by ID."""
+        return await self._load_provider(provider_id)
+
     async def get_providers(self, skip: int = 0, limit: int = 100) -> List[Provider]:
         """Get a list of providers."""
         result = await self.db.execute(select(Provider).offset(skip).limit(limit))
         return result.scalars().all()
 
+    @invalidates("provider", key=("provider_id",), tenant_arg=None)
     async def update_provider(
         self, provider_id: UUID, provider_data: ProviderUpdate
     ) -> Optional[Provider]:
         """Update a provider."""
-        provider = await self.get_provider(provider_id)
+        provider = await self._load_provider(provider_id)
         if not provider:
             return None
 
@@ -52,9 +67,10 @@ class ProviderService:
         await self.db.refresh(provider)
         return provider
 
+    @invalidates("provider", key=("provider_id",), tenant_arg=None)
     async def delete_provider(self, provider_id: UUID) -> bool:
         """Delete a provider."""
-        provider = await self.get_provider(provider_id)
+        provider = await self._load_provider(provider_id)
         if not provider:
             return False
 
@@ -0,0 +1,245 @@
+"""Two-tier read-through cache with request coalescing."""
+
+import asyncio
+import json
+import random
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from app.services.redis_cache import RedisCache
+
+# Registry of named caches so hit ratios can be reported in one place
+_caches: Dict[str, "ReadThroughCache"] = {}
+
+
+class LocalLRU:
+    """Small in-process LRU holding (value, fresh_until, stale_until) entries."""
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[Any, float, float]]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[Tuple[Any, float, float]]:
+        """Return the entry for ``key`` unless it is past its stale window."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[2] <= time.time():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def set(self, key: str, value: Any, fresh_until: float, stale_until: float):
+        """Store an entry, evicting the least recently used one if full."""
+        self._entries[key] = (value, fresh_until, stale_until)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        """Drop ``key`` if present."""
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        self._entries.clear()
+
+
+class ReadThroughCache:
+    """
+    Read-through cache with an in-process LRU in front of Redis.
+
+    Entries are fresh for ``ttl`` seconds (with random jitter so keys written
+    together do not expire together) and may then be served stale for
+    ``stale_ttl`` seconds. Only one coroutine per key runs the loader at a
+    time; concurrent callers wait for its result. A stale value is returned
+    at once while a background task revalidates it.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        ttl: int = 300,
+        stale_ttl: int = 60,
+        local_ttl: int = 15,
+        jitter: float = 0.1,
+        max_local_entries: int = 1024,
+        redis_cache: Optional[RedisCache] = None,
+    ):
+        self.name = name
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.local_ttl = local_ttl
+        self.jitter = jitter
+        self.local = LocalLRU(max_local_entries)
+        self._redis = redis_cache
+        self._inflight: Dict[str, asyncio.Future] = {}
+        # Background revalidations, referenced until done so none is collected
+        self._refreshes: Set[asyncio.Task] = set()
+        self.stats = {
+            "local_hits": 0,
+            "redis_hits": 0,
+            "stale_hits": 0,
+            "misses": 0,
+            "loads": 0,
+            "coalesced": 0,
+            "errors": 0,
+        }
+        _caches[name] = self
+
+    @property
+    def redis(self) -> RedisCache:
+        if self._redis is None:
+            self._redis = RedisCache()
+        return self._redis
+
+    def _key(self, key: str) -> str:
+        return f"rtc:{self.name}:{key}"
+
+    def _jittered(self, seconds: int) -> float:
+        return seconds * (1 + random.uniform(-self.jitter, self.jitter))
+
+    async def _read_redis(self, key: str) -> Optional[Tuple[Any, float, float]]:
+        try:
+            raw = await self.redis.redis.get(self._key(key))
+        except Exception as e:
+            print(f"Error reading read-through cache key {key}: {e}")
+            self.stats["errors"] += 1
+            return None
+        if raw is None:
+            return None
+        envelope = json.loads(raw)
+        return envelope["value"], envelope["fresh_until"], envelope["stale_until"]
+
+    async def _store(self, key: str, value: Any, tags: Optional[List[str]]) -> None:
+        now = time.time()
+        fresh_until = now + self._jittered(self.ttl)
+        stale_until = fresh_until + self.stale_ttl
+        envelope = json.dumps(
+            {"value": value, "fresh_until": fresh_until, "stale_until": stale_until},
+            default=str,
+        )
+        await self.redis.set_tagged(
+            self._key(key), envelope, tags or [], ttl=int(stale_until - now) + 1
+        )
+        # The local tier is kept short so other workers' writes show up soon
+        self.local.set(key, value, min(fresh_until, now + self.local_ttl), stale_until)
+
+    def _begin(self, key: str) -> asyncio.Future:
+        """Register a load of ``key`` that concurrent callers can wait on."""
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        return future
+
+    async def _fill(
+        self,
+        key: str,
+        future: asyncio.Future,
+        loader: Callable[[], Awaitable[Any]],
+        tags: Optional[List[str]],
+    ) -> Any:
+        """Run ``loader`` for a registered load and publish its result."""
+        try:
+            self.stats["loads"] += 1
+            value = await loader()
+            await self._store(key, value, tags)
+            future.set_result(value)
+            return value
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark the exception retrieved when nobody else was waiting
+            future.exception()
+            raise
+        finally:
+            del self._inflight[key]
+
+    async def _load(
+        self, key: str, loader: Callable[[], Awaitable[Any]], tags: Optional[List[str]]
+    ) -> Any:
+        """Run ``loader`` once per key; concurrent callers share the result."""
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.stats["coalesced"] += 1
+            return await asyncio.shield(inflight)
+        return await self._fill(key, self._begin(key), loader, tags)
+
+    def _revalidate(
+        self, key: str, loader: Callable[[], Awaitable[Any]], tags: Optional[List[str]]
+    ) -> None:
+        """Refresh ``key`` in a background task unless a load is running."""
+        if key in self._inflight:
+            return
+        task = asyncio.create_task(self._fill(key, self._begin(key), loader, tags))
+        self._refreshes.add(task)
+        task.add_done_callback(self._revalidated)
+
+    def _revalidated(self, task: asyncio.Task) -> None:
+        self._refreshes.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            print(f"Error revalidating read-through cache: {task.exception()}")
+            self.stats["errors"] += 1
+
+    async def get_or_load(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        tags: Optional[List[str]] = None,
+    ) -> Any:
+        """
+        Return the cached value for ``key``, loading it on a miss.
+
+        Args:
+            key: Cache key, unique within this cache
+            loader: Coroutine function producing the value
+            tags: Redis invalidation tags for the stored entry
+        """
+        now = time.time()
+
+        local_entry = self.local.get(key)
+        if local_entry is not None and local_entry[1] > now:
+            self.stats["local_hits"] += 1
+            return local_entry[0]
+
+        # Another worker may already have refreshed the shared tier
+        entry = await self._read_redis(key)
+        if entry is not None and entry[1] > now:
+            self.stats["redis_hits"] += 1
+            self.local.set(key, entry[0], min(entry[1], now + self.local_ttl), entry[2])
+            return entry[0]
+        entry = entry or local_entry
+
+        if entry is not None and entry[2] > now:
+            # Stale: serve the old value and refresh it off the request path
+            self.stats["stale_hits"] += 1
+            self._revalidate(key, loader, tags)
+            return entry[0]
+
+        self.stats["misses"] += 1
+        return await self._load(key, loader, tags)
+
+    async def invalidate(self, key: str) -> None:
+        """Drop ``key`` from both tiers."""
+        self.local.delete(key)
+        await self.redis.delete(self._key(key))
+
+    def hit_ratio(self) -> float:
+        """Share of lookups served without running the loader."""
+        hits = (
+            self.stats["local_hits"]
+            + self.stats["redis_hits"]
+            + self.stats["stale_hits"]
+            + self.stats["coalesced"]
+        )
+        total = hits + self.stats["loads"]
+        return hits / total if total else 0.0
+
+    def report(self) -> Dict[str, Any]:
+        """Return counters and hit ratio for this cache."""
+        return {**self.stats, "hit_ratio": round(self.hit_ratio(), 4)}
+
+
+def get_cache_stats() -> Dict[str, Dict[str, Any]]:
+    """Return hit/miss statistics for every registered read-through cache."""
+    return {name: cache.report() for name, cache in _caches.items()}
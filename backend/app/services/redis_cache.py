@@ -1,107 +1,404 @@
 """Redis caching service for analytics data."""
 
 import json
-from typing import Any, Dict, Optional, Union
-from redis import Redis
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple, Union
+
+from redis.asyncio import ConnectionPool, Redis
+from redis.asyncio.client import Pipeline
 
 from app.core.config import settings
 
+# A queued command: (method name, positional args, keyword args)
+RedisCommand = Tuple[str, Sequence[Any], Dict[str, Any]]
 
-class RedisCache:
-    """Redis cache manager for analytics data."""
+# Keys are registered in tag sets so invalidation never needs KEYS/SCAN
+TAG_PREFIX = "tag"
+# Per-namespace generation counters embedded in cache keys
+GENERATION_PREFIX = "gen"
+# Members removed per SSCAN/UNLINK step when dropping a tag
+INVALIDATION_CHUNK_SIZE = 1000
+
+# Resolve the current generation and read the versioned key server side
+_GET_VERSIONED = """
+local generation = redis.call('GET', KEYS[1]) or '0'
+return redis.call('GET', ARGV[1] .. ':g' .. generation .. ':' .. ARGV[2])
+"""
+
+_pool: Optional[ConnectionPool] = None
 
-    def __init__(self):
-        """Initialize Redis connection."""
-        self.redis = Redis(
+
+def get_redis_pool() -> ConnectionPool:
+    """Return the process-wide Redis connection pool, creating it lazily."""
+    global _pool
+    if _pool is None:
+        _pool = ConnectionPool(
             host=settings.REDIS_HOST,
             port=settings.REDIS_PORT,
             password=settings.REDIS_PASSWORD,
+            max_connections=settings.REDIS_MAX_CONNECTIONS,
             decode_responses=True,
         )
+    return _pool
+
+
+def get_redis_client() -> Redis:
+    """Return an asyncio Redis client backed by the shared pool."""
+    return Redis(connection_pool=get_redis_pool())
+
+
+async def close_redis_pool() -> None:
+    """Disconnect every pooled connection, e.g. on application shutdown."""
+    global _pool
+    if _pool is not None:
+        await _pool.disconnect()
+        _pool = None
+
+
+def tag_key(tag: str) -> str:
+    """Return the Redis set holding every key registered under ``tag``."""
+    return f"{TAG_PREFIX}:{tag}"
+
+
+def generation_key(namespace: str) -> str:
+    """Return the counter holding the current generation of ``namespace``."""
+    return f"{GENERATION_PREFIX}:{namespace}"
+
+
+def _encode(value: Any) -> Any:
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    return value
+
+
+def _decode(value: Optional[str]) -> Optional[Any]:
+    if value and (value.startswith("{") or value.startswith("[")):
+        return json.loads(value)
+    return value
+
+
+class RedisCache:
+    """Redis cache manager for analytics data."""
+
+    def __init__(self, client: Optional[Redis] = None):
+        """Attach to the shared connection pool."""
+        self.redis = client or get_redis_client()
         self.default_ttl = 3600  # 1 hour default TTL
+        self._get_versioned = self.redis.register_script(_GET_VERSIONED)
+
+    @asynccontextmanager
+    async def pipeline(self, transaction: bool = False) -> AsyncIterator[Pipeline]:
+        """
+        Queue commands and send them in a single round trip on exit.
+
+        With ``transaction=True`` the batch is wrapped in MULTI/EXEC so it
+        is applied atomically.
+        """
+        async with self.redis.pipeline(transaction=transaction) as pipe:
+            yield pipe
+            await pipe.execute()
+
+    async def execute_batch(
+        self, commands: List[RedisCommand], transaction: bool = False
+    ) -> List[Any]:
+        """Run a list of commands in one pipelined round trip."""
+        try:
+            async with self.redis.pipeline(transaction=transaction) as pipe:
+                for name, args, kwargs in commands:
+                    getattr(pipe, name)(*args, **kwargs)
+                return await pipe.execute()
+        except Exception as e:
+            print(f"Error executing cache batch of {len(commands)} commands: {e}")
+            return []
 
-    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> bool:
+    async def set(self, key: str, value: Any, ttl: Optional[int] = None) -> bool:
         """Set a key with optional TTL."""
         try:
-            if isinstance(value, (dict, list)):
-                value = json.dumps(value)
-            return self.redis.set(key, value, ex=ttl or self.default_ttl)
+            return bool(
+                await self.redis.set(key, _encode(value), ex=ttl or self.default_ttl)
+            )
         except Exception as e:
             print(f"Error setting cache key {key}: {e}")
             return False
 
-    def get(self, key: str) -> Optional[Any]:
+    async def get(self, key: str) -> Optional[Any]:
         """Get a value from cache."""
         try:
-            value = self.redis.get(key)
-            if value and value.startswith("{") or value.startswith("["):
-                return json.loads(value)
-            return value
+            return _decode(await self.redis.get(key))
         except Exception as e:
             print(f"Error getting cache key {key}: {e}")
             return None
 
-    def delete(self, key: str) -> bool:
+    async def set_many(self, values: Dict[str, Any], ttl: Optional[int] = None) -> bool:
+        """Set several keys with the same TTL in one round trip."""
+        commands: List[RedisCommand] = [
+            ("set", (key, _encode(value)), {"ex": ttl or self.default_ttl})
+            for key, value in values.items()
+        ]
+        results = await self.execute_batch(commands)
+        return bool(results) and all(results)
+
+    async def get_many(self, keys: List[str]) -> Dict[str, Optional[Any]]:
+        """Get several keys with a single MGET."""
+        if not keys:
+            return {}
+        try:
+            values = await self.redis.mget(keys)
+            return {key: _decode(value) for key, value in zip(keys, values)}
+        except Exception as e:
+            print(f"Error getting {len(keys)} cache keys: {e}")
+            return {key: None for key in keys}
+
+    async def delete(self, key: str) -> bool:
         """Delete a key from cache."""
         try:
-            return bool(self.redis.delete(key))
+            return bool(await self.redis.delete(key))
         except Exception as e:
             print(f"Error deleting cache key {key}: {e}")
             return False
 
-    def delete_pattern(self, pattern: str) -> bool:
-        """Delete all keys matching pattern."""
+    async def delete_pattern(self, pattern: str) -> bool:
+        """
+        Delete all keys matching pattern.
+
+        Walks the keyspace incrementally with SCAN and frees memory with
+        UNLINK so Redis is never blocked; prefer tags or generations for
+        anything on a hot path.
+        """
         try:
-            keys = self.redis.keys(pattern)
-            if keys:
-                return bool(self.redis.delete(*keys))
+            batch: List[str] = []
+            async for key in self.redis.scan_iter(
+                match=pattern, count=INVALIDATION_CHUNK_SIZE
+            ):
+                batch.append(key)
+                if len(batch) >= INVALIDATION_CHUNK_SIZE:
+                    await self.redis.unlink(*batch)
+                    batch = []
+            if batch:
+                await self.redis.unlink(*batch)
             return True
         except Exception as e:
             print(f"Error deleting keys matching {pattern}: {e}")
             return False
 
-    def hincrby(self, key: str, field: str, amount: int = 1) -> bool:
+    async def set_tagged(
+        self,
+        key: str,
+        value: Any,
+        tags: List[str],
+        ttl: Optional[int] = None,
+    ) -> bool:
+        """
+        Set a key and register it in one set per tag, in one round trip.
+
+        Each write refreshes the tag set TTL, so a tag set lives as long as
+        its newest member and never accumulates long-dead keys.
+        """
+        ttl = ttl or self.default_ttl
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                pipe.set(key, _encode(value), ex=ttl)
+                for tag in tags:
+                    pipe.sadd(tag_key(tag), key)
+                    pipe.expire(tag_key(tag), ttl)
+                results = await pipe.execute()
+            return bool(results[0])
+        except Exception as e:
+            print(f"Error setting tagged cache key {key}: {e}")
+            return False
+
+    async def invalidate_tags(self, *tags: str) -> int:
+        """
+        Drop every key registered under any of ``tags``.
+
+        Walks each tag set with SSCAN and UNLINKs members in chunks, so the
+        cost is proportional to the tagged keys rather than the keyspace.
+
+        Returns:
+            Number of keys unlinked
+        """
+        removed = 0
+        try:
+            for tag in tags:
+                batch: List[str] = []
+                async for key in self.redis.sscan_iter(
+                    tag_key(tag), count=INVALIDATION_CHUNK_SIZE
+                ):
+                    batch.append(key)
+                    if len(batch) >= INVALIDATION_CHUNK_SIZE:
+                        removed += await self.redis.unlink(*batch)
+                        batch = []
+                if batch:
+                    removed += await self.redis.unlink(*batch)
+                await self.redis.unlink(tag_key(tag))
+        except Exception as e:
+            print(f"Error invalidating cache tags {tags}: {e}")
+        return removed
+
+    async def get_generation(self, namespace: str) -> int:
+        """Return the current generation of ``namespace``."""
+        try:
+            return int(await self.redis.get(generation_key(namespace)) or 0)
+        except Exception as e:
+            print(f"Error reading generation for {namespace}: {e}")
+            return 0
+
+    async def bump_generation(self, namespace: str) -> int:
+        """
+        Invalidate a whole namespace in O(1) by moving to a new generation.
+
+        Keys of older generations are never read again and age out via TTL.
+        """
+        try:
+            return int(await self.redis.incr(generation_key(namespace)))
+        except Exception as e:
+            print(f"Error bumping generation for {namespace}: {e}")
+            return 0
+
+    async def versioned_key(self, namespace: str, key: str) -> str:
+        """Return ``key`` scoped to the current generation of ``namespace``."""
+        generation = await self.get_generation(namespace)
+        return f"{namespace}:g{generation}:{key}"
+
+    async def get_versioned(self, namespace: str, key: str) -> Optional[Any]:
+        """Read a generation-scoped key in a single round trip."""
+        try:
+            value = await self._get_versioned(
+                keys=[generation_key(namespace)], args=[namespace, key]
+            )
+            return _decode(value)
+        except Exception as e:
+            print(f"Error getting versioned cache key {namespace}:{key}: {e}")
+            return None
+
+    async def hincrby(self, key: str, field: str, amount: int = 1) -> bool:
         """Increment hash field by amount."""
         try:
-            self.redis.hincrby(key, field, amount)
+            await self.redis.hincrby(key, field, amount)
             return True
         except Exception as e:
             print(f"Error incrementing hash field {field}: {e}")
             return False
 
-    def hincrbyfloat(self, key: str, field: str, amount: float) -> bool:
+    async def hincrbyfloat(self, key: str, field: str, amount: float) -> bool:
         """Increment hash field by float amount."""
         try:
-            self.redis.hincrbyfloat(key, field, amount)
+            await self.redis.hincrbyfloat(key, field, amount)
             return True
         except Exception as e:
             print(f"Error incrementing hash field {field}: {e}")
             return False
 
-    def cache_daily_metrics(
+    async def cache_daily_metrics(
         self, org_id: str, date: str, metrics: Dict[str, Union[int, float, Dict]]
     ) -> bool:
-        """Cache daily metrics for fast access."""
-        key = f"daily_metrics:{org_id}:{date}"
-        return self.set(key, metrics, ttl=86400)  # 24 hour TTL
+        """Cache daily metrics tagged by organization and date."""
+        key = await self.versioned_key("daily_metrics", f"{org_id}:{date}")
+        return await self.set_tagged(
+            key, metrics, [f"org:{org_id}", f"date:{date}"], ttl=86400
+        )  # 24 hour TTL
 
-    def get_daily_metrics(
+    async def cache_daily_metrics_batch(
+        self, entries: Dict[Tuple[str, str], Dict[str, Union[int, float, Dict]]]
+    ) -> bool:
+        """Cache daily metrics for many (org_id, date) pairs in one round trip."""
+        generation = await self.get_generation("daily_metrics")
+        ttl = 86400  # 24 hour TTL
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for (org_id, date), metrics in entries.items():
+                    key = f"daily_metrics:g{generation}:{org_id}:{date}"
+                    pipe.set(key, _encode(metrics), ex=ttl)
+                    for tag in (f"org:{org_id}", f"date:{date}"):
+                        pipe.sadd(tag_key(tag), key)
+                        pipe.expire(tag_key(tag), ttl)
+                await pipe.execute()
+            return True
+        except Exception as e:
+            print(f"Error caching {len(entries)} daily metrics entries: {e}")
+            return False
+
+    async def get_daily_metrics(
         self, org_id: str, date: str
     ) -> Optional[Dict[str, Union[int, float, Dict]]]:
         """Get cached daily metrics."""
-        key = f"daily_metrics:{org_id}:{date}"
-        return self.get(key)
+        return await self.get_versioned("daily_metrics", f"{org_id}:{date}")
+
+    async def get_daily_metrics_range(
+        self, org_id: str, dates: List[str]
+    ) -> Dict[str, Optional[Dict[str, Union[int, float, Dict]]]]:
+        """Get cached daily metrics for several dates with one MGET."""
+        generation = await self.get_generation("daily_metrics")
+        keys = [f"daily_metrics:g{generation}:{org_id}:{date}" for date in dates]
+        values = await self.get_many(keys)
+        return {date: values[key] for date, key in zip(dates, keys)}
+
+    async def invalidate_daily_metrics(
+        self, org_id: Optional[str] = None, date: Optional[str] = None
+    ) -> int:
+        """
+        Invalidate cached daily metrics for an organization and/or date.
 
-    def cache_dashboard_data(
+        With neither given, every daily metrics entry is dropped at once by
+        bumping the namespace generation.
+        """
+        tags = []
+        if org_id:
+            tags.append(f"org:{org_id}")
+        if date:
+            tags.append(f"date:{date}")
+        if not tags:
+            await self.bump_generation("daily_metrics")
+            return 0
+        return await self.invalidate_tags(*tags)
+
+    async def cache_dashboard_data(
         self, user_id: str, dashboard_type: str, data: Dict[str, Any]
     ) -> bool:
         """Cache dashboard data for specific user and type."""
-        key = f"dashboard:{dashboard_type}:{user_id}"
-        return self.set(key, data, ttl=300)  # 5 minute TTL
+        key = await self.versioned_key("dashboard", f"{dashboard_type}:{user_id}")
+        return await self.set_tagged(
+            key, data, [f"dashboard:{dashboard_type}", f"user:{user_id}"], ttl=300
+        )  # 5 minute TTL
 
-    def get_dashboard_data(
+    async def cache_dashboards(
+        self, user_id: str, dashboards: Dict[str, Dict[str, Any]]
+    ) -> bool:
+        """Cache several dashboard types for a user in one round trip."""
+        generation = await self.get_generation("dashboard")
+        ttl = 300  # 5 minute TTL
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for dashboard_type, data in dashboards.items():
+                    key = f"dashboard:g{generation}:{dashboard_type}:{user_id}"
+                    pipe.set(key, _encode(data), ex=ttl)
+                    for tag in (f"dashboard:{dashboard_type}", f"user:{user_id}"):
+                        pipe.sadd(tag_key(tag), key)
+                        pipe.expire(tag_key(tag), ttl)
+                await pipe.execute()
+            return True
+        except Exception as e:
+            print(f"Error caching dashboards for {user_id}: {e}")
+            return False
+
+    async def get_dashboard_data(
         self, user_id: str, dashboard_type: str
     ) -> Optional[Dict[str, Any]]:
         """Get cached dashboard data."""
-        key = f"dashboard:{dashboard_type}:{user_id}"
-        return self.get(key)
+        return await self.get_versioned("dashboard", f"{dashboard_type}:{user_id}")
+
+    async def get_dashboards(
+        self, user_id: str, dashboard_types: List[str]
+    ) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Get several cached dashboard types for a user with one MGET."""
+        generation = await self.get_generation("dashboard")
+        keys = [f"dashboard:g{generation}:{t}:{user_id}" for t in dashboard_types]
+        values = await self.get_many(keys)
+        return {t: values[key] for t, key in zip(dashboard_types, keys)}
+
+    async def invalidate_dashboards(self, dashboard_type: Optional[str] = None) -> int:
+        """Invalidate one dashboard type, or every dashboard when omitted."""
+        if dashboard_type is None:
+            await self.bump_generation("dashboard")
+            return 0
+        return await self.invalidate_tags(f"dashboard:{dashboard_type}")
@@ -0,0 +1,127 @@
+"""analytics_dimension_natural_keys
+
+Add natural-key unique constraints to the satisfaction and verification
+performance dimensions so batch ETL loads can upsert them. Duplicate rows
+written by the per-call loader are collapsed onto the lowest id first.
+
+Satisfaction sentiment scores are rounded to one decimal first: the
+natural key buckets the score, which stays exact on the call facts.
+
+The nullable key columns of the verification dimension become NOT NULL
+with defaults: PostgreSQL 13 has no NULLS NOT DISTINCT, so a NULL would
+let the same key be inserted again.
+
+Revision ID: b3d58f2e61a7
+Revises: 7c1e2a9d4b10
+Create Date: 2026-10-18 12:00:00.000000+00:00
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "b3d58f2e61a7"
+down_revision: Union[str, None] = "7c1e2a9d4b10"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# table -> (natural key columns, referencing fact column)
+DIMENSIONS = {
+    "dim_patient_satisfaction": (
+        [
+            "satisfaction_level",
+            "feedback_category",
+            "response_channel",
+            "sentiment_score",
+        ],
+        "satisfaction_id",
+    ),
+    "dim_verification_performance": (
+        [
+            "verification_type",
+            "response_time_category",
+            "error_type",
+            "retry_count",
+            "sla_category",
+        ],
+        "verification_performance_id",
+    ),
+}
+
+# table -> {continuous key column: decimals it is keyed at}
+KEY_ROUNDING = {
+    "dim_patient_satisfaction": {"sentiment_score": 1},
+}
+
+# table -> {nullable key column: (type, default)}
+NOT_NULL_DEFAULTS = {
+    "dim_verification_performance": {
+        "error_type": (sa.String(50), "''"),
+        "retry_count": (sa.Integer(), "0"),
+    },
+}
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    has_facts = inspector.has_table("fact_ivr_call")
+
+    for table, (columns, fact_column) in DIMENSIONS.items():
+        if not inspector.has_table(table):
+            continue
+        key = ", ".join(columns)
+
+        for column, (type_, default) in NOT_NULL_DEFAULTS.get(table, {}).items():
+            op.execute(
+                f"UPDATE {table} SET {column} = {default} WHERE {column} IS NULL"
+            )
+            op.alter_column(
+                table,
+                column,
+                existing_type=type_,
+                nullable=False,
+                server_default=sa.text(default),
+            )
+
+        for column, digits in KEY_ROUNDING.get(table, {}).items():
+            op.execute(
+                f"UPDATE {table} SET {column} = round({column}::numeric, {digits})"
+            )
+
+        # Map every duplicate onto the first row sharing its natural key
+        op.execute(
+            f"CREATE TEMP TABLE {table}_remap ON COMMIT DROP AS "
+            f"SELECT id, min(id) OVER (PARTITION BY {key}) AS keep_id "
+            f"FROM {table}"
+        )
+        if has_facts:
+            op.execute(
+                f"UPDATE fact_ivr_call f SET {fact_column} = r.keep_id "
+                f"FROM {table}_remap r "
+                f"WHERE f.{fact_column} = r.id AND r.id <> r.keep_id"
+            )
+        op.execute(
+            f"DELETE FROM {table} d USING {table}_remap r "
+            f"WHERE d.id = r.id AND r.id <> r.keep_id"
+        )
+
+        op.create_unique_constraint(f"uq_{table}_natural_key", table, columns)
+
+
+def downgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    for table in DIMENSIONS:
+        if not inspector.has_table(table):
+            continue
+        op.drop_constraint(f"uq_{table}_natural_key", table, type_="unique")
+        for column, (type_, _) in NOT_NULL_DEFAULTS.get(table, {}).items():
+            op.alter_column(
+                table,
+                column,
+                existing_type=type_,
+                nullable=True,
+                server_default=None,
+            )
@@ -0,0 +1,71 @@
+"""analytics_read_model_refresh
+
+Add the queue that order, patient and provider writes use to request a
+refresh of their organization's analytics read models, and make
+organization_metrics one row per organization so refreshes can upsert it.
+Duplicate organization_metrics rows keep the most recently updated one.
+
+Revision ID: f4c8e1a6d3b2
+Revises: e2a7c5d9b4f1
+Create Date: 2026-10-18 18:00:00.000000+00:00
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+# revision identifiers, used by Alembic.
+revision: str = "f4c8e1a6d3b2"
+down_revision: Union[str, None] = "e2a7c5d9b4f1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+
+    if inspector.has_table("organization_metrics"):
+        op.execute(
+            "DELETE FROM organization_metrics m USING ("
+            "SELECT id, row_number() OVER ("
+            "PARTITION BY organization_id ORDER BY updated_at DESC NULLS LAST"
+            ") AS rank FROM organization_metrics"
+            ") ranked WHERE m.id = ranked.id AND ranked.rank > 1"
+        )
+        op.create_unique_constraint(
+            "uq_organization_metrics_org", "organization_metrics", ["organization_id"]
+        )
+
+    op.create_table(
+        "analytics_refresh_queue",
+        sa.Column("organization_id", UUID(as_uuid=True), primary_key=True),
+        sa.Column(
+            "enqueued_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+        ),
+    )
+    op.create_index(
+        "idx_analytics_refresh_queue_enqueued",
+        "analytics_refresh_queue",
+        ["enqueued_at"],
+    )
+    # Populate the read models on the first refresher pass
+    if inspector.has_table("organizations"):
+        op.execute(
+            "INSERT INTO analytics_refresh_queue (organization_id) "
+            "SELECT id FROM organizations"
+        )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_analytics_refresh_queue_enqueued", "analytics_refresh_queue")
+    op.drop_table("analytics_refresh_queue")
+    inspector = sa.inspect(op.get_bind())
+    if inspector.has_table("organization_metrics"):
+        op.drop_constraint(
+            "uq_organization_metrics_org", "organization_metrics", type_="unique"
+        )
@@ -0,0 +1,44 @@
+"""etl_backfill_checkpoints
+
+Add the checkpoint table the partitioned ETL backfill runner records each
+completed (partition day, organization) unit in, so an interrupted run can
+resume where it stopped.
+
+Revision ID: e2a7c5d9b4f1
+Revises: d6f1b8a3c2e4
+Create Date: 2026-10-18 17:00:00.000000+00:00
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "e2a7c5d9b4f1"
+down_revision: Union[str, None] = "d6f1b8a3c2e4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "etl_backfill_checkpoints",
+        sa.Column("run_id", sa.String(64), primary_key=True),
+        sa.Column("partition_date", sa.Date(), primary_key=True),
+        sa.Column("organization_id", sa.Integer(), primary_key=True),
+        sa.Column("status", sa.String(16), nullable=False),
+        sa.Column("fact_rows", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("elapsed_ms", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column(
+            "completed_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("etl_backfill_checkpoints")
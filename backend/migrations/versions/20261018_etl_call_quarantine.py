@@ -0,0 +1,52 @@
+"""etl_call_quarantine
+
+Add the quarantine table that keeps call records rejected by ETL data
+quality checks, with the error flags that rejected them, for review and
+replay.
+
+Revision ID: d6f1b8a3c2e4
+Revises: c9a4e7d2f5b3
+Create Date: 2026-10-18 16:00:00.000000+00:00
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB
+
+# revision identifiers, used by Alembic.
+revision: str = "d6f1b8a3c2e4"
+down_revision: Union[str, None] = "c9a4e7d2f5b3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "etl_call_quarantine",
+        sa.Column("id", sa.BigInteger(), primary_key=True),
+        sa.Column("call_id", sa.String(36), nullable=True),
+        sa.Column("error_code", sa.Integer(), nullable=False),
+        sa.Column("errors", JSONB, nullable=False),
+        sa.Column("payload", JSONB, nullable=False),
+        sa.Column(
+            "quarantined_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+        ),
+        sa.Column("resolved_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index(
+        "idx_call_quarantine_quarantined_at",
+        "etl_call_quarantine",
+        ["quarantined_at"],
+    )
+    op.create_index("idx_call_quarantine_call_id", "etl_call_quarantine", ["call_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("idx_call_quarantine_call_id", "etl_call_quarantine")
+    op.drop_index("idx_call_quarantine_quarantined_at", "etl_call_quarantine")
+    op.drop_table("etl_call_quarantine")
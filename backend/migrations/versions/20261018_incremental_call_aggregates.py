@@ -0,0 +1,121 @@
+"""incremental_call_aggregates
+
+Add the daily and hourly IVR call aggregate tables keyed by their grain, and
+the per-partition watermarks used to re-aggregate only changed partitions.
+
+Revision ID: c9a4e7d2f5b3
+Revises: b3d58f2e61a7
+Create Date: 2026-10-18 15:00:00.000000+00:00
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB
+
+# revision identifiers, used by Alembic.
+revision: str = "c9a4e7d2f5b3"
+down_revision: Union[str, None] = "b3d58f2e61a7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _metric_columns() -> list:
+    return [
+        sa.Column(
+            "organization_id",
+            sa.Integer(),
+            sa.ForeignKey("dim_organization.id"),
+            nullable=False,
+        ),
+        sa.Column("territory_id", sa.String(36), nullable=False),
+        sa.Column("total_calls", sa.Integer(), nullable=False),
+        sa.Column("avg_call_duration", sa.Float(), nullable=False),
+        sa.Column("call_success_rate", sa.Float(), nullable=False),
+        sa.Column("verification_success_rate", sa.Float(), nullable=False),
+        sa.Column("avg_verification_time", sa.Float(), nullable=False),
+    ]
+
+
+def _updated_at() -> sa.Column:
+    return sa.Column(
+        "updated_at",
+        sa.DateTime(timezone=True),
+        server_default=sa.func.now(),
+        nullable=True,
+    )
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+
+    if inspector.has_table("agg_daily_metrics"):
+        # Tables from the pre-alembic schema only lack the grain constraint
+        op.create_unique_constraint(
+            "uq_agg_daily_metrics_grain",
+            "agg_daily_metrics",
+            ["date", "organization_id", "territory_id"],
+        )
+    else:
+        op.create_table(
+            "agg_daily_metrics",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("date", sa.Date(), nullable=False),
+            *_metric_columns(),
+            sa.Column("approval_rate_by_provider", JSONB, server_default="{}"),
+            sa.Column("territory_approval_rates", JSONB, server_default="{}"),
+            _updated_at(),
+            sa.UniqueConstraint(
+                "date",
+                "organization_id",
+                "territory_id",
+                name="uq_agg_daily_metrics_grain",
+            ),
+        )
+    op.create_index(
+        "idx_agg_daily_metrics_org_date",
+        "agg_daily_metrics",
+        ["organization_id", "date"],
+    )
+
+    op.create_table(
+        "agg_hourly_metrics",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("hour", sa.DateTime(), nullable=False),
+        *_metric_columns(),
+        _updated_at(),
+        sa.UniqueConstraint(
+            "hour",
+            "organization_id",
+            "territory_id",
+            name="uq_agg_hourly_metrics_grain",
+        ),
+    )
+    op.create_index(
+        "idx_agg_hourly_metrics_org_hour",
+        "agg_hourly_metrics",
+        ["organization_id", "hour"],
+    )
+
+    op.create_table(
+        "etl_aggregation_watermarks",
+        sa.Column("partition_date", sa.Date(), primary_key=True),
+        sa.Column("last_fact_id", sa.BigInteger(), nullable=False),
+        sa.Column("row_count", sa.BigInteger(), nullable=False),
+        sa.Column(
+            "aggregated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("etl_aggregation_watermarks")
+    op.drop_index("idx_agg_hourly_metrics_org_hour", "agg_hourly_metrics")
+    op.drop_table("agg_hourly_metrics")
+    # Upgrade creates the daily table on fresh databases; its index and
+    # grain constraint go with it
+    op.drop_table("agg_daily_metrics")
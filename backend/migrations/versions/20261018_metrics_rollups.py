@@ -0,0 +1,78 @@
+"""metrics_rollups
+
+Add the daily and weekly rollup tier of hourly_metrics, so raw hourly rows
+can be expired after the retention window and coarse range queries can read
+pre-aggregated buckets.
+
+Revision ID: a8d3f6b1e9c7
+Revises: f4c8e1a6d3b2
+Create Date: 2026-10-18 19:00:00.000000+00:00
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+# revision identifiers, used by Alembic.
+revision: str = "a8d3f6b1e9c7"
+down_revision: Union[str, None] = "f4c8e1a6d3b2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+METRIC_COLUMNS = (
+    "total_orders",
+    "total_patients",
+    "total_providers",
+    "total_facilities",
+    "total_users",
+    "active_users",
+    "new_orders",
+    "completed_orders",
+    "cancelled_orders",
+    "new_patients",
+    "new_providers",
+)
+
+
+def upgrade() -> None:
+    op.create_table(
+        "metrics_rollups",
+        sa.Column("id", sa.BigInteger(), primary_key=True),
+        sa.Column(
+            "organization_id",
+            UUID(as_uuid=True),
+            sa.ForeignKey("organizations.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("resolution", sa.String(8), nullable=False),
+        sa.Column("bucket_start", sa.DateTime(timezone=True), nullable=False),
+        *(
+            sa.Column(name, sa.Integer(), nullable=False, server_default="0")
+            for name in METRIC_COLUMNS
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+        ),
+        sa.UniqueConstraint(
+            "organization_id",
+            "resolution",
+            "bucket_start",
+            name="uq_metrics_rollups_bucket",
+        ),
+    )
+    # Weekly rollups and retention scan one resolution by time
+    op.create_index(
+        "idx_metrics_rollups_resolution_bucket",
+        "metrics_rollups",
+        ["resolution", "bucket_start"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_metrics_rollups_resolution_bucket", "metrics_rollups")
+    op.drop_table("metrics_rollups")
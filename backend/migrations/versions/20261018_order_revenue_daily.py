@@ -0,0 +1,52 @@
+"""order_revenue_daily
+
+Add the order revenue summary maintained from order writes, so revenue can
+be aggregated without decrypting order totals. Existing orders are folded in
+by scripts/rebuild_order_revenue.py, which needs the encryption key.
+
+Revision ID: c3a8e5f2b9d4
+Revises: b7f2d4e9a1c6
+Create Date: 2026-10-19 00:00:00.000000+00:00
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+# revision identifiers, used by Alembic.
+revision: str = "c3a8e5f2b9d4"
+down_revision: Union[str, None] = "b7f2d4e9a1c6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "order_revenue_daily",
+        sa.Column(
+            "organization_id",
+            UUID(as_uuid=True),
+            sa.ForeignKey("organizations.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("day", sa.Date(), primary_key=True),
+        sa.Column("provider_id", UUID(as_uuid=True), primary_key=True),
+        sa.Column("status", sa.String(20), primary_key=True),
+        sa.Column("order_count", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column(
+            "total_amount", sa.Numeric(14, 2), nullable=False, server_default="0"
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.func.now(),
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("order_revenue_daily")
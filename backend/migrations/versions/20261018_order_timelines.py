@@ -0,0 +1,282 @@
+"""order_timelines
+
+Add a per-order timeline projection kept current by triggers on orders,
+order_status_history, shipments and shipment_tracking, and backfill it from
+the existing rows.
+
+Revision ID: b7f2d4e9a1c6
+Revises: a4e9c2d7f1b8
+Create Date: 2026-10-18 23:30:00.000000+00:00
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+
+# revision identifiers, used by Alembic.
+revision: str = "b7f2d4e9a1c6"
+down_revision: Union[str, None] = "a4e9c2d7f1b8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# One event document per source row, shared by the triggers and the backfill
+EVENT_FUNCTIONS = [
+    """
+    CREATE OR REPLACE FUNCTION order_timeline_status_event(h order_status_history)
+    RETURNS jsonb AS $$
+        SELECT jsonb_build_object(
+            'type', 'status',
+            'id', h.id,
+            'at', h.created_at,
+            'from', h.from_status,
+            'to', h.to_status,
+            'by', h.changed_by_id,
+            'reason', h.reason
+        )
+    $$ LANGUAGE sql STABLE
+    """,
+    """
+    CREATE OR REPLACE FUNCTION order_timeline_shipment_event(s shipments)
+    RETURNS jsonb AS $$
+        SELECT jsonb_build_object(
+            'type', 'shipment',
+            'id', s.id,
+            'at', coalesce(s.updated_at, s.created_at),
+            'carrier', s.carrier_id,
+            'service_type', s.service_type,
+            'tracking_number', s.tracking_number,
+            'status', s.status
+        )
+    $$ LANGUAGE sql STABLE
+    """,
+    """
+    CREATE OR REPLACE FUNCTION order_timeline_tracking_event(t shipment_tracking)
+    RETURNS jsonb AS $$
+        SELECT jsonb_build_object(
+            'type', 'tracking',
+            'id', t.id,
+            'at', t.occurred_at,
+            'shipment_id', t.shipment_id,
+            'status', t.status,
+            'location', t.location,
+            'description', t.description
+        )
+    $$ LANGUAGE sql STABLE
+    """,
+]
+
+# Append an event (if any), set the status or a shipment's latest state (if
+# given) and bump the version, creating the timeline on first use
+APPEND_FUNCTION = """
+    CREATE OR REPLACE FUNCTION order_timeline_append(
+        p_order_id uuid, p_event jsonb, p_status text, p_shipment jsonb
+    ) RETURNS void AS $$
+    BEGIN
+        INSERT INTO order_timelines (
+            order_id, organization_id, status, version, shipments, events,
+            updated_at
+        )
+        SELECT
+            o.id,
+            o.organization_id,
+            coalesce(p_status, o.status::text),
+            1,
+            CASE WHEN p_shipment IS NULL THEN '{}'::jsonb
+                ELSE jsonb_build_object(p_shipment ->> 'id', p_shipment) END,
+            CASE WHEN p_event IS NULL THEN '[]'::jsonb
+                ELSE jsonb_build_array(p_event) END,
+            now()
+        FROM orders o
+        WHERE o.id = p_order_id
+        ON CONFLICT (order_id) DO UPDATE SET
+            status = coalesce(p_status, order_timelines.status),
+            shipments = order_timelines.shipments || EXCLUDED.shipments,
+            events = order_timelines.events || EXCLUDED.events,
+            version = order_timelines.version + 1,
+            updated_at = EXCLUDED.updated_at;
+    END
+    $$ LANGUAGE plpgsql
+"""
+
+TRIGGER_FUNCTIONS = [
+    """
+    CREATE OR REPLACE FUNCTION order_timelines_order_update() RETURNS trigger AS $$
+    BEGIN
+        PERFORM order_timeline_append(NEW.id, NULL, NEW.status::text, NULL);
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION order_timelines_status_update() RETURNS trigger AS $$
+    BEGIN
+        PERFORM order_timeline_append(
+            NEW.order_id, order_timeline_status_event(NEW), NEW.to_status::text, NULL
+        );
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION order_timelines_shipment_update() RETURNS trigger AS $$
+    DECLARE
+        event jsonb := order_timeline_shipment_event(NEW);
+    BEGIN
+        PERFORM order_timeline_append(NEW.order_id, event, NULL, event);
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION order_timelines_tracking_update() RETURNS trigger AS $$
+    BEGIN
+        PERFORM order_timeline_append(
+            (SELECT order_id FROM shipments WHERE id = NEW.shipment_id),
+            order_timeline_tracking_event(NEW),
+            NULL,
+            NULL
+        );
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+]
+
+TRIGGERS = [
+    """
+    CREATE TRIGGER order_timelines_order_insert
+    AFTER INSERT ON orders
+    FOR EACH ROW EXECUTE FUNCTION order_timelines_order_update()
+    """,
+    """
+    CREATE TRIGGER order_timelines_order_update
+    AFTER UPDATE OF status ON orders
+    FOR EACH ROW WHEN (OLD.status IS DISTINCT FROM NEW.status)
+    EXECUTE FUNCTION order_timelines_order_update()
+    """,
+    """
+    CREATE TRIGGER order_timelines_status_update
+    AFTER INSERT ON order_status_history
+    FOR EACH ROW EXECUTE FUNCTION order_timelines_status_update()
+    """,
+    """
+    CREATE TRIGGER order_timelines_shipment_insert
+    AFTER INSERT ON shipments
+    FOR EACH ROW EXECUTE FUNCTION order_timelines_shipment_update()
+    """,
+    """
+    CREATE TRIGGER order_timelines_shipment_update
+    AFTER UPDATE OF status, tracking_number ON shipments
+    FOR EACH ROW WHEN (
+        OLD.status IS DISTINCT FROM NEW.status
+        OR OLD.tracking_number IS DISTINCT FROM NEW.tracking_number
+    )
+    EXECUTE FUNCTION order_timelines_shipment_update()
+    """,
+    """
+    CREATE TRIGGER order_timelines_tracking_update
+    AFTER INSERT ON shipment_tracking
+    FOR EACH ROW EXECUTE FUNCTION order_timelines_tracking_update()
+    """,
+]
+
+# Shipments contribute their current state as one event each
+BACKFILL_SQL = """
+    INSERT INTO order_timelines (
+        order_id, organization_id, status, version, shipments, events, updated_at
+    )
+    SELECT
+        o.id,
+        o.organization_id,
+        o.status::text,
+        count(e.event) + 1,
+        coalesce(
+            (
+                SELECT jsonb_object_agg(s.id::text, order_timeline_shipment_event(s))
+                FROM shipments s
+                WHERE s.order_id = o.id
+            ),
+            '{}'::jsonb
+        ),
+        coalesce(
+            jsonb_agg(e.event ORDER BY e.at) FILTER (WHERE e.event IS NOT NULL),
+            '[]'::jsonb
+        ),
+        now()
+    FROM orders o
+    LEFT JOIN (
+        SELECT h.order_id, h.created_at AS at, order_timeline_status_event(h) AS event
+        FROM order_status_history h
+        UNION ALL
+        SELECT s.order_id, coalesce(s.updated_at, s.created_at),
+            order_timeline_shipment_event(s)
+        FROM shipments s
+        UNION ALL
+        SELECT s.order_id, t.occurred_at, order_timeline_tracking_event(t)
+        FROM shipment_tracking t
+        JOIN shipments s ON s.id = t.shipment_id
+    ) e ON e.order_id = o.id
+    GROUP BY o.id
+"""
+
+DROPPED_TRIGGERS = {
+    "order_timelines_order_insert": "orders",
+    "order_timelines_order_update": "orders",
+    "order_timelines_status_update": "order_status_history",
+    "order_timelines_shipment_insert": "shipments",
+    "order_timelines_shipment_update": "shipments",
+    "order_timelines_tracking_update": "shipment_tracking",
+}
+
+
+def upgrade() -> None:
+    op.create_table(
+        "order_timelines",
+        sa.Column(
+            "order_id",
+            UUID(as_uuid=True),
+            sa.ForeignKey("orders.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("organization_id", UUID(as_uuid=True), nullable=False),
+        sa.Column("status", sa.String(50), nullable=True),
+        sa.Column("version", sa.BigInteger(), nullable=False, server_default="1"),
+        sa.Column("shipments", JSONB(), nullable=False, server_default=sa.text("'{}'")),
+        sa.Column("events", JSONB(), nullable=False, server_default=sa.text("'[]'")),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.func.now(),
+        ),
+    )
+    for statement in EVENT_FUNCTIONS + [APPEND_FUNCTION] + TRIGGER_FUNCTIONS:
+        op.execute(statement)
+    # Backfilled before the triggers exist, under a lock so no event is missed
+    op.execute(
+        "LOCK TABLE orders, order_status_history, shipments, shipment_tracking "
+        "IN SHARE MODE"
+    )
+    op.execute(BACKFILL_SQL)
+    for statement in TRIGGERS:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    for trigger, table in DROPPED_TRIGGERS.items():
+        op.execute(f"DROP TRIGGER IF EXISTS {trigger} ON {table}")
+    for function in (
+        "order_timelines_order_update()",
+        "order_timelines_status_update()",
+        "order_timelines_shipment_update()",
+        "order_timelines_tracking_update()",
+        "order_timeline_append(uuid, jsonb, text, jsonb)",
+        "order_timeline_status_event(order_status_history)",
+        "order_timeline_shipment_event(shipments)",
+        "order_timeline_tracking_event(shipment_tracking)",
+    ):
+        op.execute(f"DROP FUNCTION IF EXISTS {function}")
+    op.drop_table("order_timelines")
@@ -0,0 +1,192 @@
+"""partition_audit_tables
+
+Convert the audit tables to monthly range partitions on created_at so
+expired months can be detached instead of bulk-deleted. Rows outside the
+monthly partitions land in a DEFAULT partition instead of failing.
+
+Revision ID: 7c1e2a9d4b10
+Revises: 40606d3453b9
+Create Date: 2026-10-18 09:00:00.000000+00:00
+
+"""
+
+import re
+from datetime import datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.services.audit_partition_service import (
+    DEFAULT_MONTHS_AHEAD,
+    PARTITIONED_AUDIT_TABLES,
+    add_months,
+    default_partition_name,
+    month_start,
+    partition_bounds,
+    partition_name,
+)
+
+# revision identifiers, used by Alembic.
+revision: str = "7c1e2a9d4b10"
+down_revision: Union[str, None] = "40606d3453b9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _existing_tables() -> list:
+    inspector = sa.inspect(op.get_bind())
+    return [t for t in PARTITIONED_AUDIT_TABLES if inspector.has_table(t)]
+
+
+def _foreign_keys(table: str) -> list:
+    """Return (name, definition) of the foreign keys declared on ``table``."""
+    rows = op.get_bind().execute(
+        sa.text(
+            "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+            "WHERE conrelid = to_regclass(:table) AND contype = 'f'"
+        ),
+        {"table": table},
+    )
+    return list(rows)
+
+
+def _indexes(table: str) -> list:
+    """Return (name, definition) of the secondary indexes on ``table``."""
+    rows = op.get_bind().execute(
+        sa.text(
+            "SELECT i.indexrelid::regclass::text, pg_get_indexdef(i.indexrelid) "
+            "FROM pg_index i WHERE i.indrelid = to_regclass(:table) "
+            "AND NOT i.indisprimary AND NOT EXISTS ("
+            "SELECT 1 FROM pg_constraint c WHERE c.conindid = i.indexrelid)"
+        ),
+        {"table": table},
+    )
+    return list(rows)
+
+
+def _unique_constraints(table: str) -> list:
+    """Return (name, definition) of the UNIQUE constraints on ``table``."""
+    rows = op.get_bind().execute(
+        sa.text(
+            "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+            "WHERE conrelid = to_regclass(:table) AND contype = 'u'"
+        ),
+        {"table": table},
+    )
+    return list(rows)
+
+
+def _with_partition_key(definition: str) -> str:
+    """Add created_at to a unique key, which partitioned tables require."""
+    if not definition.lstrip().upper().startswith(("UNIQUE", "CREATE UNIQUE")):
+        return definition
+    match = re.search(r"\(([^()]*)\)", definition)
+    if match is None or "created_at" in match.group(1):
+        return definition
+    start, end = match.span(1)
+    return f"{definition[:start]}{match.group(1)}, created_at{definition[end:]}"
+
+
+def _move_keys(source: str, target: str, indexes: list, uniques: list) -> None:
+    """Move secondary indexes and unique constraints from source to target."""
+    for name, definition in uniques:
+        op.execute(f'ALTER TABLE "{source}" DROP CONSTRAINT "{name}"')
+        op.execute(
+            f'ALTER TABLE "{target}" ADD CONSTRAINT "{name}" '
+            f"{_with_partition_key(definition)}"
+        )
+    for name, definition in indexes:
+        # Definitions name the table as it was when they were read
+        op.execute(f"DROP INDEX {name}")
+        op.execute(_with_partition_key(definition))
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    current = month_start(datetime.utcnow().date())
+
+    for table in _existing_tables():
+        legacy = f"{table}_legacy"
+        foreign_keys = _foreign_keys(table)
+        indexes = _indexes(table)
+        uniques = _unique_constraints(table)
+
+        op.execute(f'ALTER TABLE "{table}" RENAME TO "{legacy}"')
+        op.execute(
+            f'ALTER TABLE "{legacy}" RENAME CONSTRAINT "{table}_pkey" '
+            f'TO "{legacy}_pkey"'
+        )
+        # Indexes are moved by _move_keys: LIKE ... INCLUDING INDEXES would also
+        # copy the id-only primary key, which a partitioned table rejects
+        op.execute(
+            f'CREATE TABLE "{table}" (LIKE "{legacy}" '
+            f"INCLUDING DEFAULTS INCLUDING CONSTRAINTS) "
+            f"PARTITION BY RANGE (created_at)"
+        )
+        op.execute(
+            f'ALTER TABLE "{table}" ADD CONSTRAINT "{table}_pkey" '
+            f"PRIMARY KEY (id, created_at)"
+        )
+        for name, definition in foreign_keys:
+            op.execute(f'ALTER TABLE "{legacy}" DROP CONSTRAINT "{name}"')
+            op.execute(f'ALTER TABLE "{table}" ADD CONSTRAINT "{name}" {definition}')
+        _move_keys(legacy, table, indexes, uniques)
+
+        # Rows without a timestamp cannot be routed; keep them as current
+        op.execute(f'UPDATE "{legacy}" SET created_at = now() WHERE created_at IS NULL')
+
+        # Cover every month that already holds rows plus the months ahead
+        oldest = bind.execute(
+            sa.text(f'SELECT min(created_at) FROM "{legacy}"')
+        ).scalar()
+        month = month_start(oldest.date()) if oldest else current
+        last = add_months(current, DEFAULT_MONTHS_AHEAD)
+        while month <= last:
+            start, end = partition_bounds(month)
+            op.execute(
+                f'CREATE TABLE "{partition_name(table, month)}" '
+                f'PARTITION OF "{table}" '
+                f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+            )
+            month = add_months(month, 1)
+        op.execute(
+            f'CREATE TABLE "{default_partition_name(table)}" '
+            f'PARTITION OF "{table}" DEFAULT'
+        )
+
+        op.execute(f'INSERT INTO "{table}" SELECT * FROM "{legacy}"')
+        op.execute(f'DROP TABLE "{legacy}"')
+
+    op.execute('CREATE SCHEMA IF NOT EXISTS "audit_archive"')
+
+
+def downgrade() -> None:
+    for table in _existing_tables():
+        partitioned = f"{table}_partitioned"
+        foreign_keys = _foreign_keys(table)
+        indexes = _indexes(table)
+        uniques = _unique_constraints(table)
+
+        op.execute(f'ALTER TABLE "{table}" RENAME TO "{partitioned}"')
+        op.execute(
+            f'ALTER TABLE "{partitioned}" RENAME CONSTRAINT "{table}_pkey" '
+            f'TO "{partitioned}_pkey"'
+        )
+        op.execute(
+            f'CREATE TABLE "{table}" (LIKE "{partitioned}" '
+            f"INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+        )
+        op.execute(
+            f'ALTER TABLE "{table}" ADD CONSTRAINT "{table}_pkey" PRIMARY KEY (id)'
+        )
+        for name, definition in foreign_keys:
+            op.execute(f'ALTER TABLE "{partitioned}" DROP CONSTRAINT "{name}"')
+            op.execute(f'ALTER TABLE "{table}" ADD CONSTRAINT "{name}" {definition}')
+        _move_keys(partitioned, table, indexes, uniques)
+
+        op.execute(f'INSERT INTO "{table}" SELECT * FROM "{partitioned}"')
+        # Dropping the parent drops every attached partition with it
+        op.execute(f'DROP TABLE "{partitioned}"')
+
+    # Archived partitions are left in place; they hold retained audit data
@@ -0,0 +1,40 @@
+"""patient_birth_year_bucket
+
+Add a coarse 5-year birth-year bucket to patients, indexed with the
+organization, so age-range cohort filters use an index instead of comparing
+encrypted dates of birth. The bucket is derived from the decrypted date, so
+existing rows are filled by running ``scripts/reindex_patients.py`` after
+this migration.
+
+Revision ID: c7a2f5e8d1b4
+Revises: b3e9d1c7a5f2
+Create Date: 2026-10-18 20:30:00.000000+00:00
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "c7a2f5e8d1b4"
+down_revision: Union[str, None] = "b3e9d1c7a5f2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "patients", sa.Column("birth_year_bucket", sa.SmallInteger(), nullable=True)
+    )
+    op.create_index(
+        "idx_patients_org_birth_year_bucket",
+        "patients",
+        ["organization_id", "birth_year_bucket"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_patients_org_birth_year_bucket", table_name="patients")
+    op.drop_column("patients", "birth_year_bucket")
@@ -0,0 +1,38 @@
+"""patient_blind_indexes
+
+Add keyed HMAC blind-index columns for first name, last name and date of
+birth to patients, so encrypted PHI can be matched by equality (and bulk
+searches run as one indexed join). The digests need the application key,
+so existing rows are indexed by running ``scripts/reindex_patients.py``
+after this migration (with BLIND_INDEX_KEY set).
+
+Revision ID: b3e9d1c7a5f2
+Revises: a8d3f6b1e9c7
+Create Date: 2026-10-18 20:00:00.000000+00:00
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "b3e9d1c7a5f2"
+down_revision: Union[str, None] = "a8d3f6b1e9c7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BLIND_INDEX_COLUMNS = ("first_name_bidx", "last_name_bidx", "dob_bidx")
+
+
+def upgrade() -> None:
+    for column in BLIND_INDEX_COLUMNS:
+        op.add_column("patients", sa.Column(column, sa.String(64), nullable=True))
+        op.create_index(f"idx_patients_{column}", "patients", [column])
+
+
+def downgrade() -> None:
+    for column in reversed(BLIND_INDEX_COLUMNS):
+        op.drop_index(f"idx_patients_{column}", table_name="patients")
+        op.drop_column("patients", column)
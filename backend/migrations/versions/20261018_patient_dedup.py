@@ -0,0 +1,102 @@
+"""patient_dedup
+
+Add the phone blind index used as a dedup blocking key, an updated_at index
+for incremental runs, the patient_duplicate_candidates review table and the
+patient_dedup_runs watermark table.
+
+Revision ID: d5b8e2f1a7c3
+Revises: c7a2f5e8d1b4
+Create Date: 2026-10-18 21:00:00.000000+00:00
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+# revision identifiers, used by Alembic.
+revision: str = "d5b8e2f1a7c3"
+down_revision: Union[str, None] = "c7a2f5e8d1b4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("patients", sa.Column("phone_bidx", sa.String(64), nullable=True))
+    op.create_index("idx_patients_phone_bidx", "patients", ["phone_bidx"])
+    op.create_index("idx_patients_updated_at", "patients", ["updated_at"])
+
+    op.create_table(
+        "patient_duplicate_candidates",
+        sa.Column("id", UUID(as_uuid=True), primary_key=True),
+        sa.Column(
+            "organization_id",
+            UUID(as_uuid=True),
+            sa.ForeignKey("organizations.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column(
+            "patient_id",
+            UUID(as_uuid=True),
+            sa.ForeignKey("patients.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column(
+            "duplicate_id",
+            UUID(as_uuid=True),
+            sa.ForeignKey("patients.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("score", sa.Float(), nullable=False),
+        sa.Column("field_scores", sa.JSON(), nullable=True),
+        sa.Column("blocking_keys", sa.ARRAY(sa.String()), nullable=True),
+        sa.Column("status", sa.String(20), nullable=False, server_default="pending"),
+        sa.Column(
+            "resolved_by_id",
+            UUID(as_uuid=True),
+            sa.ForeignKey("users.id"),
+            nullable=True,
+        ),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+        ),
+        sa.UniqueConstraint(
+            "patient_id", "duplicate_id", name="uq_patient_duplicate_candidates_pair"
+        ),
+    )
+    op.create_index(
+        "idx_patient_duplicate_candidates_org_status_score",
+        "patient_duplicate_candidates",
+        ["organization_id", "status", "score"],
+    )
+
+    op.create_table(
+        "patient_dedup_runs",
+        sa.Column("id", UUID(as_uuid=True), primary_key=True),
+        sa.Column("since", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("started_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("pairs_scored", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("candidates", sa.Integer(), nullable=False, server_default="0"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("patient_dedup_runs")
+    op.drop_index(
+        "idx_patient_duplicate_candidates_org_status_score",
+        table_name="patient_duplicate_candidates",
+    )
+    op.drop_table("patient_duplicate_candidates")
+    op.drop_index("idx_patients_updated_at", table_name="patients")
+    op.drop_index("idx_patients_phone_bidx", table_name="patients")
+    op.drop_column("patients", "phone_bidx")
@@ -0,0 +1,96 @@
+"""patient_search_vector
+
+Add a trigger-maintained tsvector over the non-PHI patient fields
+(external_id, tags, status, notes) with a GIN index, backfilled in batches.
+
+Revision ID: e8c4a1f6b2d9
+Revises: d5b8e2f1a7c3
+Create Date: 2026-10-18 21:30:00.000000+00:00
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import TSVECTOR
+
+# revision identifiers, used by Alembic.
+revision: str = "e8c4a1f6b2d9"
+down_revision: Union[str, None] = "d5b8e2f1a7c3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 50_000
+
+# Identifiers rank above tags, tags above status, status above free text
+SEARCH_VECTOR_FUNCTION = """
+    CREATE OR REPLACE FUNCTION patient_search_vector(
+        external_id text, tags text[], status text, notes text
+    ) RETURNS tsvector AS $$
+        SELECT
+            setweight(to_tsvector('english', coalesce(external_id, '')), 'A')
+            || setweight(
+                to_tsvector('english', coalesce(array_to_string(tags, ' '), '')), 'B'
+            )
+            || setweight(to_tsvector('english', coalesce(status, '')), 'C')
+            || setweight(to_tsvector('english', coalesce(notes, '')), 'D')
+    $$ LANGUAGE sql STABLE
+"""
+
+TRIGGER_FUNCTION = """
+    CREATE OR REPLACE FUNCTION patients_search_vector_update() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector := patient_search_vector(
+            NEW.external_id, NEW.tags, NEW.status, NEW.notes
+        );
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+"""
+
+TRIGGER = """
+    CREATE TRIGGER patients_search_vector_update
+    BEFORE INSERT OR UPDATE OF external_id, tags, status, notes ON patients
+    FOR EACH ROW EXECUTE FUNCTION patients_search_vector_update()
+"""
+
+BACKFILL_SQL = """
+    UPDATE patients
+    SET search_vector = patient_search_vector(external_id, tags, status, notes)
+    WHERE id IN (
+        SELECT id FROM patients WHERE search_vector IS NULL LIMIT :batch
+    )
+"""
+
+
+def upgrade() -> None:
+    op.add_column("patients", sa.Column("search_vector", TSVECTOR(), nullable=True))
+    op.execute(SEARCH_VECTOR_FUNCTION)
+    op.execute(TRIGGER_FUNCTION)
+    op.execute(TRIGGER)
+
+    # Batched so no single statement rewrites the whole table
+    bind = op.get_bind()
+    while True:
+        result = bind.execute(sa.text(BACKFILL_SQL), {"batch": BACKFILL_BATCH_SIZE})
+        if result.rowcount < BACKFILL_BATCH_SIZE:
+            break
+
+    # Built after the backfill, which is much faster than maintaining it
+    op.create_index(
+        "idx_patients_search_vector",
+        "patients",
+        ["search_vector"],
+        postgresql_using="gin",
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_patients_search_vector", table_name="patients")
+    op.execute("DROP TRIGGER IF EXISTS patients_search_vector_update ON patients")
+    op.execute("DROP FUNCTION IF EXISTS patients_search_vector_update()")
+    op.execute(
+        "DROP FUNCTION IF EXISTS patient_search_vector(text, text[], text, text)"
+    )
+    op.drop_column("patients", "search_vector")
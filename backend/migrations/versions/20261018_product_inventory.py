@@ -0,0 +1,58 @@
+"""product_inventory
+
+Add per-territory product stock with a reserved quantity, so order creation
+can reserve every line item with one conditional UPDATE.
+
+Revision ID: f1d7b3a9c5e2
+Revises: e8c4a1f6b2d9
+Create Date: 2026-10-18 22:00:00.000000+00:00
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+# revision identifiers, used by Alembic.
+revision: str = "f1d7b3a9c5e2"
+down_revision: Union[str, None] = "e8c4a1f6b2d9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "product_inventory",
+        sa.Column("id", UUID(as_uuid=True), primary_key=True),
+        sa.Column(
+            "product_id",
+            UUID(as_uuid=True),
+            sa.ForeignKey("products.id"),
+            nullable=False,
+        ),
+        sa.Column("territory_id", UUID(as_uuid=True), nullable=False),
+        sa.Column("quantity", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column(
+            "reserved_quantity", sa.Integer(), nullable=False, server_default="0"
+        ),
+        sa.Column("reorder_point", sa.Integer(), nullable=False, server_default="10"),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.func.now(),
+        ),
+        sa.UniqueConstraint(
+            "product_id", "territory_id", name="uq_product_inventory_territory"
+        ),
+        sa.CheckConstraint(
+            "reserved_quantity >= 0 AND reserved_quantity <= quantity",
+            name="ck_product_inventory_reserved",
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("product_inventory")
@@ -0,0 +1,82 @@
+"""product_inventory_shards
+
+Spread each product's territory stock over counter shards, so concurrent
+reservations of a popular product lock different rows. Existing stock is
+moved into shard 0; the first inventory compaction spreads it out.
+
+Revision ID: a4e9c2d7f1b8
+Revises: f1d7b3a9c5e2
+Create Date: 2026-10-18 23:00:00.000000+00:00
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+# revision identifiers, used by Alembic.
+revision: str = "a4e9c2d7f1b8"
+down_revision: Union[str, None] = "f1d7b3a9c5e2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Matches the INVENTORY_SHARDS default
+SHARDS = 8
+
+
+def upgrade() -> None:
+    op.create_table(
+        "product_inventory_shards",
+        sa.Column(
+            "product_id",
+            UUID(as_uuid=True),
+            sa.ForeignKey("products.id"),
+            primary_key=True,
+        ),
+        sa.Column("territory_id", UUID(as_uuid=True), primary_key=True),
+        sa.Column("shard", sa.SmallInteger(), primary_key=True),
+        sa.Column("quantity", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column(
+            "reserved_quantity", sa.Integer(), nullable=False, server_default="0"
+        ),
+        sa.CheckConstraint(
+            "reserved_quantity >= 0 AND reserved_quantity <= quantity",
+            name="ck_product_inventory_shards_reserved",
+        ),
+    )
+    op.execute(
+        f"""
+        INSERT INTO product_inventory_shards (
+            product_id, territory_id, shard, quantity, reserved_quantity
+        )
+        SELECT
+            i.product_id,
+            i.territory_id,
+            s.shard,
+            CASE WHEN s.shard = 0 THEN i.quantity ELSE 0 END,
+            CASE WHEN s.shard = 0 THEN i.reserved_quantity ELSE 0 END
+        FROM product_inventory i
+        CROSS JOIN generate_series(0, {SHARDS - 1}) AS s(shard)
+        """
+    )
+
+
+def downgrade() -> None:
+    # Fold the live shard counts back into the inventory rows
+    op.execute(
+        """
+        UPDATE product_inventory i
+        SET quantity = t.quantity, reserved_quantity = t.reserved_quantity
+        FROM (
+            SELECT product_id, territory_id,
+                sum(quantity) AS quantity,
+                sum(reserved_quantity) AS reserved_quantity
+            FROM product_inventory_shards
+            GROUP BY product_id, territory_id
+        ) t
+        WHERE i.product_id = t.product_id AND i.territory_id = t.territory_id
+        """
+    )
+    op.drop_table("product_inventory_shards")
@@ -0,0 +1,42 @@
+"""patient_territory
+
+Map the territory a patient is served in, indexed with the organization,
+so bulk patient search can be scoped to the caller's territories. Databases
+that already carry ``patients.territory_id`` keep their column and index.
+
+Revision ID: d2f6a9c4e8b1
+Revises: c3a8e5f2b9d4
+Create Date: 2026-10-19 06:00:00.000000+00:00
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+# revision identifiers, used by Alembic.
+revision: str = "d2f6a9c4e8b1"
+down_revision: Union[str, None] = "c3a8e5f2b9d4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    columns = {c["name"] for c in sa.inspect(op.get_bind()).get_columns("patients")}
+    if "territory_id" not in columns:
+        op.add_column(
+            "patients", sa.Column("territory_id", UUID(as_uuid=True), nullable=True)
+        )
+    op.create_index(
+        "idx_patients_territory_org",
+        "patients",
+        ["territory_id", "organization_id"],
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_patients_territory_org", table_name="patients")
+    op.drop_column("patients", "territory_id")
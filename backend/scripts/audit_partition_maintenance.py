@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Audit Partition Maintenance Script for Healthcare IVR Platform.
+Pre-creates future monthly audit partitions, detaches partitions older than
+the hot window (AUDIT_HOT_RETENTION_DAYS) and exports them to cold storage,
+where audit reports keep reading them. Intended to run daily from cron.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+
+from app.core.database import async_session_factory
+from app.services.audit_archive_service import AuditArchiver
+from app.services.audit_partition_service import (
+    DEFAULT_MONTHS_AHEAD,
+    AuditPartitionService,
+)
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger("audit_partition_maintenance")
+
+
+async def run(months_ahead: int, skip_retention: bool, skip_archive: bool) -> dict:
+    """Run partition creation, retention enforcement and archival."""
+    async with async_session_factory() as db:
+        service = AuditPartitionService(db)
+        summary = {"created": await service.ensure_partitions(months_ahead)}
+        if not skip_retention:
+            summary["detached"] = await service.detach_expired_partitions()
+        if not skip_archive:
+            summary["archived"] = await AuditArchiver(db).archive_pending()
+        return summary
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Maintain audit table partitions")
+    parser.add_argument(
+        "--months-ahead",
+        type=int,
+        default=DEFAULT_MONTHS_AHEAD,
+        help="Number of future monthly partitions to keep ready",
+    )
+    parser.add_argument(
+        "--skip-retention",
+        action="store_true",
+        help="Only create partitions, do not detach ones past the hot window",
+    )
+    parser.add_argument(
+        "--skip-archive",
+        action="store_true",
+        help="Leave detached partitions in Postgres instead of exporting them",
+    )
+    args = parser.parse_args()
+
+    try:
+        summary = asyncio.run(
+            run(args.months_ahead, args.skip_retention, args.skip_archive)
+        )
+        print(json.dumps(summary, indent=2))
+    except Exception as e:
+        logger.error(f"Partition maintenance failed: {str(e)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Cache Invalidation Benchmark for Healthcare IVR Platform.
+Populates a large daily-metrics keyspace and compares tag-based, generation
+and KEYS-pattern invalidation, including how long Redis stays unresponsive
+to other clients while each strategy runs.
+
+Run against a disposable Redis instance only: it flushes the database.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import time
+from datetime import date, timedelta
+from typing import Any, Awaitable, Dict
+
+from app.services.redis_cache import RedisCache, get_redis_client, tag_key
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger("cache_invalidation_benchmark")
+
+PIPELINE_SIZE = 10_000
+
+
+async def populate(cache: RedisCache, keys: int, orgs: int, days: int) -> None:
+    """Write ``keys`` tagged daily-metrics entries spread over orgs and days."""
+    start = date(2024, 1, 1)
+    payload = json.dumps({"total_calls": 1, "avg_call_duration": 42.0})
+    written = 0
+    began = time.perf_counter()
+    while written < keys:
+        async with cache.redis.pipeline(transaction=False) as pipe:
+            for i in range(written, min(written + PIPELINE_SIZE, keys)):
+                org_id = f"org-{i % orgs}"
+                day = (start + timedelta(days=(i // orgs) % days)).isoformat()
+                key = f"daily_metrics:g0:{org_id}:{day}:{i}"
+                pipe.set(key, payload, ex=86400)
+                pipe.sadd(tag_key(f"org:{org_id}"), key)
+                pipe.sadd(tag_key(f"date:{day}"), key)
+            await pipe.execute()
+        written = min(written + PIPELINE_SIZE, keys)
+        if written % 1_000_000 == 0:
+            logger.info(f"Populated {written:,} keys")
+    logger.info(f"Populated {keys:,} keys in {time.perf_counter() - began:.1f}s")
+
+
+async def measure(label: str, operation: Awaitable[Any]) -> Dict[str, Any]:
+    """Time ``operation`` while probing Redis latency from a second client."""
+    probe = get_redis_client()
+    worst = 0.0
+    done = asyncio.Event()
+
+    async def ping_loop() -> None:
+        nonlocal worst
+        while not done.is_set():
+            sent = time.perf_counter()
+            await probe.ping()
+            worst = max(worst, time.perf_counter() - sent)
+            await asyncio.sleep(0.001)
+
+    pinger = asyncio.create_task(ping_loop())
+    began = time.perf_counter()
+    result = await operation
+    elapsed = time.perf_counter() - began
+    done.set()
+    await pinger
+
+    summary = {
+        "strategy": label,
+        "seconds": round(elapsed, 4),
+        "max_ping_ms": round(worst * 1000, 2),
+        "result": result,
+    }
+    logger.info(json.dumps(summary))
+    return summary
+
+
+async def run(keys: int, orgs: int, days: int, include_keys: bool) -> list:
+    """Populate the keyspace and benchmark each invalidation strategy."""
+    cache = RedisCache()
+    await cache.redis.flushdb()
+    await populate(cache, keys, orgs, days)
+
+    results = [
+        await measure(
+            "tag:date", cache.invalidate_tags(f"date:{date(2024, 1, 1).isoformat()}")
+        ),
+        await measure("tag:org", cache.invalidate_tags("org:org-0")),
+        await measure("generation", cache.bump_generation("daily_metrics")),
+    ]
+    if include_keys:
+        # The legacy path: a single KEYS call over the whole keyspace
+        async def keys_delete() -> int:
+            matched = await cache.redis.keys("daily_metrics:*:2024-01-02:*")
+            if matched:
+                await cache.redis.delete(*matched)
+            return len(matched)
+
+        results.append(await measure("keys-pattern", keys_delete()))
+    return results
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Benchmark cache invalidation")
+    parser.add_argument("--keys", type=int, default=10_000_000)
+    parser.add_argument("--orgs", type=int, default=500)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument(
+        "--include-keys",
+        action="store_true",
+        help="Also time the legacy KEYS-pattern delete (blocks Redis)",
+    )
+    args = parser.parse_args()
+
+    try:
+        results = asyncio.run(run(args.keys, args.orgs, args.days, args.include_keys))
+        print(json.dumps(results, indent=2))
+    except Exception as e:
+        logger.error(f"Benchmark failed: {str(e)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
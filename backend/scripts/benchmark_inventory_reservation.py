@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Inventory Reservation Concurrency Benchmark for Healthcare IVR Platform.
+Runs concurrent workers reserving one hot product, each holding its
+transaction open for --hold-ms like the rest of order creation does, and
+compares a single counter row (the old row-lock behaviour) with sharded
+counters. Throughput should scale with workers up to the shard count.
+
+Requires the product_inventory_shards migration. The scratch product and
+its stock are deleted afterwards.
+"""
+
+import argparse
+import json
+import logging
+import sys
+import threading
+import time
+from typing import Any, Dict, List
+from uuid import uuid4
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import get_sync_url
+from app.core.exceptions import ValidationError
+from app.services.inventory_shards import ShardedInventory
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger("inventory_reservation_benchmark")
+
+DEFAULT_WORKERS = [1, 2, 4, 8, 16]
+# Far more than any run can reserve, so only lock contention is measured
+STOCK = 10_000_000
+
+TOTALS_SQL = """
+    SELECT coalesce(sum(quantity), 0), coalesce(sum(reserved_quantity), 0)
+    FROM product_inventory_shards
+    WHERE product_id = :product_id AND territory_id = :territory_id
+"""
+
+
+def reset_stock(engine, product_id, territory_id, shards: int) -> None:
+    """Recreate the product's shards holding ``STOCK`` free units."""
+    with Session(engine) as db:
+        db.execute(
+            text("DELETE FROM product_inventory_shards WHERE product_id = :product_id"),
+            {"product_id": product_id},
+        )
+        ShardedInventory(db, shards=shards).add_stock(product_id, territory_id, STOCK)
+        db.commit()
+
+
+def run_case(
+    engine,
+    product_id,
+    territory_id,
+    shards: int,
+    workers: int,
+    seconds: float,
+    hold_ms: int,
+) -> Dict[str, Any]:
+    """Reserve from ``workers`` threads for ``seconds`` and report throughput."""
+    reset_stock(engine, product_id, territory_id, shards)
+    deadline = time.perf_counter() + seconds
+    counts: List[int] = [0] * workers
+    failures: List[int] = [0] * workers
+
+    def worker(index: int) -> None:
+        with Session(engine) as db:
+            inventory = ShardedInventory(db, shards=shards)
+            while time.perf_counter() < deadline:
+                try:
+                    inventory.reserve(territory_id, {product_id: 1})
+                    db.execute(text("SELECT pg_sleep(:hold)"), {"hold": hold_ms / 1000})
+                    db.commit()
+                    counts[index] += 1
+                except ValidationError:
+                    db.rollback()
+                    failures[index] += 1
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(workers)]
+    began = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - began
+
+    with engine.connect() as conn:
+        quantity, reserved = conn.execute(
+            text(TOTALS_SQL),
+            {"product_id": product_id, "territory_id": territory_id},
+        ).one()
+    reservations = sum(counts)
+    return {
+        "shards": shards,
+        "workers": workers,
+        "reservations": reservations,
+        "failures": sum(failures),
+        "per_second": round(reservations / elapsed, 1),
+        # Every committed reservation is counted exactly once
+        "consistent": reserved == reservations and quantity == STOCK,
+    }
+
+
+def run(
+    workers: List[int], shards: int, seconds: float, hold_ms: int
+) -> Dict[str, Any]:
+    """Time every worker count against one counter row and against shards."""
+    engine = create_engine(get_sync_url(), pool_size=max(workers) + 1, max_overflow=0)
+    product_id, territory_id = uuid4(), uuid4()
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "INSERT INTO products (id, name, sku, unit_price, is_active, "
+                "created_at) VALUES (:id, 'Benchmark SKU', :sku, 1, true, now())"
+            ),
+            {"id": product_id, "sku": f"BENCH-{product_id.hex[:12]}"},
+        )
+    try:
+        summary: Dict[str, Any] = {"hold_ms": hold_ms, "seconds": seconds, "runs": []}
+        for shard_count in (1, shards):
+            for count in workers:
+                result = run_case(
+                    engine,
+                    product_id,
+                    territory_id,
+                    shard_count,
+                    count,
+                    seconds,
+                    hold_ms,
+                )
+                logger.info(json.dumps(result))
+                summary["runs"].append(result)
+        single = {r["workers"]: r for r in summary["runs"] if r["shards"] == 1}
+        summary["speedup"] = {
+            str(r["workers"]): round(
+                r["per_second"] / max(single[r["workers"]]["per_second"], 0.1), 2
+            )
+            for r in summary["runs"]
+            if r["shards"] == shards
+        }
+        return summary
+    finally:
+        with engine.begin() as conn:
+            for table in ("product_inventory_shards", "product_inventory"):
+                conn.execute(
+                    text(f"DELETE FROM {table} WHERE product_id = :product_id"),
+                    {"product_id": product_id},
+                )
+            conn.execute(
+                text("DELETE FROM products WHERE id = :product_id"),
+                {"product_id": product_id},
+            )
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark concurrent inventory reservations"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        action="append",
+        help="Concurrent workers to time (repeatable)",
+    )
+    parser.add_argument("--shards", type=int, default=settings.INVENTORY_SHARDS)
+    parser.add_argument(
+        "--seconds", type=float, default=10, help="Duration of each run"
+    )
+    parser.add_argument(
+        "--hold-ms",
+        type=int,
+        default=5,
+        help="Time each reservation's transaction stays open",
+    )
+    args = parser.parse_args()
+
+    try:
+        summary = run(
+            args.workers or DEFAULT_WORKERS, args.shards, args.seconds, args.hold_ms
+        )
+        print(json.dumps(summary, indent=2))
+    except Exception as e:
+        logger.error(f"Benchmark failed: {str(e)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Patient Full-Text Search Benchmark for Healthcare IVR Platform.
+Loads synthetic non-PHI patient fields into a scratch table maintained by
+the production search_vector trigger function, then compares ranked GIN
+full-text search with the ILIKE scan it replaces.
+
+Requires the patient_search_vector migration. The scratch table is dropped
+afterwards unless --keep is given.
+"""
+
+import argparse
+import json
+import logging
+import sys
+import time
+from typing import Any, Dict, List
+
+from sqlalchemy import create_engine, text
+
+from app.core.database import get_sync_url
+from app.services.patient_index import SEARCH_CONFIG
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger("patient_search_benchmark")
+
+TABLE = "bench_patient_search"
+LOAD_BATCH_SIZE = 500_000
+DEFAULT_QUERIES = ["diabetic", "wound care", "MRN-0004242", "inactive -pending"]
+
+CREATE_SQL = f"""
+    CREATE UNLOGGED TABLE {TABLE} (
+        id bigint PRIMARY KEY,
+        external_id varchar(100),
+        status varchar(20),
+        notes text,
+        tags varchar[],
+        search_vector tsvector
+    );
+    CREATE TRIGGER {TABLE}_search_vector_update
+    BEFORE INSERT OR UPDATE OF external_id, tags, status, notes ON {TABLE}
+    FOR EACH ROW EXECUTE FUNCTION patients_search_vector_update();
+"""
+
+# Notes and tags drawn from small vocabularies, like real intake notes
+LOAD_SQL = f"""
+    INSERT INTO {TABLE} (id, external_id, status, notes, tags)
+    SELECT
+        n,
+        'MRN-' || lpad(n::text, 7, '0'),
+        (ARRAY['active', 'inactive', 'pending'])[1 + n % 3],
+        (ARRAY[
+            'Follow-up for diabetic foot ulcer',
+            'Chronic wound care, dressing changed weekly',
+            'Referred for skin substitute evaluation',
+            'Post-surgical incision healing well',
+            'Venous leg ulcer, compression therapy'
+        ])[1 + n % 5] || ' visit ' || (n % 97),
+        ARRAY[(ARRAY['diabetes', 'vascular', 'surgical', 'pressure'])[1 + n % 4]]
+    FROM generate_series(:start, :stop) AS n
+"""
+
+FTS_SQL = f"""
+    SELECT id, ts_rank_cd(search_vector, q) AS rank
+    FROM {TABLE}, websearch_to_tsquery('{SEARCH_CONFIG}', :query) AS q
+    WHERE search_vector @@ q
+    ORDER BY rank DESC, id
+    LIMIT :limit
+"""
+
+ILIKE_SQL = f"""
+    SELECT id FROM {TABLE}
+    WHERE notes ILIKE :pattern
+        OR external_id ILIKE :pattern
+        OR array_to_string(tags, ' ') ILIKE :pattern
+    ORDER BY id
+    LIMIT :limit
+"""
+
+
+def explain(conn, sql: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    """Run ``sql`` under EXPLAIN ANALYZE and return its timings."""
+    plan = conn.execute(
+        text(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {sql}"), params
+    ).scalar()[0]
+    return {
+        "execution_ms": round(plan["Execution Time"], 2),
+        "planning_ms": round(plan["Planning Time"], 2),
+        "rows": plan["Plan"]["Actual Rows"],
+        "uses_gin": "idx_" + TABLE + "_search_vector" in json.dumps(plan),
+    }
+
+
+def load(conn, rows: int) -> Dict[str, float]:
+    """Insert ``rows`` rows through the trigger, then build the GIN index."""
+    began = time.perf_counter()
+    for start in range(1, rows + 1, LOAD_BATCH_SIZE):
+        stop = min(start + LOAD_BATCH_SIZE - 1, rows)
+        conn.execute(text(LOAD_SQL), {"start": start, "stop": stop})
+        logger.info(f"Loaded {stop:,} rows")
+    loaded = time.perf_counter() - began
+
+    began = time.perf_counter()
+    conn.execute(
+        text(
+            f"CREATE INDEX idx_{TABLE}_search_vector ON {TABLE} "
+            "USING gin (search_vector)"
+        )
+    )
+    conn.execute(text(f"ANALYZE {TABLE}"))
+    indexed = time.perf_counter() - began
+    return {
+        "load_seconds": round(loaded, 1),
+        "rows_per_second": round(rows / loaded),
+        "index_seconds": round(indexed, 1),
+    }
+
+
+def run(rows: int, queries: List[str], limit: int, keep: bool) -> Dict[str, Any]:
+    """Load the scratch table and time each query both ways."""
+    engine = create_engine(get_sync_url())
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text(f"DROP TABLE IF EXISTS {TABLE}"))
+        for statement in CREATE_SQL.split(";"):
+            if statement.strip():
+                conn.execute(text(statement))
+        try:
+            summary = {"rows": rows, **load(conn, rows), "queries": []}
+            for query in queries:
+                result = {
+                    "query": query,
+                    "fts": explain(conn, FTS_SQL, {"query": query, "limit": limit}),
+                    "ilike": explain(
+                        conn, ILIKE_SQL, {"pattern": f"%{query}%", "limit": limit}
+                    ),
+                }
+                logger.info(json.dumps(result))
+                summary["queries"].append(result)
+            return summary
+        finally:
+            if not keep:
+                conn.execute(text(f"DROP TABLE IF EXISTS {TABLE}"))
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Benchmark patient text search")
+    parser.add_argument("--rows", type=int, default=5_000_000)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument(
+        "--query",
+        action="append",
+        dest="queries",
+        help="Search text to time (repeatable)",
+    )
+    parser.add_argument(
+        "--keep", action="store_true", help="Keep the scratch table afterwards"
+    )
+    args = parser.parse_args()
+
+    try:
+        summary = run(args.rows, args.queries or DEFAULT_QUERIES, args.limit, args.keep)
+        print(json.dumps(summary, indent=2))
+    except Exception as e:
+        logger.error(f"Benchmark failed: {str(e)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+ETL Backfill Script for Healthcare IVR Platform.
+Rebuilds IVR call aggregates (and optionally latency sketches) for a date
+range in parallel, one (partition day, organization) unit per task. Each
+completed unit is checkpointed, so re-running with the same --run-id resumes
+an interrupted backfill.
+"""
+
+import argparse
+import json
+import logging
+import sys
+import time
+from datetime import date, timedelta
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.analytics.backfill import DEFAULT_WORKERS, BackfillProgress, BackfillRunner
+from app.core.database import get_sync_url
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger("etl_backfill")
+
+# Minimum seconds between progress log lines
+PROGRESS_INTERVAL = 10.0
+
+
+def progress_logger(interval: float = PROGRESS_INTERVAL):
+    """Return an on_progress callback that logs at most every ``interval``."""
+    last = {"logged": 0.0}
+
+    def log(progress: BackfillProgress) -> None:
+        now = time.monotonic()
+        done = progress.completed_units + progress.failed_units
+        if now - last["logged"] < interval and done < progress.total_units:
+            return
+        last["logged"] = now
+        eta = progress.eta_seconds
+        logger.info(
+            f"{done}/{progress.total_units - progress.skipped_units} units, "
+            f"{progress.failed_units} failed, "
+            f"{progress.rows_per_second:,.0f} rows/s, "
+            f"ETA {f'{eta:,.0f}s' if eta is not None else 'unknown'}"
+        )
+
+    return log
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Backfill IVR call aggregates")
+    parser.add_argument(
+        "--start", type=date.fromisoformat, required=True, help="First day"
+    )
+    parser.add_argument(
+        "--end",
+        type=date.fromisoformat,
+        required=True,
+        help="Last day (inclusive)",
+    )
+    parser.add_argument(
+        "--org",
+        type=int,
+        action="append",
+        dest="organization_ids",
+        help="Only backfill this dim_organization id (repeatable)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help="Worker processes, each with its own database connection",
+    )
+    parser.add_argument(
+        "--run-id",
+        help="Checkpoint name; reuse it to resume (default: backfill-START-END)",
+    )
+    parser.add_argument(
+        "--sketches",
+        action="store_true",
+        help="Also rebuild the latency percentile sketches in Redis",
+    )
+    args = parser.parse_args()
+
+    run_id = args.run_id or f"backfill-{args.start}-{args.end}"
+    database_url = get_sync_url()
+    session = sessionmaker(bind=create_engine(database_url))()
+    try:
+        runner = BackfillRunner(
+            session,
+            run_id,
+            workers=args.workers,
+            rebuild_sketches=args.sketches,
+            database_url=database_url,
+        )
+        progress = runner.run(
+            args.start,
+            args.end + timedelta(days=1),
+            args.organization_ids,
+            on_progress=progress_logger(),
+        )
+        print(json.dumps({"run_id": run_id, **progress.as_dict()}, indent=2))
+        if progress.failed_units:
+            sys.exit(1)
+    except Exception as e:
+        logger.error(f"Backfill failed: {str(e)}")
+        sys.exit(1)
+    finally:
+        session.close()
+
+
+if __name__ == "__main__":
+    main()
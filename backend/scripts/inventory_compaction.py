@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Inventory Compaction Script for Healthcare IVR Platform.
+Evens free stock out across each product's counter shards and refreshes
+the product_inventory totals. Intended to run every few minutes from cron.
+"""
+
+import argparse
+import json
+import logging
+import sys
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.core.database import get_sync_url
+from app.services.inventory_shards import COMPACT_BATCH_SIZE, ShardedInventory
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger("inventory_compaction")
+
+
+def run(batch_size: int) -> dict:
+    """Compact every product's shards."""
+    with Session(create_engine(get_sync_url())) as db:
+        return ShardedInventory(db).compact(batch_size=batch_size)
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Compact inventory counter shards")
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=COMPACT_BATCH_SIZE,
+        help="Products locked and compacted per statement",
+    )
+    args = parser.parse_args()
+
+    try:
+        summary = run(args.batch_size)
+        print(json.dumps(summary, indent=2))
+    except Exception as e:
+        logger.error(f"Inventory compaction failed: {str(e)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
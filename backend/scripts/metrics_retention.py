@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Metrics Retention Script for Healthcare IVR Platform.
+Rolls raw hourly metrics into daily and weekly buckets and deletes raw
+hourly rows and daily rollups that are past their retention window.
+Intended to run hourly from cron.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+
+from app.analytics.retention import MetricsRetentionEngine, RetentionPolicy
+from app.core.database import async_session_factory
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger("metrics_retention")
+
+
+async def run(policy: RetentionPolicy, skip_expiry: bool) -> dict:
+    """Roll up every tier and optionally enforce retention."""
+    async with async_session_factory() as db:
+        engine = MetricsRetentionEngine(db, policy)
+        if skip_expiry:
+            return {
+                "daily_buckets": await engine.rollup_daily(),
+                "weekly_buckets": await engine.rollup_weekly(),
+            }
+        return await engine.run()
+
+
+def main():
+    """Main entry point."""
+    defaults = RetentionPolicy()
+    parser = argparse.ArgumentParser(description="Roll up and expire hourly metrics")
+    parser.add_argument(
+        "--raw-days",
+        type=int,
+        default=defaults.raw_days,
+        help="Days of raw hourly metrics to keep",
+    )
+    parser.add_argument(
+        "--daily-days",
+        type=int,
+        default=defaults.daily_days,
+        help="Days of daily rollups to keep",
+    )
+    parser.add_argument(
+        "--skip-expiry",
+        action="store_true",
+        help="Only roll up, do not delete expired rows",
+    )
+    args = parser.parse_args()
+
+    try:
+        summary = asyncio.run(
+            run(RetentionPolicy(args.raw_days, args.daily_days), args.skip_expiry)
+        )
+        print(json.dumps(summary, indent=2))
+    except Exception as e:
+        logger.error(f"Metrics retention failed: {str(e)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
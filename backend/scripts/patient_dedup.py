@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Patient Dedup Script for Healthcare IVR Platform.
+Finds likely duplicate patients among records created or changed since the
+last run and stores them for review. Intended to run nightly from cron.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+
+from app.core.config import settings
+from app.core.database import async_session_factory
+from app.services.patient_dedup import PatientDedupEngine
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger("patient_dedup")
+
+
+async def run(full: bool, threshold: float, batch_size: int) -> dict:
+    """Run one dedup pass."""
+    async with async_session_factory() as db:
+        engine = PatientDedupEngine(db, threshold=threshold, batch_size=batch_size)
+        return await engine.run(full=full)
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Find likely duplicate patients")
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Consider every patient, not only those changed since the last run",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=settings.PATIENT_DEDUP_THRESHOLD,
+        help="Minimum pair score stored as a likely duplicate",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=settings.PATIENT_DEDUP_BATCH_SIZE,
+        help="Changed patients blocked and scored per batch",
+    )
+    args = parser.parse_args()
+
+    try:
+        summary = asyncio.run(run(args.full, args.threshold, args.batch_size))
+        print(json.dumps(summary, indent=2))
+    except Exception as e:
+        logger.error(f"Patient dedup failed: {str(e)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
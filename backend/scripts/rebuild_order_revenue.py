@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Order Revenue Rebuild Script for Healthcare IVR Platform.
+Recomputes the order_revenue_daily summary from the encrypted order totals.
+Run once after the order_revenue_daily migration, and again after any bulk
+write to orders that bypassed the ORM.
+"""
+
+import argparse
+import json
+import logging
+import sys
+from uuid import UUID
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.analytics.revenue import rebuild_revenue
+from app.core.database import get_sync_url
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger("order_revenue_rebuild")
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description="Rebuild the order revenue summary from the orders"
+    )
+    parser.add_argument(
+        "--organization-id",
+        type=UUID,
+        help="Rebuild one organization only",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=5000,
+        help="Orders fetched and summary rows written per batch",
+    )
+    args = parser.parse_args()
+
+    try:
+        with Session(create_engine(get_sync_url())) as db:
+            summary = rebuild_revenue(db, args.organization_id, args.batch_size)
+        print(json.dumps(summary, indent=2))
+    except Exception as e:
+        logger.error(f"Order revenue rebuild failed: {str(e)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
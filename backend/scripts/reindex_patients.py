@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Patient Reindex Script for Healthcare IVR Platform.
+Recomputes the blind indexes (and birth-year bucket) of every patient from
+the decrypted PHI. Run once after the patient_blind_indexes migration, and
+again whenever BLIND_INDEX_KEY is rotated.
+"""
+
+import argparse
+import json
+import logging
+import sys
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.core.database import get_sync_url
+from app.services.patient_index import reindex_patients
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger("patient_reindex")
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description="Recompute patient blind indexes from the encrypted PHI"
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=1000,
+        help="Patients decrypted and updated per transaction",
+    )
+    args = parser.parse_args()
+
+    try:
+        with Session(create_engine(get_sync_url())) as db:
+            summary = reindex_patients(db, args.batch_size)
+        print(json.dumps(summary, indent=2))
+    except Exception as e:
+        logger.error(f"Patient reindex failed: {str(e)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
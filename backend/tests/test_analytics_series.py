@@ -0,0 +1,90 @@
+"""
+Unit tests for columnar analytics series and downsampling.
+"""
+
+import asyncio
+import json
+from datetime import datetime, timezone
+from decimal import Decimal
+from unittest.mock import AsyncMock, MagicMock
+
+import pyarrow as pa
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.analytics.models import HourlyMetrics
+from app.analytics.series import (
+    COUNTER_COLUMNS,
+    GAUGE_COLUMNS,
+    bucket_seconds,
+    load_series,
+    series_arrow,
+    series_json,
+    series_query,
+    series_rows,
+)
+
+HOUR_0 = datetime(2026, 10, 18, 0, tzinfo=timezone.utc)
+HOUR_6 = datetime(2026, 10, 18, 6, tzinfo=timezone.utc)
+
+
+def _bucketed_session():
+    row = (HOUR_0, *[Decimal(i) for i in range(len(COUNTER_COLUMNS))])
+    row += tuple(range(len(GAUGE_COLUMNS)))
+    result = MagicMock()
+    result.all.return_value = [row, (HOUR_6, *row[1:])]
+    session = AsyncMock()
+    session.execute.return_value = result
+    return session
+
+
+def test_bucket_seconds_rejects_unknown_or_finer_resolutions():
+    """Test resolutions must be known and no finer than the stored grain."""
+    assert bucket_seconds(None, "1h") is None
+    assert bucket_seconds("1h", "1h") is None
+    assert bucket_seconds("6h", "1h") == 6 * 3600
+    with pytest.raises(ValueError):
+        bucket_seconds("5m", "1h")
+    with pytest.raises(ValueError):
+        bucket_seconds("6h", "1d")
+
+
+def test_downsampled_query_groups_by_time_bucket():
+    """Test bucketed series sum counters and keep peak totals per bucket."""
+    query = series_query(HourlyMetrics, "timestamp", "org", bucket=6 * 3600)
+    sql = str(query.compile(dialect=postgresql.dialect()))
+
+    assert "to_timestamp(floor(" in sql
+    assert "sum(hourly_metrics.new_orders)" in sql
+    assert "max(hourly_metrics.total_orders)" in sql
+    assert "GROUP BY to_timestamp" in sql
+    assert "provider_metrics" not in sql
+
+
+def test_series_encodings_round_trip():
+    """Test columnar JSON, Arrow and row formats carry the same series."""
+    series = asyncio.run(
+        load_series(
+            _bucketed_session(),
+            HourlyMetrics,
+            "timestamp",
+            "org",
+            resolution="6h",
+        )
+    )
+
+    columnar = json.loads(series_json(series))
+    assert columnar["length"] == 2
+    assert columnar["columns"]["timestamp"] == [
+        int(HOUR_0.timestamp() * 1000),
+        int(HOUR_6.timestamp() * 1000),
+    ]
+    assert columnar["columns"]["completed_orders"] == [1, 1]
+
+    table = pa.ipc.open_stream(series_arrow(series)).read_all()
+    assert table.num_rows == 2
+    assert table.schema.field("timestamp").type == pa.timestamp("ms", tz="UTC")
+
+    rows = series_rows(series)
+    assert rows[1]["timestamp"] == HOUR_6
+    assert rows[1]["total_patients"] == 1
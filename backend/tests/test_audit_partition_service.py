@@ -0,0 +1,76 @@
+"""
+Unit tests for the audit partition service.
+"""
+
+import asyncio
+from datetime import date, timedelta
+from unittest.mock import AsyncMock
+
+from app.services.audit_partition_service import AuditPartitionService
+
+TODAY = date(2026, 10, 18)
+
+
+def _service(partitions):
+    db = AsyncMock()
+    service = AuditPartitionService(db, tables=["audit_logs"])
+    service.is_partitioned = AsyncMock(return_value=True)
+    service.list_partitions = AsyncMock(return_value=partitions)
+    return service, db
+
+
+def _statements(db):
+    return [str(call.args[0]) for call in db.execute.await_args_list]
+
+
+def test_ensure_partitions_creates_missing_months():
+    """Test only the missing months up to months_ahead are created."""
+    service, db = _service(["audit_logs_p202610"])
+
+    created = asyncio.run(service.ensure_partitions(months_ahead=2, today=TODAY))
+
+    assert created == {"audit_logs": ["audit_logs_p202611", "audit_logs_p202612"]}
+    statements = _statements(db)
+    assert len(statements) == 2
+    assert statements[0].startswith('CREATE TABLE IF NOT EXISTS "audit_logs_p202611"')
+    assert "FOR VALUES FROM ('2026-11-01') TO ('2026-12-01')" in statements[0]
+    db.commit.assert_awaited_once()
+
+
+def test_ensure_partitions_moves_rows_out_of_the_default_partition():
+    """Test a new month is filled from the default partition, then attached."""
+    service, db = _service(["audit_logs_default", "audit_logs_p202610"])
+
+    asyncio.run(service.ensure_partitions(months_ahead=1, today=TODAY))
+
+    create, move, attach = _statements(db)
+    assert create.startswith('CREATE TABLE "audit_logs_p202611" (LIKE "audit_logs"')
+    assert 'DELETE FROM "audit_logs_default"' in move
+    assert 'INSERT INTO "audit_logs_p202611"' in move
+    params = db.execute.await_args_list[1].args[1]
+    assert params == {"start": date(2026, 11, 1), "end": date(2026, 12, 1)}
+    assert attach == (
+        'ALTER TABLE "audit_logs" ATTACH PARTITION "audit_logs_p202611" '
+        "FOR VALUES FROM ('2026-11-01') TO ('2026-12-01')"
+    )
+
+
+def test_detach_expired_partitions_keeps_recent_and_default():
+    """Test only months wholly past retention are detached and archived."""
+    service, db = _service(
+        ["audit_logs_default", "audit_logs_p202608", "audit_logs_p202609"]
+    )
+
+    detached = asyncio.run(
+        service.detach_expired_partitions(
+            retention=timedelta(days=30), today=date(2026, 10, 5)
+        )
+    )
+
+    assert detached == {"audit_logs": ["audit_logs_p202608"]}
+    statements = _statements(db)
+    assert statements[1:] == [
+        'ALTER TABLE "audit_logs" DETACH PARTITION "audit_logs_p202608"',
+        'ALTER TABLE "audit_logs_p202608" SET SCHEMA "audit_archive"',
+    ]
+    assert not any("audit_logs_default" in sql for sql in statements)
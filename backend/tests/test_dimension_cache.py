@@ -0,0 +1,91 @@
+"""
+Unit tests for the analytics dimension surrogate-key cache.
+"""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock
+
+from app.analytics.dimension_cache import (
+    SATISFACTION_COLUMNS,
+    DimensionKeyCache,
+    StarSchemaKeyCache,
+    sentiment_bucket,
+    time_dimension_row,
+)
+from app.analytics.models import DimPatientSatisfaction
+
+
+def _cache(existing, inserted):
+    db = MagicMock()
+    db.execute.side_effect = [existing, inserted]
+    cache = DimensionKeyCache(
+        db,
+        DimPatientSatisfaction,
+        SATISFACTION_COLUMNS,
+        constraint="uq_dim_patient_satisfaction_natural_key",
+        build_row=lambda key: dict(zip(SATISFACTION_COLUMNS, key)),
+    )
+    cache.preload()
+    return cache
+
+
+def test_time_dimension_row_uses_utc_hour():
+    """Test time rows are built at UTC hour grain."""
+    est = timezone(timedelta(hours=-5))
+    row = time_dimension_row(datetime(2026, 1, 3, 22, 45, tzinfo=est))
+
+    assert row["date"] == datetime(2026, 1, 4, 3)
+    assert row["day_of_week"] == 6
+    assert row["is_weekend"] is True
+    assert row["quarter"] == 1
+
+
+def test_resolve_many_inserts_only_missing_keys():
+    """Test known keys resolve from memory and misses are inserted once."""
+    known = ("high", "wait time", "ivr", 0.5)
+    new = ("low", "service quality", "sms", -0.2)
+    cache = _cache([(1, *known)], [(2, *new)])
+
+    resolved = cache.resolve_many([known, new])
+
+    assert resolved == {known: 1, new: 2}
+    assert cache.db.execute.call_count == 2
+    assert cache.stats == {"hits": 1, "misses": 1, "inserted": 1}
+    # A second lookup is served from the pending map without a query
+    assert cache.resolve(new) == 2
+    assert cache.db.execute.call_count == 2
+
+
+def test_discard_forgets_uncommitted_keys():
+    """Test keys inserted in a rolled-back transaction are dropped."""
+    new = ("low", "service quality", "sms", -0.2)
+    cache = _cache([], [(2, *new)])
+
+    cache.resolve(new)
+    cache.discard()
+    assert cache._lookup(new) is None
+
+    cache.db.execute.side_effect = [[(3, *new)]]
+    cache.resolve(new)
+    cache.confirm()
+    assert cache._lookup(new) == 3
+
+
+def test_time_dimension_from_a_leap_day():
+    """Test generating from Feb 29 ends on Feb 28 of a non-leap year."""
+    db = MagicMock()
+
+    StarSchemaKeyCache(db).generate_time_dimension(
+        start=datetime(2028, 2, 29, 13), years_ahead=1
+    )
+
+    params = db.execute.call_args.args[1]
+    assert params == {"start": datetime(2028, 2, 29), "end": datetime(2029, 2, 28)}
+
+
+def test_sentiment_is_keyed_at_one_decimal():
+    """Test nearby scores share a satisfaction key, halves away from zero."""
+    assert sentiment_bucket(0.5312) == sentiment_bucket(0.4731) == 0.5
+    assert sentiment_bucket(0.25) == 0.3
+    assert sentiment_bucket(-0.25) == -0.3
+    assert sentiment_bucket(1) == 1.0
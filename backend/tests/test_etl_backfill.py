@@ -0,0 +1,77 @@
+"""
+Unit tests for the partitioned ETL backfill runner.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from unittest.mock import MagicMock, patch
+
+from app.analytics import backfill
+from app.analytics.backfill import BackfillProgress, BackfillRunner, BackfillUnit
+
+DAY_1 = date(2026, 1, 1)
+DAY_2 = date(2026, 1, 2)
+
+
+def _runner(units, done=()):
+    runner = BackfillRunner(MagicMock(), "test-run", database_url="postgresql://")
+    runner.plan = lambda *args: units
+    runner.completed_units = lambda: set(done)
+    runner.aggregator = MagicMock()
+    runner.aggregator.partition_state.side_effect = lambda day: {"day": day}
+    runner._executor = lambda: ThreadPoolExecutor(max_workers=2)
+    return runner
+
+
+def test_run_skips_checkpointed_units():
+    """Test a resumed run only rebuilds units not yet completed."""
+    units = [
+        BackfillUnit(DAY_1, 1, 10),
+        BackfillUnit(DAY_1, 2, 20),
+        BackfillUnit(DAY_2, 1, 30),
+    ]
+    runner = _runner(units, done={(DAY_1, 1)})
+    ran = []
+
+    with patch.object(
+        backfill, "_run_unit", lambda run_id, unit, sketches: ran.append(unit)
+    ):
+        progress = runner.run(DAY_1, DAY_2)
+
+    assert sorted(ran) == units[1:]
+    assert progress.skipped_units == 1
+    assert progress.completed_units == 2
+    assert progress.rows == 50
+    # Only the day rebuilt entirely by this run gets a new watermark
+    runner.aggregator.record_watermark.assert_called_once_with(DAY_2, {"day": DAY_2})
+
+
+def test_failed_unit_is_checkpointed_and_blocks_watermark():
+    """Test a failing unit is recorded and its day keeps its old watermark."""
+    units = [BackfillUnit(DAY_1, 1, 10), BackfillUnit(DAY_1, 2, 20)]
+    runner = _runner(units)
+
+    def run_unit(run_id, unit, sketches):
+        if unit.organization_id == 2:
+            raise RuntimeError("deadlock detected")
+
+    with patch.object(backfill, "_run_unit", run_unit):
+        progress = runner.run(DAY_1, DAY_2)
+
+    assert progress.failed_units == 1
+    assert progress.completed_units == 1
+    params = runner.db.execute.call_args.args[1]
+    assert params["status"] == "failed"
+    assert params["error"] == "deadlock detected"
+    runner.aggregator.record_watermark.assert_not_called()
+
+
+def test_progress_reports_throughput_and_eta():
+    """Test throughput and ETA are derived from processed fact rows."""
+    progress = BackfillProgress(total_units=4, total_rows=1000, rows=250)
+    progress.started_at -= 10
+
+    report = progress.as_dict()
+
+    assert 24 <= report["rows_per_second"] <= 25
+    assert 29 <= report["eta_seconds"] <= 31
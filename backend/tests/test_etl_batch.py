@@ -0,0 +1,258 @@
+"""
+Unit tests for batch call ingestion in the ETL pipeline.
+"""
+
+import asyncio
+import csv
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock
+
+from app.analytics.dimension_cache import DimensionKeyCache
+from app.analytics.etl_pipeline import (
+    CALL_FACT_COLUMNS,
+    DataQualityError,
+    DataQualityValidator,
+    ETLPipeline,
+)
+from app.analytics.models import DimOrganization
+from app.analytics.quantile_sketch import SketchStore
+from app.services.redis_cache import RedisCache
+
+
+def _call(call_id, org_id=1, **overrides):
+    call_data = {
+        "call_id": call_id,
+        "time_id": 1,
+        "geography_id": 2,
+        "organization_id": org_id,
+        "insurance_provider_id": 3,
+        "duration_seconds": 120,
+        "approval_status": "approved",
+        "verification_time_seconds": 30,
+        "satisfaction_level": "high",
+        "feedback_category": "wait time",
+        "response_channel": "ivr",
+        "sentiment_score": 0.5,
+        "verification_type": "real-time",
+        "response_time_category": "fast",
+        "sla_category": "met",
+    }
+    call_data.update(overrides)
+    return call_data
+
+
+class _FakeRedisPipeline:
+    """Queues hash commands against a _FakeHashRedis until execute."""
+
+    def __init__(self, client):
+        self.client = client
+        self.queued = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def __getattr__(self, name):
+        def queue(*args):
+            self.queued.append((name, args))
+
+        return queue
+
+    async def execute(self):
+        results = [getattr(self.client, name)(*args) for name, args in self.queued]
+        self.queued = []
+        return results
+
+
+class _FakeHashRedis:
+    """Just the Redis hash commands the real-time cache updates use."""
+
+    def __init__(self):
+        self.hashes = {}
+
+    def register_script(self, source):
+        return None
+
+    def pipeline(self, transaction=False):
+        return _FakeRedisPipeline(self)
+
+    def hincrby(self, key, field, amount):
+        fields = self.hashes.setdefault(key, {})
+        fields[field] = str(int(fields.get(field, 0)) + amount)
+
+    def hincrbyfloat(self, key, field, amount):
+        fields = self.hashes.setdefault(key, {})
+        fields[field] = str(float(fields.get(field, 0)) + amount)
+
+    def expire(self, key, ttl):
+        return True
+
+    def hgetall(self, key):
+        return dict(self.hashes.get(key, {}))
+
+
+def _pipeline():
+    pipeline = ETLPipeline.__new__(ETLPipeline)
+    pipeline.db = MagicMock()
+    pipeline.validator = DataQualityValidator()
+    return pipeline
+
+
+def test_validate_batch_rejects_invalid_calls():
+    """Test invalid and incomplete calls are dropped from a batch."""
+    pipeline = _pipeline()
+    calls = [
+        _call("a"),
+        _call("b", approval_status="unknown"),
+        {k: v for k, v in _call("c").items() if k != "sla_category"},
+    ]
+
+    valid, rejected = pipeline._validate_batch(calls)
+
+    assert [c["call_id"] for c in valid] == ["a"]
+    assert [(c["call_id"], code) for c, code in rejected] == [
+        ("b", DataQualityError.INVALID_APPROVAL_STATUS),
+        ("c", DataQualityError.MISSING_FIELD),
+    ]
+
+
+def test_validate_batch_combines_error_flags():
+    """Test each row's code carries every rule it breaks."""
+    validator = DataQualityValidator()
+    calls = [
+        _call("a"),
+        _call("b", duration_seconds=-5, verification_type="fax"),
+        _call("c", duration_seconds="long"),
+        {"call_id": "d"},
+    ]
+
+    codes = validator.validate_batch(calls)
+
+    assert codes[0] == 0
+    assert codes[1] == (
+        DataQualityError.NEGATIVE_DURATION | DataQualityError.INVALID_VERIFICATION_TYPE
+    )
+    assert codes[2] == DataQualityError.INVALID_TYPE
+    assert codes[3] & DataQualityError.MISSING_FIELD
+
+
+def test_invalid_calls_are_quarantined_with_the_batch():
+    """Test rejected rows are written to the quarantine table."""
+    pipeline = _pipeline()
+    bad = _call("b", approval_status="unknown")
+
+    pipeline._quarantine([(bad, int(DataQualityError.INVALID_APPROVAL_STATUS))])
+
+    rows = pipeline.db.execute.call_args.args[1]
+    assert rows == [
+        {
+            "call_id": "b",
+            "error_code": 8,
+            "errors": ["INVALID_APPROVAL_STATUS"],
+            "payload": bad,
+        }
+    ]
+
+
+def test_call_fact_csv_resolves_dimension_ids():
+    """Test COPY rows follow the fact column order with dimension ids."""
+    call_data = _call("a", feedback_text=None)
+    satisfaction_ids = {ETLPipeline._satisfaction_key(call_data): 11}
+    verification_ids = {ETLPipeline._verification_key(call_data): 22}
+
+    buffer = ETLPipeline._call_fact_csv(
+        [call_data], satisfaction_ids, verification_ids, date(2026, 10, 18)
+    )
+    row = dict(zip(CALL_FACT_COLUMNS, next(csv.reader(buffer))))
+
+    assert row["call_id"] == "a"
+    assert row["satisfaction_id"] == "11"
+    assert row["verification_performance_id"] == "22"
+    assert row["menu_selections"] == "{}"
+    assert row["feedback_text"] == ""
+    assert row["partition_date"] == "2026-10-18"
+
+
+def test_verification_key_has_no_nulls():
+    """Test missing error types and retry counts map to the column defaults."""
+    without_error = ETLPipeline._verification_key(_call(1, error_type=None))
+    with_error = ETLPipeline._verification_key(
+        _call(2, error_type="timeout", retry_count=2)
+    )
+
+    assert without_error == ("real-time", "fast", "", 0, "met")
+    assert with_error == ("real-time", "fast", "timeout", 2, "met")
+
+
+def test_satisfaction_key_buckets_the_sentiment_score():
+    """Test calls with close sentiment scores share one satisfaction row."""
+    keys = {
+        ETLPipeline._satisfaction_key(_call(i, sentiment_score=score))
+        for i, score in enumerate((0.51, 0.48, 0.5449))
+    }
+
+    assert keys == {("high", "wait time", "ivr", 0.5)}
+
+
+def test_cache_updates_aggregate_per_organization():
+    """Test cache increments are folded per organization."""
+    per_org = ETLPipeline._aggregate_cache_updates(
+        [_call("a"), _call("b", satisfaction_level="low"), _call("c", org_id=2)]
+    )
+
+    assert per_org[1]["total_calls"] == 2
+    assert per_org[1]["duration"] == 240
+    assert per_org[1]["satisfaction"] == {"high": 1, "low": 1}
+    assert per_org[1]["verification"] == {"real-time": 2, "met": 2}
+    assert per_org[2]["total_calls"] == 1
+
+
+def test_cache_failure_after_commit_still_reports_success():
+    """Test a Redis error after the commit neither fails nor rolls back."""
+    pipeline = _pipeline()
+    pipeline.dimensions = MagicMock()
+    pipeline.process_satisfaction_data = MagicMock(return_value=11)
+    pipeline.process_verification_data = MagicMock(return_value=22)
+    pipeline._update_cache = AsyncMock(side_effect=ConnectionError("redis down"))
+
+    assert asyncio.run(pipeline.process_call_data(_call("a"))) is True
+    pipeline.db.commit.assert_called_once()
+    pipeline.db.rollback.assert_not_called()
+    pipeline._update_cache.assert_awaited_once()
+
+
+def test_sketches_written_per_call_are_read_by_the_organization_id():
+    """Test a call loaded by surrogate id lands in the endpoint's sketch."""
+    organization_id = uuid.uuid4()
+    db = MagicMock()
+    db.execute.return_value = [(1, str(organization_id))]
+    organizations = DimensionKeyCache(db, DimOrganization, ("org_id",))
+    organizations.preload()
+
+    pipeline = _pipeline()
+    pipeline.dimensions = MagicMock()
+    pipeline.dimensions.organization = organizations
+    pipeline.process_satisfaction_data = MagicMock(return_value=11)
+    pipeline.process_verification_data = MagicMock(return_value=22)
+    pipeline.cache = RedisCache(_FakeHashRedis())
+    pipeline.sketches = SketchStore(pipeline.cache)
+    call_time = datetime(2026, 10, 18, 9, 30, tzinfo=timezone.utc)
+
+    async def run():
+        await pipeline.process_call_data(_call("a", call_time=call_time))
+        # Read the way GET /metrics/percentiles does
+        current_user = {"organization_id": organization_id}
+        return await SketchStore(pipeline.cache).load(
+            "call_duration",
+            str(current_user["organization_id"]),
+            call_time - timedelta(hours=1),
+            call_time + timedelta(hours=1),
+        )
+
+    sketch = asyncio.run(run())
+
+    assert sketch.count == 1
+    assert sketch.sum == 120
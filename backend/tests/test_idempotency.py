@@ -0,0 +1,104 @@
+"""
+Unit tests for Idempotency-Key request replay.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import httpx
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+from app.core.idempotency import IdempotencyMiddleware
+
+HEADERS = {"Idempotency-Key": "retry-1", "Authorization": "Bearer token"}
+
+
+def _fake_redis_cache():
+    """RedisCache stand-in backed by a dict."""
+    store = {}
+    cache = MagicMock()
+
+    async def set(key, value, nx=False, ex=None):
+        if nx and key in store:
+            return None
+        store[key] = value
+        return True
+
+    cache.redis.set = AsyncMock(side_effect=set)
+    cache.redis.get = AsyncMock(side_effect=lambda key: store.get(key))
+    cache.redis.delete = AsyncMock(side_effect=lambda key: store.pop(key, None))
+    return cache, store
+
+
+def _app(redis_cache, status_code=201):
+    """An app whose order creation counts how often it runs."""
+    app = FastAPI()
+    app.state.calls = 0
+
+    @app.post("/api/v1/orders/")
+    async def create_order(request: Request):
+        app.state.calls += 1
+        await asyncio.sleep(0.05)
+        payload = await request.json()
+        return JSONResponse(
+            {"order": app.state.calls, **payload}, status_code=status_code
+        )
+
+    app.add_middleware(IdempotencyMiddleware, redis_cache=redis_cache, lock_ttl=5)
+    return app
+
+
+async def _post(app, *bodies, headers=HEADERS):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://t") as client:
+        return await asyncio.gather(
+            *[
+                client.post("/api/v1/orders/", json=body, headers=headers)
+                for body in bodies
+            ]
+        )
+
+
+def test_concurrent_duplicates_run_once_and_replay():
+    """Test duplicates in flight wait for and replay the first response."""
+    redis_cache, _ = _fake_redis_cache()
+    app = _app(redis_cache)
+
+    responses = asyncio.run(_post(app, *[{"patient": "p1"}] * 5))
+
+    assert app.state.calls == 1
+    assert {r.status_code for r in responses} == {201}
+    assert all(r.json() == {"order": 1, "patient": "p1"} for r in responses)
+    replayed = [r for r in responses if r.headers.get("idempotent-replayed")]
+    assert len(replayed) == 4
+
+
+def test_retry_replays_and_reused_key_is_rejected():
+    """Test a later retry is replayed and a different body under the key fails."""
+    redis_cache, store = _fake_redis_cache()
+    app = _app(redis_cache)
+
+    first = asyncio.run(_post(app, {"patient": "p1"}))[0]
+    retry = asyncio.run(_post(app, {"patient": "p1"}))[0]
+    reused = asyncio.run(_post(app, {"patient": "p2"}))[0]
+    other_key = asyncio.run(_post(app, {"patient": "p1"}, headers={}))[0]
+
+    assert app.state.calls == 2
+    assert retry.json() == first.json()
+    assert retry.headers["idempotent-replayed"] == "true"
+    assert reused.status_code == 422
+    assert other_key.json()["order"] == 2
+    assert len(store) == 1
+
+
+def test_server_errors_are_not_stored():
+    """Test a failed request releases its key so a retry runs again."""
+    redis_cache, store = _fake_redis_cache()
+    app = _app(redis_cache, status_code=503)
+
+    asyncio.run(_post(app, {"patient": "p1"}))
+    asyncio.run(_post(app, {"patient": "p1"}))
+
+    assert app.state.calls == 2
+    assert store == {}
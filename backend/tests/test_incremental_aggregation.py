@@ -0,0 +1,52 @@
+"""
+Unit tests for watermark-driven incremental call aggregation.
+"""
+
+from datetime import date, datetime, timedelta, timezone
+from unittest.mock import MagicMock
+
+from app.analytics.etl_pipeline import ETLPipeline
+from app.analytics.incremental_aggregation import IncrementalAggregator
+
+
+def test_dirty_partitions_skip_unchanged_days():
+    """Test only partitions whose watermark moved are reprocessed."""
+    aggregator = IncrementalAggregator(MagicMock())
+    days = [date(2026, 10, 1), date(2026, 10, 16), date(2026, 10, 17)]
+    current = {
+        days[0]: {"last_fact_id": 900, "row_count": 11},
+        days[1]: {"last_fact_id": 500, "row_count": 40},
+        days[2]: {"last_fact_id": 800, "row_count": 25},
+    }
+    aggregator.candidate_partitions = lambda: days
+    aggregator.recorded_state = lambda _: {
+        # A late call landed in an old partition
+        days[0]: {"last_fact_id": 120, "row_count": 10},
+        days[1]: {"last_fact_id": 500, "row_count": 40},
+    }
+    aggregator.partition_state = current.get
+
+    assert aggregator.dirty_partitions() == [days[0], days[2]]
+
+
+def test_run_commits_each_partition():
+    """Test every dirty partition is aggregated and committed separately."""
+    db = MagicMock()
+    aggregator = IncrementalAggregator(db)
+    aggregator.aggregate_partition = lambda day: {"daily_rows": 1}
+
+    processed = aggregator.run([date(2026, 10, 16), date(2026, 10, 17)])
+
+    assert list(processed) == [date(2026, 10, 16), date(2026, 10, 17)]
+    assert db.commit.call_count == 2
+
+
+def test_calls_partition_by_utc_call_day():
+    """Test facts land in the partition of the day the call happened."""
+    pacific = timezone(timedelta(hours=-7))
+    late_call = {"call_time": datetime(2026, 10, 1, 20, 30, tzinfo=pacific)}
+
+    assert ETLPipeline._partition_date(late_call, date(2026, 10, 18)) == date(
+        2026, 10, 2
+    )
+    assert ETLPipeline._partition_date({}, date(2026, 10, 18)) == date(2026, 10, 18)
@@ -0,0 +1,165 @@
+"""
+Unit tests for batched order inventory lookups and reservations.
+"""
+
+import asyncio
+import uuid
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import OperationalError
+
+from app.core.exceptions import ValidationError
+from app.services import inventory_shards
+from app.services.inventory_service import InventoryService, OrderProduct
+from app.services.inventory_shards import ShardedInventory, stock_totals
+
+TERRITORY = uuid.uuid4()
+
+
+class _PgError(Exception):
+    """A driver error carrying a Postgres SQLSTATE."""
+
+    def __init__(self, pgcode):
+        super().__init__(pgcode)
+        self.pgcode = pgcode
+
+
+def _conflict(pgcode="40P01"):
+    return OperationalError("UPDATE product_inventory_shards", {}, _PgError(pgcode))
+
+
+def _sql(db) -> str:
+    statement = db.execute.call_args.args[0]
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+def test_order_products_are_fetched_in_one_query():
+    """Test price, compliance and summed shard stock come from one join."""
+    a, b = uuid.uuid4(), uuid.uuid4()
+    db = MagicMock()
+    db.execute.return_value.all.return_value = [
+        (a, 12.5, True, 4),
+        (b, 3.0, True, None),
+    ]
+
+    products = asyncio.run(InventoryService(db).get_order_products([a, b], TERRITORY))
+
+    assert db.execute.call_count == 1
+    sql = _sql(db)
+    assert "LEFT OUTER JOIN (SELECT product_inventory_shards.product_id" in sql
+    assert "GROUP BY product_inventory_shards.product_id" in sql
+    assert products[a] == OrderProduct(a, 12.5, True, 4)
+    assert products[b].available is None
+
+
+def test_reservation_skips_locked_shards():
+    """Test every line item is reserved on one random shard without waiting."""
+    a, b = uuid.uuid4(), uuid.uuid4()
+    db = MagicMock()
+    db.execute.return_value.scalars.return_value = [a, b]
+
+    asyncio.run(InventoryService(db).reserve_items(TERRITORY, {a: 2, b: 5}))
+
+    sql = _sql(db)
+    assert db.execute.call_count == 1
+    assert sql.startswith("UPDATE product_inventory_shards SET reserved_quantity=")
+    assert "FOR UPDATE OF locked SKIP LOCKED" in sql
+    assert ">= requested.quantity" in sql
+    assert "RETURNING product_inventory_shards.product_id" in sql
+
+
+def test_skipped_products_retry_on_untried_shards():
+    """Test only skipped products retry, each on a shard it has not tried."""
+    a, b = uuid.uuid4(), uuid.uuid4()
+    inventory = ShardedInventory(MagicMock(), shards=4)
+    inventory._try_shards = MagicMock(side_effect=[{a}, {b}])
+
+    assert inventory.apply("reserve", TERRITORY, {a: 2, b: 5}) == []
+
+    first, second = (c.args[2] for c in inventory._try_shards.call_args_list)
+    assert [pick[0] for pick in second] == [b]
+    assert second[0][1] != next(p[1] for p in first if p[0] == b)
+
+
+def test_fallback_spans_shards_and_reports_shortfalls():
+    """Test stock split over shards is gathered under lock, or reported short."""
+    a, b = uuid.uuid4(), uuid.uuid4()
+    db = MagicMock()
+    locked = {
+        # Skipping locked shards is tried first, then every shard is locked
+        a: [[(0, 1)], [(0, 1), (1, 2)]],
+        b: [[], [(0, 1)]],
+    }
+    rows = [*locked[a], *locked[b]] if a < b else [*locked[b], *locked[a]]
+    db.execute.return_value.all.side_effect = rows
+    inventory = ShardedInventory(db, shards=2, attempts=1)
+    inventory._try_shards = MagicMock(return_value=set())
+
+    with pytest.raises(ValidationError) as excinfo:
+        inventory.reserve(TERRITORY, {a: 3, b: 5})
+
+    assert str(b) in excinfo.value.detail
+    assert str(a) not in excinfo.value.detail
+    updates = [
+        str(c.args[0].compile(dialect=postgresql.dialect()))
+        for c in db.execute.call_args_list
+        if str(c.args[0]).startswith("UPDATE")
+    ]
+    # Product a took one unit from shard 0 and two from shard 1
+    assert len(updates) == 2
+
+
+def test_stock_totals_sum_the_shards():
+    """Test current and free stock are summed per product and territory."""
+    sql = str(stock_totals(TERRITORY).compile(dialect=postgresql.dialect()))
+
+    assert "sum(product_inventory_shards.quantity) AS quantity" in sql
+    assert (
+        "sum(product_inventory_shards.quantity - "
+        "product_inventory_shards.reserved_quantity) AS available"
+    ) in sql
+    assert "WHERE product_inventory_shards.territory_id = " in sql
+    assert "product_inventory " not in sql
+
+
+def test_conflicts_retry_in_a_savepoint_with_backoff(monkeypatch):
+    """Test a deadlock victim rolls back its savepoint and retries later."""
+    a = uuid.uuid4()
+    sleeps = []
+    monkeypatch.setattr(inventory_shards.time, "sleep", sleeps.append)
+    db = MagicMock()
+    inventory = ShardedInventory(db, shards=2)
+    inventory._try_shards = MagicMock(
+        side_effect=[_conflict(), _conflict("40001"), {a}]
+    )
+
+    inventory.reserve(TERRITORY, {a: 2})
+
+    assert db.begin_nested.call_count == 3
+    # Each failed savepoint saw the error, so it was rolled back
+    exits = db.begin_nested.return_value.__exit__.call_args_list
+    assert [c.args[0] for c in exits] == [OperationalError, OperationalError, None]
+    assert len(sleeps) == 2
+    backoff = inventory_shards.CONFLICT_BACKOFF
+    assert backoff <= sleeps[0] < 2 * backoff <= sleeps[1] < 4 * backoff
+
+
+def test_conflicts_give_up_after_retries_and_other_errors_do_not_retry(
+    monkeypatch,
+):
+    """Test conflicts raise once retries run out; other errors raise at once."""
+    a = uuid.uuid4()
+    monkeypatch.setattr(inventory_shards.time, "sleep", lambda seconds: None)
+    inventory = ShardedInventory(MagicMock(), retries=2)
+    inventory._try_shards = MagicMock(side_effect=_conflict())
+
+    with pytest.raises(OperationalError):
+        inventory.reserve(TERRITORY, {a: 2})
+    assert inventory._try_shards.call_count == 3
+
+    inventory._try_shards = MagicMock(side_effect=_conflict("23514"))
+    with pytest.raises(OperationalError):
+        inventory.reserve(TERRITORY, {a: 2})
+    assert inventory._try_shards.call_count == 1
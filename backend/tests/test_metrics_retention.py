@@ -0,0 +1,92 @@
+"""
+Unit tests for the HourlyMetrics retention and rollup policy.
+"""
+
+import asyncio
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock
+
+from sqlalchemy.dialects import postgresql
+
+from app.analytics.models import HourlyMetrics
+from app.analytics.retention import MetricsRetentionEngine, RetentionPolicy, align
+from app.analytics.series import load_series, rollup_tier, time_bucket
+
+NOW = datetime(2026, 10, 18, 15, 30, tzinfo=timezone.utc)
+
+
+def test_rollup_tier_picks_coarsest_dividing_tier():
+    """Test day and week resolutions route to rollups, finer ones to raw rows."""
+    assert rollup_tier("7d") == "7d"
+    assert rollup_tier("1d") == "1d"
+    assert rollup_tier("12h") is None
+    assert rollup_tier(None) is None
+
+
+def test_expire_never_deletes_past_rolled_buckets():
+    """Test retention cutoffs are capped at the last rolled bucket."""
+    db = AsyncMock()
+    result = MagicMock(rowcount=0)
+    db.execute.return_value = result
+    engine = MetricsRetentionEngine(db, RetentionPolicy(raw_days=90, daily_days=730))
+    last_daily = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    engine._last_bucket = AsyncMock(side_effect=[last_daily, None])
+
+    asyncio.run(engine.expire(NOW))
+
+    hourly_params = db.execute.await_args_list[0].args[1]
+    daily_params = db.execute.await_args_list[1].args[1]
+    # Raw rows since the last daily bucket are not rolled up yet
+    assert hourly_params["cutoff"] == last_daily
+    # Nothing is rolled into weeks, so no daily rollup may be deleted
+    assert daily_params["cutoff"] == datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def test_weekly_resolution_reads_rollup_tier():
+    """Test a 7d hourly-metrics query is served from weekly rollups."""
+    result = MagicMock()
+    result.all.return_value = []
+    session = AsyncMock()
+    session.execute.return_value = result
+
+    series = asyncio.run(
+        load_series(
+            session,
+            HourlyMetrics,
+            "timestamp",
+            "org",
+            resolution="7d",
+            use_rollups=True,
+        )
+    )
+
+    sql = str(session.execute.await_args.args[0].compile(dialect=postgresql.dialect()))
+    assert "FROM metrics_rollups" in sql
+    assert "hourly_metrics" not in sql
+    assert "GROUP BY" not in sql
+    assert series["source"] == "rollup:7d"
+    assert align(NOW, 24 * 3600) == datetime(2026, 10, 18, tzinfo=timezone.utc)
+
+
+def test_weekly_rollups_start_on_monday():
+    """Test weekly buckets are calendar weeks in SQL and when aligning."""
+    db = AsyncMock()
+    db.execute.return_value = MagicMock(rowcount=1)
+    engine = MetricsRetentionEngine(db)
+    engine._last_bucket = AsyncMock(return_value=NOW)
+
+    asyncio.run(engine.rollup_weekly())
+
+    statement, params = db.execute.await_args.args
+    assert "floor((extract(epoch FROM bucket_start) - :origin)" in str(statement)
+    # Sunday 2026-10-18 is in the week of Monday 2026-10-12; one week overlaps
+    assert params["since"] == datetime(2026, 10, 5, tzinfo=timezone.utc)
+    assert params["since"].weekday() == 0
+    assert align(NOW, 3600) == datetime(2026, 10, 18, 15, tzinfo=timezone.utc)
+
+    sql = str(
+        time_bucket(HourlyMetrics.timestamp, 7 * 24 * 3600).compile(
+            dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+        )
+    )
+    assert "- 345600" in sql and "+ 345600" in sql
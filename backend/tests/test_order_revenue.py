@@ -0,0 +1,165 @@
+"""
+Unit tests for the write-time order revenue summary.
+"""
+
+import uuid
+from datetime import date, datetime
+from decimal import Decimal
+from unittest.mock import MagicMock
+
+from sqlalchemy import Column, MetaData, Table, create_engine, inspect
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session, defer, make_transient_to_detached
+
+from app.analytics.revenue import (
+    can_view_revenue,
+    load_tracked_columns,
+    record_status_change,
+    revenue_deltas,
+    revenue_query,
+)
+from app.core.security import encrypt_field
+from app.models.order import Order
+
+ORG = uuid.uuid4()
+PROVIDER = uuid.uuid4()
+DAY = date(2026, 10, 18)
+
+
+def _order(total, status="pending"):
+    order = Order(
+        id=uuid.uuid4(),
+        organization_id=ORG,
+        provider_id=PROVIDER,
+        status=status,
+        created_at=datetime(2026, 10, 18, 15),
+    )
+    order.total_amount = total
+    return order
+
+
+def _persisted(total, status="pending"):
+    """An order as if loaded from the database."""
+    order = _order(total, status)
+    make_transient_to_detached(order)
+    return order
+
+
+def test_new_and_changed_orders_fold_into_summary_rows():
+    """Test inserts add, and changes move amounts between summary rows."""
+    session = Session()
+    session.add(_order(120.5))
+    session.add(_order(79.5))
+    moved = _persisted(50)
+    session.add(moved)
+    moved.status = "cancelled"
+    repriced = _persisted(10)
+    session.add(repriced)
+    repriced.total_amount = 25
+
+    deltas = revenue_deltas(session)
+
+    assert deltas[(ORG, DAY, PROVIDER, "pending")] == [1, Decimal("165.0")]
+    assert deltas[(ORG, DAY, PROVIDER, "cancelled")] == [1, Decimal("50")]
+
+
+def test_deleted_and_untouched_orders():
+    """Test deletes subtract and orders without tracked changes are skipped."""
+    session = Session()
+    deleted = _order(40)
+    # Loaded, empty cascades, so the delete needs no database
+    for collection in (
+        "shipping_addresses",
+        "shipments",
+        "fulfillment_orders",
+        "status_history",
+    ):
+        setattr(deleted, collection, [])
+    make_transient_to_detached(deleted)
+    untouched = _persisted(99)
+    session.add_all([deleted, untouched])
+    session.delete(deleted)
+    untouched.notes = "left at reception"
+
+    assert revenue_deltas(session) == {
+        (ORG, DAY, PROVIDER, "pending"): [-1, Decimal("-40")]
+    }
+
+
+def test_unloaded_created_at_keeps_the_order_day():
+    """Test a deferred created_at is loaded so the old row is the order's day."""
+    engine = create_engine("sqlite://")
+    # The orders columns without their NOT NULL constraints
+    columns = [
+        Column(column.name, column.type, primary_key=column.primary_key)
+        for column in Order.__table__.columns
+    ]
+    Table("orders", MetaData(), *columns).create(engine)
+    with Session(engine) as session:
+        session.add(_order(30))
+        session.commit()
+
+    with Session(engine) as session:
+        order = session.query(Order).options(defer(Order.created_at)).one()
+        order.status = "cancelled"
+        assert "created_at" in inspect(order).unloaded
+
+        load_tracked_columns(session)
+
+        assert revenue_deltas(session) == {
+            (ORG, DAY, PROVIDER, "pending"): [-1, Decimal("-30")],
+            (ORG, DAY, PROVIDER, "cancelled"): [1, Decimal("30")],
+        }
+
+
+def test_bulk_status_change_moves_summary_rows():
+    """Test a Core status update moves each order's amount to the new status."""
+    connection = MagicMock()
+    connection.dialect.name = "postgresql"
+    created = datetime(2026, 10, 18, 15)
+    connection.execute.return_value.all.return_value = [
+        (ORG, created, PROVIDER, "PROCESSING", encrypt_field("30")),
+        (ORG, created, PROVIDER, "ON_HOLD", encrypt_field("12.5")),
+        (ORG, created, PROVIDER, "PROCESSING", None),
+    ]
+
+    record_status_change(connection, [uuid.uuid4()], "CANCELLED")
+
+    select_call, upsert_call = connection.execute.call_args_list
+    assert "WHERE orders.id IN" in str(select_call.args[0])
+    upsert = upsert_call.args[0].compile(dialect=postgresql.dialect())
+    assert "ON CONFLICT (organization_id, day, provider_id, status)" in str(upsert)
+    moved = {
+        params["status"]: (params["order_count"], params["total_amount"])
+        for params in (
+            {
+                name: upsert.params[f"{name}_m{i}"]
+                for name in ("status", "order_count", "total_amount")
+            }
+            for i in range(3)
+        )
+    }
+    assert moved == {
+        "CANCELLED": (3, Decimal("42.5")),
+        "ON_HOLD": (-1, Decimal("-12.5")),
+        "PROCESSING": (-2, Decimal("-30")),
+    }
+
+
+def test_revenue_query_aggregates_the_summary():
+    """Test revenue is a grouped SQL aggregate with small groups left out."""
+    query = revenue_query(ORG, ["state", "day"], min_group_size=5)
+    sql = str(query.compile(dialect=postgresql.dialect()))
+
+    assert "FROM order_revenue_daily JOIN providers" in sql
+    assert "FROM orders" not in sql
+    assert "GROUP BY providers.state, order_revenue_daily.day" in sql
+    assert "HAVING sum(order_revenue_daily.order_count) >= " in sql
+
+
+def test_revenue_needs_the_analytics_permission():
+    """Test revenue is only granted by the permission or a wildcard role."""
+    assert can_view_revenue("Admin")
+    assert can_view_revenue("Doctor", ["analytics:revenue"])
+    assert not can_view_revenue("Doctor")
+    assert not can_view_revenue(None, ["orders:read"])
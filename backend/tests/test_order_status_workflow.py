@@ -0,0 +1,126 @@
+"""
+Unit tests for planning and writing bulk order status changes.
+"""
+
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+from uuid import uuid4
+
+from sqlalchemy.dialects import postgresql
+
+from app.services.order_status_workflow import (
+    apply_bulk_status_update,
+    lock_orders,
+    plan_bulk_status_update,
+)
+
+NOW = datetime(2026, 10, 18, 12)
+USER_ID = uuid4()
+
+
+def _row(order_id, status, territory_id=1):
+    return SimpleNamespace(id=order_id, status=status, territory_id=territory_id)
+
+
+def test_plan_reports_why_each_order_cannot_move():
+    """Test missing, foreign-territory and invalid-transition orders fail."""
+    rows = [
+        _row(1, "processing"),
+        _row(2, "processing", territory_id=2),
+        _row(3, "completed"),
+        _row(5, "pending"),
+    ]
+
+    eligible, failed = plan_bulk_status_update(
+        [1, 2, 3, 4, 5, 1], rows, "cancelled", territory_id=1
+    )
+
+    assert [row.id for row in eligible] == [1, 5]
+    assert failed == [
+        {"order_id": 2, "error": "Not authorized for this territory"},
+        {"order_id": 3, "error": "Invalid transition from completed to cancelled"},
+        {"order_id": 4, "error": "Order not found"},
+    ]
+
+
+def test_plan_rejects_every_order_for_the_initial_status():
+    """Test no order may move into a status nothing transitions to."""
+    eligible, failed = plan_bulk_status_update(
+        [1], [_row(1, "verified")], "pending", territory_id=1
+    )
+
+    assert eligible == []
+    assert failed == [
+        {"order_id": 1, "error": "Invalid transition from verified to pending"}
+    ]
+
+
+def test_lock_orders_reads_the_territory_from_the_patient():
+    """Test only the orders are locked and the territory comes from patients."""
+    db = MagicMock()
+
+    lock_orders(db, [1, 5])
+
+    sql = str(db.execute.call_args.args[0].compile(dialect=postgresql.dialect()))
+    assert "patients.territory_id" in sql
+    assert "JOIN patients ON patients.id = orders.patient_id" in sql
+    assert sql.endswith("FOR UPDATE OF orders")
+
+
+def test_apply_runs_one_update_and_one_executemany_insert():
+    """Test the batch is one UPDATE and one multi-row history INSERT."""
+    db = MagicMock()
+    eligible = [_row(1, "processing"), _row(5, "pending")]
+
+    apply_bulk_status_update(db, eligible, "cancelled", USER_ID, NOW, "recalled")
+
+    assert db.execute.call_count == 2
+    (update_call, insert_call) = db.execute.call_args_list
+    update_sql = update_call.args[0].compile(dialect=postgresql.dialect())
+    assert str(update_sql).startswith("UPDATE orders SET updated_by_id=")
+    assert "WHERE orders.id IN (__[POSTCOMPILE_id_1])" in str(update_sql)
+    assert update_sql.params["id_1"] == [1, 5]
+    assert update_sql.params["status"] == "cancelled"
+    assert update_sql.params["updated_at"] == NOW
+    assert update_sql.params["updated_by_id"] == USER_ID
+
+    insert_sql = insert_call.args[0].compile(
+        dialect=postgresql.dialect(), column_keys=list(insert_call.args[1][0])
+    )
+    assert str(insert_sql).startswith(
+        "INSERT INTO order_status_history (id, order_id, from_status, to_status, "
+        "changed_by_id, reason, created_at)"
+    )
+    assert insert_call.args[1] == [
+        {
+            "order_id": 1,
+            "from_status": "processing",
+            "to_status": "cancelled",
+            "changed_by_id": USER_ID,
+            "reason": "recalled",
+            "created_at": NOW,
+        },
+        {
+            "order_id": 5,
+            "from_status": "pending",
+            "to_status": "cancelled",
+            "changed_by_id": USER_ID,
+            "reason": "recalled",
+            "created_at": NOW,
+        },
+    ]
+
+
+def test_apply_moves_revenue_before_the_update():
+    """Test the revenue summary is read before the Core UPDATE changes status."""
+    db = MagicMock()
+    connection = db.connection.return_value
+    connection.dialect.name = "postgresql"
+    connection.execute.return_value.all.return_value = []
+    db.execute.side_effect = lambda *args: connection.execute.assert_called_once()
+
+    apply_bulk_status_update(db, [_row(1, "processing")], "cancelled", USER_ID, NOW)
+
+    assert "WHERE orders.id IN" in str(connection.execute.call_args.args[0])
+    assert db.execute.call_count == 2
@@ -0,0 +1,67 @@
+"""
+Unit tests for the order timeline read model.
+"""
+
+import asyncio
+import uuid
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock
+
+from sqlalchemy.dialects import postgresql
+
+from app.models.order import OrderTimeline
+from app.services.order_timeline import (
+    get_timeline,
+    serialize_timeline,
+    timeline_etag,
+)
+
+ORDER = uuid.uuid4()
+
+
+def _timeline():
+    return OrderTimeline(
+        order_id=ORDER,
+        organization_id=uuid.uuid4(),
+        status="processing",
+        version=4,
+        shipments={"s1": {"type": "shipment", "id": "s1", "status": "IN_TRANSIT"}},
+        events=[
+            {"type": "status", "at": "2026-10-18T09:00:00+00:00", "to": "verified"},
+            {"type": "shipment", "at": "2026-10-18T12:00:00+00:00", "id": "s1"},
+            # Carrier scans can arrive after later events were appended
+            {"type": "tracking", "at": "2026-10-18T11:00:00+00:00", "id": "t1"},
+            {"type": "status", "at": "2026-10-18T10:00:00+00:00", "to": "processing"},
+        ],
+        updated_at=datetime(2026, 10, 18, 12, tzinfo=timezone.utc),
+    )
+
+
+def test_timeline_is_one_primary_key_read():
+    """Test the timeline is loaded by order id, scoped to the organization."""
+    org = uuid.uuid4()
+    db = AsyncMock()
+    db.execute.return_value = MagicMock()
+
+    asyncio.run(get_timeline(db, ORDER, org))
+
+    assert db.execute.await_count == 1
+    sql = str(db.execute.await_args.args[0].compile(dialect=postgresql.dialect()))
+    assert "FROM order_timelines" in sql
+    assert "JOIN" not in sql
+    assert "order_timelines.order_id = " in sql
+    assert "order_timelines.organization_id = " in sql
+
+
+def test_events_are_chronological_and_filterable():
+    """Test events are ordered by occurrence and filtered by type."""
+    body = serialize_timeline(_timeline())
+    statuses = serialize_timeline(_timeline(), ["status"])
+
+    assert [e["at"][11:13] for e in body["events"]] == ["09", "10", "11", "12"]
+    assert [e["to"] for e in statuses["events"]] == ["verified", "processing"]
+    assert body["shipments"] == [
+        {"type": "shipment", "id": "s1", "status": "IN_TRANSIT"}
+    ]
+    assert body["version"] == 4
+    assert timeline_etag(ORDER, 4) == f'W/"timeline-{ORDER}-4"'
@@ -0,0 +1,100 @@
+"""
+Unit tests for the patient dedup engine.
+"""
+
+import asyncio
+import uuid
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import numpy as np
+from sqlalchemy.dialects import postgresql
+
+from app.services.patient_dedup import (
+    BLOCKING_SQL,
+    PatientDedupEngine,
+    dice_similarity,
+    ngram_matrix,
+    score_pairs,
+)
+
+A, B, C = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+RECORDS = {
+    A: {
+        "first_name": "Jonathan",
+        "last_name": "Smith",
+        "date_of_birth": "1980-04-12",
+        "phone": "(555) 010-2030",
+    },
+    B: {
+        "first_name": "Jonathon",
+        "last_name": "smith ",
+        "date_of_birth": "1980-04-12",
+        "phone": "+1 555 010 2030",
+    },
+    C: {
+        "first_name": "Maria",
+        "last_name": "Garcia",
+        "date_of_birth": "1975-09-30",
+        "phone": None,
+    },
+}
+
+
+def test_dice_similarity_is_vectorized_per_row():
+    """Test each row pair gets its own bigram Dice coefficient."""
+    left = ngram_matrix(["smith", "smith", None])
+    right = ngram_matrix(["smith", "smyth", None])
+
+    similarity = dice_similarity(left, right)
+
+    assert similarity[0] == 1.0
+    assert 0 < similarity[1] < 1
+    assert similarity[2] == 0
+
+
+def test_score_pairs_weights_only_fields_present_on_both_sides():
+    """Test near-identical records score high and missing fields are skipped."""
+    scores, field_scores = score_pairs(RECORDS, [(A, B), (A, C)])
+
+    assert scores[0] > 0.85
+    assert field_scores["phone"][0] == 1.0
+    assert scores[1] < 0.5
+    assert np.isnan(field_scores["phone"][1])
+
+
+def test_score_batch_stores_matches_and_drops_stale_pending_pairs():
+    """Test one upsert for likely duplicates and one delete for misses."""
+    org_id = uuid.uuid4()
+    result = MagicMock()
+    result.all.return_value = [
+        (pid, *(v.encode() if v else None for v in record.values()))
+        for pid, record in RECORDS.items()
+    ]
+    db = AsyncMock()
+    db.execute.return_value = result
+    engine = PatientDedupEngine(db, threshold=0.85, decrypt=bytes.decode)
+    pairs = [
+        SimpleNamespace(
+            patient_id=a, duplicate_id=b, organization_id=org_id, blocking_keys=["x"]
+        )
+        for a, b in ((A, B), (A, C))
+    ]
+
+    scored, stored = asyncio.run(engine.score_batch(pairs))
+
+    assert (scored, stored) == (2, 1)
+    # Load, upsert, delete
+    assert db.execute.await_count == 3
+    upsert = db.execute.await_args_list[1].args[0]
+    assert "ON CONFLICT" in str(upsert.compile(dialect=postgresql.dialect()))
+
+
+def test_common_names_block_only_with_another_key():
+    """Test the name-only block skips names above the block size cap."""
+    blocks = BLOCKING_SQL.split("UNION ALL")
+
+    assert "HAVING count(*) > :max_block_size" in BLOCKING_SQL
+    assert "'full_name' AS key" in blocks[-1]
+    assert "c.id NOT IN (SELECT id FROM common_names)" in blocks[-1]
+    assert BLOCKING_SQL.count("FROM common_names") == 1
@@ -0,0 +1,160 @@
+"""
+Unit tests for blind-index patient lookups.
+"""
+
+import uuid
+from datetime import date
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.core.config import settings
+from app.core.encryption import EncryptionError, blind_index
+from app.services.patient_index import (
+    age_on,
+    age_range_filter,
+    birth_year_bucket,
+    bulk_match_query,
+    patient_search_indexes,
+    reindex_patients,
+    search_term_rows,
+    text_search_filter,
+    text_search_rank,
+)
+
+
+@pytest.fixture(autouse=True)
+def _blind_index_key(monkeypatch):
+    monkeypatch.setattr(settings, "BLIND_INDEX_KEY", "test-blind-index-key")
+
+
+def test_blind_index_needs_a_configured_key(monkeypatch):
+    """Test digests are refused rather than keyed with a random secret."""
+    monkeypatch.setattr(settings, "BLIND_INDEX_KEY", None)
+
+    with pytest.raises(EncryptionError):
+        blind_index("name", "jane")
+
+
+def test_blind_index_is_normalized_and_domain_separated():
+    """Test equal values match across case/spacing but not across fields."""
+    assert blind_index("name", " Jane  DOE ") == blind_index("name", "jane doe")
+    assert blind_index("name", "1990-01-02") != blind_index("dob", "1990-01-02")
+    assert blind_index("name", "   ") is None
+    indexes = patient_search_indexes(last_name="Doe", date_of_birth="01/02/1990")
+    assert indexes == {
+        "last_name_bidx": blind_index("name", "doe"),
+        "dob_bidx": blind_index("dob", "1990-01-02"),
+        "birth_year_bucket": 1990,
+    }
+
+
+def test_search_terms_expand_by_match_type():
+    """Test exact full names pin both columns and partial terms split tokens."""
+    exact = search_term_rows(["Doe, Jane", "1990-01-02"], "exact")
+    assert exact[0][:4] == (
+        0,
+        blind_index("name", "jane"),
+        blind_index("name", "doe"),
+        None,
+    )
+    assert exact[1][4] == blind_index("dob", "1990-01-02")
+
+    partial = search_term_rows(["Jane Doe"], "partial")
+    assert [row[3] for row in partial] == [
+        blind_index("name", "jane"),
+        blind_index("name", "doe"),
+    ]
+
+
+def test_bulk_match_is_one_values_join_capped_per_term():
+    """Test every term runs in one statement with a per-term result cap."""
+    query = bulk_match_query(search_term_rows(["Jane", "Doe"]), 5, ["org"])
+    sql = str(query.compile(dialect=postgresql.dialect()))
+
+    assert sql.count("VALUES") == 1
+    assert "row_number() OVER (PARTITION BY terms.search_id" in sql
+    assert "patients.organization_id IN" in sql
+    assert "patients.territory_id IN" not in sql
+    assert "rank <=" in sql
+
+
+def test_bulk_match_is_scoped_to_territories():
+    """Test requested territories narrow the matches before ranking."""
+    query = bulk_match_query(search_term_rows(["Jane"]), 5, None, ["territory"])
+    sql = str(query.compile(dialect=postgresql.dialect()))
+
+    assert "patients.territory_id IN" in sql
+    assert sql.index("patients.territory_id IN") < sql.index("rank <=")
+
+
+def test_age_range_filter_covers_every_matching_birth_date():
+    """Test bucket bounds are a superset confirmed by exact post-decrypt ages."""
+    today = date(2026, 10, 18)
+    clause = age_range_filter(30, 39, today)
+    lo, hi = clause.right.clauses[0].value, clause.right.clauses[1].value
+    # Ages 30-39 today are births from 1986-10-19 to 1996-10-18
+    assert (lo, hi) == (
+        birth_year_bucket("1986-10-19"),
+        birth_year_bucket("1996-10-18"),
+    )
+    assert (lo, hi) == (1985, 1995)
+
+    assert age_on("1996-10-18", today) == 30
+    assert age_on("1996-10-19", today) == 29
+    assert age_on("1986-10-19", today) == 39
+    assert age_on("1986-10-18", today) == 40
+
+
+def test_text_search_uses_the_trigger_config_and_ranks():
+    """Test text search matches search_vector with websearch syntax and ranks."""
+    dialect = postgresql.dialect()
+    match = str(text_search_filter('"wound care" -pending').compile(dialect=dialect))
+    rank = str(text_search_rank("wound").compile(dialect=dialect))
+
+    assert "patients.search_vector @@ websearch_to_tsquery(" in match
+    assert "ts_rank_cd(patients.search_vector, websearch_to_tsquery(" in rank
+
+
+def test_reindex_patients_pages_and_updates_every_index_column():
+    """Test each page is decrypted and written with one executemany UPDATE."""
+    first, second = uuid.uuid4(), uuid.uuid4()
+    db = MagicMock()
+    db.execute.return_value.all.side_effect = [
+        [(first, b"Jane", b"Doe", b"1990-01-02", b"(555) 010-0100")],
+        [(second, b"John", b"Roe", None, None)],
+        [],
+    ]
+
+    summary = reindex_patients(db, batch_size=1, decrypt=bytes.decode)
+
+    assert summary == {"patients": 2}
+    updates = [call.args[1] for call in db.execute.call_args_list if len(call.args) > 1]
+    assert updates == [
+        [
+            {
+                "id": first,
+                **patient_search_indexes(
+                    first_name="Jane",
+                    last_name="Doe",
+                    date_of_birth="1990-01-02",
+                    phone="5550100100",
+                ),
+            }
+        ],
+        [
+            {
+                "id": second,
+                "first_name_bidx": blind_index("name", "john"),
+                "last_name_bidx": blind_index("name", "roe"),
+                "dob_bidx": None,
+                "phone_bidx": None,
+                "birth_year_bucket": None,
+            }
+        ],
+    ]
+    # Later pages start after the last id of the previous one
+    second_page = db.execute.call_args_list[2].args[0]
+    assert "patients.id >" in str(second_page)
+    assert db.commit.call_count == 2
@@ -0,0 +1,100 @@
+"""
+Unit tests for the DDSketch latency sketches.
+"""
+
+import asyncio
+import random
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.analytics.quantile_sketch import (
+    MAX_SKETCH_HOURS,
+    DDSketch,
+    SketchStore,
+    sketch_hours,
+    sketch_key,
+)
+
+
+def _exact_quantile(values, q):
+    ordered = sorted(values)
+    return ordered[int(q * (len(ordered) - 1))]
+
+
+def test_quantiles_within_relative_accuracy():
+    """Test estimates stay within the configured relative error."""
+    rng = random.Random(7)
+    values = [rng.lognormvariate(4, 1) for _ in range(20_000)]
+    sketch = DDSketch(0.01)
+    for value in values:
+        sketch.add(value)
+
+    for q in (0.5, 0.95, 0.99):
+        exact = _exact_quantile(values, q)
+        assert abs(sketch.quantile(q) - exact) <= 0.01 * exact + 1e-9
+
+
+def test_merged_hourly_sketches_match_single_sketch():
+    """Test merging per-hour sketches equals sketching the whole range."""
+    rng = random.Random(11)
+    hours = [[rng.uniform(1, 600) for _ in range(500)] for _ in range(3)]
+    whole = DDSketch()
+    merged = DDSketch()
+    for values in hours:
+        hourly = DDSketch()
+        for value in values:
+            hourly.add(value)
+            whole.add(value)
+        # Round trip through the Redis hash representation
+        fields = {k: str(v) for k, v in hourly.to_fields().items()}
+        merged.merge(DDSketch.from_fields(fields))
+
+    assert merged.count == whole.count == 1500
+    assert merged.bins == whole.bins
+    assert merged.quantile(0.95) == whole.quantile(0.95)
+
+
+def test_store_builds_sketch_per_org_metric_and_hour():
+    """Test calls are folded into one sketch per org, metric and hour."""
+    hour = datetime(2026, 10, 18, 9, 15, tzinfo=timezone.utc)
+    calls = [
+        {
+            "organization_id": 1,
+            "org_id": "org-a",
+            "call_time": hour,
+            "duration_seconds": 0,
+            "verification_time_seconds": 12,
+        },
+        {
+            "organization_id": 1,
+            "org_id": "org-a",
+            "call_time": hour,
+            "duration_seconds": 90,
+            "verification_time_seconds": 30,
+        },
+    ]
+
+    sketches = SketchStore().build(calls)
+
+    top_of_hour = hour.replace(minute=0)
+    duration = sketches[sketch_key("call_duration", "org-a", top_of_hour)]
+    assert duration.count == 2
+    assert duration.zero_count == 1
+    assert sketches[sketch_key("verification_time", "org-a", top_of_hour)].sum == 42
+
+
+def test_ranges_over_31_days_are_rejected():
+    """Test a long range fails instead of merging only its first hours."""
+    start = datetime(2026, 9, 1)
+    assert len(sketch_hours(start, start + timedelta(days=31))) == MAX_SKETCH_HOURS
+
+    cache = MagicMock()
+    with pytest.raises(ValueError, match="limited to 31 days"):
+        asyncio.run(
+            SketchStore(cache).load(
+                "call_duration", "org-a", start, start + timedelta(days=32)
+            )
+        )
+    cache.redis.pipeline.assert_not_called()
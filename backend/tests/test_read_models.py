@@ -0,0 +1,74 @@
+"""
+Unit tests for the analytics read-model refresh engine.
+"""
+
+import asyncio
+import uuid
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from app.analytics import read_models
+from app.analytics.read_models import ReadModelRefresher, changed_organizations
+from app.models.provider import Provider
+from app.models.user import User
+
+
+def _persistent_provider(session, organization_id):
+    provider = Provider(id=uuid.uuid4(), organization_id=organization_id, state="CA")
+    make_transient_to_detached(provider)
+    session.add(provider)
+    return provider
+
+
+def test_changed_organizations_include_both_sides_of_a_move():
+    """Test new rows and rows moved between organizations are queued."""
+    session = Session()
+    new_org, old_org, moved_to = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    session.add(Provider(organization_id=new_org, state="NY"))
+    _persistent_provider(session, old_org).organization_id = moved_to
+
+    assert changed_organizations(session) == {new_org, old_org, moved_to}
+
+
+def test_unmodified_rows_do_not_queue_refreshes():
+    """Test attached rows without changes leave the queue untouched."""
+    session = Session()
+    _persistent_provider(session, uuid.uuid4())
+
+    assert changed_organizations(session) == set()
+
+
+def test_updates_outside_the_read_model_columns_are_ignored():
+    """Test a login or a rename does not queue, a provider's new state does."""
+    session = Session()
+    user = User(id=uuid.uuid4(), organization_id=uuid.uuid4())
+    make_transient_to_detached(user)
+    session.add(user)
+    user.update_last_login()
+    renamed = _persistent_provider(session, uuid.uuid4())
+    renamed.name = "Renamed Clinic"
+    moved = _persistent_provider(session, uuid.uuid4())
+    moved.state = "NV"
+
+    assert changed_organizations(session) == {moved.organization_id}
+
+
+def test_refresh_pending_publishes_versions_after_commit():
+    """Test claimed organizations are refreshed, committed, then re-versioned."""
+    org_ids = [uuid.uuid4(), uuid.uuid4()]
+    db = AsyncMock()
+    db.execute.return_value = [(org_id,) for org_id in org_ids]
+    session_factory = MagicMock()
+    session_factory.return_value.__aenter__.return_value = db
+    refresher = ReadModelRefresher(cache=MagicMock())
+    refresher.refresh = AsyncMock()
+    refresher.publish = AsyncMock()
+
+    with patch.object(read_models.database, "async_session_factory", session_factory):
+        refreshed = asyncio.run(refresher.refresh_pending())
+
+    assert refreshed == org_ids
+    refresher.refresh.assert_awaited_once_with(db, org_ids)
+    db.commit.assert_awaited_once()
+    refresher.publish.assert_awaited_once_with(org_ids)
@@ -0,0 +1,118 @@
+"""
+Unit tests for the two-tier read-through cache.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+from app.services.read_through_cache import ReadThroughCache
+
+
+def _fake_redis_cache():
+    """RedisCache stand-in backed by a dict."""
+    store = {}
+    cache = MagicMock()
+    cache.redis.get = AsyncMock(side_effect=lambda key: store.get(key))
+
+    async def set_tagged(key, value, tags, ttl=None):
+        store[key] = value
+        return True
+
+    cache.set_tagged = AsyncMock(side_effect=set_tagged)
+    cache.delete = AsyncMock(side_effect=lambda key: store.pop(key, None))
+    return cache, store
+
+
+def test_concurrent_misses_run_loader_once():
+    """Test concurrent misses for one key are coalesced into a single load."""
+    redis_cache, _ = _fake_redis_cache()
+    cache = ReadThroughCache("test_single_flight", redis_cache=redis_cache)
+    calls = 0
+
+    async def loader():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return {"total": 42}
+
+    async def run():
+        return await asyncio.gather(
+            *[cache.get_or_load("org-1", loader) for _ in range(50)]
+        )
+
+    results = asyncio.run(run())
+
+    assert calls == 1
+    assert all(result == {"total": 42} for result in results)
+    assert cache.stats["coalesced"] == 49
+
+
+def test_local_and_redis_hits():
+    """Test values are served from the local tier, then from Redis."""
+    redis_cache, _ = _fake_redis_cache()
+    cache = ReadThroughCache("test_tiers", redis_cache=redis_cache)
+    loader = AsyncMock(return_value=[1, 2, 3])
+
+    async def run():
+        await cache.get_or_load("key", loader)
+        await cache.get_or_load("key", loader)
+        cache.local.clear()
+        return await cache.get_or_load("key", loader)
+
+    assert asyncio.run(run()) == [1, 2, 3]
+    assert loader.await_count == 1
+    assert cache.stats["local_hits"] == 1
+    assert cache.stats["redis_hits"] == 1
+    assert cache.hit_ratio() == 2 / 3
+
+
+def test_stale_value_served_when_refresh_fails():
+    """Test a stale entry is still returned if revalidation raises."""
+    redis_cache, _ = _fake_redis_cache()
+    cache = ReadThroughCache(
+        "test_stale", ttl=0, stale_ttl=60, jitter=0, redis_cache=redis_cache
+    )
+
+    async def failing_loader():
+        raise RuntimeError("database unavailable")
+
+    async def run():
+        await cache.get_or_load("key", AsyncMock(return_value="cached"))
+        value = await cache.get_or_load("key", failing_loader)
+        await asyncio.gather(*cache._refreshes, return_exceptions=True)
+        return value
+
+    assert asyncio.run(run()) == "cached"
+    assert cache.stats["stale_hits"] == 1
+    assert cache.stats["errors"] == 1
+
+
+def test_stale_value_returned_before_background_refresh():
+    """Test a stale hit does not wait for the loader, which runs once."""
+    redis_cache, _ = _fake_redis_cache()
+    cache = ReadThroughCache(
+        "test_revalidate", ttl=0, stale_ttl=60, jitter=0, redis_cache=redis_cache
+    )
+    calls = 0
+
+    async def run():
+        gate = asyncio.Event()
+
+        async def slow_loader():
+            nonlocal calls
+            calls += 1
+            await gate.wait()
+            return "fresh"
+
+        await cache.get_or_load("key", AsyncMock(return_value="cached"))
+        served = await asyncio.gather(
+            *[cache.get_or_load("key", slow_loader) for _ in range(3)]
+        )
+        gate.set()
+        await asyncio.gather(*cache._refreshes)
+        return served
+
+    assert asyncio.run(run()) == ["cached"] * 3
+    assert calls == 1
+    assert cache.stats["stale_hits"] == 3
+    assert cache.local.get("key")[0] == "fresh"
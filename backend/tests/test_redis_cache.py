@@ -0,0 +1,140 @@
+"""
+Unit tests for tag and generation invalidation in the Redis cache.
+"""
+
+import asyncio
+
+from app.services import redis_cache
+from app.services.redis_cache import RedisCache, generation_key, tag_key
+
+
+class _FakePipeline:
+    """Queues commands against a _FakeRedis and runs them on execute."""
+
+    def __init__(self, client):
+        self.client = client
+        self.queued = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.queued.append((name, args, kwargs))
+
+        return queue
+
+    async def execute(self):
+        results = [
+            await getattr(self.client, name)(*args, **kwargs)
+            for name, args, kwargs in self.queued
+        ]
+        self.queued = []
+        return results
+
+
+class _FakeRedis:
+    """Just enough of the asyncio Redis client, backed by dicts."""
+
+    def __init__(self):
+        self.store = {}
+        self.sets = {}
+
+    def register_script(self, source):
+        async def get_versioned(keys, args):
+            generation = self.store.get(keys[0]) or "0"
+            return self.store.get(f"{args[0]}:g{generation}:{args[1]}")
+
+        return get_versioned
+
+    def pipeline(self, transaction=False):
+        return _FakePipeline(self)
+
+    async def set(self, key, value, ex=None):
+        self.store[key] = value
+        return True
+
+    async def get(self, key):
+        return self.store.get(key)
+
+    async def mget(self, keys):
+        return [self.store.get(key) for key in keys]
+
+    async def incr(self, key):
+        self.store[key] = str(int(self.store.get(key) or 0) + 1)
+        return int(self.store[key])
+
+    async def sadd(self, key, *members):
+        self.sets.setdefault(key, set()).update(members)
+        return len(members)
+
+    async def expire(self, key, ttl):
+        return True
+
+    async def sscan_iter(self, key, count=None):
+        for member in sorted(self.sets.get(key, ())):
+            yield member
+
+    async def unlink(self, *keys):
+        removed = 0
+        for key in keys:
+            removed += self.store.pop(key, None) is not None
+            removed += self.sets.pop(key, None) is not None
+        return removed
+
+
+def test_invalidate_tags_unlinks_only_tagged_keys(monkeypatch):
+    """Test a tag drops its members in chunks and leaves other keys alone."""
+    monkeypatch.setattr(redis_cache, "INVALIDATION_CHUNK_SIZE", 2)
+    client = _FakeRedis()
+    cache = RedisCache(client)
+
+    async def run():
+        for i in range(5):
+            await cache.set_tagged(f"k{i}", {"i": i}, ["org:1", f"item:{i}"])
+        await cache.set_tagged("other", "v", ["org:2"])
+        return await cache.invalidate_tags("org:1")
+
+    assert asyncio.run(run()) == 5
+    assert set(client.store) == {"other"}
+    assert tag_key("org:1") not in client.sets
+    assert client.sets[tag_key("org:2")] == {"other"}
+
+
+def test_daily_metrics_invalidated_by_date_tag():
+    """Test invalidating one date keeps the organization's other dates."""
+    cache = RedisCache(_FakeRedis())
+
+    async def run():
+        await cache.cache_daily_metrics("org-1", "2026-10-17", {"calls": 1})
+        await cache.cache_daily_metrics("org-1", "2026-10-18", {"calls": 2})
+        await cache.invalidate_daily_metrics(date="2026-10-18")
+        return await cache.get_daily_metrics_range(
+            "org-1", ["2026-10-17", "2026-10-18"]
+        )
+
+    assert asyncio.run(run()) == {
+        "2026-10-17": {"calls": 1},
+        "2026-10-18": None,
+    }
+
+
+def test_generation_bump_drops_the_namespace():
+    """Test bumping a generation hides old entries and scopes new writes."""
+    client = _FakeRedis()
+    cache = RedisCache(client)
+
+    async def run():
+        await cache.cache_daily_metrics("org-1", "2026-10-18", {"calls": 1})
+        before = await cache.get_daily_metrics("org-1", "2026-10-18")
+        await cache.invalidate_daily_metrics()
+        after = await cache.get_daily_metrics("org-1", "2026-10-18")
+        await cache.cache_daily_metrics("org-1", "2026-10-18", {"calls": 3})
+        return before, after, await cache.get_daily_metrics("org-1", "2026-10-18")
+
+    assert asyncio.run(run()) == ({"calls": 1}, None, {"calls": 3})
+    assert client.store[generation_key("daily_metrics")] == "1"
+    assert "daily_metrics:g1:org-1:2026-10-18" in client.store
@@ -0,0 +1,124 @@
+"""
+Unit tests for the declarative service cache decorators.
+"""
+
+import asyncio
+import uuid
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+from pydantic import BaseModel
+
+from app.core import cache as service_cache
+from app.services.provider_service import ProviderService
+
+
+class _Item(BaseModel):
+    id: int
+    name: str
+
+
+class _FakeRedis:
+    """In-memory stand-in for the RedisCache calls the decorators make."""
+
+    def __init__(self):
+        self.store = {}
+        self.tags = {}
+        self.redis = MagicMock()
+        self.redis.get = AsyncMock(side_effect=lambda key: self.store.get(key))
+
+    async def set_tagged(self, key, value, tags, ttl=None):
+        self.store[key] = value
+        for tag in tags:
+            self.tags.setdefault(tag, set()).add(key)
+
+    async def delete(self, key):
+        self.store.pop(key, None)
+
+    async def invalidate_tags(self, *tags):
+        for tag in tags:
+            for key in self.tags.pop(tag, set()):
+                self.store.pop(key, None)
+
+
+class _Service:
+    def __init__(self):
+        self.current_user = {"organization_id": "org-1"}
+        self.loads = 0
+
+    @service_cache.cached("test_item", key=("item_id",), schema=_Item)
+    async def get_item(self, item_id: int):
+        self.loads += 1
+        return {"id": item_id, "name": "widget"}
+
+    @service_cache.invalidates("test_item", key=("item_id",))
+    async def update_item(self, item_id: int):
+        return True
+
+
+def test_cached_read_hits_after_first_load(monkeypatch):
+    """Test a second read is served from the cache as a schema instance."""
+    fake = _FakeRedis()
+    monkeypatch.setattr(service_cache, "_cache", fake)
+    service = _Service()
+
+    first = asyncio.run(service.get_item(7))
+    second = asyncio.run(service.get_item(7))
+
+    assert first == _Item(id=7, name="widget")
+    assert second == _Item(id=7, name="widget")
+    assert service.loads == 1
+    assert "svc:test_item:org-1:item_id=7" in fake.store
+    assert service_cache.get_cached_stats()["test_item"]["hits"] >= 1
+
+
+def test_invalidates_drops_entry_after_write(monkeypatch):
+    """Test a decorated write removes the cached entry it changes."""
+    fake = _FakeRedis()
+    monkeypatch.setattr(service_cache, "_cache", fake)
+    service = _Service()
+
+    asyncio.run(service.get_item(3))
+    asyncio.run(service.update_item(3))
+    asyncio.run(service.get_item(3))
+
+    assert service.loads == 2
+
+
+def test_cached_provider_keeps_its_organization(monkeypatch):
+    """Test cached providers carry the organization used for access checks."""
+    monkeypatch.setattr(service_cache, "_cache", _FakeRedis())
+    organization_id = uuid.uuid4()
+    row = SimpleNamespace(
+        id=uuid.uuid4(),
+        organization_id=organization_id,
+        name="Clinic",
+        npi="1234567890",
+        tax_id="123456789",
+        email="clinic@example.com",
+        phone="555-0100",
+        fax=None,
+        address_line1="1 Main St",
+        address_line2=None,
+        city="Austin",
+        state="TX",
+        zip_code="78701",
+        specialty=None,
+        accepting_new_patients=True,
+        insurance_networks=None,
+        office_hours=None,
+        is_active=True,
+        created_at=datetime(2026, 10, 18),
+        updated_at=datetime(2026, 10, 18),
+        created_by_id=uuid.uuid4(),
+    )
+    service = ProviderService(MagicMock())
+    service._load_provider = AsyncMock(return_value=row)
+
+    first = asyncio.run(service.get_provider(row.id))
+    second = asyncio.run(service.get_provider(row.id))
+
+    assert first.organization_id == organization_id
+    assert second.organization_id == organization_id
+    service._load_provider.assert_awaited_once()